@@ -0,0 +1,122 @@
+# 응답 압축 미들웨어
+# 일정 크기 이상의 응답 본문을 brotli(가능하면) 또는 gzip으로 압축합니다.
+# 스트리밍 응답(SSE, 내보내기 등)과 이미 압축된 응답은 그대로 통과시킵니다.
+import gzip
+import os
+
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
+# 이보다 작은 본문은 압축하지 않음 (바이트)
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+
+# 압축 수준 (속도 우선: 응답마다 실시간 압축)
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 4
+
+# 이미 압축된 형식이라 다시 압축해도 이득이 없는 타입
+SKIP_CONTENT_TYPES = ("text/event-stream", "audio/", "image/", "application/zip", "application/gzip")
+
+
+def choose_encoding(accept_encoding: str) -> str:
+    """Accept-Encoding에서 사용할 인코딩 선택 (br > gzip, 없으면 빈 문자열)"""
+    accepted = set()
+    for part in accept_encoding.split(","):
+        name, _, params = part.partition(";")
+        quality = 1.0
+        params = params.strip().lower()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        if quality > 0:
+            accepted.add(name.strip().lower())
+
+    if BROTLI_AVAILABLE and "br" in accepted:
+        return "br"
+    if "gzip" in accepted:
+        return "gzip"
+    return ""
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=GZIP_LEVEL)
+
+
+class CompressionMiddleware:
+    """
+    순수 ASGI 미들웨어.
+    Content-Length가 있는(버퍼링된) 응답만 압축 대상으로 보고,
+    스트리밍 응답은 첫 메시지를 그대로 흘려보냅니다.
+    """
+
+    def __init__(self, app, minimum_size: int = COMPRESSION_MIN_SIZE):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_headers = {key.decode("latin-1").lower(): value.decode("latin-1")
+                           for key, value in scope.get("headers", [])}
+        encoding = choose_encoding(request_headers.get("accept-encoding", ""))
+        if not encoding:
+            await self.app(scope, receive, send)
+            return
+
+        start_message = None
+        chunks = []
+        passthrough = False
+
+        async def send_wrapper(message):
+            nonlocal start_message, passthrough
+            if passthrough:
+                await send(message)
+                return
+
+            if message["type"] == "http.response.start":
+                headers = {key.decode("latin-1").lower(): value.decode("latin-1")
+                           for key, value in message.get("headers", [])}
+                content_type = headers.get("content-type", "")
+                length = headers.get("content-length")
+                if (
+                    length is None
+                    or int(length) < self.minimum_size
+                    or "content-encoding" in headers
+                    or content_type.startswith(SKIP_CONTENT_TYPES)
+                ):
+                    passthrough = True
+                    await send(message)
+                    return
+                start_message = message
+                return
+
+            # http.response.body: 본문을 모아서 마지막에 한 번에 압축
+            chunks.append(message.get("body", b""))
+            if message.get("more_body", False):
+                return
+
+            body = compress(b"".join(chunks), encoding)
+            headers = [
+                (key, value) for key, value in start_message["headers"]
+                if key.lower() not in (b"content-length", b"vary")
+            ]
+            vary = next((value.decode("latin-1") for key, value in start_message["headers"]
+                         if key.lower() == b"vary"), "")
+            headers += [
+                (b"content-encoding", encoding.encode("latin-1")),
+                (b"content-length", str(len(body)).encode("latin-1")),
+                (b"vary", (f"{vary}, Accept-Encoding" if vary else "Accept-Encoding").encode("latin-1")),
+            ]
+            await send({**start_message, "headers": headers})
+            await send({"type": "http.response.body", "body": body})
+
+        await self.app(scope, receive, send_wrapper)
@@ -1,19 +1,38 @@
 # FastAPI 메인 엔트리포인트
 import os
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 from dotenv import load_dotenv
 
-from app.routers import analyze
+from app.routers import analyze, export, history, stats
+from app.serialization import FastJSONResponse
+from app.compression import CompressionMiddleware
+from app.services.metrics import render_prometheus
+from app.services.pending_sweeper import start_pending_sweeper
 
 # 환경 변수 로드
 load_dotenv()
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """서버 시작/종료 시 백그라운드 작업 관리"""
+    # 재시작 등으로 끝내지 못한 지연 단계(pending_stages) 정리
+    sweeper = start_pending_sweeper()
+    yield
+    if sweeper is not None:
+        sweeper.cancel()
+
+
 # FastAPI 앱 생성
 app = FastAPI(
     title="True Voice API",
     description="한국어 발음 교정 앱 MVP API",
     version="1.0.0",
+    default_response_class=FastJSONResponse,
+    lifespan=lifespan,
 )
 
 # CORS 설정 (개발 환경에서는 모든 출처 허용)
@@ -25,8 +44,14 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# 큰 응답 본문 압축 (brotli/gzip, COMPRESSION_MIN_SIZE 이상)
+app.add_middleware(CompressionMiddleware)
+
 # 라우터 등록
 app.include_router(analyze.router, prefix="/api", tags=["analyze"])
+app.include_router(history.router, prefix="/api", tags=["history"])
+app.include_router(stats.router, prefix="/api", tags=["stats"])
+app.include_router(export.router, prefix="/api", tags=["export"])
 
 
 @app.get("/")
@@ -48,6 +73,12 @@ async def health_check():
     }
 
 
+@app.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    """운영 메트릭 (Prometheus 텍스트 형식): 분석 동시 실행 수, 대기열 길이, 거절 수 등"""
+    return render_prometheus()
+
+
 # 개발 서버 실행 (직접 실행 시)
 if __name__ == "__main__":
     import uvicorn
@@ -1,291 +1,469 @@
 # 분석 API 라우터
+import asyncio
 import os
-from fastapi import APIRouter, HTTPException
+from typing import Optional
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
 
 from app.schemas import (
     AnalyzeRequest,
     AnalyzeResponse,
     ResultResponse,
-    Scores,
-    FormantAnalysis,
-    ToneAnalysis,
 )
+from app.serialization import negotiate, format_sse
 from app.services.supabase import (
-    get_recording,
-    update_recording_status,
-    save_analysis_result,
     get_analysis_result,
-    download_recording_file,
+    get_analysis_result_by_recording,
+    download_artifact,
+)
+from app.services.analysis_pipeline import (
+    run_analysis,
+    wait_for_claimed_analysis,
+    AnalysisClaimed,
+    AnalysisFailed,
+    Emit,
+    scores_from_row,
+    formant_from_row,
+    tone_from_row,
+)
+from app.services.contour_codec import (
+    decode_series,
+    decode_contour_level,
+    contour_to_json,
+    level_to_json,
+    CONTOUR_CHANNELS,
+    RAW_SERIES,
+    CONTENT_TYPE as CONTOUR_CONTENT_TYPE,
+)
+from app.services.single_flight import SingleFlight, SingleFlightConflict
+from app.services.cancellation import CancelToken
+from app.services.rescoring import ensure_current_scoring
+from app.services import metrics
+from app.services.admission import analysis_admission, AdmissionRejected
+from app.services.waveform_peaks import (
+    decode_peaks_level,
+    CONTENT_TYPE as PEAKS_CONTENT_TYPE,
 )
-from app.services.azure_speech import assess_pronunciation, get_mock_result, convert_to_wav
-from app.services.formant_analysis import analyze_formants, get_mock_formant_result
-from app.services.tone_analysis import analyze_tone, get_mock_tone_result
 
 router = APIRouter()
 
-# 개발 모드 확인
-DEV_MODE = os.getenv("DEV_MODE", "false").lower() == "true"
+# 같은 녹음에 대한 동시 분석 요청은 진행 중인 분석 하나를 공유
+# (옵션이 다른 요청은 공유하지 않고 409로 거절)
+analysis_flight = SingleFlight()
+
+FLIGHT_CONFLICT_DETAIL = "같은 녹음을 다른 옵션으로 분석 중입니다. 잠시 후 다시 시도해주세요."
+
+# 분석을 기다리는 동안 클라이언트 연결 끊김을 확인하는 간격 (초)
+DISCONNECT_POLL_SECONDS = 0.5
+
+# 연결이 끊긴 요청에 대한 응답 상태 (nginx의 Client Closed Request, 실제로는 전달되지 않음)
+CLIENT_CLOSED_REQUEST = 499
+
+# 시계열/파형 산출물 캐시 정책
+# 같은 결과 ID라도 다시 분석(백필)하면 산출물이 새 경로로 바뀌므로 URL만으로 영구 캐시하지 않고,
+# 경로로 만든 ETag로 매번 재검증합니다 (바뀌지 않았으면 산출물을 내려받지 않고 본문 없이 304).
+ARTIFACT_CACHE_CONTROL = "private, no-cache"
+
+
+async def run_cancellable(cancel: CancelToken, func, *args):
+    """
+    블로킹 함수를 스레드 풀에서 실행합니다.
+    이 코루틴이 취소되면 cancel로 스레드에 알리고, 스레드가 실제로 멈출 때까지 기다린 뒤 취소를 전파합니다.
+    """
+    work = asyncio.ensure_future(run_in_threadpool(func, *args))
+    try:
+        return await asyncio.shield(work)
+    except asyncio.CancelledError:
+        cancel.cancel()
+        await asyncio.wait({work})
+        if not work.cancelled():
+            work.exception()  # AnalysisCancelled는 예상된 종료이므로 소비만 함
+        raise
+
+
+async def admitted_analysis(request: AnalyzeRequest, emit: Optional[Emit] = None) -> AnalyzeResponse:
+    """
+    수락 제어 슬롯 안에서 분석을 실행합니다.
+    이 코루틴이 취소되면(기다리는 클라이언트가 모두 떠나면) 분석 스레드에 취소를 알리고,
+    스레드가 실제로 멈출 때까지 슬롯을 쥐고 있어 동시 실행 수 제한이 유지됩니다.
+    마감을 넘겨 백그라운드에서 계속되는 단계가 있으면 그 단계들이 끝날 때 슬롯을 반납합니다.
+
+    다른 인스턴스가 이미 분석 중이면 슬롯을 바로 반납하고, 슬롯 밖에서 그 결과를 기다립니다.
+    """
+    started = False
+    cancel = CancelToken()
+    try:
+        # 동시 실행 수 제한: 슬롯이 없으면 대기열에서 기다리고, 넘치면 즉시 거절
+        async with analysis_admission.slot() as lease:
+            started = True
+            # Azure/Praat 호출이 블로킹이므로 스레드 풀에서 실행해 이벤트 루프를 막지 않음
+            return await run_cancellable(cancel, run_analysis, request, emit, cancel, lease.detach)
+    except AnalysisClaimed:
+        # 폴링은 CPU를 쓰지 않으므로 슬롯을 차지하지 않음 (취소되면 다음 폴링 전에 멈춤)
+        return await run_cancellable(cancel, wait_for_claimed_analysis, request.recording_id, cancel)
+    except asyncio.CancelledError:
+        if not started:
+            # 대기열에서 기다리다 떠난 요청은 아무 작업도 하지 않음
+            metrics.inc("truevoice_analysis_cancelled_total", stage="queued")
+        raise
+
+
+def analysis_options(request: AnalyzeRequest) -> tuple:
+    """결과를 바꾸는 요청 옵션 (같은 녹음이라도 이 값이 같을 때만 진행 중인 분석을 공유)"""
+    return (
+        request.reference_text,
+        request.include_formant,
+        request.include_tone,
+        request.preset,
+        request.deadline_ms,
+    )
+
+
+async def finished_before_disconnect(http_request: Request, task: asyncio.Future) -> bool:
+    """
+    task가 끝날 때까지 기다리며 클라이언트 연결 끊김을 확인합니다.
+    먼저 끊기면 task를 취소하고 False를 반환합니다.
+    """
+    while True:
+        done, _ = await asyncio.wait({task}, timeout=DISCONNECT_POLL_SECONDS)
+        if done:
+            return True
+        if await http_request.is_disconnected():
+            print("[INFO] 클라이언트 연결 끊김, 분석 취소")
+            task.cancel()
+            await asyncio.wait({task})
+            return False
 
 
 @router.post("/analyze", response_model=AnalyzeResponse)
-async def analyze_recording(request: AnalyzeRequest):
+async def analyze_recording(request: AnalyzeRequest, http_request: Request):
     """
     음성 파일을 분석하고 발음 평가 결과를 반환합니다.
+    Accept: application/msgpack 이면 MessagePack으로 응답합니다.
 
     - recording_id: 녹음 ID (Supabase recordings 테이블)
     - reference_text: 평가 기준 텍스트
     - include_formant: 공명 분석 포함 여부 (기본값: True)
     - include_tone: 톤 분석 포함 여부 (기본값: True)
+    - deadline_ms: 응답 마감 시간 (기본값: ANALYZE_DEADLINE_MS). 공명/톤 분석이 마감까지
+      끝나지 않으면 준비된 결과만 먼저 반환하고 pending에 남은 단계를 표시합니다.
+      남은 단계는 백그라운드에서 계속 계산되어 GET /results/{result_id}에 채워집니다.
+
+    같은 녹음이 다른 옵션(reference_text, include_*, preset, deadline_ms)으로 분석 중이면 409를 반환합니다.
     """
-    recording_id = request.recording_id
-    reference_text = request.reference_text
-    include_formant = request.include_formant
-    include_tone = request.include_tone
-
-    # 개발 모드에서는 목업 결과 반환
-    if DEV_MODE:
-        mock_result = get_mock_result(reference_text)
-
-        # 공명 목업 결과
-        formant_analysis = None
-        formant_data = None
-        if include_formant:
-            mock_formant = get_mock_formant_result()
-            formant_analysis = FormantAnalysis(
-                resonance_score=mock_formant.resonance_score,
-                stability_score=mock_formant.stability_score,
-                feedback=mock_formant.feedback,
-            )
-            formant_data = {
-                "resonance_score": mock_formant.resonance_score,
-                "stability_score": mock_formant.stability_score,
-                "feedback": mock_formant.feedback,
-            }
-
-        # 톤 목업 결과
-        tone_analysis = None
-        tone_data = None
-        if include_tone:
-            mock_tone = get_mock_tone_result()
-            tone_analysis = ToneAnalysis(
-                tone_score=mock_tone.tone_score,
-                stability_score=mock_tone.stability_score,
-                clarity_score=mock_tone.clarity_score,
-                intonation_score=mock_tone.intonation_score,
-                mean_pitch=mock_tone.mean_pitch,
-                pitch_range=mock_tone.pitch_range,
-                feedback=mock_tone.feedback,
-            )
-            tone_data = {
-                "tone_score": mock_tone.tone_score,
-                "stability_score": mock_tone.stability_score,
-                "clarity_score": mock_tone.clarity_score,
-                "intonation_score": mock_tone.intonation_score,
-                "mean_pitch": mock_tone.mean_pitch,
-                "pitch_range": mock_tone.pitch_range,
-                "feedback": mock_tone.feedback,
-            }
-
-        # 목업 결과 저장
-        saved_result = save_analysis_result(
-            recording_id=recording_id,
-            accuracy_score=mock_result.accuracy_score,
-            fluency_score=mock_result.fluency_score,
-            completeness_score=mock_result.completeness_score,
-            pronunciation_score=mock_result.pronunciation_score,
-            feedback=mock_result.feedback,
-            formant_data=formant_data,
-            tone_data=tone_data,
-        )
+    # 더블 탭/재시도로 같은 녹음이 동시에 들어오면 진행 중인 분석 하나를 공유
+    # 분석 중에 연결이 끊기면 (공유 중인 다른 요청이 없을 때) 분석을 취소
+    analysis = asyncio.ensure_future(
+        analysis_flight.do(request.recording_id, lambda: admitted_analysis(request), analysis_options(request))
+    )
+    if not await finished_before_disconnect(http_request, analysis):
+        return Response(status_code=CLIENT_CLOSED_REQUEST)
 
-        result_id = saved_result["id"] if saved_result else "mock-result-id"
-
-        return AnalyzeResponse(
-            success=True,
-            result_id=result_id,
-            scores=Scores(
-                accuracy=mock_result.accuracy_score,
-                fluency=mock_result.fluency_score,
-                completeness=mock_result.completeness_score,
-                pronunciation=mock_result.pronunciation_score,
-            ),
-            feedback=mock_result.feedback,
-            formant=formant_analysis,
-            tone=tone_analysis,
+    try:
+        response = analysis.result()
+    except AdmissionRejected as e:
+        print(f"[INFO] 분석 요청 거절 ({e.reason}): {request.recording_id}")
+        raise HTTPException(
+            status_code=e.status_code,
+            detail="요청이 많아 지금은 분석할 수 없습니다. 잠시 후 다시 시도해주세요.",
+            headers={"Retry-After": str(e.retry_after)},
         )
+    except SingleFlightConflict:
+        raise HTTPException(status_code=409, detail=FLIGHT_CONFLICT_DETAIL)
+    except AnalysisFailed as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
+    return negotiate(http_request, response)
 
-    # 1. 녹음 정보 조회
-    recording = get_recording(recording_id)
-    if not recording:
-        raise HTTPException(status_code=404, detail="녹음을 찾을 수 없습니다.")
 
-    # 2. 상태 업데이트: analyzing
-    update_recording_status(recording_id, "analyzing")
+# 스트림이 끝나기 전에 반드시 보내야 하는 이벤트 (공유된 분석을 기다린 경우 최종 응답으로 채움)
+FINAL_EVENTS = ("scores", "formant", "tone", "saved")
 
-    try:
-        # 3. 음성 파일 다운로드
-        audio_data = download_recording_file(recording["file_path"])
-        if not audio_data:
-            update_recording_status(recording_id, "failed")
-            raise HTTPException(status_code=500, detail="음성 파일을 다운로드할 수 없습니다.")
-
-        # 4. 오디오 형식 변환 (M4A/WebM → WAV)
-        file_path = recording["file_path"]
-        audio_format = "wav"
-        if file_path.endswith(".m4a"):
-            audio_format = "m4a"
-        elif file_path.endswith(".webm"):
-            audio_format = "webm"
-        elif file_path.endswith(".mp4"):
-            audio_format = "mp4"
-        
-        # WAV로 변환
-        wav_audio_data = audio_data
-        if audio_format != "wav":
-            wav_audio_data = convert_to_wav(audio_data, audio_format)
-        
-        # 5. Azure 발음 평가
-        result = assess_pronunciation(wav_audio_data, reference_text, "wav")
-
-        if not result.success:
-            update_recording_status(recording_id, "failed")
-            return AnalyzeResponse(
-                success=False,
-                error=result.error or "발음 평가에 실패했습니다.",
-            )
 
-        # 6. 공명 분석 (옵션)
-        formant_analysis = None
-        formant_data = None
-        if include_formant:
-            formant_result = analyze_formants(wav_audio_data)
-            if formant_result.success:
-                formant_analysis = FormantAnalysis(
-                    resonance_score=formant_result.resonance_score,
-                    stability_score=formant_result.stability_score,
-                    feedback=formant_result.feedback,
-                )
-                formant_data = {
-                    "resonance_score": formant_result.resonance_score,
-                    "stability_score": formant_result.stability_score,
-                    "feedback": formant_result.feedback,
-                }
-
-        # 7. 톤 분석 (옵션)
-        tone_analysis = None
-        tone_data = None
-        if include_tone:
-            tone_result = analyze_tone(wav_audio_data)
-            if tone_result.success:
-                tone_analysis = ToneAnalysis(
-                    tone_score=tone_result.tone_score,
-                    stability_score=tone_result.stability_score,
-                    clarity_score=tone_result.clarity_score,
-                    intonation_score=tone_result.intonation_score,
-                    mean_pitch=tone_result.mean_pitch,
-                    pitch_range=tone_result.pitch_range,
-                    feedback=tone_result.feedback,
-                )
-                tone_data = {
-                    "tone_score": tone_result.tone_score,
-                    "stability_score": tone_result.stability_score,
-                    "clarity_score": tone_result.clarity_score,
-                    "intonation_score": tone_result.intonation_score,
-                    "mean_pitch": tone_result.mean_pitch,
-                    "pitch_range": tone_result.pitch_range,
-                    "feedback": tone_result.feedback,
-                }
-
-        # 8. 결과 저장
-        saved_result = save_analysis_result(
-            recording_id=recording_id,
-            accuracy_score=result.accuracy_score,
-            fluency_score=result.fluency_score,
-            completeness_score=result.completeness_score,
-            pronunciation_score=result.pronunciation_score,
-            feedback=result.feedback,
-            formant_data=formant_data,
-            tone_data=tone_data,
-        )
+@router.post("/analyze/stream")
+async def analyze_recording_stream(request: AnalyzeRequest):
+    """
+    /analyze와 같은 분석을 Server-Sent Events로 진행 상황과 함께 반환합니다.
+    단계가 끝날 때마다 이벤트를 보내므로 첫 결과를 가장 느린 단계보다 먼저 받을 수 있습니다.
+
+    이벤트 (event: 이름, data: JSON):
+    - downloaded: {bytes}
+    - converted: {duration, speech_duration, sample_rate}
+    - scores: Scores
+    - formant: FormantAnalysis
+    - tone: ToneAnalysis
+    - saved: AnalyzeResponse (result_id 포함, 마지막 이벤트)
+    - error: {status_code, detail} (실패 시 마지막 이벤트)
+
+    스트림에서는 단계별로 바로 보내므로 deadline_ms를 적용하지 않고 모든 단계를 기다립니다.
+    스트림이 끝나기 전에 연결이 끊기면 분석을 취소합니다.
+    """
+    loop = asyncio.get_running_loop()
+    events: asyncio.Queue = asyncio.Queue()
 
-        if not saved_result:
-            update_recording_status(recording_id, "failed")
-            raise HTTPException(status_code=500, detail="결과 저장에 실패했습니다.")
-
-        # 9. 상태 업데이트: completed
-        update_recording_status(recording_id, "completed")
-
-        return AnalyzeResponse(
-            success=True,
-            result_id=saved_result["id"],
-            scores=Scores(
-                accuracy=result.accuracy_score,
-                fluency=result.fluency_score,
-                completeness=result.completeness_score,
-                pronunciation=result.pronunciation_score,
-            ),
-            feedback=result.feedback,
-            formant=formant_analysis,
-            tone=tone_analysis,
+    def emit(event: str, payload):
+        # 분석 스레드에서 호출되므로 이벤트 루프로 넘겨서 큐에 넣음
+        loop.call_soon_threadsafe(events.put_nowait, (event, payload))
+
+    streamed_request = request.model_copy(update={"deadline_ms": 0})
+
+    async def event_stream():
+        # 같은 녹음의 분석이 이미 진행 중이면 그 결과를 공유 (이 경우 중간 이벤트 없이 최종 결과만 전송)
+        analysis = asyncio.ensure_future(
+            analysis_flight.do(
+                request.recording_id,
+                lambda: admitted_analysis(streamed_request, emit),
+                analysis_options(streamed_request),
+            )
         )
+        sent = set()
+        try:
+            while True:
+                next_event = asyncio.ensure_future(events.get())
+                done, _ = await asyncio.wait({next_event, analysis}, return_when=asyncio.FIRST_COMPLETED)
+                if next_event not in done:
+                    next_event.cancel()
+                    break
+                event, payload = next_event.result()
+                sent.add(event)
+                yield format_sse(event, payload)
+        finally:
+            # 연결이 끊기면 StreamingResponse가 이 제너레이터를 취소함 → 분석도 취소
+            if not analysis.done():
+                print(f"[INFO] 스트림 연결 끊김, 분석 취소: {request.recording_id}")
+                analysis.cancel()
 
-    except HTTPException:
-        raise
-    except Exception as e:
-        update_recording_status(recording_id, "failed")
-        print(f"분석 오류: {e}")
-        raise HTTPException(status_code=500, detail="분석 중 오류가 발생했습니다.")
+        # 분석이 끝나기 직전에 들어온 이벤트
+        while not events.empty():
+            event, payload = events.get_nowait()
+            sent.add(event)
+            yield format_sse(event, payload)
+
+        try:
+            response = analysis.result()
+        except AdmissionRejected as e:
+            print(f"[INFO] 분석 요청 거절 ({e.reason}): {request.recording_id}")
+            yield format_sse("error", {
+                "status_code": e.status_code,
+                "detail": "요청이 많아 지금은 분석할 수 없습니다. 잠시 후 다시 시도해주세요.",
+                "retry_after": e.retry_after,
+            })
+            return
+        except SingleFlightConflict:
+            yield format_sse("error", {"status_code": 409, "detail": FLIGHT_CONFLICT_DETAIL})
+            return
+        except AnalysisFailed as e:
+            yield format_sse("error", {"status_code": e.status_code, "detail": e.detail})
+            return
+        except Exception as e:
+            print(f"분석 오류: {e}")
+            yield format_sse("error", {"status_code": 500, "detail": "분석 중 오류가 발생했습니다."})
+            return
+
+        if not response.success:
+            yield format_sse("error", {"status_code": 200, "detail": response.error})
+            return
+
+        final_payloads = {
+            "scores": response.scores,
+            "formant": response.formant,
+            "tone": response.tone,
+            "saved": response,
+        }
+        for event in FINAL_EVENTS:
+            if event not in sent and final_payloads[event] is not None:
+                yield format_sse(event, final_payloads[event])
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+def result_response(result: dict) -> ResultResponse:
+    """저장된 결과 행 → 결과 조회 응답"""
+    return ResultResponse(
+        id=result["id"],
+        recording_id=result["recording_id"],
+        created_at=result["created_at"],
+        scores=scores_from_row(result),
+        feedback=result["feedback"],
+        formant=formant_from_row(result),
+        tone=tone_from_row(result),
+        pending=result.get("pending_stages") or None,
+        preset=result.get("analysis_preset"),
+    )
 
 
 @router.get("/results/{result_id}", response_model=ResultResponse)
-async def get_result(result_id: str):
+async def get_result(result_id: str, http_request: Request):
     """
     저장된 분석 결과를 조회합니다.
+    Accept: application/msgpack 이면 MessagePack으로 응답합니다.
 
     - result_id: 분석 결과 ID
     """
-    # 결과 조회
-    result = get_analysis_result(result_id)
+    # 결과 조회 (이전 점수 공식으로 저장된 결과는 특징값으로 재채점)
+    result = ensure_current_scoring(get_analysis_result(result_id))
 
     if not result:
         raise HTTPException(status_code=404, detail="결과를 찾을 수 없습니다.")
 
-    # 공명 데이터 변환
-    formant_analysis = None
-    if result.get("formant_data"):
-        fd = result["formant_data"]
-        formant_analysis = FormantAnalysis(
-            resonance_score=fd.get("resonance_score", 0),
-            stability_score=fd.get("stability_score", 0),
-            feedback=fd.get("feedback", ""),
-        )
+    return negotiate(http_request, result_response(result))
 
-    # 톤 데이터 변환
-    tone_analysis = None
-    if result.get("tone_data"):
-        td = result["tone_data"]
-        tone_analysis = ToneAnalysis(
-            tone_score=td.get("tone_score", 0),
-            stability_score=td.get("stability_score", 0),
-            clarity_score=td.get("clarity_score", 0),
-            intonation_score=td.get("intonation_score", 0),
-            mean_pitch=td.get("mean_pitch", 0),
-            pitch_range=td.get("pitch_range", 0),
-            feedback=td.get("feedback", ""),
-        )
 
-    # 응답 반환
-    return ResultResponse(
-        id=result["id"],
-        recording_id=result["recording_id"],
-        created_at=result["created_at"],
-        scores=Scores(
-            accuracy=result["accuracy_score"],
-            fluency=result["fluency_score"],
-            completeness=result["completeness_score"],
-            pronunciation=result["pronunciation_score"],
-        ),
-        feedback=result["feedback"],
-        formant=formant_analysis,
-        tone=tone_analysis,
+@router.get("/recordings/{recording_id}/result", response_model=ResultResponse)
+async def get_recording_result(recording_id: str, http_request: Request):
+    """
+    녹음의 최신 분석 결과를 조회합니다 (result_id를 모를 때).
+    Accept: application/msgpack 이면 MessagePack으로 응답합니다.
+
+    - recording_id: 녹음 ID
+    """
+    result = ensure_current_scoring(get_analysis_result_by_recording(recording_id))
+
+    if not result:
+        raise HTTPException(status_code=404, detail="결과를 찾을 수 없습니다.")
+
+    return negotiate(http_request, result_response(result))
+
+
+def artifact_path(result_id: str, column: str, missing_detail: str) -> str:
+    """분석 결과 행의 산출물 경로 (결과나 산출물이 없으면 404)"""
+    result = get_analysis_result(result_id)
+    if not result:
+        raise HTTPException(status_code=404, detail="결과를 찾을 수 없습니다.")
+    path = result.get(column)
+    if not path:
+        raise HTTPException(status_code=404, detail=missing_detail)
+    return path
+
+
+def artifact_headers(path: str) -> dict:
+    """산출물 응답 헤더 (파일명이 분석마다 새 uuid이므로 경로로 약한 ETag를 만듦)"""
+    etag = f'W/"{os.path.splitext(os.path.basename(path))[0]}"'
+    return {"Cache-Control": ARTIFACT_CACHE_CONTROL, "ETag": etag}
+
+
+def not_modified(http_request: Request, headers: dict) -> Optional[Response]:
+    """If-None-Match가 현재 ETag와 같으면 304 응답 (JSON/MessagePack 응답과 같은 Vary 포함)"""
+    tags = [tag.strip() for tag in http_request.headers.get("if-none-match", "").split(",")]
+    if headers["ETag"] in tags or "*" in tags:
+        return Response(status_code=304, headers={**headers, "Vary": "Accept"})
+    return None
+
+
+def load_artifact(path: str, missing_detail: str) -> bytes:
+    """산출물을 내려받습니다 (없으면 404)."""
+    data = download_artifact(path)
+    if not data:
+        raise HTTPException(status_code=404, detail=missing_detail)
+    return data
+
+
+@router.get("/results/{result_id}/contours")
+async def get_result_contours(result_id: str, http_request: Request, format: str = "binary"):
+    """
+    분석 결과의 시계열(포먼트 트랙, 피치 컨투어)을 조회합니다.
+    차트를 열 때만 호출하도록 결과 조회와 분리되어 있습니다.
+
+    - result_id: 분석 결과 ID
+    - format: binary (기본값, 양자화된 컨테이너 그대로) 또는 json (원본 해상도만)
+    """
+    path = artifact_path(result_id, "contour_path", "시계열 데이터가 없습니다.")
+    headers = artifact_headers(path)
+    cached = not_modified(http_request, headers)
+    if cached:
+        return cached
+    data = load_artifact(path, "시계열 데이터가 없습니다.")
+
+    if format == "json":
+        series, meta = decode_series(data, RAW_SERIES)
+        return negotiate(http_request, {"meta": meta, **contour_to_json(series)}, headers=headers)
+
+    return Response(content=data, media_type=CONTOUR_CONTENT_TYPE, headers=headers)
+
+
+@router.get("/results/{result_id}/contours/{kind}")
+async def get_result_contour_level(
+    result_id: str,
+    kind: str,
+    http_request: Request,
+    points: int = Query(500, ge=10, le=10000),
+    start: Optional[float] = Query(None, ge=0),
+    end: Optional[float] = Query(None, ge=0),
+):
+    """
+    차트 크기에 맞춘 시계열을 조회합니다.
+    분석 시 미리 만든 LOD 레벨 중 범위 안 포인트 수가 points 이하인 가장 세밀한 레벨을 반환하므로,
+    녹음 길이와 상관없이 응답 크기가 일정합니다. 원본(level 0)이 아니면
+    각 포인트는 버킷 평균이고 <채널>_min / <채널>_max 에 버킷 범위가 함께 담깁니다.
+
+    - kind: pitch 또는 formant
+    - points: 최대 포인트 수 (차트 가로 픽셀 수 정도)
+    - start, end: 시간 범위 (초, 줌/스크롤)
+    """
+    if kind not in CONTOUR_CHANNELS:
+        raise HTTPException(status_code=400, detail="kind는 pitch 또는 formant 여야 합니다.")
+    if start is not None and end is not None and end < start:
+        raise HTTPException(status_code=400, detail="end는 start보다 커야 합니다.")
+
+    path = artifact_path(result_id, "contour_path", "시계열 데이터가 없습니다.")
+    headers = artifact_headers(path)
+    cached = not_modified(http_request, headers)
+    if cached:
+        return cached
+    data = load_artifact(path, "시계열 데이터가 없습니다.")
+    level = decode_contour_level(data, kind, points, start, end)
+    if level is None:
+        raise HTTPException(status_code=404, detail="시계열 데이터가 없습니다.")
+
+    return negotiate(
+        http_request,
+        {
+            "kind": kind,
+            "level": level["level"],
+            "bucket_size": level["bucket_size"],
+            **level_to_json(level["series"]),
+        },
+        headers=headers,
+    )
+
+
+@router.get("/results/{result_id}/waveform")
+async def get_result_waveform(
+    result_id: str,
+    http_request: Request,
+    width: int = Query(200, ge=10, le=20000),
+    format: str = "json",
+):
+    """
+    오디오 플레이어용 파형 피크를 조회합니다.
+    녹음 파일을 받아 디코딩하지 않아도 바로 파형을 그릴 수 있습니다.
+
+    - width: 그릴 막대(피크) 수. 이 이상을 채우는 가장 거친 해상도를 반환
+    - format: json (기본값) 또는 binary (모든 해상도가 담긴 int8 컨테이너)
+    """
+    path = artifact_path(result_id, "waveform_path", "파형 데이터가 없습니다.")
+    headers = artifact_headers(path)
+    cached = not_modified(http_request, headers)
+    if cached:
+        return cached
+    data = load_artifact(path, "파형 데이터가 없습니다.")
+
+    if format == "binary":
+        return Response(content=data, media_type=PEAKS_CONTENT_TYPE, headers=headers)
+
+    peaks = decode_peaks_level(data, width)
+    return negotiate(
+        http_request,
+        {
+            "sample_rate": peaks["sample_rate"],
+            "duration": peaks["duration"],
+            "samples_per_peak": peaks["samples_per_peak"],
+            "min": [round(float(value), 3) for value in peaks["min"]],
+            "max": [round(float(value), 3) for value in peaks["max"]],
+        },
+        headers=headers,
     )
@@ -0,0 +1,74 @@
+# 내보내기 API 라우터
+# 분석 결과를 Parquet 또는 Arrow IPC 스트림으로 흘려보냅니다 (app/services/export.py).
+# 동기 제너레이터를 StreamingResponse가 스레드 풀에서 돌리므로 블로킹 조회가 이벤트 루프를 막지 않고,
+# 페이지 하나씩 인코딩해 보내므로 결과가 아무리 많아도 메모리 사용량이 일정합니다.
+from datetime import datetime
+from typing import Iterator, Literal, Optional
+
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
+
+from app.schemas import RecordingStatus
+from app.services import metrics
+from app.services.export import (
+    EXPORT_BATCH_ROWS,
+    FILE_EXTENSIONS,
+    MEDIA_TYPES,
+    PYARROW_AVAILABLE,
+    ExportFailed,
+    stream_export,
+)
+
+router = APIRouter()
+
+metrics.describe("truevoice_exported_rows_total", "Analysis result rows exported, by format")
+
+
+def logged_export(chunks: Iterator[bytes]) -> Iterator[bytes]:
+    """응답 헤더를 보낸 뒤 실패하면 상태 코드를 바꿀 수 없으므로 로그만 남기고 스트림을 끊음"""
+    try:
+        yield from chunks
+    except ExportFailed as e:
+        print(f"[ERROR] 내보내기 중단: {e}")
+        raise
+
+
+@router.get("/export/results")
+async def export_results(
+    format: Literal["parquet", "arrow"] = "parquet",
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    status: Optional[RecordingStatus] = None,
+    features: bool = False,
+    batch_rows: int = Query(EXPORT_BATCH_ROWS, ge=100, le=50000),
+):
+    """
+    분석 결과를 오래된 순으로 내보냅니다 (연구/QA용 대량 덤프).
+
+    - format: parquet (기본값, 배치마다 row group 하나, zstd 압축) 또는 arrow (IPC 스트림)
+    - start, end: 결과 생성 시각 범위 [start, end) (ISO 8601)
+    - status: 녹음 상태 필터 (예: completed)
+    - features: 공명/톤 점수와 재채점용 원시 특징값(포먼트, 피치, jitter, shimmer, HNR) 열 포함
+    - batch_rows: 한 번에 읽고 인코딩할 행 수
+    """
+    if not PYARROW_AVAILABLE:
+        raise HTTPException(status_code=501, detail="pyarrow가 설치되어 있지 않아 내보낼 수 없습니다.")
+    if start and end and end <= start:
+        raise HTTPException(status_code=400, detail="end는 start보다 커야 합니다.")
+
+    def count_rows(rows: int):
+        metrics.inc("truevoice_exported_rows_total", rows, format=format)
+
+    chunks = stream_export(
+        format, start=start, end=end, status=status,
+        include_features=features, batch_rows=batch_rows, on_batch=count_rows,
+    )
+    filename = f"analysis_results_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{FILE_EXTENSIONS[format]}"
+    return StreamingResponse(
+        logged_export(chunks),
+        media_type=MEDIA_TYPES[format],
+        headers={
+            "Content-Disposition": f'attachment; filename="{filename}"',
+            "Cache-Control": "no-store",
+        },
+    )
@@ -0,0 +1,132 @@
+# 기록 API 라우터
+# 녹음/분석 결과 목록을 최신순 (created_at, id) keyset 페이지로 반환합니다.
+# 커서 다음 행부터 limit + 1개만 읽으므로 기록이 아무리 많아도 페이지 하나의 비용이 같고,
+# 결과 목록은 기본적으로 점수 열만 조회해 무거운 JSONB(word_details, formant_data, tone_data)를 읽지 않습니다.
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Query, Request
+from starlette.concurrency import run_in_threadpool
+
+from app.schemas import RecordingHistoryResponse, RecordingStatus, ResultHistoryResponse, ResultSummary
+from app.serialization import negotiate
+from app.services.analysis_pipeline import formant_from_row, scores_from_row, tone_from_row
+from app.services.pagination import InvalidCursor, decode_cursor, split_page
+from app.services.supabase import list_analysis_results_page, list_recordings_page
+
+router = APIRouter()
+
+# 결과 목록 기본 열 (공명/톤 종합 점수는 JSONB에서 값 하나만 추출)
+RESULT_SUMMARY_COLUMNS = (
+    "id",
+    "recording_id",
+    "created_at",
+    "accuracy_score",
+    "fluency_score",
+    "completeness_score",
+    "pronunciation_score",
+    "feedback",
+    "pending_stages",
+    "analysis_preset",
+    "resonance_score:formant_data->resonance_score",
+    "tone_score:tone_data->tone_score",
+)
+
+# include로 추가할 수 있는 무거운 열
+INCLUDE_COLUMNS = {
+    "formant": "formant_data",
+    "tone": "tone_data",
+    "words": "word_details",
+}
+
+
+def parse_cursor(cursor: Optional[str]):
+    try:
+        return decode_cursor(cursor)
+    except InvalidCursor:
+        raise HTTPException(status_code=400, detail="잘못된 커서입니다.")
+
+
+def parse_include(include: Optional[str]) -> list:
+    names = [name.strip() for name in (include or "").split(",") if name.strip()]
+    unknown = [name for name in names if name not in INCLUDE_COLUMNS]
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"include는 {', '.join(INCLUDE_COLUMNS)} 중에서 선택해야 합니다.",
+        )
+    return names
+
+
+def summary_from_row(row: dict, include: list) -> ResultSummary:
+    """목록 행 → 결과 요약 (include한 필드만 채움)"""
+    return ResultSummary(
+        id=row["id"],
+        recording_id=row["recording_id"],
+        created_at=row["created_at"],
+        scores=scores_from_row(row),
+        feedback=row.get("feedback"),
+        resonance_score=row.get("resonance_score"),
+        tone_score=row.get("tone_score"),
+        pending=row.get("pending_stages") or None,
+        preset=row.get("analysis_preset"),
+        formant=formant_from_row(row) if "formant" in include else None,
+        tone=tone_from_row(row) if "tone" in include else None,
+        word_details=row.get("word_details") if "words" in include else None,
+    )
+
+
+@router.get("/results", response_model=ResultHistoryResponse)
+async def list_results(
+    http_request: Request,
+    cursor: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
+    include: Optional[str] = None,
+    recording_id: Optional[str] = None,
+):
+    """
+    분석 결과 기록을 최신순으로 조회합니다.
+    Accept: application/msgpack 이면 MessagePack으로 응답합니다.
+
+    - cursor: 이전 응답의 next_cursor (없으면 첫 페이지)
+    - limit: 페이지 크기
+    - include: 함께 받을 무거운 필드 (쉼표 구분: formant, tone, words)
+    - recording_id: 이 녹음의 결과만 (재녹음/재분석 기록)
+    """
+    after = parse_cursor(cursor)
+    include_names = parse_include(include)
+    columns = ",".join(RESULT_SUMMARY_COLUMNS + tuple(INCLUDE_COLUMNS[name] for name in include_names))
+
+    rows = await run_in_threadpool(list_analysis_results_page, columns, after, limit + 1, recording_id)
+    if rows is None:
+        raise HTTPException(status_code=503, detail="결과 기록을 조회할 수 없습니다.")
+
+    page, next_cursor = split_page(rows, limit)
+    response = ResultHistoryResponse(
+        items=[summary_from_row(row, include_names) for row in page],
+        next_cursor=next_cursor,
+    )
+    return negotiate(http_request, response)
+
+
+@router.get("/recordings", response_model=RecordingHistoryResponse)
+async def list_recordings(
+    http_request: Request,
+    cursor: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
+    status: Optional[RecordingStatus] = None,
+):
+    """
+    녹음 기록을 최신순으로 조회합니다.
+
+    - cursor: 이전 응답의 next_cursor (없으면 첫 페이지)
+    - limit: 페이지 크기
+    - status: 이 상태의 녹음만 (pending, analyzing, completed, failed, cancelled)
+    """
+    after = parse_cursor(cursor)
+
+    rows = await run_in_threadpool(list_recordings_page, after, limit + 1, True, status)
+    if rows is None:
+        raise HTTPException(status_code=503, detail="녹음 기록을 조회할 수 없습니다.")
+
+    page, next_cursor = split_page(rows, limit)
+    return negotiate(http_request, RecordingHistoryResponse(items=page, next_cursor=next_cursor))
@@ -0,0 +1,67 @@
+# 통계 API 라우터
+# 분석 결과를 저장할 때 DB 트리거가 갱신하는 누적 집계 테이블만 조회하므로
+# analysis_results 전체를 스캔하지 않고 인덱스 조회 한 번으로 응답합니다.
+from fastapi import APIRouter, HTTPException, Query, Request
+from starlette.concurrency import run_in_threadpool
+
+from app.schemas import SentenceStatsResponse, SentenceWordsResponse, WeakWordsResponse
+from app.serialization import negotiate
+from app.services.sentence_stats import summarize_sentence_stats
+from app.services.supabase import get_sentence_stats, get_sentence_word_stats, get_weak_words
+
+router = APIRouter()
+
+
+@router.get("/words/weak", response_model=WeakWordsResponse)
+async def get_weak_word_stats(
+    http_request: Request,
+    limit: int = Query(20, ge=1, le=100),
+    min_attempts: int = Query(5, ge=1),
+):
+    """
+    가장 자주 틀리는 단어를 조회합니다 (오류 횟수 내림차순).
+
+    - limit: 최대 단어 수
+    - min_attempts: 이 횟수 이상 평가된 단어만
+    """
+    words = await run_in_threadpool(get_weak_words, limit, min_attempts)
+    if words is None:
+        raise HTTPException(status_code=503, detail="단어 통계를 조회할 수 없습니다.")
+    return negotiate(http_request, WeakWordsResponse(words=words))
+
+
+@router.get("/sentences/words", response_model=SentenceWordsResponse)
+async def get_sentence_words(
+    http_request: Request,
+    text: str = Query(..., min_length=1),
+    limit: int = Query(5, ge=1, le=100),
+    min_attempts: int = Query(1, ge=1),
+):
+    """
+    문장(기준 텍스트)에서 어려운 단어를 조회합니다 (평균 점수 오름차순, 첫 번째가 가장 어려운 단어).
+
+    - text: 연습 문장 (녹음의 original_text와 같아야 함)
+    - limit: 최대 단어 수
+    - min_attempts: 이 횟수 이상 평가된 단어만
+    """
+    words = await run_in_threadpool(get_sentence_word_stats, text, limit, min_attempts)
+    if words is None:
+        raise HTTPException(status_code=503, detail="단어 통계를 조회할 수 없습니다.")
+    return negotiate(http_request, SentenceWordsResponse(original_text=text, words=words))
+
+
+@router.get("/sentences/stats", response_model=SentenceStatsResponse)
+async def get_sentence_score_stats(
+    http_request: Request,
+    text: str = Query(..., min_length=1),
+):
+    """
+    문장(기준 텍스트)의 점수 평균/표준편차와 발음 점수 분포를 조회합니다.
+    저장 때마다 누적된 집계 행 하나만 읽습니다.
+
+    - text: 연습 문장 (녹음의 original_text와 같아야 함)
+    """
+    stats = summarize_sentence_stats(await run_in_threadpool(get_sentence_stats, text))
+    if stats is None:
+        raise HTTPException(status_code=404, detail="이 문장의 분석 기록이 없습니다.")
+    return negotiate(http_request, SentenceStatsResponse(**stats))
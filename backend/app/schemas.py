@@ -1,5 +1,5 @@
 # Pydantic 스키마 정의
-from typing import Optional
+from typing import Dict, List, Literal, Optional
 from pydantic import BaseModel
 
 
@@ -11,6 +11,17 @@ class Scores(BaseModel):
     pronunciation: float   # 종합 발음 점수 (0-100)
 
 
+# 모음별 포먼트 분석 결과
+class VowelAnalysis(BaseModel):
+    vowel: str                  # 모음 (ㅏ, ㅓ, ...)
+    frames: int                 # 분석된 프레임 수
+    mean_f1: float              # 평균 F1 (Hz)
+    mean_f2: float              # 평균 F2 (Hz)
+    target_f1: List[float]      # 기준 F1 범위 [최소, 최대]
+    target_f2: List[float]      # 기준 F2 범위 [최소, 최대]
+    score: float                # 기준 범위 대비 점수 (0-100)
+
+
 # 포먼트(공명) 분석 결과
 class FormantAnalysis(BaseModel):
     # 종합 점수
@@ -20,6 +31,9 @@ class FormantAnalysis(BaseModel):
     # 피드백
     feedback: str
 
+    # 모음별 분석 (모음 구간 분석 모드에서만)
+    vowel_analysis: Optional[List[VowelAnalysis]] = None
+
 
 # 톤 분석 결과
 class ToneAnalysis(BaseModel):
@@ -37,12 +51,18 @@ class ToneAnalysis(BaseModel):
     feedback: str
 
 
+# 분석 품질 프리셋 (app/services/analysis_presets.py)
+AnalysisPresetName = Literal["fast", "balanced", "accurate"]
+
+
 # 분석 요청
 class AnalyzeRequest(BaseModel):
     recording_id: str
     reference_text: str
     include_formant: bool = True  # 공명 분석 포함 여부
     include_tone: bool = True     # 톤 분석 포함 여부
+    deadline_ms: Optional[int] = None  # 응답 마감 시간 (없으면 서버 기본값, 0이면 제한 없음)
+    preset: Optional[AnalysisPresetName] = None  # 분석 품질 프리셋 (없으면 서버 기본값)
 
 
 # 분석 응답
@@ -56,6 +76,10 @@ class AnalyzeResponse(BaseModel):
     formant: Optional[FormantAnalysis] = None
     # 톤 분석 결과
     tone: Optional[ToneAnalysis] = None
+    # 마감까지 끝나지 않아 나중에 결과 조회로 받을 단계 (formant, tone)
+    pending: Optional[List[str]] = None
+    # 사용한 분석 품질 프리셋
+    preset: Optional[str] = None
 
 
 # 결과 조회 응답
@@ -69,6 +93,78 @@ class ResultResponse(BaseModel):
     formant: Optional[FormantAnalysis] = None
     # 톤 분석 결과
     tone: Optional[ToneAnalysis] = None
+    # 아직 계산 중인 단계
+    pending: Optional[List[str]] = None
+    # 사용한 분석 품질 프리셋
+    preset: Optional[str] = None
+
+
+# 점수 분포 (문장별 집계)
+class ScoreDistribution(BaseModel):
+    count: int
+    mean: Optional[float] = None
+    std: Optional[float] = None
+
+
+# 문장별 점수 집계 응답
+class SentenceStatsResponse(BaseModel):
+    original_text: str
+    attempts: int                                # 분석 결과 수
+    scores: Dict[str, ScoreDistribution]         # pronunciation, accuracy, fluency, completeness, resonance, tone
+    pronunciation_histogram: List[int]           # 발음 점수 칸별 결과 수 (0점부터)
+    histogram_bucket_width: int                  # 칸 너비 (점)
+
+
+# 기록 목록의 분석 결과 (include로 요청한 무거운 필드만 채움)
+class ResultSummary(BaseModel):
+    id: str
+    recording_id: str
+    created_at: str
+    scores: Scores
+    feedback: Optional[str] = None
+    resonance_score: Optional[float] = None   # 공명 품질 점수 (formant_data에서 추출)
+    tone_score: Optional[float] = None        # 종합 톤 점수 (tone_data에서 추출)
+    pending: Optional[List[str]] = None
+    preset: Optional[str] = None
+    # include=formant / tone / words 일 때만
+    formant: Optional[FormantAnalysis] = None
+    tone: Optional[ToneAnalysis] = None
+    word_details: Optional[List[dict]] = None
+
+
+# 분석 결과 기록 응답 (next_cursor가 없으면 마지막 페이지)
+class ResultHistoryResponse(BaseModel):
+    items: List[ResultSummary]
+    next_cursor: Optional[str] = None
+
+
+# 단어별 누적 집계 (word_stats)
+class WordStat(BaseModel):
+    word: str
+    attempts: int               # 평가된 횟수
+    error_count: int            # 오류(발음 오류, 생략, 삽입 등) 횟수
+    error_rate: float           # 오류 비율 (0-1)
+    mean_score: float           # 평균 정확도 점수 (0-100)
+
+
+# 문장 안 단어 위치별 누적 집계 (sentence_word_stats)
+class SentenceWordStat(WordStat):
+    position: int               # 문장 안 단어 순서 (0부터)
+
+
+# 약한 단어 조회 응답
+class WeakWordsResponse(BaseModel):
+    words: List[WordStat]
+
+
+# 문장 단어 조회 응답 (어려운 단어부터)
+class SentenceWordsResponse(BaseModel):
+    original_text: str
+    words: List[SentenceWordStat]
+
+
+# 녹음 상태
+RecordingStatus = Literal["pending", "analyzing", "completed", "failed", "cancelled"]
 
 
 # 녹음 정보
@@ -95,3 +191,9 @@ class AnalysisResult(BaseModel):
     formant_data: Optional[dict] = None
     # 톤 분석 결과
     tone_data: Optional[dict] = None
+
+
+# 녹음 기록 응답 (next_cursor가 없으면 마지막 페이지)
+class RecordingHistoryResponse(BaseModel):
+    items: List[Recording]
+    next_cursor: Optional[str] = None
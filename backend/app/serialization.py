@@ -0,0 +1,85 @@
+# 응답 직렬화 레이어
+# 기본은 orjson으로 JSON을 만들고, Accept: application/msgpack 요청에는 MessagePack으로 응답합니다.
+# orjson/msgpack이 설치되지 않은 환경에서는 표준 json으로 동작합니다.
+import json
+from typing import Any, Optional
+from fastapi import Request
+from fastapi.responses import JSONResponse, Response
+from pydantic import BaseModel
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+    print("Warning: orjson not installed. Falling back to the standard json module.")
+
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+    print("Warning: msgpack not installed. MessagePack responses disabled.")
+
+MSGPACK_MEDIA_TYPES = ("application/msgpack", "application/x-msgpack")
+
+
+def to_primitive(content: Any) -> Any:
+    """Pydantic 모델을 dict/list로 변환 (그 외는 그대로)"""
+    if isinstance(content, BaseModel):
+        return content.model_dump()
+    if isinstance(content, list):
+        return [to_primitive(item) for item in content]
+    return content
+
+
+def dumps_json(content: Any) -> bytes:
+    """JSON 바이트 직렬화 (orjson 우선, NaN/Inf는 null)"""
+    content = to_primitive(content)
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(content, option=orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":"), default=str).encode("utf-8")
+
+
+def format_sse(event: str, payload: Any) -> bytes:
+    """Server-Sent Events 메시지 한 건 (event/data 필드, JSON 한 줄)"""
+    return b"event: " + event.encode("utf-8") + b"\ndata: " + dumps_json(payload) + b"\n\n"
+
+
+def dumps_msgpack(content: Any) -> bytes:
+    """MessagePack 바이트 직렬화"""
+    return msgpack.packb(to_primitive(content), use_bin_type=True, default=str)
+
+
+class FastJSONResponse(JSONResponse):
+    """orjson으로 렌더링하는 기본 JSON 응답"""
+
+    def render(self, content: Any) -> bytes:
+        return dumps_json(content)
+
+
+class MsgPackResponse(Response):
+    """MessagePack 응답"""
+    media_type = MSGPACK_MEDIA_TYPES[0]
+
+    def render(self, content: Any) -> bytes:
+        return dumps_msgpack(content)
+
+
+def wants_msgpack(request: Request) -> bool:
+    """Accept 헤더가 MessagePack을 요청하는지 (msgpack 미설치 시 항상 False)"""
+    if not MSGPACK_AVAILABLE:
+        return False
+    accept = request.headers.get("accept", "")
+    return any(media_type in accept for media_type in MSGPACK_MEDIA_TYPES)
+
+
+def negotiate(request: Request, content: Any, status_code: int = 200,
+              headers: Optional[dict] = None) -> Response:
+    """
+    Accept 헤더에 따라 JSON(orjson) 또는 MessagePack 응답을 만듭니다.
+    캐시가 형식별로 나뉘도록 Vary: Accept를 붙입니다.
+    """
+    headers = {**(headers or {}), "Vary": "Accept"}
+    response_class = MsgPackResponse if wants_msgpack(request) else FastJSONResponse
+    return response_class(content=content, status_code=status_code, headers=headers)
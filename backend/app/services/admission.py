@@ -0,0 +1,184 @@
+# 분석 요청 수락 제어 (admission control)
+# 동시에 실행하는 분석 수를 제한하고, 초과 요청은 길이가 제한된 대기열에서 순서대로 기다립니다.
+# 대기열이 가득 찼거나 오래 기다려야 하면 즉시 거절해, 수락된 요청의 지연 시간을 예측 가능하게 유지합니다.
+import asyncio
+import math
+import os
+import threading
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Callable
+
+from app.services import metrics
+
+# 동시에 실행할 최대 분석 수
+ANALYZE_MAX_IN_FLIGHT = int(os.getenv("ANALYZE_MAX_IN_FLIGHT", "4"))
+
+# 대기열 최대 길이 (이보다 많으면 429)
+ANALYZE_MAX_QUEUE = int(os.getenv("ANALYZE_MAX_QUEUE", "16"))
+
+# 대기열 최대 대기 시간 (초, 넘기면 503)
+ANALYZE_MAX_WAIT_SECONDS = float(os.getenv("ANALYZE_MAX_WAIT_SECONDS", "10"))
+
+# 처리 시간 이동 평균의 초깃값 (초)과 가중치
+INITIAL_SERVICE_TIME = 3.0
+SERVICE_TIME_ALPHA = 0.2
+
+
+class AdmissionRejected(Exception):
+    """수락 거절 (status_code: 429 대기열 가득 참, 503 대기 시간 초과)"""
+
+    def __init__(self, status_code: int, retry_after: int, reason: str):
+        super().__init__(reason)
+        self.status_code = status_code
+        self.retry_after = retry_after
+        self.reason = reason
+
+
+class SlotLease:
+    """
+    slot()이 넘겨주는 슬롯 핸들
+
+    detach()하면 async with를 벗어나도 슬롯을 반납하지 않고, 돌려받은 함수를 호출할 때 반납합니다.
+    응답을 보낸 뒤에도 이어지는 백그라운드 작업(마감을 넘긴 분석 단계)을 동시 실행 수에 포함시키는 데 씁니다.
+    반납 함수는 어느 스레드에서 호출해도 되고, 두 번째 호출부터는 무시됩니다.
+    """
+
+    def __init__(self, controller: "AdmissionController", loop: asyncio.AbstractEventLoop):
+        self._controller = controller
+        self._loop = loop
+        self.started = time.monotonic()
+        self.detached = False
+
+    def detach(self) -> Callable[[], None]:
+        self.detached = True
+        lock = threading.Lock()
+        released = False
+
+        def release() -> None:
+            nonlocal released
+            with lock:
+                if released:
+                    return
+                released = True
+            try:
+                self._loop.call_soon_threadsafe(self._controller.finish, self.started)
+            except RuntimeError:
+                pass  # 이벤트 루프가 이미 닫힘 (서버 종료 중)
+
+        return release
+
+
+class AdmissionController:
+    """
+    FIFO 대기열이 있는 동시 실행 제한기
+
+    - in_flight < max_in_flight 이고 대기자가 없으면 바로 실행
+    - 그 외에는 대기열 끝에서 기다림. 슬롯이 나면 앞사람에게 바로 넘겨줌
+    - 대기열이 가득 찼으면 429, 예상 대기 시간이 max_wait를 넘거나 실제로 넘기면 503
+    - Retry-After는 최근 처리 시간 이동 평균으로 추정
+    """
+
+    def __init__(self, name: str, max_in_flight: int, max_queue: int, max_wait: float):
+        self.name = name
+        self.max_in_flight = max_in_flight
+        self.max_queue = max_queue
+        self.max_wait = max_wait
+        self.in_flight = 0
+        self.service_time = INITIAL_SERVICE_TIME
+        self._waiters: deque = deque()
+        metrics.register_collector(self._collect)
+
+    @property
+    def queue_length(self) -> int:
+        return len(self._waiters)
+
+    def estimated_wait(self, position: int) -> float:
+        """대기열 position번째(1부터)의 예상 대기 시간 (초)"""
+        return self.service_time * math.ceil(position / max(self.max_in_flight, 1))
+
+    def _reject(self, status_code: int, reason: str) -> AdmissionRejected:
+        metrics.inc("truevoice_admission_rejected_total", queue=self.name, reason=reason)
+        retry_after = max(1, math.ceil(self.estimated_wait(self.queue_length + 1)))
+        return AdmissionRejected(status_code, retry_after, reason)
+
+    async def acquire(self) -> None:
+        """실행 슬롯 획득 (거절되면 AdmissionRejected)"""
+        if self.in_flight < self.max_in_flight and not self._waiters:
+            self.in_flight += 1
+            metrics.inc("truevoice_admission_admitted_total", queue=self.name)
+            return
+
+        position = self.queue_length + 1
+        if position > self.max_queue:
+            raise self._reject(429, "queue_full")
+        if self.estimated_wait(position) > self.max_wait:
+            raise self._reject(503, "overloaded")
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        started = time.monotonic()
+        try:
+            await asyncio.wait_for(waiter, timeout=self.max_wait)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+            if waiter.done() and not waiter.cancelled():
+                # 슬롯을 넘겨받는 순간과 겹침: 받은 슬롯을 바로 반납
+                self.release()
+            elif waiter in self._waiters:
+                self._waiters.remove(waiter)
+            if isinstance(e, asyncio.CancelledError):
+                raise
+            raise self._reject(503, "wait_timeout")
+
+        metrics.inc("truevoice_admission_admitted_total", queue=self.name)
+        metrics.inc("truevoice_admission_wait_seconds_total", time.monotonic() - started, queue=self.name)
+
+    def release(self) -> None:
+        """슬롯 반납 (대기자가 있으면 맨 앞 대기자에게 바로 넘김)"""
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.in_flight -= 1
+
+    def record_service_time(self, seconds: float) -> None:
+        self.service_time += SERVICE_TIME_ALPHA * (seconds - self.service_time)
+
+    def finish(self, started: float) -> None:
+        """처리 시간 기록 후 슬롯 반납"""
+        self.record_service_time(time.monotonic() - started)
+        self.release()
+
+    @asynccontextmanager
+    async def slot(self):
+        """
+        async with controller.slot() as lease: ... 형태로 슬롯 획득/반납
+        lease.detach()를 호출했으면 블록을 벗어나도 반납하지 않음 (SlotLease 참고)
+        """
+        await self.acquire()
+        lease = SlotLease(self, asyncio.get_running_loop())
+        try:
+            yield lease
+        finally:
+            if not lease.detached:
+                self.finish(lease.started)
+
+    def _collect(self):
+        return [
+            ("truevoice_admission_in_flight", {"queue": self.name}, self.in_flight),
+            ("truevoice_admission_queue_length", {"queue": self.name}, self.queue_length),
+            ("truevoice_admission_max_in_flight", {"queue": self.name}, self.max_in_flight),
+            ("truevoice_admission_max_queue", {"queue": self.name}, self.max_queue),
+            ("truevoice_admission_service_time_seconds", {"queue": self.name}, round(self.service_time, 3)),
+        ]
+
+
+# 분석 엔드포인트용 수락 제어기
+analysis_admission = AdmissionController(
+    "analyze",
+    max_in_flight=ANALYZE_MAX_IN_FLIGHT,
+    max_queue=ANALYZE_MAX_QUEUE,
+    max_wait=ANALYZE_MAX_WAIT_SECONDS,
+)
@@ -0,0 +1,839 @@
+# 분석 파이프라인
+# 녹음 조회 → 점유 → 다운로드 → 디코딩 → 음성 구간 검출 → Azure 발음 평가 → (공명, 톤) → 저장
+#
+# 발음 평가까지는 필수 단계이고, 공명/톤은 선택 단계로 병렬 실행합니다.
+# Praat 호출은 GIL을 놓지 않으므로 선택 단계는 프로세스 풀에서 실행해, 요청 스레드가 마감 시각에 바로 깨어납니다.
+# 공명/톤은 한 작업에서 함께 실행해 Sound/Pitch/PointProcess를 한 번만 계산합니다.
+# 선택 단계가 마감 시간(deadline) 안에 끝나지 않으면 준비된 결과만 먼저 응답하고
+# 나머지는 pending으로 표시한 뒤 백그라운드에서 마저 계산해 결과 행에 붙입니다.
+# 백그라운드 단계가 끝날 때까지 수락 제어 슬롯을 반납하지 않으므로 밀린 단계가 무한히 쌓이지 않고,
+# 재시작 등으로 끝내지 못한 pending은 pending_sweeper가 정리합니다.
+# emit 콜백을 넘기면 단계가 끝날 때마다 이벤트(downloaded, converted, scores, formant, tone, saved)를 보냅니다.
+# cancel 신호가 취소되면(클라이언트 연결 끊김) Azure 인식을 멈추고, 대기 중인 DSP 작업을 버리고,
+# 녹음 상태를 cancelled로 바꾼 뒤 버려진 작업량(Azure 오디오 초, CPU 초)을 메트릭으로 남깁니다.
+import multiprocessing
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+from app.schemas import (
+    AnalyzeRequest,
+    AnalyzeResponse,
+    Scores,
+    FormantAnalysis,
+    ToneAnalysis,
+)
+from app.services.supabase import (
+    get_recording,
+    update_recording_status,
+    save_analysis_result,
+    update_analysis_result,
+    get_analysis_result_by_recording,
+    claim_recording,
+    wait_for_analysis,
+    download_recording_file,
+    upload_artifact,
+)
+from app.services.audio_io import decode_audio, AudioDecodeError, DecodedAudio
+from app.services.voice_activity import detect_voice_activity, trim_silence
+from app.services.azure_client import assess_pronunciation_with_retry, get_mock_result_with_retry
+from app.services.praat_context import PraatAnalysisContext
+from app.services.formant_analysis import (
+    analyze_formants, get_mock_formant_result, FORMANT_ENGINE, FORMANT_SEGMENT_MODE,
+)
+from app.services.vowel_segments import find_vowel_segments
+from app.services.contour_codec import build_contour_artifact, CONTENT_TYPE as CONTOUR_CONTENT_TYPE
+from app.services.tone_analysis import analyze_tone, get_mock_tone_result, TONE_ENGINE
+from app.services.chunked_analysis import Chunk, analyze_formants_chunked, analyze_tone_chunked, plan_chunks
+from app.services.cancellation import AnalysisCancelled, CancelToken
+from app.services.analysis_presets import AnalysisPreset, get_preset
+from app.services.rescoring import ensure_current_scoring
+from app.services.scoring import SCORING_VERSION
+from app.services import metrics
+from app.services.waveform_peaks import build_peaks_artifact, CONTENT_TYPE as PEAKS_CONTENT_TYPE
+
+# 개발 모드 확인
+DEV_MODE = os.getenv("DEV_MODE", "false").lower() == "true"
+
+# 분석 마감 시간 (밀리초, 0이면 제한 없음). 요청의 deadline_ms가 우선
+ANALYZE_DEADLINE_MS = int(os.getenv("ANALYZE_DEADLINE_MS", "8000"))
+
+# 선택 단계(공명/톤) 실행 프로세스 수 (마감 뒤 백그라운드 계산도 여기서 이어짐)
+ANALYSIS_STAGE_WORKERS = int(os.getenv("ANALYSIS_STAGE_WORKERS", "4"))
+
+# 청크 프로세스 풀을 기다리기만 하는 단계(긴 녹음)와 목업 단계는 스레드에서 실행
+_stage_executor = ThreadPoolExecutor(max_workers=ANALYSIS_STAGE_WORKERS, thread_name_prefix="analysis-stage")
+
+_stage_pool: Optional[ProcessPoolExecutor] = None
+_stage_pool_lock = threading.Lock()
+
+# 선택 단계를 기다리는 동안 취소 여부를 확인하는 간격 (초)
+CANCEL_POLL_SECONDS = 0.1
+
+metrics.describe("truevoice_analysis_cancelled_total", "Analyses cancelled because the client disconnected, by stage")
+metrics.describe("truevoice_analysis_abandoned_stages_total", "Queued DSP stages dropped before they started")
+metrics.describe("truevoice_analysis_wasted_azure_audio_seconds_total",
+                 "Audio seconds sent to Azure for analyses nobody received (stopped: cut short, upper bound)")
+metrics.describe("truevoice_analysis_wasted_cpu_seconds_total", "Thread CPU seconds spent on cancelled analyses")
+
+
+class AnalysisFailed(Exception):
+    """HTTP 오류로 응답해야 하는 분석 실패 (녹음 없음, 다운로드/저장 실패 등)"""
+
+    def __init__(self, status_code: int, detail: str):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+
+
+class AnalysisClaimed(Exception):
+    """
+    다른 인스턴스가 이미 이 녹음을 분석 중 (점유 실패).
+    수락 제어 슬롯을 쥔 채 기다리지 않도록, 호출하는 쪽이 슬롯을 반납한 뒤
+    wait_for_claimed_analysis로 결과를 기다립니다.
+    """
+
+
+# 단계 이벤트 콜백 (이벤트 이름, 페이로드). 분석 스레드에서 호출됨
+Emit = Callable[[str, Any], None]
+
+
+def _emit(emit: Optional[Emit], event: str, payload: Any) -> None:
+    """이벤트 전송 (콜백이 없으면 무시, 콜백 오류는 분석에 영향 없음)"""
+    if emit is None:
+        return
+    try:
+        emit(event, payload)
+    except Exception as e:
+        print(f"[ERROR] 단계 이벤트 전송 오류 ({event}): {e}")
+
+
+@dataclass
+class StageOutput:
+    """선택 단계 결과 (실패하면 analysis/data가 None)"""
+    analysis: Optional[object] = None   # FormantAnalysis 또는 ToneAnalysis
+    data: Optional[dict] = None         # 결과 행에 저장할 JSON
+    track: Optional[list] = None        # 시계열 (포먼트 트랙 또는 피치 컨투어)
+    cpu_seconds: float = 0.0            # 단계 스레드(작업 프로세스) CPU 시간
+
+
+@dataclass
+class RunProgress:
+    """취소 시 어느 단계였는지, 얼마나 일했는지 기록"""
+    stage: str = "start"
+    azure_audio_seconds: float = 0.0    # Azure에 보낸 오디오 길이
+    azure_done: bool = False            # Azure 응답을 받았는지
+    cpu_started: float = field(default_factory=time.thread_time)
+
+
+def record_cancellation(progress: RunProgress) -> None:
+    """취소된 분석의 단계와 버려진 작업량 기록 (선택 단계 CPU는 abandon_stages에서 따로 기록)"""
+    metrics.inc("truevoice_analysis_cancelled_total", stage=progress.stage)
+    if progress.azure_audio_seconds:
+        outcome = "discarded" if progress.azure_done else "stopped"
+        metrics.inc("truevoice_analysis_wasted_azure_audio_seconds_total", progress.azure_audio_seconds, outcome=outcome)
+    metrics.inc("truevoice_analysis_wasted_cpu_seconds_total",
+                time.thread_time() - progress.cpu_started, stage="pipeline")
+    print(f"[INFO] 분석 취소 ({progress.stage}): Azure {progress.azure_audio_seconds:.1f}초 오디오")
+
+
+# =========================================
+# 저장 도우미
+# =========================================
+
+def store_contours(recording_id: str, formant_track: Optional[list], pitch_track: Optional[list]) -> Optional[str]:
+    """포먼트/피치 시계열을 바이너리로 압축해 업로드하고 저장 경로를 반환"""
+    artifact = build_contour_artifact(formant_track, pitch_track)
+    if artifact is None:
+        return None
+    path = f"contours/{recording_id}/{uuid.uuid4()}.tvc"
+    if not upload_artifact(path, artifact, CONTOUR_CONTENT_TYPE):
+        return None
+    return path
+
+
+def store_waveform(recording_id: str, audio: DecodedAudio) -> Optional[str]:
+    """재생용 파형 피크(min/max 포락선)를 업로드하고 저장 경로를 반환"""
+    artifact = build_peaks_artifact(audio)
+    if artifact is None:
+        return None
+    path = f"waveforms/{recording_id}/{uuid.uuid4()}.tvc"
+    if not upload_artifact(path, artifact, PEAKS_CONTENT_TYPE):
+        return None
+    return path
+
+
+# =========================================
+# 결과 행 변환
+# =========================================
+
+def scores_from_row(result: dict) -> Scores:
+    """저장된 결과 행의 점수 변환"""
+    return Scores(
+        accuracy=result["accuracy_score"],
+        fluency=result["fluency_score"],
+        completeness=result["completeness_score"],
+        pronunciation=result["pronunciation_score"],
+    )
+
+
+def formant_from_row(result: dict) -> Optional[FormantAnalysis]:
+    """저장된 결과 행의 공명 데이터 변환"""
+    if not result.get("formant_data"):
+        return None
+    fd = result["formant_data"]
+    return FormantAnalysis(
+        resonance_score=fd.get("resonance_score", 0),
+        stability_score=fd.get("stability_score", 0),
+        feedback=fd.get("feedback", ""),
+        vowel_analysis=fd.get("vowel_analysis"),
+    )
+
+
+def tone_from_row(result: dict) -> Optional[ToneAnalysis]:
+    """저장된 결과 행의 톤 데이터 변환"""
+    if not result.get("tone_data"):
+        return None
+    td = result["tone_data"]
+    return ToneAnalysis(
+        tone_score=td.get("tone_score", 0),
+        stability_score=td.get("stability_score", 0),
+        clarity_score=td.get("clarity_score", 0),
+        intonation_score=td.get("intonation_score", 0),
+        mean_pitch=td.get("mean_pitch", 0),
+        pitch_range=td.get("pitch_range", 0),
+        feedback=td.get("feedback", ""),
+    )
+
+
+def wait_for_claimed_analysis(recording_id: str, cancel: Optional[CancelToken] = None) -> AnalyzeResponse:
+    """
+    다른 인스턴스가 점유한 분석이 끝나기를 기다렸다가 그 결과를 반환합니다.
+    lease 시간 안에 끝나지 않으면 409를 반환하고, 취소되면 AnalysisCancelled를 발생시킵니다.
+    """
+    status = wait_for_analysis(recording_id, cancel=cancel)
+    if status is None:
+        raise AnalysisFailed(409, "이미 분석 중입니다. 잠시 후 다시 시도해주세요.")
+
+    result = get_analysis_result_by_recording(recording_id) if status == "completed" else None
+    result = ensure_current_scoring(result)
+    if not result:
+        return AnalyzeResponse(
+            success=False,
+            error="분석에 실패했습니다. 다시 시도해주세요.",
+        )
+    return AnalyzeResponse(
+        success=True,
+        result_id=result["id"],
+        scores=scores_from_row(result),
+        feedback=result["feedback"],
+        formant=formant_from_row(result),
+        tone=tone_from_row(result),
+        pending=result.get("pending_stages") or None,
+        preset=result.get("analysis_preset"),
+    )
+
+
+# =========================================
+# 선택 단계 (공명, 톤)
+# =========================================
+
+def formant_stage(wav_audio_data: bytes, speech_audio: DecodedAudio, word_details: list,
+                  praat_context: Optional[PraatAnalysisContext], preset: AnalysisPreset,
+                  chunks: Optional[List[Chunk]] = None,
+                  cancel: Optional[CancelToken] = None) -> StageOutput:
+    """공명 분석 (chunks가 있으면 청크별로 병렬 분석해 병합, 프리셋이 시계열 생략이면 track 없음)"""
+    # 모음 핵 구간 (단어 타이밍 기반, 없으면 유성음 검출)
+    vowel_segments = None
+    if FORMANT_SEGMENT_MODE == "vowel":
+        vowel_segments = find_vowel_segments(word_details, speech_audio.samples, speech_audio.sample_rate)
+    if chunks:
+        formant_result = analyze_formants_chunked(
+            speech_audio, chunks, segments=vowel_segments or None, preset=preset, cancel=cancel
+        )
+    else:
+        formant_result = analyze_formants(wav_audio_data, context=praat_context, segments=vowel_segments or None)
+    if not formant_result.success:
+        return StageOutput()
+    # LPC 엔진은 프리셋과 무관하게 모음별 분석을 채우므로 여기서 한 번 더 거름
+    vowel_analysis = formant_result.vowel_analysis if preset.vowel_analysis else None
+    return StageOutput(
+        analysis=FormantAnalysis(
+            resonance_score=formant_result.resonance_score,
+            stability_score=formant_result.stability_score,
+            feedback=formant_result.feedback,
+            vowel_analysis=vowel_analysis,
+        ),
+        data={
+            "resonance_score": formant_result.resonance_score,
+            "stability_score": formant_result.stability_score,
+            "feedback": formant_result.feedback,
+            "vowel_analysis": vowel_analysis,
+            "features": formant_result.features,
+        },
+        track=formant_result.formant_track if preset.contours else None,
+    )
+
+
+def tone_stage(wav_audio_data: bytes, praat_context: Optional[PraatAnalysisContext], preset: AnalysisPreset,
+               speech_audio: Optional[DecodedAudio] = None, chunks: Optional[List[Chunk]] = None,
+               cancel: Optional[CancelToken] = None) -> StageOutput:
+    """톤 분석 (chunks가 있으면 청크별로 병렬 분석해 병합, 프리셋이 시계열 생략이면 track 없음)"""
+    if chunks:
+        tone_result = analyze_tone_chunked(speech_audio, chunks, preset=preset, cancel=cancel)
+    else:
+        tone_result = analyze_tone(wav_audio_data, context=praat_context)
+    if not tone_result.success:
+        return StageOutput()
+    return StageOutput(
+        analysis=ToneAnalysis(
+            tone_score=tone_result.tone_score,
+            stability_score=tone_result.stability_score,
+            clarity_score=tone_result.clarity_score,
+            intonation_score=tone_result.intonation_score,
+            mean_pitch=tone_result.mean_pitch,
+            pitch_range=tone_result.pitch_range,
+            feedback=tone_result.feedback,
+        ),
+        data={
+            "tone_score": tone_result.tone_score,
+            "stability_score": tone_result.stability_score,
+            "clarity_score": tone_result.clarity_score,
+            "intonation_score": tone_result.intonation_score,
+            "mean_pitch": tone_result.mean_pitch,
+            "pitch_range": tone_result.pitch_range,
+            "feedback": tone_result.feedback,
+            "features": tone_result.features,
+        },
+        track=tone_result.pitch_track if preset.contours else None,
+    )
+
+
+def mock_formant_stage() -> StageOutput:
+    """공명 목업 결과"""
+    mock_formant = get_mock_formant_result()
+    return StageOutput(
+        analysis=FormantAnalysis(
+            resonance_score=mock_formant.resonance_score,
+            stability_score=mock_formant.stability_score,
+            feedback=mock_formant.feedback,
+        ),
+        data={
+            "resonance_score": mock_formant.resonance_score,
+            "stability_score": mock_formant.stability_score,
+            "feedback": mock_formant.feedback,
+        },
+        track=mock_formant.formant_track,
+    )
+
+
+def mock_tone_stage() -> StageOutput:
+    """톤 목업 결과"""
+    mock_tone = get_mock_tone_result()
+    return StageOutput(
+        analysis=ToneAnalysis(
+            tone_score=mock_tone.tone_score,
+            stability_score=mock_tone.stability_score,
+            clarity_score=mock_tone.clarity_score,
+            intonation_score=mock_tone.intonation_score,
+            mean_pitch=mock_tone.mean_pitch,
+            pitch_range=mock_tone.pitch_range,
+            feedback=mock_tone.feedback,
+        ),
+        data={
+            "tone_score": mock_tone.tone_score,
+            "stability_score": mock_tone.stability_score,
+            "clarity_score": mock_tone.clarity_score,
+            "intonation_score": mock_tone.intonation_score,
+            "mean_pitch": mock_tone.mean_pitch,
+            "pitch_range": mock_tone.pitch_range,
+            "feedback": mock_tone.feedback,
+        },
+    )
+
+
+def _guarded(name: str, stage: Callable[[], StageOutput]) -> Callable[[], StageOutput]:
+    """단계 예외를 실패 결과로 바꿔 다른 단계와 응답에 영향을 주지 않게 함"""
+    def run() -> StageOutput:
+        cpu_started = time.thread_time()
+        try:
+            output = stage()
+        except Exception as e:
+            print(f"[ERROR] {name} 분석 오류: {e}")
+            output = StageOutput()
+        output.cpu_seconds = time.thread_time() - cpu_started
+        return output
+    return run
+
+
+def praat_stages_job(wav_audio_data: bytes, speech_audio: DecodedAudio, word_details: list,
+                     preset: AnalysisPreset, names: tuple) -> Dict[str, StageOutput]:
+    """
+    프로세스 풀용 공명/톤 분석 ({이름: StageOutput})
+    Praat 컨텍스트(Sound, Pitch, PointProcess)를 작업 프로세스에서 한 번만 만들어 두 단계가 공유합니다.
+    Praat 엔진을 쓰는 단계가 처음 필요로 할 때 만들므로 numpy/LPC 엔진만 쓰면 만들지 않습니다.
+    """
+    contexts: List[Optional[PraatAnalysisContext]] = []
+
+    def praat_context() -> Optional[PraatAnalysisContext]:
+        if not contexts:
+            contexts.append(PraatAnalysisContext.from_audio(speech_audio, preset))
+        return contexts[0]
+
+    stages = {
+        "formant": lambda: formant_stage(
+            wav_audio_data, speech_audio, word_details,
+            praat_context() if FORMANT_ENGINE == "praat" else None, preset,
+        ),
+        "tone": lambda: tone_stage(wav_audio_data, praat_context() if TONE_ENGINE == "praat" else None, preset),
+    }
+    # 공명 단계가 먼저 피치를 계산하면 톤 단계는 같은 Pitch/PointProcess를 그대로 씀
+    return {name: _guarded(name, stages[name])() for name in ("formant", "tone") if name in names}
+
+
+def _get_stage_pool() -> ProcessPoolExecutor:
+    """선택 단계 프로세스 풀 (처음 사용할 때 생성, spawn으로 서버 스레드 상태를 물려받지 않음)"""
+    global _stage_pool
+    with _stage_pool_lock:
+        if _stage_pool is None:
+            _stage_pool = ProcessPoolExecutor(
+                max_workers=ANALYSIS_STAGE_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _stage_pool
+
+
+# 선택 단계 시작 함수 (호출하면 실행을 시작하고 StageOutput을 돌려줄 Future를 반환)
+StageStarter = Callable[[], Future]
+
+
+class SharedStageFuture(Future):
+    """여러 단계를 함께 계산하는 프로세스 풀 작업에서 한 단계의 결과만 보는 Future"""
+
+    def __init__(self, name: str, job: Future):
+        super().__init__()
+        self._name = name
+        self._job = job
+        job.add_done_callback(self._copy)
+
+    def cancel(self) -> bool:
+        # 공유 작업이 시작 전일 때만 취소 (실행 중이면 끝나는 대로 결과를 받음)
+        return self._job.cancel() and super().cancel()
+
+    def _copy(self, job: Future) -> None:
+        if job.cancelled():
+            super().cancel()
+            return
+        try:
+            self.set_result(job.result()[self._name])
+        except Exception as e:
+            self.set_exception(e)
+
+
+def praat_process_stages(names: List[str], wav_audio_data: bytes, speech_audio: DecodedAudio,
+                         word_details: list, preset: AnalysisPreset) -> Dict[str, StageStarter]:
+    """
+    프로세스 풀에서 한 작업으로 실행할 공명/톤 단계 (Praat 분석, praat_stages_job)
+    어느 단계를 먼저 시작해도 작업은 한 번만 제출하고, 단계마다 자기 결과만 보는 Future를 돌려줍니다.
+    """
+    jobs: List[Future] = []
+
+    def submit() -> Future:
+        if not jobs:
+            jobs.append(_get_stage_pool().submit(
+                praat_stages_job, wav_audio_data, speech_audio, word_details, preset, tuple(names)
+            ))
+        return jobs[0]
+
+    return {name: (lambda name=name: SharedStageFuture(name, submit())) for name in names}
+
+
+def thread_stage(name: str, stage: Callable[[], StageOutput]) -> StageStarter:
+    """스레드에서 실행할 단계 (청크 프로세스 풀을 기다리는 단계, 목업)"""
+    return lambda: _stage_executor.submit(_guarded(name, stage))
+
+
+def stage_output(name: str, future: Future) -> StageOutput:
+    """끝난 단계의 결과 (작업 프로세스가 죽는 등 풀 오류도 실패 결과로 바꿈)"""
+    try:
+        return future.result()
+    except Exception as e:
+        print(f"[ERROR] {name} 분석 오류: {e}")
+        return StageOutput()
+
+
+def _record_wasted_stage(name: str, future: Future) -> None:
+    if not future.cancelled():
+        metrics.inc("truevoice_analysis_wasted_cpu_seconds_total", stage_output(name, future).cpu_seconds, stage=name)
+
+
+def abandon_stages(futures: Dict[str, Future]) -> None:
+    """
+    취소된 분석의 선택 단계 정리: 아직 시작하지 않은 단계는 실행하지 않고 버리고,
+    실행 중인 Praat 호출은 중단할 수 없으므로 끝나는 대로 CPU 시간만 기록합니다.
+    """
+    for name, future in futures.items():
+        if future.cancel():
+            metrics.inc("truevoice_analysis_abandoned_stages_total", stage=name)
+        else:
+            future.add_done_callback(lambda done, name=name: _record_wasted_stage(name, done))
+
+
+def run_optional_stages(stages: Dict[str, StageStarter], deadline: Optional[float],
+                        emit: Optional[Emit] = None, cancel: Optional[CancelToken] = None):
+    """
+    선택 단계를 병렬로 시작하고 마감 시각(time.monotonic 기준)까지 기다립니다.
+    단계가 끝나는 대로 이벤트를 보내므로 saved보다 항상 먼저 도착합니다.
+    기다리는 동안 취소되면 단계를 버리고 AnalysisCancelled.
+
+    Returns:
+        (끝난 단계 {이름: StageOutput}, 마감까지 못 끝난 단계 {이름: Future})
+    """
+    futures = {name: start() for name, start in stages.items()}
+    ready: Dict[str, StageOutput] = {}
+    while True:
+        for name, future in futures.items():
+            if name not in ready and future.done():
+                ready[name] = stage_output(name, future)
+                if ready[name].analysis is not None:
+                    _emit(emit, name, ready[name].analysis)
+        not_done = [future for name, future in futures.items() if name not in ready]
+        if not not_done:
+            break
+        if cancel is not None and cancel.cancelled:
+            abandon_stages(futures)
+            raise AnalysisCancelled()
+        if deadline is not None and time.monotonic() >= deadline:
+            break
+
+        timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+        if cancel is not None:
+            timeout = CANCEL_POLL_SECONDS if timeout is None else min(timeout, CANCEL_POLL_SECONDS)
+        wait(not_done, timeout=timeout, return_when=FIRST_COMPLETED)
+
+    pending = {name: future for name, future in futures.items() if name not in ready}
+    return ready, pending
+
+
+class PendingStages:
+    """
+    마감 뒤에 끝난 선택 단계를 결과 행에 이어 붙입니다.
+    단계가 끝날 때마다 {단계}_data와 pending_stages를 갱신하고,
+    마지막 단계가 끝나면 시계열을 저장한 뒤 on_finished(수락 제어 슬롯 반납)를 호출합니다.
+    """
+
+    def __init__(self, result_id: str, recording_id: str,
+                 ready: Dict[str, StageOutput], pending: Dict[str, Future],
+                 on_finished: Optional[Callable[[], None]] = None):
+        self.result_id = result_id
+        self.recording_id = recording_id
+        self.outputs = dict(ready)
+        self.pending = dict(pending)
+        self.on_finished = on_finished
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        for name, future in list(self.pending.items()):
+            future.add_done_callback(lambda done, name=name: self._on_done(name, done))
+
+    def _on_done(self, name: str, future: Future) -> None:
+        output = stage_output(name, future)
+        with self._lock:
+            self.outputs[name] = output
+            self.pending.pop(name, None)
+            remaining = sorted(self.pending)
+
+        try:
+            fields = {f"{name}_data": output.data, "pending_stages": remaining or None}
+            if not remaining:
+                fields["contour_path"] = store_contours(
+                    self.recording_id,
+                    self.outputs["formant"].track if "formant" in self.outputs else None,
+                    self.outputs["tone"].track if "tone" in self.outputs else None,
+                )
+            # 갱신에 실패하면 pending_stages가 남으므로 pending_sweeper가 나중에 다시 계산
+            update_analysis_result(self.result_id, fields)
+            print(f"[INFO] 지연된 {name} 분석 완료: {self.result_id} (남은 단계: {remaining or '없음'})")
+        finally:
+            if not remaining and self.on_finished is not None:
+                self.on_finished()
+
+
+# =========================================
+# 파이프라인
+# =========================================
+
+def resolve_deadline(request: AnalyzeRequest, started: float) -> Optional[float]:
+    """요청/설정의 마감 시간을 time.monotonic 기준 시각으로 변환 (제한 없으면 None)"""
+    deadline_ms = request.deadline_ms if request.deadline_ms is not None else ANALYZE_DEADLINE_MS
+    if not deadline_ms:
+        return None
+    return started + deadline_ms / 1000.0
+
+
+def finish_analysis(recording_id: str, pronunciation, stages: Dict[str, StageStarter],
+                    deadline: Optional[float], preset: AnalysisPreset, waveform_path: Optional[str] = None,
+                    emit: Optional[Emit] = None, cancel: Optional[CancelToken] = None,
+                    fallback_result_id: Optional[str] = None,
+                    detach_slot: Optional[Callable[[], Callable[[], None]]] = None) -> AnalyzeResponse:
+    """
+    발음 점수 이벤트 → 선택 단계 실행 → 결과 저장 → 응답 생성 (마감을 넘긴 단계는 pending)
+
+    fallback_result_id가 있으면 저장에 실패해도 500 대신 이 ID로 응답합니다 (개발 모드 목업용).
+    detach_slot은 수락 제어 슬롯을 응답 뒤까지 넘겨받는 함수(SlotLease.detach)입니다.
+    마감을 넘긴 단계가 있으면 슬롯을 넘겨받아 그 단계들이 끝날 때 반납합니다.
+    """
+    scores = Scores(
+        accuracy=pronunciation.accuracy_score,
+        fluency=pronunciation.fluency_score,
+        completeness=pronunciation.completeness_score,
+        pronunciation=pronunciation.pronunciation_score,
+    )
+    _emit(emit, "scores", scores)
+
+    ready, pending = run_optional_stages(stages, deadline, emit, cancel)
+    if cancel is not None:
+        # 저장 직전 마지막 확인 (저장 뒤에는 취소하지 않고 끝까지 진행)
+        cancel.check()
+    if pending:
+        print(f"[INFO] 마감 초과, 나중에 저장할 단계: {sorted(pending)}")
+
+    formant = ready.get("formant", StageOutput())
+    tone = ready.get("tone", StageOutput())
+
+    # 시계열(포먼트 트랙, 피치 컨투어)은 행에 넣지 않고 바이너리로 별도 저장
+    # (지연된 단계가 있으면 모두 끝난 뒤 한 번에 저장)
+    contour_path = None
+    if not pending:
+        contour_path = store_contours(recording_id, formant.track, tone.track)
+
+    saved_result = save_analysis_result(
+        recording_id=recording_id,
+        accuracy_score=pronunciation.accuracy_score,
+        fluency_score=pronunciation.fluency_score,
+        completeness_score=pronunciation.completeness_score,
+        pronunciation_score=pronunciation.pronunciation_score,
+        feedback=pronunciation.feedback,
+        word_details=pronunciation.word_details,
+        formant_data=formant.data,
+        tone_data=tone.data,
+        contour_path=contour_path,
+        waveform_path=waveform_path,
+        pending_stages=sorted(pending) or None,
+        analysis_preset=preset.name,
+        scoring_version=SCORING_VERSION,
+    )
+    if saved_result:
+        result_id = saved_result["id"]
+        if pending:
+            on_finished = detach_slot() if detach_slot is not None else None
+            PendingStages(result_id, recording_id, ready, pending, on_finished).start()
+    elif fallback_result_id:
+        # 저장할 행이 없으므로 늦은 단계는 채워지지 않음
+        print(f"[WARNING] 결과 저장 실패, 임시 ID로 응답: {fallback_result_id}")
+        result_id = fallback_result_id
+    else:
+        raise AnalysisFailed(500, "결과 저장에 실패했습니다.")
+
+    response = AnalyzeResponse(
+        success=True,
+        result_id=result_id,
+        scores=scores,
+        feedback=pronunciation.feedback,
+        formant=formant.analysis,
+        tone=tone.analysis,
+        pending=sorted(pending) or None,
+        preset=preset.name,
+    )
+    _emit(emit, "saved", response)
+    return response
+
+
+def run_mock_analysis(request: AnalyzeRequest, deadline: Optional[float],
+                      emit: Optional[Emit] = None, cancel: Optional[CancelToken] = None,
+                      detach_slot: Optional[Callable[[], Callable[[], None]]] = None) -> AnalyzeResponse:
+    """개발 모드 목업 파이프라인"""
+    progress = RunProgress(stage="azure")
+    # 목업도 실제와 같은 재시도 래퍼를 거침 (AZURE_MOCK_FAULTS로 장애/지연 주입)
+    try:
+        mock_result = get_mock_result_with_retry(request.reference_text, cancel)
+    except AnalysisCancelled:
+        record_cancellation(progress)
+        raise
+    if not mock_result.success:
+        return AnalyzeResponse(
+            success=False,
+            error=mock_result.error or "발음 평가에 실패했습니다.",
+        )
+
+    stages = {}
+    if request.include_formant:
+        stages["formant"] = thread_stage("formant", mock_formant_stage)
+    if request.include_tone:
+        stages["tone"] = thread_stage("tone", mock_tone_stage)
+    progress.stage = "dsp"
+    try:
+        return finish_analysis(
+            request.recording_id, mock_result, stages, deadline, get_preset(request.preset), emit=emit, cancel=cancel,
+            fallback_result_id="mock-result-id", detach_slot=detach_slot,
+        )
+    except AnalysisCancelled:
+        record_cancellation(progress)
+        raise
+
+
+def run_analysis(request: AnalyzeRequest, emit: Optional[Emit] = None,
+                 cancel: Optional[CancelToken] = None,
+                 detach_slot: Optional[Callable[[], Callable[[], None]]] = None) -> AnalyzeResponse:
+    """
+    분석 파이프라인 실행 (블로킹, 응답 직렬화는 호출하는 쪽에서 처리)
+
+    Args:
+        request: 분석 요청
+        emit: 단계 이벤트 콜백 (SSE 스트리밍용, 분석 스레드에서 호출됨)
+        cancel: 취소 신호 (클라이언트 연결이 끊기면 취소됨, 취소되면 AnalysisCancelled)
+        detach_slot: 마감을 넘긴 단계가 끝날 때까지 수락 제어 슬롯을 넘겨받는 함수 (SlotLease.detach)
+
+    Raises:
+        AnalysisClaimed: 다른 인스턴스가 분석 중 (결과는 wait_for_claimed_analysis로 기다림)
+    """
+    started = time.monotonic()
+    deadline = resolve_deadline(request, started)
+    recording_id = request.recording_id
+    cancel = cancel or CancelToken()
+    preset = get_preset(request.preset)
+
+    # 개발 모드에서는 목업 결과 반환
+    if DEV_MODE:
+        return run_mock_analysis(request, deadline, emit, cancel, detach_slot)
+
+    # 1. 녹음 정보 조회
+    recording = get_recording(recording_id)
+    if not recording:
+        raise AnalysisFailed(404, "녹음을 찾을 수 없습니다.")
+    if cancel.cancelled:
+        record_cancellation(RunProgress(stage="claim"))
+        raise AnalysisCancelled()
+
+    # 2. 분석 점유 (status → analyzing, lease 포함)
+    # 다른 인스턴스가 이미 분석 중이면 새로 분석하지 않음 (호출하는 쪽이 슬롯 밖에서 결과를 기다림)
+    claimed = claim_recording(recording_id)
+    if claimed is None:
+        # 점유 여부를 모르는 상태에서 기다리면 lease 시간 내내 폴링하다 409가 되므로 바로 실패
+        raise AnalysisFailed(503, "분석을 시작할 수 없습니다. 잠시 후 다시 시도해주세요.")
+    if not claimed:
+        print(f"[INFO] 다른 인스턴스에서 분석 중: {recording_id}")
+        raise AnalysisClaimed(recording_id)
+
+    progress = RunProgress(stage="download")
+    try:
+        # 3. 음성 파일 다운로드
+        audio_data = download_recording_file(recording["file_path"])
+        if not audio_data:
+            update_recording_status(recording_id, "failed")
+            raise AnalysisFailed(500, "음성 파일을 다운로드할 수 없습니다.")
+        _emit(emit, "downloaded", {"bytes": len(audio_data)})
+        cancel.check()
+        progress.stage = "decode"
+
+        # 4. 오디오 디코딩 (매직 바이트로 형식 판별, 규격 WAV는 그대로 통과)
+        file_path = recording["file_path"]
+        format_hint = os.path.splitext(file_path)[1].lstrip(".").lower() or None
+        try:
+            decoded_audio = decode_audio(audio_data, format_hint=format_hint)
+        except AudioDecodeError as e:
+            print(f"[ERROR] 오디오 디코딩 실패: {e}")
+            update_recording_status(recording_id, "failed")
+            return AnalyzeResponse(
+                success=False,
+                error="오디오 파일을 해석할 수 없습니다. 다시 녹음해주세요.",
+            )
+
+        # 5. 음성 구간 검출: 음성이 없으면 Azure 호출 전에 중단하고, 무음은 잘라냄
+        vad = detect_voice_activity(decoded_audio.samples, decoded_audio.sample_rate)
+        if not vad.has_speech:
+            print(f"[INFO] 음성 미검출: speech={vad.speech_duration}s, snr={vad.snr_db}dB")
+            update_recording_status(recording_id, "failed")
+            return AnalyzeResponse(
+                success=False,
+                error="No speech recognized",
+            )
+        speech_audio = trim_silence(decoded_audio, vad)
+        wav_audio_data = speech_audio.to_wav_bytes()
+        _emit(emit, "converted", {
+            "duration": round(decoded_audio.duration, 3),
+            "speech_duration": round(speech_audio.duration, 3),
+            "sample_rate": speech_audio.sample_rate,
+        })
+        cancel.check()
+
+        # 6. Azure 발음 평가 (필수 단계, 일시적 오류/요청 한도 초과는 백오프 후 재시도)
+        # 취소되면 진행 중인 인식을 멈춤
+        progress.stage = "azure"
+        progress.azure_audio_seconds = speech_audio.duration
+        result = assess_pronunciation_with_retry(
+            wav_audio_data, reference_text=request.reference_text, cancel=cancel
+        )
+        progress.azure_done = True
+        if not result.success:
+            update_recording_status(recording_id, "failed")
+            return AnalyzeResponse(
+                success=False,
+                error=result.error or "발음 평가에 실패했습니다.",
+            )
+        cancel.check()
+        progress.stage = "dsp"
+
+        # 긴 녹음은 쉼에서 청크로 나눠 Praat 분석을 프로세스 풀에서 병렬 실행
+        chunks = plan_chunks(speech_audio.samples, speech_audio.sample_rate)
+        formant_chunks = chunks if request.include_formant and FORMANT_ENGINE == "praat" else None
+        tone_chunks = chunks if request.include_tone and TONE_ENGINE == "praat" else None
+
+        # 7~8. 공명/톤 분석 (선택 단계, 마감을 넘기면 백그라운드에서 마저 계산)
+        # 한 번에 분석하는 단계는 프로세스 풀의 한 작업에서 Praat 컨텍스트를 공유해 실행
+        stages = {}
+        if formant_chunks:
+            stages["formant"] = thread_stage("formant", lambda: formant_stage(
+                wav_audio_data, speech_audio, result.word_details, None, preset, formant_chunks, cancel
+            ))
+        if tone_chunks:
+            stages["tone"] = thread_stage("tone", lambda: tone_stage(
+                wav_audio_data, None, preset, speech_audio, tone_chunks, cancel
+            ))
+        whole = [name for name, included in (("formant", request.include_formant), ("tone", request.include_tone))
+                 if included and name not in stages]
+        if whole:
+            stages.update(praat_process_stages(whole, wav_audio_data, speech_audio, result.word_details, preset))
+
+        # 재생 파형은 잘라내지 않은 원본 녹음 기준 (플레이어가 원본 파일을 재생)
+        waveform_path = store_waveform(recording_id, decoded_audio)
+
+        # 9~10. 결과 저장
+        try:
+            response = finish_analysis(
+                recording_id, result, stages, deadline, preset, waveform_path, emit, cancel,
+                detach_slot=detach_slot,
+            )
+        except AnalysisFailed:
+            update_recording_status(recording_id, "failed")
+            raise
+
+        # 11. 상태 업데이트: completed (지연된 단계는 결과 행의 pending_stages로 추적)
+        update_recording_status(recording_id, "completed")
+        return response
+
+    except AnalysisCancelled:
+        # 아무도 받지 않을 결과는 저장하지 않고, 다시 분석할 수 있도록 cancelled로 표시
+        update_recording_status(recording_id, "cancelled")
+        record_cancellation(progress)
+        raise
+    except AnalysisFailed:
+        raise
+    except Exception as e:
+        update_recording_status(recording_id, "failed")
+        print(f"분석 오류: {e}")
+        raise AnalysisFailed(500, "분석 중 오류가 발생했습니다.")
@@ -0,0 +1,81 @@
+# 분석 품질 프리셋
+# Praat 분석의 프레임 간격, 분석 창, 부가 지표(시계열, 모음별 분석) 계산 여부를 이름 하나로 묶습니다.
+# 요청의 preset으로 고르고, 없으면 ANALYSIS_PRESET 서버 기본값을 사용합니다.
+#
+# - fast:     20ms 프레임, 긴 포먼트 창(30ms), 시계열/모음별 분석 생략 (점수만 빠르게)
+# - balanced: 기존 기본값 (Praat 자동 간격, 포먼트 창 25ms, 포먼트 10ms 샘플링)
+# - accurate: 5ms 프레임, 짧은 포먼트 창(20ms)으로 모음 전이 구간의 시간 해상도를 높임
+#
+# 오디오 1초당 프레임 수 (피치 하한 75Hz 기준, 포먼트 비용은 프레임 수 × 창 길이에 비례):
+#   preset    | pitch | formant | harmonicity | formant 프레임×창(ms)
+#   fast      |   50  |    50   |      33     | 1500
+#   balanced  |  100  |   160   |     100     | 4000
+#   accurate  |  200  |   200   |     200     | 4000
+# accurate는 피치/HNR 프레임이 balanced의 2배이고 포먼트 비용은 비슷합니다.
+# 실제 처리 시간과 accurate 대비 특징값 차이는 녹음으로 측정합니다:
+#   python -m scripts.compare_analysis_presets <오디오 파일> ...
+import os
+from dataclasses import dataclass
+from typing import Optional
+
+
+@dataclass(frozen=True)
+class AnalysisPreset:
+    """분석 품질 프리셋"""
+    name: str
+    pitch_time_step: float          # To Pitch 프레임 간격 (초, 0이면 Praat 자동 = 0.75 / 피치 하한)
+    formant_time_step: float        # To Formant 프레임 간격 (초, 0이면 Praat 자동 = 창 길이의 25%)
+    formant_window_length: float    # 포먼트 분석 창 길이 (초, Praat은 이 길이의 2배 가우스 창을 씀)
+    max_formants: int               # 추출할 포먼트 개수 (포먼트 상한 5000/5500Hz 안에 5개 기준이라 프리셋마다 같음)
+    track_time_step: float          # 포먼트 통계/시계열 샘플링 간격 (초)
+    harmonicity_time_step: float    # To Harmonicity 프레임 간격 (초)
+    contours: bool                  # 피치/포먼트 시계열 생성 및 저장
+    vowel_analysis: bool            # 모음별 포먼트 분석 (구간 분석 모드에서만)
+
+
+PRESETS = {
+    "fast": AnalysisPreset(
+        name="fast",
+        pitch_time_step=0.02,
+        formant_time_step=0.02,
+        formant_window_length=0.03,
+        max_formants=5,
+        track_time_step=0.02,
+        harmonicity_time_step=0.03,
+        contours=False,
+        vowel_analysis=False,
+    ),
+    "balanced": AnalysisPreset(
+        name="balanced",
+        pitch_time_step=0.0,
+        formant_time_step=0.0,
+        formant_window_length=0.025,
+        max_formants=5,
+        track_time_step=0.01,
+        harmonicity_time_step=0.01,
+        contours=True,
+        vowel_analysis=True,
+    ),
+    "accurate": AnalysisPreset(
+        name="accurate",
+        pitch_time_step=0.005,
+        formant_time_step=0.005,
+        formant_window_length=0.02,
+        max_formants=5,
+        track_time_step=0.005,
+        harmonicity_time_step=0.005,
+        contours=True,
+        vowel_analysis=True,
+    ),
+}
+
+# 서버 기본 프리셋 (fast, balanced, accurate)
+ANALYSIS_PRESET = os.getenv("ANALYSIS_PRESET", "balanced").lower()
+if ANALYSIS_PRESET not in PRESETS:
+    print(f"[WARNING] 알 수 없는 ANALYSIS_PRESET: {ANALYSIS_PRESET}, balanced 사용")
+    ANALYSIS_PRESET = "balanced"
+
+
+def get_preset(name: Optional[str] = None) -> AnalysisPreset:
+    """이름으로 프리셋 조회 (없으면 서버 기본값)"""
+    return PRESETS[name or ANALYSIS_PRESET]
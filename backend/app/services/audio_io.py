@@ -0,0 +1,274 @@
+# 오디오 입력(Ingestion) 서비스
+# 컨테이너 매직 바이트로 형식을 판별하고, 분석용 16kHz mono PCM으로 디코딩합니다.
+import io
+import os
+import shutil
+import subprocess
+import tempfile
+import wave
+from math import gcd
+from typing import Optional
+from dataclasses import dataclass
+import numpy as np
+
+try:
+    import soundfile as sf
+    SOUNDFILE_AVAILABLE = True
+except ImportError:
+    SOUNDFILE_AVAILABLE = False
+    print("Warning: soundfile not installed. Native WAV/FLAC/OGG decoding disabled.")
+
+try:
+    from scipy.signal import resample_poly
+    SCIPY_AVAILABLE = True
+except ImportError:
+    SCIPY_AVAILABLE = False
+
+# Azure 권장 설정: 16kHz, 16bit, mono
+TARGET_SAMPLE_RATE = 16000
+
+# ffmpeg 실행 파일 (m4a/webm 디코딩용)
+FFMPEG_PATH = os.getenv("FFMPEG_PATH") or shutil.which("ffmpeg")
+
+# ffmpeg 디코딩 제한 시간 (초). 손상되거나 악의적인 파일로 작업 스레드가 무한히 묶이지 않게 함
+FFMPEG_TIMEOUT_SECONDS = float(os.getenv("FFMPEG_TIMEOUT_SECONDS", "30"))
+
+# soundfile(libsndfile)로 직접 디코딩 가능한 형식
+NATIVE_FORMATS = {"wav", "flac", "ogg"}
+
+# ffmpeg 파이프로 디코딩하는 형식 (이 밖의 형식은 ffmpeg에 넘기지 않고 거부)
+FFMPEG_FORMATS = {"m4a", "webm", "mp3"}
+
+
+class AudioDecodeError(Exception):
+    """오디오를 디코딩할 수 없을 때 발생하는 예외"""
+
+
+class _FfmpegTimeout(AudioDecodeError):
+    """ffmpeg가 제한 시간 안에 끝나지 않음 (임시 파일로 다시 시도하지 않음)"""
+
+
+@dataclass
+class DecodedAudio:
+    """디코딩된 오디오 (16kHz mono float32)"""
+    samples: np.ndarray          # -1.0 ~ 1.0 범위의 float32 샘플
+    sample_rate: int
+    source_format: str           # 판별된 원본 형식
+    passthrough: bool = False    # 원본이 이미 규격 WAV여서 그대로 사용했는지
+    wav_bytes: Optional[bytes] = None
+
+    @property
+    def duration(self) -> float:
+        """길이 (초)"""
+        return len(self.samples) / self.sample_rate if self.sample_rate else 0.0
+
+    def to_wav_bytes(self) -> bytes:
+        """16bit PCM WAV 바이트 반환 (규격 WAV 원본이면 재인코딩하지 않음)"""
+        if self.wav_bytes is None:
+            self.wav_bytes = encode_wav(self.samples, self.sample_rate)
+        return self.wav_bytes
+
+
+def sniff_format(audio_data: bytes) -> str:
+    """
+    컨테이너 매직 바이트로 오디오 형식을 판별합니다.
+
+    Returns:
+        wav, flac, ogg, webm, m4a, mp3 또는 unknown
+    """
+    head = audio_data[:12]
+    if head[:4] == b"RIFF" and head[8:12] == b"WAVE":
+        return "wav"
+    if head[:4] == b"fLaC":
+        return "flac"
+    if head[:4] == b"OggS":
+        return "ogg"
+    if head[:4] == b"\x1a\x45\xdf\xa3":  # EBML (Matroska/WebM)
+        return "webm"
+    if head[4:8] == b"ftyp":             # ISO BMFF (m4a/mp4/aac)
+        return "m4a"
+    if head[:3] == b"ID3" or (len(head) >= 2 and head[0] == 0xFF and (head[1] & 0xE0) == 0xE0):
+        return "mp3"
+    return "unknown"
+
+
+def encode_wav(samples: np.ndarray, sample_rate: int = TARGET_SAMPLE_RATE) -> bytes:
+    """float32 샘플을 16bit mono PCM WAV로 인코딩"""
+    pcm = (np.clip(samples, -1.0, 1.0) * 32767.0).astype("<i2")
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav_file:
+        wav_file.setnchannels(1)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(sample_rate)
+        wav_file.writeframes(pcm.tobytes())
+    return buffer.getvalue()
+
+
+def resample(samples: np.ndarray, source_rate: int, target_rate: int = TARGET_SAMPLE_RATE) -> np.ndarray:
+    """polyphase 필터로 리샘플링 (SciPy가 없으면 선형 보간)"""
+    if source_rate == target_rate or len(samples) == 0:
+        return samples.astype(np.float32, copy=False)
+
+    if SCIPY_AVAILABLE:
+        divisor = gcd(int(source_rate), int(target_rate))
+        up = int(target_rate) // divisor
+        down = int(source_rate) // divisor
+        return resample_poly(samples, up, down).astype(np.float32)
+
+    target_length = int(round(len(samples) * target_rate / source_rate))
+    source_times = np.arange(len(samples)) / source_rate
+    target_times = np.arange(target_length) / target_rate
+    return np.interp(target_times, source_times, samples).astype(np.float32)
+
+
+def _decode_pcm_wav(audio_data: bytes) -> Optional[DecodedAudio]:
+    """
+    표준 PCM WAV를 파싱합니다.
+    이미 16kHz/16bit/mono라면 원본 바이트를 그대로 통과시킵니다.
+    """
+    try:
+        with wave.open(io.BytesIO(audio_data), "rb") as wav_file:
+            channels = wav_file.getnchannels()
+            sample_width = wav_file.getsampwidth()
+            sample_rate = wav_file.getframerate()
+            frames = wav_file.readframes(wav_file.getnframes())
+    except (wave.Error, EOFError):
+        # WAVE_FORMAT_EXTENSIBLE, float WAV 등은 soundfile로 처리
+        return None
+
+    if sample_width != 2:
+        return None
+
+    pcm = np.frombuffer(frames, dtype="<i2")
+    if channels > 1:
+        pcm = pcm[: len(pcm) - len(pcm) % channels].reshape(-1, channels).mean(axis=1)
+    samples = (pcm / 32768.0).astype(np.float32)
+
+    if channels == 1 and sample_rate == TARGET_SAMPLE_RATE:
+        return DecodedAudio(
+            samples=samples,
+            sample_rate=sample_rate,
+            source_format="wav",
+            passthrough=True,
+            wav_bytes=audio_data,
+        )
+
+    return DecodedAudio(
+        samples=resample(samples, sample_rate),
+        sample_rate=TARGET_SAMPLE_RATE,
+        source_format="wav",
+    )
+
+
+def _decode_with_soundfile(audio_data: bytes, source_format: str) -> DecodedAudio:
+    """soundfile(libsndfile)로 WAV/FLAC/OGG를 메모리에서 직접 디코딩"""
+    samples, sample_rate = sf.read(io.BytesIO(audio_data), dtype="float32", always_2d=True)
+    samples = samples.mean(axis=1) if samples.shape[1] > 1 else samples[:, 0]
+    return DecodedAudio(
+        samples=resample(samples, sample_rate),
+        sample_rate=TARGET_SAMPLE_RATE,
+        source_format=source_format,
+    )
+
+
+def _run_ffmpeg(input_arg: str, stdin_data: Optional[bytes]) -> bytes:
+    """ffmpeg로 16kHz mono float32 raw PCM을 stdout으로 받습니다."""
+    command = [FFMPEG_PATH, "-hide_banner", "-loglevel", "error"]
+    if stdin_data is None:
+        command.append("-nostdin")
+    command += [
+        "-i", input_arg,
+        "-f", "f32le", "-acodec", "pcm_f32le", "-ac", "1", "-ar", str(TARGET_SAMPLE_RATE),
+        "pipe:1",
+    ]
+    try:
+        process = subprocess.run(
+            command, input=stdin_data, capture_output=True, check=False, timeout=FFMPEG_TIMEOUT_SECONDS
+        )
+    except subprocess.TimeoutExpired:
+        # subprocess.run이 ffmpeg를 종료시킨 뒤 다시 올려 보냄
+        raise _FfmpegTimeout(f"ffmpeg timed out after {FFMPEG_TIMEOUT_SECONDS:g}s")
+    if process.returncode != 0 or not process.stdout:
+        raise AudioDecodeError(process.stderr.decode("utf-8", errors="replace").strip() or "ffmpeg failed")
+    return process.stdout
+
+
+def _decode_with_ffmpeg(audio_data: bytes, source_format: str) -> DecodedAudio:
+    """
+    ffmpeg stdin/stdout 파이프로 디코딩합니다 (임시 파일 없음).
+
+    moov 아톰이 파일 끝에 있는 m4a는 탐색(seek) 불가능한 파이프로 읽을 수 없으므로,
+    그 경우에만 임시 파일로 한 번 더 시도합니다.
+    """
+    if not FFMPEG_PATH:
+        raise AudioDecodeError("ffmpeg not available")
+
+    try:
+        raw = _run_ffmpeg("pipe:0", audio_data)
+    except AudioDecodeError as e:
+        if source_format != "m4a" or isinstance(e, _FfmpegTimeout):
+            raise
+        temp_input_path = None
+        try:
+            with tempfile.NamedTemporaryFile(suffix=".m4a", delete=False) as temp_input:
+                temp_input.write(audio_data)
+                temp_input_path = temp_input.name
+            raw = _run_ffmpeg(temp_input_path, None)
+        finally:
+            if temp_input_path and os.path.exists(temp_input_path):
+                os.unlink(temp_input_path)
+
+    return DecodedAudio(
+        samples=np.frombuffer(raw, dtype="<f4").copy(),
+        sample_rate=TARGET_SAMPLE_RATE,
+        source_format=source_format,
+    )
+
+
+def decode_audio(audio_data: bytes, format_hint: Optional[str] = None) -> DecodedAudio:
+    """
+    오디오 바이트를 16kHz mono float32로 디코딩합니다.
+
+    1. 매직 바이트로 형식 판별 (판별 실패 시 format_hint 사용)
+    2. 규격 WAV(16kHz/16bit/mono)는 그대로 통과
+    3. WAV/FLAC/OGG는 soundfile로 직접 디코딩
+    4. m4a/webm/mp3는 ffmpeg 파이프로 디코딩 (판별할 수 없는 형식은 거부)
+
+    Args:
+        audio_data: 원본 오디오 데이터 (bytes)
+        format_hint: 파일 확장자 등으로 추정한 형식 (선택)
+
+    Returns:
+        DecodedAudio
+
+    Raises:
+        AudioDecodeError: 디코딩에 실패한 경우
+    """
+    if not audio_data:
+        raise AudioDecodeError("empty audio data")
+
+    source_format = sniff_format(audio_data)
+    if source_format == "unknown" and format_hint:
+        source_format = {"mp4": "m4a", "aac": "m4a"}.get(format_hint, format_hint)
+    if source_format not in NATIVE_FORMATS and source_format not in FFMPEG_FORMATS:
+        raise AudioDecodeError(f"unsupported audio format: {source_format}")
+
+    try:
+        if source_format == "wav":
+            decoded = _decode_pcm_wav(audio_data)
+            if decoded is not None:
+                return decoded
+
+        if source_format in NATIVE_FORMATS and SOUNDFILE_AVAILABLE:
+            try:
+                return _decode_with_soundfile(audio_data, source_format)
+            except Exception as e:
+                # libsndfile 빌드에 따라 OGG/Opus 미지원일 수 있음 → ffmpeg로 재시도
+                print(f"[WARNING] soundfile 디코딩 실패, ffmpeg로 재시도: {e}")
+
+        return _decode_with_ffmpeg(audio_data, source_format)
+
+    except AudioDecodeError:
+        raise
+    except Exception as e:
+        raise AudioDecodeError(str(e)) from e
@@ -0,0 +1,476 @@
+# Azure Speech 호출 안정화 래퍼
+# 요청 한도 초과(429)나 일시적 취소가 바로 분석 실패로 이어지지 않도록
+# 토큰 버킷(요청률 제한), 지터 백오프 재시도, 서킷 브레이커, 선택적 헤징을 적용합니다.
+# 여러 Speech 리소스(키, 리전)를 엔드포인트 풀로 묶어 가중치 기반 최소 부하로 분산하고,
+# 실패한 엔드포인트(인증 실패 포함)는 건너뛰어 다른 엔드포인트로 넘깁니다.
+import os
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Callable, List, Optional, Set
+
+import numpy as np
+
+from app.services import metrics
+from app.services.azure_speech import (
+    PronunciationResult,
+    assess_pronunciation,
+    AZURE_SPEECH_KEY,
+    AZURE_REGION,
+    get_faulty_mock_result,
+    failed_result,
+    RETRYABLE_ERRORS,
+    ENDPOINT_ERRORS,
+    ERROR_THROTTLED,
+    ERROR_TRANSIENT,
+)
+from app.services.cancellation import AnalysisCancelled, CancelToken
+
+# Speech 리소스 목록: "리전:키[:가중치],..." (없으면 AZURE_SPEECH_KEY / AZURE_REGION 하나)
+# 가중치는 리소스의 상대적 한도 (라우팅 비율과 요청률 제한에 함께 반영)
+AZURE_SPEECH_ENDPOINTS = os.getenv("AZURE_SPEECH_ENDPOINTS", "")
+
+# 엔드포인트(가중치 1)당 초당 요청 한도보다 약간 낮게 (토큰 버킷 보충 속도, 최대 버스트)
+AZURE_REQUESTS_PER_SECOND = float(os.getenv("AZURE_REQUESTS_PER_SECOND", "10"))
+AZURE_BURST = int(os.getenv("AZURE_BURST", "20"))
+
+# 재시도 횟수와 백오프 (초)
+AZURE_MAX_RETRIES = int(os.getenv("AZURE_MAX_RETRIES", "3"))
+BACKOFF_BASE = 0.5
+BACKOFF_CAP = 8.0
+THROTTLE_BACKOFF_BASE = 2.0  # 429는 더 길게 쉼
+
+# 토큰을 기다리는 최대 시간 (초, 넘기면 throttled 로 처리)
+TOKEN_WAIT_SECONDS = 5.0
+
+# 서킷 브레이커: 연속 실패가 이만큼이면 열고, 이 시간 뒤 한 번 시험 호출
+BREAKER_FAILURE_THRESHOLD = int(os.getenv("AZURE_BREAKER_FAILURES", "5"))
+BREAKER_RESET_SECONDS = float(os.getenv("AZURE_BREAKER_RESET_SECONDS", "30"))
+
+# 헤징: 응답이 최근 p95보다 늦으면 같은 요청을 한 번 더 보내 먼저 온 결과 사용
+AZURE_HEDGE = os.getenv("AZURE_HEDGE", "false").lower() == "true"
+HEDGE_MIN_SAMPLES = 20
+HEDGE_MIN_DELAY = 1.0
+
+_hedge_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="azure-hedge")
+
+
+class TokenBucket:
+    """스레드 안전 토큰 버킷"""
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def try_acquire(self) -> bool:
+        with self._lock:
+            self._refill()
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return True
+            return False
+
+    def acquire(self, timeout: float, cancel: Optional[CancelToken] = None) -> bool:
+        """토큰이 생길 때까지 최대 timeout초 대기 (기다리는 동안 cancel이 취소되면 AnalysisCancelled)"""
+        deadline = time.monotonic() + timeout
+        while True:
+            with self._lock:
+                self._refill()
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return True
+                wait_time = (1 - self.tokens) / self.rate
+            if time.monotonic() + wait_time > deadline:
+                return False
+            if cancel is None:
+                time.sleep(wait_time)
+            elif cancel.wait(wait_time):
+                raise AnalysisCancelled()
+
+
+class CircuitBreaker:
+    """
+    closed → (연속 실패 threshold회) → open → (reset_seconds 경과) → half_open
+    half_open에서는 시험 호출 하나만 허용하고, 성공하면 closed, 실패하면 다시 open
+    """
+
+    def __init__(self, threshold: int, reset_seconds: float):
+        self.threshold = threshold
+        self.reset_seconds = reset_seconds
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    def available(self) -> bool:
+        """호출을 받을 수 있는 상태인지 (상태를 바꾸지 않음, 라우팅 후보 선정용)"""
+        with self._lock:
+            if self.state == "closed":
+                return True
+            if self.state == "open":
+                return time.monotonic() - self.opened_at >= self.reset_seconds
+            return not self._trial_in_flight
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == "open" and time.monotonic() - self.opened_at >= self.reset_seconds:
+                self.state = "half_open"
+                self._trial_in_flight = False
+            if self.state == "closed":
+                return True
+            if self.state == "half_open" and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            return False
+
+    def release_trial(self) -> None:
+        """호출하지 못한 half_open 시험 기회 반납"""
+        with self._lock:
+            self._trial_in_flight = False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.state = "closed"
+            self.failures = 0
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            self._trial_in_flight = False
+            if self.state == "half_open" or self.failures >= self.threshold:
+                if self.state != "open":
+                    print(f"[WARNING] Azure 서킷 브레이커 열림 (연속 실패 {self.failures}회)")
+                self.state = "open"
+                self.opened_at = time.monotonic()
+
+
+class LatencyTracker:
+    """최근 성공 호출 지연 시간 (p95 계산용)"""
+
+    def __init__(self, size: int = 200):
+        self._samples = deque(maxlen=size)
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def percentile(self, q: float) -> Optional[float]:
+        with self._lock:
+            if not self._samples:
+                return None
+            return float(np.percentile(np.fromiter(self._samples, dtype=float), q))
+
+
+def backoff_delay(attempt: int, error_kind: str) -> float:
+    """full jitter 지수 백오프 (attempt: 0부터)"""
+    base = THROTTLE_BACKOFF_BASE if error_kind == ERROR_THROTTLED else BACKOFF_BASE
+    return random.uniform(0, min(BACKOFF_CAP, base * (2 ** attempt)))
+
+
+class SpeechEndpoint:
+    """
+    Speech 리소스 하나 (키, 리전)
+
+    엔드포인트마다 토큰 버킷, 서킷 브레이커, 지연 시간, 진행 중 요청 수를 따로 관리합니다.
+    """
+
+    def __init__(self, name: str, speech_key: str, region: str, weight: float = 1.0):
+        self.name = name
+        self.speech_key = speech_key
+        self.region = region
+        self.weight = weight
+        self.bucket = TokenBucket(AZURE_REQUESTS_PER_SECOND * weight, max(1, int(AZURE_BURST * weight)))
+        self.breaker = CircuitBreaker(BREAKER_FAILURE_THRESHOLD, BREAKER_RESET_SECONDS)
+        self.latency = LatencyTracker()
+        self.in_flight = 0
+        self._lock = threading.Lock()
+
+    def load(self) -> float:
+        """가중치 대비 부하 (진행 중 요청 수 + 1) / 가중치"""
+        return (self.in_flight + 1) / self.weight
+
+    def begin(self) -> None:
+        with self._lock:
+            self.in_flight += 1
+
+    def end(self) -> None:
+        with self._lock:
+            self.in_flight -= 1
+
+
+def parse_endpoints(spec: str, default_key: str, default_region: str) -> List[SpeechEndpoint]:
+    """AZURE_SPEECH_ENDPOINTS 파싱 (비어 있으면 기본 키/리전 하나)"""
+    endpoints = []
+    for index, item in enumerate(filter(None, (part.strip() for part in spec.split(","))), start=1):
+        parts = item.split(":")
+        if len(parts) < 2:
+            print(f"[WARNING] 잘못된 AZURE_SPEECH_ENDPOINTS 항목 무시: {parts[0]}:...")
+            continue
+        region, speech_key = parts[0], parts[1]
+        weight = float(parts[2]) if len(parts) > 2 else 1.0
+        endpoints.append(SpeechEndpoint(f"{region}-{index}", speech_key, region, weight))
+    if not endpoints:
+        endpoints.append(SpeechEndpoint(default_region, default_key, default_region))
+    return endpoints
+
+
+class ResilientSpeechClient:
+    """
+    발음 평가 호출 래퍼 (엔드포인트 풀)
+
+    - 라우팅: 서킷이 열리지 않은 엔드포인트 중 (진행 중 요청 + 1) / 가중치가 가장 작은 곳,
+      같으면 최근 p50 지연 시간이 짧은 곳
+    - 재시도: 실패한 엔드포인트를 제외하고 다른 엔드포인트로 바로 넘김(failover).
+      남은 엔드포인트가 없으면 지터 백오프 후 전체에서 다시 선택 (인증 실패는 넘기기만 하고 백오프 재시도 없음)
+    - 헤징: 응답이 해당 엔드포인트의 p95보다 늦으면 다른 엔드포인트(없으면 같은 곳)로 한 번 더 요청
+
+    attempt: 엔드포인트를 받아 한 번 평가하는 함수 (실패 시 PronunciationResult.error_kind로 재시도 여부 판단)
+    """
+
+    def __init__(self, name: str, endpoints: List[SpeechEndpoint],
+                 max_retries: int = AZURE_MAX_RETRIES, hedge: bool = AZURE_HEDGE):
+        self.name = name
+        self.endpoints = endpoints
+        self.max_retries = max_retries
+        self.hedge = hedge
+        metrics.register_collector(self._collect)
+
+    def choose(self, exclude: Set[str] = frozenset()) -> Optional[SpeechEndpoint]:
+        """가중치 기반 최소 부하 엔드포인트 선택 (호출 가능한 곳이 없으면 None)"""
+        candidates = [
+            endpoint for endpoint in self.endpoints
+            if endpoint.name not in exclude and endpoint.breaker.available()
+        ]
+        candidates.sort(key=lambda endpoint: (endpoint.load(), endpoint.latency.percentile(50) or 0.0))
+        for endpoint in candidates:
+            if endpoint.breaker.allow():
+                return endpoint
+        return None
+
+    def _timed(self, endpoint: SpeechEndpoint,
+               attempt: Callable[[SpeechEndpoint], PronunciationResult]) -> PronunciationResult:
+        endpoint.begin()
+        started = time.monotonic()
+        try:
+            result = attempt(endpoint)
+        finally:
+            endpoint.end()
+        elapsed = time.monotonic() - started
+        if result.success:
+            endpoint.latency.record(elapsed)
+        outcome = "success" if result.success else result.error_kind
+        metrics.inc("truevoice_azure_requests_total", client=self.name, endpoint=endpoint.name, outcome=outcome)
+        metrics.inc("truevoice_azure_request_seconds_total", elapsed, client=self.name, endpoint=endpoint.name)
+        return result
+
+    def _record(self, endpoint: SpeechEndpoint, result: PronunciationResult) -> None:
+        """엔드포인트 상태 반영 (엔드포인트 장애만 실패로 셈, 잘못된 요청/음성 미인식은 성공으로 봄)"""
+        if result.success or result.error_kind not in ENDPOINT_ERRORS:
+            endpoint.breaker.record_success()
+        else:
+            endpoint.breaker.record_failure()
+
+    def _hedge_delay(self, endpoint: SpeechEndpoint) -> Optional[float]:
+        if not self.hedge or len(endpoint.latency) < HEDGE_MIN_SAMPLES:
+            return None
+        return max(HEDGE_MIN_DELAY, endpoint.latency.percentile(95))
+
+    def _call_once(self, endpoint: SpeechEndpoint,
+                   attempt: Callable[[SpeechEndpoint], PronunciationResult]) -> PronunciationResult:
+        """한 번 호출 (p95보다 늦으면 두 번째 요청을 보내 먼저 성공한 결과 사용)"""
+        delay = self._hedge_delay(endpoint)
+        if delay is None:
+            result = self._timed(endpoint, attempt)
+            self._record(endpoint, result)
+            return result
+
+        primary = _hedge_executor.submit(self._timed, endpoint, attempt)
+        done, _ = wait([primary], timeout=delay)
+        backup = None if done else (self.choose(exclude={endpoint.name}) or endpoint)
+        if backup is not None and not backup.bucket.try_acquire():
+            if backup is not endpoint:
+                # choose()에서 받은 half_open 시험 기회를 쓰지 않았으므로 반납
+                backup.breaker.release_trial()
+            backup = None
+        if backup is None:
+            result = primary.result()
+            self._record(endpoint, result)
+            return result
+
+        metrics.inc("truevoice_azure_hedged_total", client=self.name, endpoint=backup.name)
+        futures = {
+            primary: endpoint,
+            _hedge_executor.submit(self._timed, backup, attempt): backup,
+        }
+        pending = set(futures)
+        result = None
+        try:
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    if future.exception() is not None and futures[future] is not endpoint:
+                        # 백업 호출의 시험 기회 반납 (주 호출은 call()에서 반납)
+                        futures[future].breaker.release_trial()
+                    result = future.result()
+                    self._record(futures[future], result)
+                    if result.success:
+                        return result
+            return result
+        finally:
+            # 늦은 쪽 호출은 SDK에서 중단할 수 없으므로 백그라운드에서 끝나도록 두고,
+            # 끝나면 그 결과도 엔드포인트 상태에 반영 (half_open 시험 호출이면 여기서 풀림)
+            for loser in pending:
+                loser.add_done_callback(
+                    lambda late, late_endpoint=futures[loser]: self._record_late(late_endpoint, late)
+                )
+
+    def _record_late(self, endpoint: SpeechEndpoint, future) -> None:
+        """헤징에서 진 호출의 결과 반영 (예외로 끝났으면 시험 기회만 반납)"""
+        if future.exception() is not None:
+            endpoint.breaker.release_trial()
+            return
+        self._record(endpoint, future.result())
+
+    def call(self, attempt: Callable[[SpeechEndpoint], PronunciationResult],
+             cancel: Optional[CancelToken] = None) -> PronunciationResult:
+        """
+        라우팅/재시도/요청률 제한/서킷 브레이커를 적용해 평가 수행
+        cancel이 취소되면 재시도/백오프를 멈추고 AnalysisCancelled를 그대로 전달합니다.
+        """
+        result = None
+        failed: Set[str] = set()
+        for retry in range(self.max_retries + 1):
+            if cancel is not None:
+                cancel.check()
+            endpoint = self.choose(exclude=failed) or (self.choose() if failed else None)
+            if endpoint is None:
+                metrics.inc("truevoice_azure_requests_total", client=self.name, endpoint="none", outcome="circuit_open")
+                return failed_result(
+                    "음성 평가 서비스가 일시적으로 불안정합니다. 잠시 후 다시 시도해주세요.",
+                    "Azure circuit breaker open",
+                    ERROR_TRANSIENT,
+                )
+
+            try:
+                acquired = endpoint.bucket.acquire(TOKEN_WAIT_SECONDS, cancel)
+            except AnalysisCancelled:
+                endpoint.breaker.release_trial()
+                raise
+            if not acquired:
+                # 로컬 한도 초과: Azure에 보내지 않고 429와 같게 처리 (서비스 상태와 무관하므로 브레이커 제외)
+                endpoint.breaker.release_trial()
+                result = failed_result(
+                    "요청이 많아 음성 평가가 지연되고 있습니다.",
+                    "Local rate limit exceeded",
+                    ERROR_THROTTLED,
+                )
+                metrics.inc("truevoice_azure_requests_total", client=self.name,
+                            endpoint=endpoint.name, outcome="local_throttled")
+            else:
+                try:
+                    result = self._call_once(endpoint, attempt)
+                except AnalysisCancelled:
+                    # 취소는 서비스 상태와 무관하므로 브레이커 시험 호출만 반납
+                    endpoint.breaker.release_trial()
+                    raise
+                if result.success or result.error_kind not in ENDPOINT_ERRORS:
+                    return result
+
+            if retry == self.max_retries:
+                break
+            failed.add(endpoint.name)
+            if result.error_kind not in RETRYABLE_ERRORS and not self.has_candidates(failed):
+                # 인증 실패는 기다려도 같은 엔드포인트에서 같은 결과이므로 백오프 재시도하지 않음
+                return result
+            metrics.inc("truevoice_azure_retries_total", client=self.name, reason=result.error_kind)
+            if self.has_candidates(failed):
+                # 다른 엔드포인트가 남아 있으면 기다리지 않고 바로 넘김
+                print(f"[INFO] Azure {result.error_kind} ({endpoint.name}), 다른 엔드포인트로 재시도: {result.error}")
+                continue
+            delay = backoff_delay(retry, result.error_kind)
+            print(f"[INFO] Azure {result.error_kind} ({endpoint.name}), {delay:.2f}초 후 재시도 ({retry + 1}/{self.max_retries}): {result.error}")
+            failed.clear()
+            if cancel is None:
+                time.sleep(delay)
+            elif cancel.wait(delay):
+                raise AnalysisCancelled()
+        return result
+
+    def has_candidates(self, exclude: Set[str]) -> bool:
+        """제외 목록 밖에 호출 가능한 엔드포인트가 있는지"""
+        return any(
+            endpoint.name not in exclude and endpoint.breaker.available()
+            for endpoint in self.endpoints
+        )
+
+    def _collect(self):
+        values = []
+        for endpoint in self.endpoints:
+            labels = {"client": self.name, "endpoint": endpoint.name, "region": endpoint.region}
+            p95 = endpoint.latency.percentile(95)
+            values += [
+                ("truevoice_azure_endpoint_weight", labels, endpoint.weight),
+                ("truevoice_azure_endpoint_in_flight", labels, endpoint.in_flight),
+                ("truevoice_azure_endpoint_healthy", labels, 1 if endpoint.breaker.state == "closed" else 0),
+                ("truevoice_azure_tokens_available", labels, round(endpoint.bucket.tokens, 2)),
+                ("truevoice_azure_latency_p95_seconds", labels, round(p95, 3) if p95 is not None else 0),
+            ]
+        return values
+
+
+# 실제 Azure 호출용 / 로컬 목업(장애 주입)용 클라이언트
+speech_client = ResilientSpeechClient(
+    "azure", parse_endpoints(AZURE_SPEECH_ENDPOINTS, AZURE_SPEECH_KEY, AZURE_REGION)
+)
+mock_speech_client = ResilientSpeechClient(
+    "mock", parse_endpoints(AZURE_SPEECH_ENDPOINTS, "mock", "mock")
+)
+
+
+def limit_request_rate(requests_per_second: float) -> None:
+    """
+    이 프로세스의 전체 요청률 한도를 다시 설정 (엔드포인트 가중치 비율로 나눔).
+    백필처럼 여러 프로세스가 Azure 한도를 나눠 쓸 때 프로세스마다 호출합니다.
+    """
+    total_weight = sum(endpoint.weight for endpoint in speech_client.endpoints)
+    for endpoint in speech_client.endpoints:
+        rate = requests_per_second * endpoint.weight / total_weight
+        endpoint.bucket = TokenBucket(rate, max(1, int(rate)))
+
+
+def assess_pronunciation_with_retry(audio_data: bytes, reference_text: str,
+                                    audio_format: str = "wav",
+                                    cancel: Optional[CancelToken] = None) -> PronunciationResult:
+    """엔드포인트 라우팅/재시도/요청률 제한/서킷 브레이커/헤징을 적용한 발음 평가 (취소 가능)"""
+    return speech_client.call(
+        lambda endpoint: assess_pronunciation(
+            audio_data, reference_text, audio_format,
+            speech_key=endpoint.speech_key, region=endpoint.region, cancel=cancel,
+        ),
+        cancel,
+    )
+
+
+def get_mock_result_with_retry(reference_text: str,
+                               cancel: Optional[CancelToken] = None) -> PronunciationResult:
+    """장애를 주입한 목업을 같은 래퍼로 호출 (AZURE_MOCK_FAULTS로 검증)"""
+    return mock_speech_client.call(
+        lambda endpoint: get_faulty_mock_result(reference_text, cancel=cancel),
+        cancel,
+    )
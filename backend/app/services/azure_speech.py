@@ -1,12 +1,17 @@
 # Azure Speech 서비스 - 발음 평가 API 연동
 import os
+import json
+import random
 import tempfile
+import threading
+import time
 from typing import Optional
 from dataclasses import dataclass
 import azure.cognitiveservices.speech as speechsdk
 from dotenv import load_dotenv
-from pydub import AudioSegment
-import io
+
+from app.services.audio_io import decode_audio
+from app.services.cancellation import AnalysisCancelled, CancelToken
 
 load_dotenv()
 
@@ -14,6 +19,23 @@ load_dotenv()
 AZURE_SPEECH_KEY = os.getenv("AZURE_SPEECH_KEY", "")
 AZURE_REGION = os.getenv("AZURE_REGION", "koreacentral")
 
+# 로컬 목업 장애 주입 (예: "throttle=0.2,transient=0.1,latency=0.5-3.0")
+#   throttle/transient/auth/fatal: 각 오류를 돌려줄 확률, latency: 응답 지연 범위 (초)
+AZURE_MOCK_FAULTS = os.getenv("AZURE_MOCK_FAULTS", "")
+
+# 오류 분류 (PronunciationResult.error_kind)
+ERROR_THROTTLED = "throttled"   # 요청 한도 초과 (429) - 재시도
+ERROR_TRANSIENT = "transient"   # 연결 실패, 타임아웃, 일시적 서비스 오류 - 재시도
+ERROR_AUTH = "auth"             # 인증 실패, 권한 없음 - 이 엔드포인트(키/리소스) 문제, 다른 엔드포인트로 넘김
+ERROR_FATAL = "fatal"           # 잘못된 요청 등 - 어느 엔드포인트로 보내도 같은 결과
+ERROR_NO_MATCH = "no_match"     # 음성 미인식 - 서비스는 정상
+
+RETRYABLE_ERRORS = (ERROR_THROTTLED, ERROR_TRANSIENT)
+
+# 엔드포인트 장애로 보는 오류 (서킷 브레이커 실패로 세고 다른 엔드포인트로 넘김)
+# ERROR_FATAL, ERROR_NO_MATCH는 요청 자체의 문제이므로 엔드포인트 상태에 반영하지 않음
+ENDPOINT_ERRORS = RETRYABLE_ERRORS + (ERROR_AUTH,)
+
 
 @dataclass
 class PronunciationResult:
@@ -26,6 +48,7 @@ class PronunciationResult:
     feedback: str
     success: bool
     error: Optional[str] = None
+    error_kind: Optional[str] = None  # ERROR_* (실패 시)
 
 
 def generate_feedback(pronunciation_score: float, word_details: list) -> str:
@@ -52,79 +75,160 @@ def generate_feedback(pronunciation_score: float, word_details: list) -> str:
     return base_feedback
 
 
+def parse_word_details(json_result: Optional[str]) -> list:
+    """
+    Azure 인식 결과 JSON에서 단어별 점수와 타이밍을 추출합니다.
+    Offset/Duration은 100ns 단위이므로 초로 변환합니다. (누락된 단어는 타이밍 없음)
+    """
+    if not json_result:
+        return []
+    try:
+        nbest = json.loads(json_result).get("NBest") or []
+        words = nbest[0].get("Words", []) if nbest else []
+    except (ValueError, AttributeError, IndexError):
+        return []
+
+    word_details = []
+    for word in words:
+        assessment = word.get("PronunciationAssessment", {})
+        offset = word.get("Offset")
+        duration = word.get("Duration")
+        word_details.append({
+            "word": word.get("Word", ""),
+            "score": assessment.get("AccuracyScore", 0),
+            "error_type": assessment.get("ErrorType"),
+            "offset": round(offset / 1e7, 3) if offset is not None else None,
+            "duration": round(duration / 1e7, 3) if duration is not None else None,
+        })
+    return word_details
+
+
+def classify_cancellation(cancellation) -> str:
+    """
+    cancellation_details를 재시도 가능 여부 기준으로 분류합니다.
+
+    - TooManyRequests → throttled
+    - ConnectionFailure, ServiceTimeout, ServiceError, ServiceUnavailable → transient
+    - AuthenticationFailure, Forbidden → auth
+    - BadRequest 등 → fatal
+    - EndOfStream (오디오 끝까지 음성 없음) → no_match
+    """
+    if cancellation.reason == speechsdk.CancellationReason.EndOfStream:
+        return ERROR_NO_MATCH
+
+    code = cancellation.code
+    if code == speechsdk.CancellationErrorCode.TooManyRequests:
+        return ERROR_THROTTLED
+    if code in (
+        speechsdk.CancellationErrorCode.ConnectionFailure,
+        speechsdk.CancellationErrorCode.ServiceTimeout,
+        speechsdk.CancellationErrorCode.ServiceError,
+        speechsdk.CancellationErrorCode.ServiceUnavailable,
+    ):
+        return ERROR_TRANSIENT
+    if code in (
+        speechsdk.CancellationErrorCode.AuthenticationFailure,
+        speechsdk.CancellationErrorCode.Forbidden,
+    ):
+        return ERROR_AUTH
+    return ERROR_FATAL
+
+
+def failed_result(feedback: str, error: str, error_kind: str) -> PronunciationResult:
+    """실패 결과 생성"""
+    return PronunciationResult(
+        accuracy_score=0,
+        fluency_score=0,
+        completeness_score=0,
+        pronunciation_score=0,
+        word_details=[],
+        feedback=feedback,
+        success=False,
+        error=error,
+        error_kind=error_kind,
+    )
+
+
 def convert_to_wav(audio_data: bytes, source_format: str = "m4a") -> bytes:
     """
     오디오 데이터를 WAV 형식으로 변환 (Azure Speech용)
     
     Azure Speech SDK는 WAV 형식만 지원하므로, M4A/WebM 등의 형식을
-    16kHz, 16bit, mono WAV로 변환합니다.
+    16kHz, 16bit, mono WAV로 변환합니다. 이미 규격에 맞는 WAV는 그대로 반환합니다.
     
     Args:
         audio_data: 원본 오디오 데이터 (bytes)
-        source_format: 원본 형식 (m4a, mp4, webm 등)
+        source_format: 원본 형식 힌트 (m4a, mp4, webm 등, 매직 바이트 판별이 우선)
     
     Returns:
         WAV 형식의 오디오 데이터 (bytes)
+
+    Raises:
+        AudioDecodeError: 변환에 실패한 경우
+    """
+    decoded = decode_audio(audio_data, format_hint=source_format)
+    wav_data = decoded.to_wav_bytes()
+    print(f"[INFO] 오디오 변환 완료: {decoded.source_format} -> wav ({len(wav_data)} bytes)")
+    return wav_data
+
+
+def recognize_cancellable(speech_recognizer, cancel: CancelToken):
+    """
+    취소 가능한 단일 발화 인식 (recognize_once와 같은 결과)
+
+    recognize_once는 도중에 멈출 수 없으므로 연속 인식을 시작해 첫 결과만 받고,
+    그 전에 취소되면 stop_continuous_recognition_async로 인식을 멈춥니다.
+    세션이 결과 없이 끝나면 None을 반환합니다.
     """
-    temp_input_path = None
+    done = threading.Event()
+    results = []
+
+    def on_result(evt):
+        if not results:
+            results.append(evt.result)
+        done.set()
+
+    speech_recognizer.recognized.connect(on_result)
+    speech_recognizer.canceled.connect(on_result)
+    speech_recognizer.session_stopped.connect(lambda evt: done.set())
+
+    unregister = cancel.on_cancel(done.set)
+    speech_recognizer.start_continuous_recognition_async().get()
     try:
-        # 임시 파일에 원본 저장
-        with tempfile.NamedTemporaryFile(suffix=f".{source_format}", delete=False) as temp_input:
-            temp_input.write(audio_data)
-            temp_input_path = temp_input.name
-        
-        # pydub으로 오디오 로드 (형식별 처리)
-        format_map = {"m4a": "m4a", "mp4": "m4a", "aac": "m4a", "webm": "webm"}
-        audio_format = format_map.get(source_format, None)
-        
-        if audio_format:
-            audio = AudioSegment.from_file(temp_input_path, format=audio_format)
-        else:
-            audio = AudioSegment.from_file(temp_input_path)
-        
-        # Azure 권장 설정으로 변환: 16kHz, 16bit, mono
-        audio = audio.set_frame_rate(16000).set_channels(1).set_sample_width(2)
-        
-        # WAV로 내보내기
-        wav_buffer = io.BytesIO()
-        audio.export(wav_buffer, format="wav")
-        wav_data = wav_buffer.getvalue()
-        
-        print(f"[INFO] 오디오 변환 완료: {source_format} -> wav ({len(wav_data)} bytes)")
-        return wav_data
-        
-    except Exception as e:
-        print(f"[ERROR] 오디오 변환 실패: {e}")
-        return audio_data  # 변환 실패 시 원본 반환
-        
+        done.wait()
     finally:
-        # 임시 파일 정리
-        if temp_input_path and os.path.exists(temp_input_path):
-            os.unlink(temp_input_path)
+        unregister()
+        speech_recognizer.stop_continuous_recognition_async().get()
+
+    if cancel.cancelled and not results:
+        raise AnalysisCancelled()
+    return results[0] if results else None
 
 
-def assess_pronunciation(audio_data: bytes, reference_text: str, audio_format: str = "wav") -> PronunciationResult:
+def assess_pronunciation(audio_data: bytes, reference_text: str, audio_format: str = "wav",
+                         speech_key: Optional[str] = None,
+                         region: Optional[str] = None,
+                         cancel: Optional[CancelToken] = None) -> PronunciationResult:
     """
-    Azure Pronunciation Assessment를 사용하여 발음 평가
+    Azure Pronunciation Assessment를 사용하여 발음 평가 (단일 시도, 재시도 없음)
 
     Args:
         audio_data: 오디오 데이터 (bytes)
         reference_text: 평가할 기준 텍스트
         audio_format: 오디오 형식 (wav, m4a, webm 등)
+        speech_key, region: Speech 리소스 (기본값: AZURE_SPEECH_KEY, AZURE_REGION)
+        cancel: 취소 신호 (취소되면 인식을 멈추고 AnalysisCancelled)
 
     Returns:
-        PronunciationResult: 발음 평가 결과
+        PronunciationResult: 발음 평가 결과 (실패 시 error_kind로 재시도 여부 판단)
     """
-    if not AZURE_SPEECH_KEY:
-        return PronunciationResult(
-            accuracy_score=0,
-            fluency_score=0,
-            completeness_score=0,
-            pronunciation_score=0,
-            word_details=[],
-            feedback="Azure Speech 키가 설정되지 않았습니다.",
-            success=False,
-            error="AZURE_SPEECH_KEY not configured",
+    speech_key = speech_key or AZURE_SPEECH_KEY
+    region = region or AZURE_REGION
+    if not speech_key:
+        return failed_result(
+            "Azure Speech 키가 설정되지 않았습니다.",
+            "AZURE_SPEECH_KEY not configured",
+            ERROR_AUTH,
         )
 
     try:
@@ -135,8 +239,8 @@ def assess_pronunciation(audio_data: bytes, reference_text: str, audio_format: s
         
         # Speech 설정
         speech_config = speechsdk.SpeechConfig(
-            subscription=AZURE_SPEECH_KEY,
-            region=AZURE_REGION,
+            subscription=speech_key,
+            region=region,
         )
         speech_config.speech_recognition_language = "ko-KR"
 
@@ -166,16 +270,27 @@ def assess_pronunciation(audio_data: bytes, reference_text: str, audio_format: s
             # 발음 평가 적용
             pronunciation_config.apply_to(speech_recognizer)
 
-            # 인식 수행
-            result = speech_recognizer.recognize_once()
+            # 인식 수행 (취소 신호가 있으면 도중에 멈출 수 있는 방식으로)
+            if cancel is None:
+                result = speech_recognizer.recognize_once()
+            else:
+                result = recognize_cancellable(speech_recognizer, cancel)
+                if result is None:
+                    return failed_result(
+                        "음성을 인식할 수 없습니다. 더 크고 명확하게 말씀해주세요.",
+                        "No speech recognized",
+                        ERROR_NO_MATCH,
+                    )
 
             if result.reason == speechsdk.ResultReason.RecognizedSpeech:
                 # 발음 평가 결과 가져오기
                 pronunciation_result = speechsdk.PronunciationAssessmentResult(result)
 
-                # 단어별 상세 결과
-                word_details = []
-                if pronunciation_result.words:
+                # 단어별 상세 결과 (JSON 결과에서 타이밍 포함, 실패 시 SDK 객체 사용)
+                word_details = parse_word_details(
+                    result.properties.get(speechsdk.PropertyId.SpeechServiceResponse_JsonResult)
+                )
+                if not word_details and pronunciation_result.words:
                     for word in pronunciation_result.words:
                         word_details.append({
                             "word": word.word,
@@ -200,52 +315,41 @@ def assess_pronunciation(audio_data: bytes, reference_text: str, audio_format: s
                 )
 
             elif result.reason == speechsdk.ResultReason.NoMatch:
-                return PronunciationResult(
-                    accuracy_score=0,
-                    fluency_score=0,
-                    completeness_score=0,
-                    pronunciation_score=0,
-                    word_details=[],
-                    feedback="음성을 인식할 수 없습니다. 더 크고 명확하게 말씀해주세요.",
-                    success=False,
-                    error="No speech recognized",
+                return failed_result(
+                    "음성을 인식할 수 없습니다. 더 크고 명확하게 말씀해주세요.",
+                    "No speech recognized",
+                    ERROR_NO_MATCH,
                 )
 
             else:
                 cancellation = result.cancellation_details
-                return PronunciationResult(
-                    accuracy_score=0,
-                    fluency_score=0,
-                    completeness_score=0,
-                    pronunciation_score=0,
-                    word_details=[],
-                    feedback="음성 인식 중 오류가 발생했습니다.",
-                    success=False,
-                    error=f"Cancelled: {cancellation.reason}",
+                error_kind = classify_cancellation(cancellation)
+                if error_kind == ERROR_NO_MATCH:
+                    return failed_result(
+                        "음성을 인식할 수 없습니다. 더 크고 명확하게 말씀해주세요.",
+                        "No speech recognized",
+                        ERROR_NO_MATCH,
+                    )
+                return failed_result(
+                    "음성 인식 중 오류가 발생했습니다.",
+                    f"Cancelled: {cancellation.reason} ({cancellation.code}) {cancellation.error_details or ''}".strip(),
+                    error_kind,
                 )
 
         finally:
             # 임시 파일 삭제
             os.unlink(temp_file_path)
 
+    except AnalysisCancelled:
+        raise
     except Exception as e:
+        # SDK/네트워크 예외는 일시적 오류로 보고 재시도 대상에 포함
         print(f"Azure Speech 오류: {e}")
-        return PronunciationResult(
-            accuracy_score=0,
-            fluency_score=0,
-            completeness_score=0,
-            pronunciation_score=0,
-            word_details=[],
-            feedback="발음 평가 중 오류가 발생했습니다.",
-            success=False,
-            error=str(e),
-        )
+        return failed_result("발음 평가 중 오류가 발생했습니다.", str(e), ERROR_TRANSIENT)
 
 
 def get_mock_result(reference_text: str) -> PronunciationResult:
     """개발용 목업 결과 반환"""
-    import random
-
     # 텍스트를 단어로 분리 (공백 기준)
     words = reference_text.split()
     if not words:
@@ -273,3 +377,46 @@ def get_mock_result(reference_text: str) -> PronunciationResult:
         feedback=generate_feedback(avg_score, word_details),
         success=True,
     )
+
+
+def parse_mock_faults(spec: str) -> dict:
+    """AZURE_MOCK_FAULTS 파싱: "throttle=0.2,latency=0.5-3.0" → {"throttle": 0.2, "latency": (0.5, 3.0)}"""
+    faults = {}
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        name, _, value = item.partition("=")
+        if name == "latency":
+            low, _, high = value.partition("-")
+            faults[name] = (float(low), float(high or low))
+        else:
+            faults[name] = float(value)
+    return faults
+
+
+def get_faulty_mock_result(reference_text: str, faults: Optional[dict] = None,
+                           cancel: Optional[CancelToken] = None) -> PronunciationResult:
+    """
+    장애를 주입한 목업 결과 (재시도/서킷 브레이커/헤징/취소 로컬 검증용)
+    AZURE_MOCK_FAULTS가 비어 있으면 get_mock_result와 같습니다.
+    """
+    faults = parse_mock_faults(AZURE_MOCK_FAULTS) if faults is None else faults
+
+    if "latency" in faults:
+        delay = random.uniform(*faults["latency"])
+        if cancel is None:
+            time.sleep(delay)
+        elif cancel.wait(delay):
+            raise AnalysisCancelled()
+
+    roll = random.random()
+    for name, error_kind, error in (
+        ("throttle", ERROR_THROTTLED, "Cancelled: Error (TooManyRequests) [mock]"),
+        ("transient", ERROR_TRANSIENT, "Cancelled: Error (ServiceTimeout) [mock]"),
+        ("auth", ERROR_AUTH, "Cancelled: Error (AuthenticationFailure) [mock]"),
+        ("fatal", ERROR_FATAL, "Cancelled: Error (BadRequest) [mock]"),
+    ):
+        probability = faults.get(name, 0.0)
+        if roll < probability:
+            return failed_result("음성 인식 중 오류가 발생했습니다.", error, error_kind)
+        roll -= probability
+
+    return get_mock_result(reference_text)
@@ -0,0 +1,116 @@
+# 과거 녹음 재분석 (백필)
+# scripts.backfill_analysis 가 프로세스 풀에서 녹음마다 analyze_for_backfill을 실행하고,
+# 돌려받은 결과 행을 배치 단위로 upsert 합니다.
+#
+# 요청 경로(run_analysis)와 달리 녹음을 점유하거나 결과 행을 직접 저장하지 않고,
+# 마감 없이 공명/톤 단계까지 끝까지 계산합니다. 병렬화는 녹음 단위(프로세스 풀)로 하므로
+# 긴 녹음 청크 분석(프로세스 풀 안의 프로세스 풀)은 사용하지 않습니다.
+import os
+import uuid
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+from app.services.analysis_pipeline import formant_stage, store_contours, store_waveform, tone_stage
+from app.services.analysis_presets import get_preset
+from app.services.audio_io import AudioDecodeError, decode_audio
+from app.services.azure_client import assess_pronunciation_with_retry, limit_request_rate
+from app.services.praat_context import PraatAnalysisContext
+from app.services.scoring import SCORING_VERSION
+from app.services.supabase import download_recording_file
+from app.services.voice_activity import detect_voice_activity, trim_silence
+
+# 백필 대상 (missing: 공명/톤/단어 상세 중 하나라도 없는 녹음, all: 전체)
+BACKFILL_MODES = ("missing", "all")
+
+
+@dataclass
+class BackfillOutcome:
+    """녹음 하나의 백필 결과"""
+    recording_id: str
+    row: Optional[dict] = None      # upsert할 analysis_results 행 (실패하면 None)
+    audio_seconds: float = 0.0      # 분석한 음성 길이 (처리량 보고용)
+    error: Optional[str] = None
+    replaced_paths: List[str] = field(default_factory=list)  # 행을 저장한 뒤 지울 이전 산출물 경로
+
+
+def needs_backfill(recording: dict, latest_result: Optional[dict], mode: str) -> bool:
+    """백필 대상인지 (분석 중인 녹음은 요청 경로와 겹치지 않도록 제외)"""
+    if recording.get("status") == "analyzing":
+        return False
+    if mode == "all" or latest_result is None:
+        return True
+    return not (latest_result.get("word_details")
+                and latest_result.get("formant_data")
+                and latest_result.get("tone_data"))
+
+
+def init_worker(requests_per_second: float) -> None:
+    """프로세스 풀 초기화: Azure 요청률 한도를 프로세스 수로 나눠 설정"""
+    if requests_per_second > 0:
+        limit_request_rate(requests_per_second)
+
+
+def analyze_for_backfill(recording: dict, latest_result: Optional[dict] = None,
+                         preset_name: Optional[str] = None) -> BackfillOutcome:
+    """
+    녹음 하나를 다운로드부터 공명/톤 분석까지 실행해 analysis_results 행을 만듭니다.
+    latest_result가 있으면 그 행을 덮어쓰고(upsert), 없으면 새 행 id를 만듭니다.
+
+    산출물(시계열/파형)은 분석마다 새 경로에 올리므로 같은 결과 ID라도 경로(=ETag)가 바뀌어
+    클라이언트 캐시가 재검증됩니다. 이전 산출물은 행을 저장한 뒤 replaced_paths로 지웁니다.
+    """
+    recording_id = recording["id"]
+    preset = get_preset(preset_name)
+    try:
+        audio_data = download_recording_file(recording["file_path"])
+        if not audio_data:
+            return BackfillOutcome(recording_id, error="download failed")
+
+        format_hint = os.path.splitext(recording["file_path"])[1].lstrip(".").lower() or None
+        try:
+            decoded_audio = decode_audio(audio_data, format_hint=format_hint)
+        except AudioDecodeError as e:
+            return BackfillOutcome(recording_id, error=f"decode failed: {e}")
+
+        vad = detect_voice_activity(decoded_audio.samples, decoded_audio.sample_rate)
+        if not vad.has_speech:
+            return BackfillOutcome(recording_id, error="no speech")
+        speech_audio = trim_silence(decoded_audio, vad)
+        wav_audio_data = speech_audio.to_wav_bytes()
+
+        result = assess_pronunciation_with_retry(wav_audio_data, reference_text=recording["original_text"])
+        if not result.success:
+            return BackfillOutcome(recording_id, audio_seconds=speech_audio.duration,
+                                   error=result.error or "assessment failed")
+
+        praat_context = PraatAnalysisContext.from_audio(speech_audio, preset)
+        formant = formant_stage(wav_audio_data, speech_audio, result.word_details, praat_context, preset)
+        tone = tone_stage(wav_audio_data, praat_context, preset)
+
+        # 모든 행의 열 구성을 같게 유지 (일괄 upsert)
+        previous = latest_result or {}
+        row = {
+            "id": previous.get("id") or str(uuid.uuid4()),
+            "recording_id": recording_id,
+            "accuracy_score": result.accuracy_score,
+            "fluency_score": result.fluency_score,
+            "completeness_score": result.completeness_score,
+            "pronunciation_score": result.pronunciation_score,
+            "word_details": result.word_details,
+            "feedback": result.feedback,
+            "formant_data": formant.data,
+            "tone_data": tone.data,
+            "contour_path": store_contours(recording_id, formant.track, tone.track),
+            "waveform_path": store_waveform(recording_id, decoded_audio),
+            "pending_stages": None,
+            "analysis_preset": preset.name,
+            "scoring_version": SCORING_VERSION,
+        }
+        replaced_paths = [previous[column] for column in ("contour_path", "waveform_path")
+                          if previous.get(column) and previous[column] != row[column]]
+        return BackfillOutcome(recording_id, row=row, audio_seconds=speech_audio.duration,
+                               replaced_paths=replaced_paths)
+
+    except Exception as e:
+        print(f"[ERROR] 백필 분석 오류 ({recording_id}): {e}")
+        return BackfillOutcome(recording_id, error=str(e))
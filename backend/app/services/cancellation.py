@@ -0,0 +1,61 @@
+# 요청 단위 취소
+# 클라이언트 연결이 끊기면 이벤트 루프 쪽에서 cancel()을 호출하고,
+# 분석 스레드는 단계 사이마다 check()로 확인하거나 on_cancel()로 진행 중인 작업(Azure 인식 등)을 멈춥니다.
+import threading
+from typing import Callable, List, Optional
+
+
+class AnalysisCancelled(Exception):
+    """분석 취소 (클라이언트 연결 끊김)"""
+
+
+class CancelToken:
+    """스레드 간에 공유하는 취소 신호"""
+
+    def __init__(self):
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+        self._callbacks: List[Callable[[], None]] = []
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def cancel(self) -> None:
+        """취소 (등록된 콜백은 한 번만 호출)"""
+        with self._lock:
+            if self._event.is_set():
+                return
+            self._event.set()
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception as e:
+                print(f"[ERROR] 취소 콜백 오류: {e}")
+
+    def check(self) -> None:
+        """취소됐으면 AnalysisCancelled"""
+        if self._event.is_set():
+            raise AnalysisCancelled()
+
+    def wait(self, timeout: Optional[float]) -> bool:
+        """취소되거나 timeout이 지날 때까지 대기 (취소됐으면 True). time.sleep 대신 사용"""
+        return self._event.wait(timeout)
+
+    def on_cancel(self, callback: Callable[[], None]) -> Callable[[], None]:
+        """
+        취소 시 호출할 콜백 등록 (이미 취소됐으면 바로 호출).
+        등록 해제 함수를 반환합니다.
+        """
+        with self._lock:
+            if not self._event.is_set():
+                self._callbacks.append(callback)
+                return lambda: self._remove(callback)
+        callback()
+        return lambda: None
+
+    def _remove(self, callback: Callable[[], None]) -> None:
+        with self._lock:
+            if callback in self._callbacks:
+                self._callbacks.remove(callback)
@@ -0,0 +1,380 @@
+# 긴 녹음 청크 병렬 분석 서비스
+# 낭독처럼 긴 녹음은 Praat 분석 한 번이 코어 하나만 쓰므로, 쉼(저에너지 구간)에서 청크로 나눠
+# 프로세스 풀에서 병렬로 분석하고 청크별 통계를 병합 가능한 누적기로 합칩니다.
+#
+# - 청크는 앞뒤로 CHUNK_OVERLAP_SECONDS만큼 겹쳐 분석 창이 경계에서 잘리지 않게 하고,
+#   통계와 시계열은 겹치지 않는 핵심 구간(core)의 프레임만 모읍니다.
+# - 각 청크의 Sound는 원래 녹음의 시간축(start_time)을 유지하므로 시계열을 그대로 이어 붙입니다.
+# - Praat 호출은 GIL을 놓지 않아 스레드로는 빨라지지 않으므로 프로세스 풀을 사용합니다.
+import math
+import multiprocessing
+import os
+import threading
+from concurrent.futures import FIRST_EXCEPTION, ProcessPoolExecutor, wait
+from dataclasses import dataclass
+from typing import List, Optional
+
+import numpy as np
+
+try:
+    from parselmouth.praat import call
+    PARSELMOUTH_AVAILABLE = True
+except ImportError:
+    PARSELMOUTH_AVAILABLE = False
+
+from app.services import metrics
+from app.services.analysis_presets import AnalysisPreset, get_preset
+from app.services.audio_io import DecodedAudio
+from app.services.cancellation import CancelToken
+from app.services.formant_analysis import (
+    FormantData,
+    FormantResult,
+    formant_result_from_stats,
+    vowel_stats_from_frames,
+    _sample_formant,
+)
+from app.services.praat_context import PraatAnalysisContext
+from app.services.running_stats import RunningStats, WeightedMean, merge_all
+from app.services.tone_analysis import ToneResult, build_tone_result
+from app.services.voice_activity import frame_energy_db
+from app.services.vowel_segments import VowelSegment
+
+# 이보다 긴 녹음만 청크로 나눔 (초)
+ANALYSIS_CHUNK_MIN_SECONDS = float(os.getenv("ANALYSIS_CHUNK_MIN_SECONDS", "30"))
+
+# 목표 청크 길이 (초)
+ANALYSIS_CHUNK_SECONDS = float(os.getenv("ANALYSIS_CHUNK_SECONDS", "10"))
+
+# 청크 분석 프로세스 수 (기본값: CPU 코어 수)
+ANALYSIS_CHUNK_WORKERS = int(os.getenv("ANALYSIS_CHUNK_WORKERS", "0")) or os.cpu_count() or 1
+
+# 청크 앞뒤로 겹치게 분석할 길이 (초). 피치 창(3/75Hz = 40ms)과 포먼트 창보다 넉넉하게
+CHUNK_OVERLAP_SECONDS = 0.5
+
+# 목표 경계 앞뒤로 쉼을 찾는 범위 (초)
+CHUNK_SEARCH_SECONDS = 2.0
+
+# 쉼 검출용 에너지 이동 평균 길이 (프레임, 10ms 단위). 단어 안 폐쇄음의 짧은 무음은 무시
+PAUSE_SMOOTH_FRAMES = 15
+
+# 취소 여부 확인 간격 (초)
+CANCEL_POLL_SECONDS = 0.1
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+metrics.describe("truevoice_analysis_chunks_total", "Chunks analyzed in parallel for long recordings, by kind")
+
+
+@dataclass
+class Chunk:
+    """분석 청크 (초, 원래 녹음 기준)"""
+    start: float         # 분석 구간 시작 (겹침 포함)
+    end: float           # 분석 구간 끝 (겹침 포함)
+    core_start: float    # 통계에 반영할 구간 시작
+    core_end: float      # 통계에 반영할 구간 끝
+    last: bool = False   # 마지막 청크 (core_end 시점 프레임 포함)
+
+    def contains(self, times: np.ndarray) -> np.ndarray:
+        """핵심 구간 [core_start, core_end) 안의 시점 (마지막 청크는 끝 포함)"""
+        if self.last:
+            return (times >= self.core_start) & (times <= self.core_end)
+        return (times >= self.core_start) & (times < self.core_end)
+
+
+@dataclass
+class FormantPartial:
+    """청크 포먼트 누적 결과"""
+    f1: RunningStats
+    f2: RunningStats
+    f3: RunningStats
+    vowel_stats: Optional[dict]     # {모음: (F1, F2)} (구간 분석 모드에서만)
+    frames: list                    # [(time, f1, f2, f3), ...]
+
+
+@dataclass
+class TonePartial:
+    """청크 톤 누적 결과"""
+    pitch: RunningStats             # 유성 프레임 F0 (Hz)
+    jitter: WeightedMean            # 주기 수로 가중한 jitter (%)
+    shimmer: WeightedMean           # 주기 수로 가중한 shimmer (%)
+    hnr: RunningStats               # 유성 프레임 HNR (dB)
+    pitch_track: list
+
+
+def plan_chunks(samples: np.ndarray, sample_rate: int) -> Optional[List[Chunk]]:
+    """
+    긴 녹음을 쉼에서 나눌 청크 목록 (짧아서 나눌 필요가 없으면 None)
+
+    목표 길이마다 경계를 두되, 경계 앞뒤 CHUNK_SEARCH_SECONDS 안에서
+    이동 평균 에너지가 가장 낮은 지점(문장/어절 사이 쉼)으로 옮깁니다.
+    """
+    duration = len(samples) / sample_rate
+    if ANALYSIS_CHUNK_SECONDS <= 0 or duration < ANALYSIS_CHUNK_MIN_SECONDS:
+        return None
+    count = math.ceil(duration / ANALYSIS_CHUNK_SECONDS)
+    if count < 2:
+        return None
+
+    frame_step, frame_length = 0.01, 0.025
+    energy = frame_energy_db(samples, sample_rate, frame_length, frame_step)
+    kernel = np.ones(PAUSE_SMOOTH_FRAMES) / PAUSE_SMOOTH_FRAMES
+    smoothed = np.convolve(energy, kernel, mode="same")
+    min_length = ANALYSIS_CHUNK_SECONDS / 2
+
+    boundaries = [0.0]
+    for k in range(1, count):
+        target = k * duration / count
+        low = max(boundaries[-1] + min_length, target - CHUNK_SEARCH_SECONDS)
+        high = min(duration - min_length, target + CHUNK_SEARCH_SECONDS)
+        low_index, high_index = int(low / frame_step), min(int(high / frame_step), len(smoothed))
+        if high_index > low_index:
+            index = low_index + int(np.argmin(smoothed[low_index:high_index]))
+            boundary = index * frame_step + frame_length / 2
+        else:
+            boundary = target
+        # 포먼트 샘플링 격자(10ms)에 맞춤
+        boundaries.append(round(boundary, 2))
+    boundaries.append(duration)
+
+    chunks = []
+    for index, (core_start, core_end) in enumerate(zip(boundaries[:-1], boundaries[1:])):
+        chunks.append(Chunk(
+            start=round(max(0.0, core_start - CHUNK_OVERLAP_SECONDS), 2),
+            end=min(duration, core_end + CHUNK_OVERLAP_SECONDS),
+            core_start=core_start,
+            core_end=core_end,
+            last=index == len(boundaries) - 2,
+        ))
+    return chunks
+
+
+def _chunk_samples(audio: DecodedAudio, chunk: Chunk) -> np.ndarray:
+    start = int(round(chunk.start * audio.sample_rate))
+    end = int(round(chunk.end * audio.sample_rate))
+    return audio.samples[start:end]
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    """청크 분석 프로세스 풀 (처음 사용할 때 생성, spawn으로 서버 스레드 상태를 물려받지 않음)"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(
+                max_workers=ANALYSIS_CHUNK_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _pool
+
+
+def _run_chunks(job, jobs_args: list, cancel: Optional[CancelToken]) -> Optional[list]:
+    """
+    청크 작업을 프로세스 풀에서 병렬 실행하고 청크 순서대로 결과를 반환합니다.
+    취소되면 아직 시작하지 않은 청크를 버리고 None을 반환합니다.
+    """
+    pool = _get_pool()
+    futures = [pool.submit(job, *args) for args in jobs_args]
+    pending = set(futures)
+    while pending:
+        done, pending = wait(pending, timeout=CANCEL_POLL_SECONDS, return_when=FIRST_EXCEPTION)
+        if any(future.exception() is not None for future in done):
+            for future in pending:
+                future.cancel()
+            raise next(future.exception() for future in done if future.exception() is not None)
+        if pending and cancel is not None and cancel.cancelled:
+            for future in pending:
+                future.cancel()
+            return None
+    return [future.result() for future in futures]
+
+
+# =========================================
+# 청크 작업 (프로세스 풀에서 실행)
+# =========================================
+
+def _formant_chunk(samples: np.ndarray, sample_rate: int, chunk: Chunk,
+                   segments: Optional[List[VowelSegment]], preset: AnalysisPreset) -> FormantPartial:
+    """청크 포먼트 분석 (포먼트 상한은 청크 피치로 결정)"""
+    context = PraatAnalysisContext(samples, sample_rate, start_time=chunk.start, preset=preset)
+    time_step = preset.track_time_step
+    frames = []
+    labels = None
+    if segments is not None:
+        labels = []
+        for segment in segments:
+            try:
+                formant = context.formant_part(segment.start, segment.end)
+            except Exception as e:
+                print(f"[WARNING] 구간 포먼트 추출 실패 ({segment.start}-{segment.end}s): {e}")
+                continue
+            segment_frames = _sample_formant(formant, segment.start, segment.end, time_step)
+            frames.extend(segment_frames)
+            labels.extend([segment.vowel] * len(segment_frames))
+    else:
+        formant = context.formant()
+        # 한 번에 분석할 때와 같은 샘플링 격자에서 핵심 구간만 샘플링
+        first = math.ceil(chunk.core_start / time_step - 1e-6) * time_step
+        last = chunk.core_end if chunk.last else chunk.core_end - time_step / 2
+        frames = _sample_formant(formant, first, last, time_step)
+
+    values = np.array([frame[1:] for frame in frames], dtype=np.float64).reshape(-1, 3)
+    return FormantPartial(
+        f1=RunningStats.from_values(values[:, 0]),
+        f2=RunningStats.from_values(values[:, 1]),
+        f3=RunningStats.from_values(values[:, 2]),
+        vowel_stats=(
+            vowel_stats_from_frames(labels, values[:, 0], values[:, 1])
+            if labels is not None and preset.vowel_analysis else None
+        ),
+        frames=frames,
+    )
+
+
+def _tone_chunk(samples: np.ndarray, sample_rate: int, chunk: Chunk, preset: AnalysisPreset) -> TonePartial:
+    """청크 톤 분석 (핵심 구간의 프레임/주기만 통계에 반영)"""
+    context = PraatAnalysisContext(samples, sample_rate, start_time=chunk.start, preset=preset)
+
+    # 피치: 핵심 구간의 유성 프레임
+    pitch = context.pitch
+    times = pitch.xs()
+    frequencies = pitch.selected_array["frequency"]
+    voiced = chunk.contains(times) & (frequencies > 0)
+    pitch_track = [
+        {"time": round(float(time), 3), "f0": round(float(f0), 1)}
+        for time, f0 in zip(times[voiced], frequencies[voiced])
+    ] if preset.contours else []
+
+    # jitter/shimmer: 핵심 구간으로 범위를 제한하고 주기 수로 가중
+    point_process = context.point_process
+    period_args = (chunk.core_start, chunk.core_end, 0.0001, 0.02, 1.3)
+    periods = call(point_process, "Get number of periods", *period_args)
+    jitter = WeightedMean()
+    jitter.add(call(point_process, "Get jitter (local)", *period_args) * 100, periods)
+    shimmer = WeightedMean()
+    shimmer.add(call([context.sound, point_process], "Get shimmer (local)", *period_args, 1.6) * 100, periods)
+
+    # HNR: 유성 프레임(-200dB가 아닌 프레임) 평균 = Praat Harmonicity의 Get mean
+    harmonicity = call(context.sound, "To Harmonicity (cc)", preset.harmonicity_time_step, 75, 0.1, 1.0)
+    hnr_values = harmonicity.values[0]
+    sounding = chunk.contains(harmonicity.xs()) & (hnr_values != -200)
+
+    return TonePartial(
+        pitch=RunningStats.from_values(frequencies[voiced]),
+        jitter=jitter,
+        shimmer=shimmer,
+        hnr=RunningStats.from_values(hnr_values[sounding]),
+        pitch_track=pitch_track,
+    )
+
+
+# =========================================
+# 병합
+# =========================================
+
+def merge_formant_partials(partials: List[FormantPartial]) -> FormantResult:
+    """청크 포먼트 누적 결과를 합쳐 한 번에 분석한 것과 같은 형태의 FormantResult 생성"""
+    vowel_stats = None
+    if partials and partials[0].vowel_stats is not None:
+        vowel_stats = {}
+        for partial in partials:
+            for vowel, (f1, f2) in partial.vowel_stats.items():
+                merged_f1, merged_f2 = vowel_stats.get(vowel, (RunningStats(), RunningStats()))
+                vowel_stats[vowel] = (merged_f1.merge(f1), merged_f2.merge(f2))
+
+    formant_track = [
+        FormantData(time=round(time, 3), f1=round(f1, 1), f2=round(f2, 1), f3=round(f3, 1))
+        for partial in partials
+        for time, f1, f2, f3 in partial.frames
+    ]
+    return formant_result_from_stats(
+        merge_all((partial.f1 for partial in partials), RunningStats()),
+        merge_all((partial.f2 for partial in partials), RunningStats()),
+        merge_all((partial.f3 for partial in partials), RunningStats()),
+        formant_track,
+        vowel_stats=vowel_stats,
+    )
+
+
+def merge_tone_partials(partials: List[TonePartial]) -> ToneResult:
+    """청크 톤 누적 결과를 합쳐 ToneResult 생성 (피치 표준편차는 Praat처럼 표본 표준편차)"""
+    pitch = merge_all((partial.pitch for partial in partials), RunningStats())
+    jitter = merge_all((partial.jitter for partial in partials), WeightedMean())
+    shimmer = merge_all((partial.shimmer for partial in partials), WeightedMean())
+    hnr = merge_all((partial.hnr for partial in partials), RunningStats())
+
+    voiced = pitch.count > 0
+    return build_tone_result(
+        pitch.mean if voiced else 0,
+        pitch.min if voiced else 0,
+        pitch.max if voiced else 0,
+        pitch.sample_std if voiced else 0,
+        jitter.value,
+        shimmer.value,
+        hnr.mean if hnr.count else 0,
+        pitch_track=[point for partial in partials for point in partial.pitch_track],
+    )
+
+
+# =========================================
+# 공개 함수
+# =========================================
+
+def analyze_formants_chunked(audio: DecodedAudio, chunks: List[Chunk],
+                             segments: Optional[List[VowelSegment]] = None,
+                             preset: Optional[AnalysisPreset] = None,
+                             cancel: Optional[CancelToken] = None) -> FormantResult:
+    """
+    청크별 포먼트 분석을 병렬로 실행해 병합합니다.
+    모음 구간은 중점이 속한 청크에서 분석합니다.
+    """
+    if not PARSELMOUTH_AVAILABLE:
+        return FormantResult(
+            success=False,
+            error="parselmouth library not available",
+            feedback="포먼트 분석 라이브러리가 설치되지 않았습니다."
+        )
+
+    preset = preset or get_preset()
+    jobs_args = []
+    for chunk in chunks:
+        chunk_segments = None
+        if segments:
+            midpoints = np.array([(segment.start + segment.end) / 2 for segment in segments])
+            chunk_segments = [segment for segment, inside in zip(segments, chunk.contains(midpoints)) if inside]
+        jobs_args.append((_chunk_samples(audio, chunk), audio.sample_rate, chunk, chunk_segments, preset))
+
+    try:
+        partials = _run_chunks(_formant_chunk, jobs_args, cancel)
+    except Exception as e:
+        print(f"청크 포먼트 분석 오류: {e}")
+        return FormantResult(success=False, error=str(e), feedback="포먼트 분석 중 오류가 발생했습니다.")
+    if partials is None:
+        return FormantResult(success=False, error="cancelled")
+
+    metrics.inc("truevoice_analysis_chunks_total", len(chunks), kind="formant")
+    return merge_formant_partials(partials)
+
+
+def analyze_tone_chunked(audio: DecodedAudio, chunks: List[Chunk],
+                         preset: Optional[AnalysisPreset] = None,
+                         cancel: Optional[CancelToken] = None) -> ToneResult:
+    """청크별 톤 분석을 병렬로 실행해 병합합니다."""
+    if not PARSELMOUTH_AVAILABLE:
+        return ToneResult(
+            success=False,
+            error="parselmouth library not available",
+            feedback="톤 분석 라이브러리가 설치되지 않았습니다."
+        )
+
+    preset = preset or get_preset()
+    jobs_args = [(_chunk_samples(audio, chunk), audio.sample_rate, chunk, preset) for chunk in chunks]
+    try:
+        partials = _run_chunks(_tone_chunk, jobs_args, cancel)
+    except Exception as e:
+        print(f"청크 톤 분석 오류: {e}")
+        return ToneResult(success=False, error=str(e), feedback="톤 분석 중 오류가 발생했습니다.")
+    if partials is None:
+        return ToneResult(success=False, error="cancelled")
+
+    metrics.inc("truevoice_analysis_chunks_total", len(chunks), kind="tone")
+    return merge_tone_partials(partials)
@@ -0,0 +1,235 @@
+# 시계열(컨투어) 바이너리 코덱
+# 포먼트 트랙과 피치(F0) 컨투어를 스케일 양자화한 정수 배열로 압축 저장합니다.
+#
+# 형식 (리틀 엔디언):
+#   b"TVC1" | 헤더 길이 (uint32) | JSON 헤더 (utf-8) | 배열 데이터...
+#   헤더: {"version": 1, "meta": {...}, "series": [
+#       {"name": "pitch.f0", "dtype": "<i2", "scale": 0.1, "count": N, "offset": 바이트 위치}, ...]}
+#   값 = 정수 × scale (int8/int16/int32), 결측값(NaN)은 dtype 최솟값으로 저장
+#   LOD 레벨은 "pitch.L1.time", "pitch.L1.f0", "pitch.L1.f0_min", ... 형태로 함께 저장
+#   (meta["lod"][그룹] = 레벨별 버킷 크기 목록)
+import json
+import struct
+from typing import Dict, Optional, Tuple
+import numpy as np
+
+from app.services.contour_lod import build_lod_levels, count_in_range, slice_range
+
+MAGIC = b"TVC1"
+FORMAT_VERSION = 1
+
+# 시리즈 이름 접미사별 양자화 간격
+SERIES_SCALES = {
+    "time": 0.001,  # 1ms
+    "f0": 0.1,      # 0.1Hz
+    "f1": 0.25,     # 0.25Hz
+    "f2": 0.25,
+    "f3": 0.25,
+    "min": 1.0 / 127,  # 파형 피크 ([-1, 1] → int8)
+    "max": 1.0 / 127,
+}
+DEFAULT_SCALE = 0.01
+
+CONTENT_TYPE = "application/x-truevoice-contour"
+
+# 그룹별 채널 (time 제외)
+CONTOUR_CHANNELS = {
+    "formant": ["f1", "f2", "f3"],
+    "pitch": ["f0"],
+}
+
+# 원본 해상도 시리즈 이름 (LOD 레벨 제외)
+RAW_SERIES = [
+    f"{group}.{field}"
+    for group, channels in CONTOUR_CHANNELS.items()
+    for field in ["time"] + channels
+]
+
+
+def _scale_for(name: str) -> float:
+    field = name.rsplit(".", 1)[-1]
+    for suffix in ("_min", "_max"):
+        if field.endswith(suffix):
+            field = field[:-len(suffix)]
+    return SERIES_SCALES.get(field, DEFAULT_SCALE)
+
+
+def _quantize(values: np.ndarray, scale: float) -> Tuple[np.ndarray, str]:
+    """float 배열을 범위에 맞는 가장 작은 정수형(int8/int16/int32)으로 양자화"""
+    values = np.asarray(values, dtype=np.float64)
+    missing = np.isnan(values)
+    quantized = np.rint(np.where(missing, 0.0, values) / scale)
+
+    finite = quantized[~missing]
+    low = finite.min() if len(finite) else 0
+    high = finite.max() if len(finite) else 0
+    # 최솟값은 결측값 표시용으로 비워 둠
+    dtype = "<i4"
+    for candidate in ("<i1", "<i2"):
+        limits = np.iinfo(np.dtype(candidate))
+        if low > limits.min and high <= limits.max:
+            dtype = candidate
+            break
+
+    result = quantized.astype(dtype)
+    result[missing] = np.iinfo(np.dtype(dtype)).min
+    return result, dtype
+
+
+def encode_series(series: Dict[str, np.ndarray], meta: Optional[dict] = None) -> bytes:
+    """
+    이름 → float 배열 사전을 컨테이너 바이트로 인코딩합니다.
+
+    Args:
+        series: {"pitch.time": [...], "pitch.f0": [...], ...}
+        meta: 헤더에 함께 저장할 부가 정보
+    """
+    descriptors = []
+    payloads = []
+    offset = 0
+    for name, values in series.items():
+        scale = _scale_for(name)
+        quantized, dtype = _quantize(values, scale)
+        data = quantized.tobytes()
+        descriptors.append({
+            "name": name,
+            "dtype": dtype,
+            "scale": scale,
+            "count": int(len(quantized)),
+            "offset": offset,
+        })
+        payloads.append(data)
+        offset += len(data)
+
+    header = json.dumps(
+        {"version": FORMAT_VERSION, "meta": meta or {}, "series": descriptors},
+        separators=(",", ":"),
+        ensure_ascii=False,
+    ).encode("utf-8")
+    return MAGIC + struct.pack("<I", len(header)) + header + b"".join(payloads)
+
+
+def read_header(data: bytes) -> Tuple[dict, int]:
+    """컨테이너 헤더와 배열 데이터 시작 위치 반환"""
+    if data[:4] != MAGIC:
+        raise ValueError("not a contour container")
+    (header_length,) = struct.unpack_from("<I", data, 4)
+    header = json.loads(data[8:8 + header_length].decode("utf-8"))
+    return header, 8 + header_length
+
+
+def decode_series(data: bytes, names: Optional[list] = None) -> Tuple[Dict[str, np.ndarray], dict]:
+    """
+    컨테이너 바이트를 이름 → float 배열 사전으로 디코딩합니다.
+
+    Args:
+        data: encode_series 결과
+        names: 일부 시리즈만 읽을 때 이름 목록 (접두사 "pitch." 처럼 그룹 지정 가능)
+
+    Returns:
+        (시리즈 사전, meta)
+    """
+    header, base = read_header(data)
+    series = {}
+    for descriptor in header["series"]:
+        name = descriptor["name"]
+        if names and not any(name == n or name.startswith(n) for n in names):
+            continue
+        dtype = np.dtype(descriptor["dtype"])
+        quantized = np.frombuffer(data, dtype=dtype, count=descriptor["count"],
+                                  offset=base + descriptor["offset"])
+        values = quantized.astype(np.float64) * descriptor["scale"]
+        values[quantized == np.iinfo(dtype).min] = np.nan
+        series[name] = values
+    return series, header.get("meta", {})
+
+
+def build_contour_artifact(formant_track: Optional[list], pitch_track: Optional[list],
+                           meta: Optional[dict] = None) -> Optional[bytes]:
+    """
+    분석 결과의 포먼트 트랙과 피치 트랙을 하나의 컨테이너로 묶습니다.
+    차트용 LOD 레벨도 이때 미리 계산해 함께 저장합니다.
+    둘 다 없으면 None을 반환합니다.
+    """
+    series = {}
+    lod = {}
+    for group, track in (("formant", formant_track), ("pitch", pitch_track)):
+        if not track:
+            continue
+        times = np.array([frame["time"] for frame in track], dtype=np.float64)
+        channels = {
+            field: np.array([frame[field] for frame in track], dtype=np.float64)
+            for field in CONTOUR_CHANNELS[group]
+        }
+        series[f"{group}.time"] = times
+        for field, values in channels.items():
+            series[f"{group}.{field}"] = values
+
+        levels = build_lod_levels(times, channels)
+        for index, (_, level) in enumerate(levels, start=1):
+            for field, values in level.items():
+                series[f"{group}.L{index}.{field}"] = values
+        lod[group] = [bucket_size for bucket_size, _ in levels]
+
+    if not series:
+        return None
+    return encode_series(series, {**(meta or {}), "lod": lod})
+
+
+def decode_contour_level(data: bytes, group: str, points: int,
+                         start: Optional[float] = None, end: Optional[float] = None) -> Optional[dict]:
+    """
+    [start, end] 범위에서 포인트 수가 points 이하인 가장 세밀한 레벨을 골라 디코딩합니다.
+    어느 레벨도 맞지 않으면 가장 거친 레벨을 반환합니다.
+
+    Returns:
+        {"level", "bucket_size", "series"} 또는 그룹이 없으면 None
+    """
+    header, _ = read_header(data)
+    names = {descriptor["name"] for descriptor in header["series"]}
+    if f"{group}.time" not in names:
+        return None
+
+    bucket_sizes = header.get("meta", {}).get("lod", {}).get(group, [])
+    candidates = [(0, 1, f"{group}.")] + [
+        (index, bucket_size, f"{group}.L{index}.")
+        for index, bucket_size in enumerate(bucket_sizes, start=1)
+    ]
+
+    chosen = candidates[-1]
+    for candidate in candidates:
+        times, _ = decode_series(data, [candidate[2] + "time"])
+        if count_in_range(times[candidate[2] + "time"], start, end) <= points:
+            chosen = candidate
+            break
+
+    level, bucket_size, prefix = chosen
+    if level == 0:
+        wanted = [f"{group}.{field}" for field in ["time"] + CONTOUR_CHANNELS[group]]
+    else:
+        wanted = [prefix]
+    decoded, _ = decode_series(data, wanted)
+    series = {name[len(prefix):]: values for name, values in decoded.items()}
+    return {
+        "level": level,
+        "bucket_size": bucket_size,
+        "series": slice_range(series, start, end),
+    }
+
+
+def _values_to_json(values: np.ndarray) -> list:
+    return [None if np.isnan(value) else round(float(value), 3) for value in values]
+
+
+def contour_to_json(series: Dict[str, np.ndarray]) -> dict:
+    """디코딩한 시리즈를 그룹별 JSON 객체로 변환 (NaN → null)"""
+    groups: Dict[str, dict] = {}
+    for name, values in series.items():
+        group, _, field = name.partition(".")
+        groups.setdefault(group, {})[field] = _values_to_json(values)
+    return groups
+
+
+def level_to_json(series: Dict[str, np.ndarray]) -> dict:
+    """decode_contour_level의 시리즈를 JSON 객체로 변환 (NaN → null)"""
+    return {name: _values_to_json(values) for name, values in series.items()}
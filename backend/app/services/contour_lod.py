@@ -0,0 +1,72 @@
+# 시계열 LOD(Level of Detail) 서비스
+# 분석 시점에 컨투어를 여러 해상도의 min/max 버킷으로 미리 줄여 두고,
+# 차트가 요청한 포인트 수와 시간 범위에 맞는 레벨을 골라 반환합니다.
+import warnings
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+
+# 레벨마다 버킷 크기를 4배씩 키움 (4, 16, 64, ... 원본 포인트)
+LOD_FACTOR = 4
+
+# 버킷 수가 이보다 적어지면 더 거친 레벨은 만들지 않음
+MIN_LOD_POINTS = 64
+
+
+def minmax_buckets(times: np.ndarray, channels: Dict[str, np.ndarray],
+                   bucket_size: int) -> Dict[str, np.ndarray]:
+    """
+    bucket_size개씩 묶어 버킷별 평균 시간과 채널별 평균/최소/최대를 계산합니다.
+    reshape 한 번으로 모든 버킷을 동시에 처리합니다.
+
+    Returns:
+        {"time": ..., "<채널>": 평균, "<채널>_min": ..., "<채널>_max": ...}
+    """
+    count = len(times)
+    num_buckets = -(-count // bucket_size)
+    padding = num_buckets * bucket_size - count
+
+    def _reshape(values):
+        padded = np.concatenate((np.asarray(values, dtype=np.float64), np.full(padding, np.nan)))
+        return padded.reshape(num_buckets, bucket_size)
+
+    levels = {}
+    with warnings.catch_warnings():
+        # 모든 값이 NaN인 버킷은 NaN으로 남김
+        warnings.simplefilter("ignore", category=RuntimeWarning)
+        levels["time"] = np.nanmean(_reshape(times), axis=1)
+        for name, values in channels.items():
+            buckets = _reshape(values)
+            levels[name] = np.nanmean(buckets, axis=1)
+            levels[f"{name}_min"] = np.nanmin(buckets, axis=1)
+            levels[f"{name}_max"] = np.nanmax(buckets, axis=1)
+    return levels
+
+
+def build_lod_levels(times: np.ndarray, channels: Dict[str, np.ndarray]) -> List[Tuple[int, Dict[str, np.ndarray]]]:
+    """
+    원본 컨투어에서 LOD 레벨 목록을 만듭니다.
+
+    Returns:
+        [(버킷 크기, 레벨 시리즈), ...] (세밀한 레벨부터)
+    """
+    levels = []
+    bucket_size = LOD_FACTOR
+    while len(times) / bucket_size >= MIN_LOD_POINTS:
+        levels.append((bucket_size, minmax_buckets(times, channels, bucket_size)))
+        bucket_size *= LOD_FACTOR
+    return levels
+
+
+def count_in_range(times: np.ndarray, start: Optional[float], end: Optional[float]) -> int:
+    """[start, end] 시간 범위에 들어가는 포인트 수"""
+    left = np.searchsorted(times, start, side="left") if start is not None else 0
+    right = np.searchsorted(times, end, side="right") if end is not None else len(times)
+    return int(max(0, right - left))
+
+
+def slice_range(series: Dict[str, np.ndarray], start: Optional[float], end: Optional[float]) -> Dict[str, np.ndarray]:
+    """time 시리즈 기준으로 [start, end] 범위만 잘라냄"""
+    times = series["time"]
+    left = np.searchsorted(times, start, side="left") if start is not None else 0
+    right = np.searchsorted(times, end, side="right") if end is not None else len(times)
+    return {name: values[left:right] for name, values in series.items()}
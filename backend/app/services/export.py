@@ -0,0 +1,212 @@
+# 분석 결과 일괄 내보내기 (Parquet / Arrow IPC 스트림)
+# 결과 행을 (created_at, id) keyset 페이지로 읽어 페이지마다 Arrow RecordBatch 하나로 변환하고,
+# 인코딩된 바이트를 바로 흘려보냅니다. 한 번에 메모리에 있는 것은 페이지 하나뿐이라
+# 수백만 행을 내보내도 메모리 사용량이 일정합니다.
+#
+# - GET /api/export/results : StreamingResponse로 전송 (블로킹 조회는 스레드 풀에서 실행)
+# - python -m scripts.export_results : 파일로 저장
+import os
+from datetime import datetime
+from typing import Callable, Iterator, List, Optional
+
+from app.services.scoring import FORMANT_FEATURES, TONE_FEATURES
+from app.services.supabase import list_results_for_export
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+# 페이지(= Arrow 배치 = Parquet row group) 하나의 행 수
+EXPORT_BATCH_ROWS = int(os.getenv("EXPORT_BATCH_ROWS", "5000"))
+
+EXPORT_FORMATS = ("parquet", "arrow")
+
+MEDIA_TYPES = {
+    "parquet": "application/vnd.apache.parquet",
+    "arrow": "application/vnd.apache.arrow.stream",
+}
+
+FILE_EXTENSIONS = {
+    "parquet": "parquet",
+    "arrow": "arrows",
+}
+
+# 기본 열 (녹음의 기준 텍스트/상태는 recordings에서 함께 조회)
+BASE_COLUMNS = (
+    "id",
+    "recording_id",
+    "created_at",
+    "accuracy_score",
+    "fluency_score",
+    "completeness_score",
+    "pronunciation_score",
+    "analysis_preset",
+    "scoring_version",
+    "recordings!inner(original_text, status)",
+)
+
+# features=True일 때 추가하는 열 (JSONB에서 필요한 값만 경로로 추출)
+FEATURE_COLUMNS = (
+    "resonance_score:formant_data->resonance_score",
+    "formant_stability_score:formant_data->stability_score",
+    "formant_features:formant_data->features",
+    "tone_score:tone_data->tone_score",
+    "tone_stability_score:tone_data->stability_score",
+    "clarity_score:tone_data->clarity_score",
+    "intonation_score:tone_data->intonation_score",
+    "tone_features:tone_data->features",
+)
+
+SCORE_FIELDS = ("accuracy_score", "fluency_score", "completeness_score", "pronunciation_score")
+FEATURE_SCORE_FIELDS = (
+    "resonance_score", "formant_stability_score",
+    "tone_score", "tone_stability_score", "clarity_score", "intonation_score",
+)
+
+
+class ExportFailed(RuntimeError):
+    """내보내기 도중 결과 조회 실패 (이미 보낸 데이터는 불완전)"""
+
+
+def export_schema(include_features: bool) -> "pa.Schema":
+    fields = [
+        pa.field("id", pa.string()),
+        pa.field("recording_id", pa.string()),
+        pa.field("created_at", pa.timestamp("us", tz="UTC")),
+        pa.field("original_text", pa.string()),
+        pa.field("status", pa.string()),
+        *(pa.field(name, pa.float64()) for name in SCORE_FIELDS),
+        pa.field("analysis_preset", pa.string()),
+        pa.field("scoring_version", pa.int32()),
+    ]
+    if include_features:
+        fields += [pa.field(name, pa.float64()) for name in FEATURE_SCORE_FIELDS]
+        fields += [pa.field(name, pa.float64()) for name in FORMANT_FEATURES + TONE_FEATURES]
+    return pa.schema(fields)
+
+
+def rows_to_batch(rows: List[dict], schema: "pa.Schema", include_features: bool) -> "pa.RecordBatch":
+    """조회한 결과 행 → 열 단위 RecordBatch"""
+    recordings = [row.get("recordings") or {} for row in rows]
+    columns = {
+        "id": [row["id"] for row in rows],
+        "recording_id": [row["recording_id"] for row in rows],
+        "created_at": [datetime.fromisoformat(row["created_at"]) for row in rows],
+        "original_text": [recording.get("original_text") for recording in recordings],
+        "status": [recording.get("status") for recording in recordings],
+        "analysis_preset": [row.get("analysis_preset") for row in rows],
+        "scoring_version": [row.get("scoring_version") for row in rows],
+    }
+    for name in SCORE_FIELDS:
+        columns[name] = [row.get(name) for row in rows]
+    if include_features:
+        for name in FEATURE_SCORE_FIELDS:
+            columns[name] = [row.get(name) for row in rows]
+        for source, names in (("formant_features", FORMANT_FEATURES), ("tone_features", TONE_FEATURES)):
+            features = [row.get(source) or {} for row in rows]
+            for name in names:
+                columns[name] = [feature.get(name) for feature in features]
+    return pa.RecordBatch.from_arrays(
+        [pa.array(columns[field.name], type=field.type) for field in schema],
+        schema=schema,
+    )
+
+
+def iter_result_batches(start: Optional[datetime] = None, end: Optional[datetime] = None,
+                        status: Optional[str] = None, include_features: bool = False,
+                        batch_rows: int = EXPORT_BATCH_ROWS) -> Iterator["pa.RecordBatch"]:
+    """조건에 맞는 결과를 오래된 순으로 페이지마다 RecordBatch 하나씩"""
+    schema = export_schema(include_features)
+    columns = ",".join(BASE_COLUMNS + (FEATURE_COLUMNS if include_features else ()))
+    after = None
+    while True:
+        rows = list_results_for_export(
+            columns, after=after, limit=batch_rows,
+            start=start.isoformat() if start else None,
+            end=end.isoformat() if end else None,
+            status=status,
+        )
+        if rows is None:
+            raise ExportFailed(f"결과 조회 실패 (커서 {after})")
+        if not rows:
+            return
+        yield rows_to_batch(rows, schema, include_features)
+        if len(rows) < batch_rows:
+            return
+        after = (rows[-1]["created_at"], rows[-1]["id"])
+
+
+class _ChunkSink:
+    """
+    pyarrow writer가 쓰는 파일 객체.
+    쓴 바이트를 모아 두었다가 drain()으로 꺼내 바로 전송하므로 전체 파일을 쌓아 두지 않습니다.
+    """
+
+    def __init__(self):
+        self.chunks: List[bytes] = []
+        self.position = 0
+        self.closed = False
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self.chunks.append(data)
+        self.position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self.position
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data = b"".join(self.chunks)
+        self.chunks.clear()
+        return data
+
+
+def stream_export(fmt: str, start: Optional[datetime] = None, end: Optional[datetime] = None,
+                  status: Optional[str] = None, include_features: bool = False,
+                  batch_rows: int = EXPORT_BATCH_ROWS,
+                  on_batch: Optional[Callable[[int], None]] = None) -> Iterator[bytes]:
+    """
+    결과를 Parquet(배치마다 row group 하나) 또는 Arrow IPC 스트림으로 인코딩하며 바이트 조각을 내보냅니다.
+
+    Args:
+        fmt: parquet 또는 arrow
+        start, end: created_at 범위 [start, end)
+        status: 녹음 상태 필터 (completed 등)
+        include_features: 공명/톤 점수와 재채점용 원시 특징값 열 포함
+        on_batch: 배치를 쓸 때마다 행 수로 호출 (진행 상황 표시용)
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"지원하지 않는 형식: {fmt}")
+    schema = export_schema(include_features)
+    sink = _ChunkSink()
+    if fmt == "parquet":
+        writer = pq.ParquetWriter(sink, schema, compression="zstd")
+    else:
+        writer = pa.ipc.new_stream(sink, schema)
+
+    for batch in iter_result_batches(start, end, status, include_features, batch_rows):
+        if fmt == "parquet":
+            writer.write_batch(batch, row_group_size=batch.num_rows)
+        else:
+            writer.write_batch(batch)
+        if on_batch:
+            on_batch(batch.num_rows)
+        chunk = sink.drain()
+        if chunk:
+            yield chunk
+
+    # Parquet 푸터 / Arrow 스트림 끝 표시
+    writer.close()
+    chunk = sink.drain()
+    if chunk:
+        yield chunk
@@ -1,8 +1,7 @@
 # 포먼트(공명) 분석 서비스
 # F1, F2, F3 포먼트 주파수를 분석하여 모음 발음 품질을 평가합니다.
 import os
-import tempfile
-from typing import Optional
+from typing import List, Optional
 from dataclasses import dataclass
 import numpy as np
 
@@ -21,6 +20,17 @@ except ImportError:
     LIBROSA_AVAILABLE = False
     print("Warning: librosa not installed.")
 
+from app.services.praat_context import PraatAnalysisContext
+from app.services.vowel_segments import VowelSegment
+from app.services.running_stats import RunningStats
+from app.services.scoring import formant_scores, resonance_scores
+
+# 포먼트 분석 엔진 선택 (praat: parselmouth Burg, lpc: 벡터화 NumPy/SciPy LPC)
+FORMANT_ENGINE = os.getenv("FORMANT_ENGINE", "praat").lower()
+
+# 포먼트 분석 범위 (vowel: 모음 핵 구간만, full: 전체 녹음)
+FORMANT_SEGMENT_MODE = os.getenv("FORMANT_SEGMENT_MODE", "vowel").lower()
+
 
 @dataclass
 class FormantData:
@@ -59,6 +69,9 @@ class FormantResult:
     # 분석된 모음 정보
     vowel_analysis: list = None
 
+    # 점수 재계산용 원시 특징값 (scoring.FORMANT_FEATURES)
+    features: dict = None
+
     # 피드백
     feedback: str = ""
 
@@ -77,17 +90,50 @@ KOREAN_VOWELS_FORMANTS = {
 }
 
 
-def analyze_formants(audio_data: bytes, sample_rate: int = 16000) -> FormantResult:
+def analyze_formants(audio_data: bytes, sample_rate: int = 16000, engine: Optional[str] = None,
+                     context: Optional[PraatAnalysisContext] = None,
+                     segments: Optional[List[VowelSegment]] = None) -> FormantResult:
     """
     오디오 데이터에서 포먼트를 분석합니다.
 
     Args:
         audio_data: WAV 형식의 오디오 데이터 (bytes)
         sample_rate: 샘플링 레이트 (기본 16000Hz)
+        engine: 분석 엔진 ("praat" 또는 "lpc", 기본값은 FORMANT_ENGINE 설정)
+        context: 톤 분석과 공유하는 Praat 분석 컨텍스트 (없으면 새로 생성)
+        segments: 모음 핵 구간 목록 (주어지면 해당 구간만 분석하고 모음별 결과를 채움)
 
     Returns:
         FormantResult: 포먼트 분석 결과
     """
+    if (engine or FORMANT_ENGINE) == "lpc":
+        from app.services.lpc_formant import analyze_formants_lpc
+        return analyze_formants_lpc(audio_data, segments=segments)
+    return _analyze_formants_praat(audio_data, context, segments)
+
+
+def _sample_formant(formant, start_time: float, end_time: float, time_step: float = 0.01):
+    """Formant 객체를 일정 간격으로 샘플링하여 (시간, F1, F2, F3) 목록 반환 (NaN 프레임 제외)"""
+    samples = []
+    current_time = start_time
+
+    while current_time <= end_time:
+        f1 = call(formant, "Get value at time", 1, current_time, "Hertz", "Linear")
+        f2 = call(formant, "Get value at time", 2, current_time, "Hertz", "Linear")
+        f3 = call(formant, "Get value at time", 3, current_time, "Hertz", "Linear")
+
+        # NaN이 아닌 값만 수집
+        if not (np.isnan(f1) or np.isnan(f2) or np.isnan(f3)):
+            samples.append((current_time, f1, f2, f3))
+
+        current_time += time_step
+
+    return samples
+
+
+def _analyze_formants_praat(audio_data: bytes, context: Optional[PraatAnalysisContext] = None,
+                            segments: Optional[List[VowelSegment]] = None) -> FormantResult:
+    """Praat(parselmouth) Burg 알고리즘으로 포먼트를 분석합니다."""
     if not PARSELMOUTH_AVAILABLE:
         return FormantResult(
             success=False,
@@ -96,108 +142,51 @@ def analyze_formants(audio_data: bytes, sample_rate: int = 16000) -> FormantResu
         )
 
     try:
-        # 임시 파일에 오디오 저장
-        with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as temp_file:
-            temp_file.write(audio_data)
-            temp_file_path = temp_file.name
-
-        try:
-            # Praat Sound 객체 생성
-            sound = parselmouth.Sound(temp_file_path)
-
-            # 포먼트 추출 (최대 5개 포먼트, 5500Hz까지)
-            formant = call(sound, "To Formant (burg)", 0.0, 5, 5500, 0.025, 50)
+        # Sound는 컨텍스트에서 한 번만 생성
+        if context is None:
+            context = PraatAnalysisContext.from_wav_bytes(audio_data)
+
+        frames = []
+        labels = None
+        if segments:
+            # 모음 핵 구간만 포먼트 추출
+            labels = []
+            for segment in segments:
+                try:
+                    formant = context.formant_part(segment.start, segment.end)
+                except Exception as e:
+                    print(f"[WARNING] 구간 포먼트 추출 실패 ({segment.start}-{segment.end}s): {e}")
+                    continue
+                segment_frames = _sample_formant(
+                    formant, segment.start, segment.end, context.preset.track_time_step
+                )
+                frames.extend(segment_frames)
+                labels.extend([segment.vowel] * len(segment_frames))
+        else:
+            # 포먼트 추출 (개수/창은 프리셋, 상한은 화자 피치로 결정: 남성 5000Hz, 그 외 5500Hz)
+            formant = context.formant()
 
             # 시간 범위
             start_time = call(formant, "Get start time")
             end_time = call(formant, "Get end time")
-            duration = end_time - start_time
-
-            # 포먼트 값 수집
-            f1_values = []
-            f2_values = []
-            f3_values = []
-            formant_track = []
-
-            # 10ms 간격으로 샘플링
-            time_step = 0.01
-            current_time = start_time
-
-            while current_time <= end_time:
-                f1 = call(formant, "Get value at time", 1, current_time, "Hertz", "Linear")
-                f2 = call(formant, "Get value at time", 2, current_time, "Hertz", "Linear")
-                f3 = call(formant, "Get value at time", 3, current_time, "Hertz", "Linear")
-
-                # NaN이 아닌 값만 수집
-                if not (np.isnan(f1) or np.isnan(f2) or np.isnan(f3)):
-                    f1_values.append(f1)
-                    f2_values.append(f2)
-                    f3_values.append(f3)
-                    formant_track.append(FormantData(
-                        time=round(current_time - start_time, 3),
-                        f1=round(f1, 1),
-                        f2=round(f2, 1),
-                        f3=round(f3, 1)
-                    ))
-
-                current_time += time_step
-
-            if not f1_values:
-                return FormantResult(
-                    success=False,
-                    error="No valid formant data extracted",
-                    feedback="음성에서 포먼트를 추출할 수 없습니다. 더 크게 말씀해주세요."
-                )
-
-            # 평균 계산
-            mean_f1 = np.mean(f1_values)
-            mean_f2 = np.mean(f2_values)
-            mean_f3 = np.mean(f3_values)
-
-            # 표준편차 계산 (안정성 지표)
-            std_f1 = np.std(f1_values)
-            std_f2 = np.std(f2_values)
-            std_f3 = np.std(f3_values)
-
-            # 안정성 점수 계산 (표준편차가 낮을수록 높은 점수)
-            # 일반적으로 F1 표준편차 100Hz 이하, F2 200Hz 이하가 안정적
-            stability_f1 = max(0, 100 - (std_f1 / 2))  # 200Hz 이상이면 0점
-            stability_f2 = max(0, 100 - (std_f2 / 4))  # 400Hz 이상이면 0점
-            stability_f3 = max(0, 100 - (std_f3 / 5))  # 500Hz 이상이면 0점
-
-            stability_score = (stability_f1 * 0.4 + stability_f2 * 0.4 + stability_f3 * 0.2)
-
-            # 공명 품질 점수 계산
-            resonance_score = calculate_resonance_score(mean_f1, mean_f2, mean_f3, stability_score)
 
-            # 피드백 생성
-            feedback = generate_formant_feedback(
-                mean_f1, mean_f2, mean_f3,
-                stability_score, resonance_score
-            )
-
-            return FormantResult(
-                success=True,
-                mean_f1=round(mean_f1, 1),
-                mean_f2=round(mean_f2, 1),
-                mean_f3=round(mean_f3, 1),
-                stability_f1=round(stability_f1, 1),
-                stability_f2=round(stability_f2, 1),
-                stability_f3=round(stability_f3, 1),
-                stability_score=round(stability_score, 1),
-                resonance_score=round(resonance_score, 1),
-                formant_track=[{
-                    'time': f.time,
-                    'f1': f.f1,
-                    'f2': f.f2,
-                    'f3': f.f3
-                } for f in formant_track],
-                feedback=feedback
-            )
-
-        finally:
-            # 임시 파일 삭제
-            os.unlink(temp_file_path)
+            # 프리셋 간격(기본 10ms)으로 샘플링 (시간은 분석 시작 기준)
+            frames = [
+                (time - start_time, f1, f2, f3)
+                for time, f1, f2, f3 in _sample_formant(formant, start_time, end_time, context.preset.track_time_step)
+            ]
+
+        formant_track = [
+            FormantData(time=round(time, 3), f1=round(f1, 1), f2=round(f2, 1), f3=round(f3, 1))
+            for time, f1, f2, f3 in frames
+        ]
+        return build_formant_result(
+            [frame[1] for frame in frames],
+            [frame[2] for frame in frames],
+            [frame[3] for frame in frames],
+            formant_track,
+            vowel_labels=labels if context.preset.vowel_analysis else None,
+        )
 
     except Exception as e:
         print(f"포먼트 분석 오류: {e}")
@@ -208,44 +197,166 @@ def analyze_formants(audio_data: bytes, sample_rate: int = 16000) -> FormantResu
         )
 
 
-def calculate_resonance_score(f1: float, f2: float, f3: float, stability: float) -> float:
+def build_formant_result(f1_values, f2_values, f3_values, formant_track,
+                         vowel_labels: Optional[list] = None) -> FormantResult:
     """
-    공명 품질 점수를 계산합니다.
+    유효 프레임의 F1~F3 값으로 평균/안정성/공명 점수와 피드백을 계산합니다.
+    Praat 엔진과 LPC 엔진이 같은 점수 공식을 쓰도록 공유합니다.
 
-    좋은 공명의 특징:
-    - F1, F2, F3가 적절한 범위 내에 있음
-    - 포먼트 간 적절한 간격 유지
-    - 안정적인 포먼트 값
+    Args:
+        f1_values, f2_values, f3_values: NaN이 제거된 프레임별 포먼트 값
+        formant_track: FormantData 목록
+        vowel_labels: 프레임별 모음 (구간 분석 모드에서만, 모음을 모르면 None 원소)
     """
-    score = 50.0  # 기본 점수
+    vowel_stats = None
+    if vowel_labels is not None and len(f1_values) > 0:
+        vowel_stats = vowel_stats_from_frames(vowel_labels, f1_values, f2_values)
+    return formant_result_from_stats(
+        RunningStats.from_values(f1_values),
+        RunningStats.from_values(f2_values),
+        RunningStats.from_values(f3_values),
+        formant_track,
+        vowel_stats=vowel_stats,
+    )
 
-    # F1 범위 체크 (250-900Hz가 일반적)
-    if 250 <= f1 <= 900:
-        score += 15
-    elif 200 <= f1 <= 1000:
-        score += 10
-    else:
-        score -= 10
 
-    # F2 범위 체크 (700-2800Hz가 일반적)
-    if 700 <= f2 <= 2800:
-        score += 15
-    elif 600 <= f2 <= 3000:
-        score += 10
-    else:
-        score -= 10
+def vowel_stats_from_frames(vowel_labels: list, f1_values, f2_values) -> dict:
+    """모음별 F1/F2 누적기 {모음: (F1, F2)}"""
+    labels = np.array([label or "" for label in vowel_labels])
+    f1_values = np.asarray(f1_values, dtype=float)
+    f2_values = np.asarray(f2_values, dtype=float)
+    vowel_stats = {}
+    for vowel in KOREAN_VOWELS_FORMANTS:
+        mask = labels == vowel
+        if mask.any():
+            vowel_stats[vowel] = (
+                RunningStats.from_values(f1_values[mask]),
+                RunningStats.from_values(f2_values[mask]),
+            )
+    return vowel_stats
 
-    # F2/F1 비율 체크 (1.5-4.0이 일반적)
-    f2_f1_ratio = f2 / f1 if f1 > 0 else 0
-    if 1.5 <= f2_f1_ratio <= 4.0:
-        score += 10
-    elif 1.2 <= f2_f1_ratio <= 5.0:
-        score += 5
 
-    # 안정성 반영
-    score += stability * 0.1
+def formant_result_from_stats(f1: RunningStats, f2: RunningStats, f3: RunningStats, formant_track,
+                              vowel_stats: Optional[dict] = None) -> FormantResult:
+    """
+    F1~F3 누적기로 평균/안정성/공명 점수와 피드백을 계산합니다.
+    한 번에 분석한 결과와 청크별로 분석해 병합한 결과가 같은 공식을 거칩니다.
 
-    return min(100, max(0, score))
+    Args:
+        f1, f2, f3: 유효 프레임의 포먼트 누적기
+        formant_track: FormantData 목록
+        vowel_stats: 모음별 (F1, F2) 누적기 (구간 분석 모드에서만)
+    """
+    if f1.count == 0:
+        return FormantResult(
+            success=False,
+            error="No valid formant data extracted",
+            feedback="음성에서 포먼트를 추출할 수 없습니다. 더 크게 말씀해주세요."
+        )
+
+    # 평균 계산
+    mean_f1 = f1.mean
+    mean_f2 = f2.mean
+    mean_f3 = f3.mean
+
+    # 표준편차 계산 (안정성 지표)
+    std_f1 = f1.std
+    std_f2 = f2.std
+    std_f3 = f3.std
+
+    # 안정성/공명 점수 (저장된 특징값으로 재계산할 때와 같은 공식)
+    scores = formant_scores(mean_f1, mean_f2, mean_f3, std_f1, std_f2, std_f3)
+    stability_f1 = float(scores["stability_f1"])
+    stability_f2 = float(scores["stability_f2"])
+    stability_f3 = float(scores["stability_f3"])
+    stability_score = float(scores["stability_score"])
+    resonance_score = float(scores["resonance_score"])
+
+    # 모음별 분석 (구간 분석 모드)
+    vowel_analysis = None
+    if vowel_stats is not None:
+        vowel_analysis = build_vowel_analysis(vowel_stats, mean_f3)
+
+    # 피드백 생성
+    feedback = formant_feedback(
+        mean_f1, mean_f2, mean_f3,
+        stability_score, resonance_score, vowel_analysis
+    )
+
+    return FormantResult(
+        success=True,
+        mean_f1=round(float(mean_f1), 1),
+        mean_f2=round(float(mean_f2), 1),
+        mean_f3=round(float(mean_f3), 1),
+        stability_f1=round(float(stability_f1), 1),
+        stability_f2=round(float(stability_f2), 1),
+        stability_f3=round(float(stability_f3), 1),
+        stability_score=round(float(stability_score), 1),
+        resonance_score=round(float(resonance_score), 1),
+        formant_track=[{
+            'time': f.time,
+            'f1': f.f1,
+            'f2': f.f2,
+            'f3': f.f3
+        } for f in formant_track],
+        vowel_analysis=vowel_analysis,
+        features={
+            "mean_f1": round(float(mean_f1), 4),
+            "mean_f2": round(float(mean_f2), 4),
+            "mean_f3": round(float(mean_f3), 4),
+            "std_f1": round(float(std_f1), 4),
+            "std_f2": round(float(std_f2), 4),
+            "std_f3": round(float(std_f3), 4),
+        },
+        feedback=feedback
+    )
+
+
+def vocal_tract_scale(mean_f3: float) -> float:
+    """
+    성도 길이 보정 계수 (KOREAN_VOWELS_FORMANTS는 성인 남성 기준)
+    F3 평균으로 성도 길이를 추정해 1.0(남성) ~ 1.25(여성/아동) 사이로 보정합니다.
+    """
+    return float(np.clip(mean_f3 / 2500.0, 1.0, 1.25))
+
+
+def score_vowel(vowel: str, mean_f1: float, mean_f2: float, scale: float = 1.0) -> float:
+    """모음 기준 범위 대비 F1/F2 점수 (범위 안이면 100, 범위 폭만큼 벗어나면 0)"""
+    target = KOREAN_VOWELS_FORMANTS[vowel]
+    scores = []
+    for value, (low, high) in ((mean_f1, target['f1']), (mean_f2, target['f2'])):
+        low, high = low * scale, high * scale
+        outside = max(low - value, value - high, 0)
+        scores.append(max(0.0, 100.0 - 100.0 * outside / (high - low)))
+    return sum(scores) / len(scores)
+
+
+def build_vowel_analysis(vowel_stats: dict, mean_f3: float) -> list:
+    """모음별 평균 F1/F2와 기준 범위 대비 점수 (vowel_stats: {모음: (F1 누적기, F2 누적기)})"""
+    scale = vocal_tract_scale(mean_f3)
+
+    vowel_analysis = []
+    for vowel, target in KOREAN_VOWELS_FORMANTS.items():
+        if vowel not in vowel_stats:
+            continue
+        f1, f2 = vowel_stats[vowel]
+        mean_f1 = f1.mean
+        mean_f2 = f2.mean
+        vowel_analysis.append({
+            'vowel': vowel,
+            'frames': f1.count,
+            'mean_f1': round(mean_f1, 1),
+            'mean_f2': round(mean_f2, 1),
+            'target_f1': [round(target['f1'][0] * scale), round(target['f1'][1] * scale)],
+            'target_f2': [round(target['f2'][0] * scale), round(target['f2'][1] * scale)],
+            'score': round(score_vowel(vowel, mean_f1, mean_f2, scale), 1),
+        })
+    return vowel_analysis
+
+
+def calculate_resonance_score(f1: float, f2: float, f3: float, stability: float) -> float:
+    """공명 품질 점수를 계산합니다. (공식은 scoring.resonance_scores)"""
+    return float(resonance_scores(f1, f2, f3, stability))
 
 
 def generate_formant_feedback(f1: float, f2: float, f3: float,
@@ -282,6 +393,17 @@ def generate_formant_feedback(f1: float, f2: float, f3: float,
     return " ".join(feedbacks)
 
 
+def formant_feedback(f1: float, f2: float, f3: float, stability: float, resonance: float,
+                     vowel_analysis: Optional[list] = None) -> str:
+    """포먼트 피드백 + 가장 약한 모음 안내 (모음별 분석이 있을 때)"""
+    feedback = generate_formant_feedback(f1, f2, f3, stability, resonance)
+    if vowel_analysis:
+        weakest = min(vowel_analysis, key=lambda v: v["score"])
+        if weakest["score"] < 60:
+            feedback += f" '{weakest['vowel']}' 모음의 입 모양을 더 정확하게 해보세요."
+    return feedback
+
+
 def get_mock_formant_result() -> FormantResult:
     """개발용 목업 결과 반환"""
     import random
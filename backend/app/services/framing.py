@@ -0,0 +1,25 @@
+# 프레임 분할 유틸리티
+# 여러 DSP 단계(VAD, 피치, 포먼트)가 같은 방식으로 신호를 프레임 단위로 나누도록 공유합니다.
+import numpy as np
+
+
+def frame_count(num_samples: int, frame_size: int, hop_size: int) -> int:
+    """프레임 개수 계산 (신호가 한 프레임보다 짧으면 0)"""
+    if num_samples < frame_size or hop_size <= 0:
+        return 0
+    return 1 + (num_samples - frame_size) // hop_size
+
+
+def frame_signal(samples: np.ndarray, frame_size: int, hop_size: int) -> np.ndarray:
+    """
+    신호를 (프레임 수, frame_size) 형태의 읽기 전용 뷰로 나눕니다.
+    복사 없이 stride만 바꾸므로 긴 신호에도 메모리를 거의 쓰지 않습니다.
+    """
+    if frame_count(len(samples), frame_size, hop_size) == 0:
+        return np.zeros((0, frame_size), dtype=samples.dtype)
+    return np.lib.stride_tricks.sliding_window_view(samples, frame_size)[::hop_size]
+
+
+def frame_times(num_frames: int, frame_size: int, hop_size: int, sample_rate: int) -> np.ndarray:
+    """각 프레임 중심의 시간 (초)"""
+    return (np.arange(num_frames) * hop_size + frame_size / 2.0) / sample_rate
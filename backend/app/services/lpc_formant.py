@@ -0,0 +1,236 @@
+# LPC 포먼트 분석 엔진
+# 신호를 프레임으로 나눠 모든 프레임의 LPC를 한 번에 계산하고,
+# 동반 행렬(companion matrix) 고윳값으로 F1~F3를 벡터화 추출합니다.
+from typing import List, Optional
+import numpy as np
+
+from app.services.audio_io import decode_audio, resample, AudioDecodeError
+from app.services.framing import frame_signal, frame_times
+from app.services.formant_analysis import FormantData, FormantResult, build_formant_result
+from app.services.vowel_segments import VowelSegment
+
+# Praat To Formant (burg) 기본 설정과 동일
+MAX_FORMANTS = 5
+FORMANT_CEILING = 5500.0
+WINDOW_LENGTH = 0.025       # Praat 관례: 실제 분석 창은 2배 (50ms)
+PRE_EMPHASIS_FROM = 50.0
+
+# 프레임 간격 (초) - 기존 트랙 샘플링 간격과 동일
+TIME_STEP = 0.01
+
+# 포먼트로 인정할 최대 대역폭 (Hz), 최저 주파수 (Hz)
+MAX_BANDWIDTH = 700.0
+MIN_FREQUENCY = 50.0
+
+# 최대 진폭 대비 이보다 작은 프레임은 건너뜀
+SILENCE_THRESHOLD = 0.01
+
+
+def _levinson_batch(autocorr: np.ndarray, order: int) -> np.ndarray:
+    """
+    여러 프레임의 Levinson-Durbin 재귀를 차수 방향으로만 반복하고,
+    프레임 방향은 벡터화하여 LPC 계수 a[0..order] (a[0]=1)를 구합니다.
+    """
+    num_frames = autocorr.shape[0]
+    coeffs = np.zeros((num_frames, order + 1))
+    coeffs[:, 0] = 1.0
+    error = autocorr[:, 0].copy()
+
+    for i in range(1, order + 1):
+        acc = np.einsum("ij,ij->i", coeffs[:, :i], autocorr[:, i:0:-1])
+        reflection = -acc / np.maximum(error, 1e-12)
+        previous = coeffs[:, 1:i].copy()
+        coeffs[:, 1:i] = previous + reflection[:, None] * previous[:, ::-1]
+        coeffs[:, i] = reflection
+        error *= 1.0 - reflection ** 2
+    return coeffs
+
+
+def _formants_from_lpc(coeffs: np.ndarray, sample_rate: float, ceiling: float) -> np.ndarray:
+    """
+    LPC 다항식의 근을 동반 행렬 고윳값으로 한 번에 구해 F1~F3 (Hz)를 반환합니다.
+    포먼트가 부족한 프레임은 NaN입니다.
+    """
+    num_frames, order_plus_one = coeffs.shape
+    order = order_plus_one - 1
+
+    # 동반 행렬: 첫 행 = -a[1..p], 부대각선 = 1
+    companion = np.zeros((num_frames, order, order))
+    companion[:, 0, :] = -coeffs[:, 1:]
+    companion[:, np.arange(1, order), np.arange(order - 1)] = 1.0
+    roots = np.linalg.eigvals(companion)
+
+    frequencies = np.angle(roots) * sample_rate / (2 * np.pi)
+    bandwidths = -np.log(np.maximum(np.abs(roots), 1e-12)) * sample_rate / np.pi
+
+    valid = (
+        (roots.imag > 0)
+        & (frequencies > MIN_FREQUENCY)
+        & (frequencies < ceiling - MIN_FREQUENCY)
+        & (bandwidths < MAX_BANDWIDTH)
+    )
+    frequencies = np.where(valid, frequencies, np.inf)
+    frequencies.sort(axis=1)
+
+    formants = frequencies[:, :3]
+    formants[~np.isfinite(formants)] = np.nan
+    return formants
+
+
+def estimate_formants_batch(signals: List[np.ndarray], sample_rate: int = 16000,
+                            max_formants: int = MAX_FORMANTS,
+                            ceiling: float = FORMANT_CEILING,
+                            window_length: float = WINDOW_LENGTH,
+                            time_step: float = TIME_STEP):
+    """
+    여러 신호의 F1~F3 트랙을 한 번의 프레임 배치로 추정합니다.
+
+    Returns:
+        신호별 (times, formants[N, 3]) 목록. 무음/추정 실패 프레임은 NaN
+    """
+    # Praat처럼 2 × ceiling 으로 리샘플링하여 관심 대역에 LPC 차수를 집중
+    analysis_rate = int(2 * ceiling)
+    frame_size = int(round(2 * window_length * analysis_rate))
+    hop_size = int(round(time_step * analysis_rate))
+    order = 2 * max_formants
+
+    # 가우시안 창 (Praat 분석 창과 유사한 모양)
+    positions = np.arange(frame_size) - (frame_size - 1) / 2.0
+    window = np.exp(-12.0 * (positions / frame_size) ** 2)
+
+    # 고역 강조 계수 (Praat pre-emphasis from 50Hz)
+    alpha = np.exp(-2 * np.pi * PRE_EMPHASIS_FROM / analysis_rate)
+
+    framed, counts, peaks = [], [], []
+    for signal in signals:
+        resampled = resample(np.asarray(signal, dtype=np.float32), sample_rate, analysis_rate)
+        emphasized = np.empty_like(resampled)
+        if len(resampled):
+            emphasized[0] = resampled[0]
+            emphasized[1:] = resampled[1:] - alpha * resampled[:-1]
+        frames = frame_signal(emphasized, frame_size, hop_size)
+        framed.append(frames)
+        counts.append(len(frames))
+        peaks.append(np.abs(resampled).max() if len(resampled) else 0.0)
+
+    if sum(counts) == 0:
+        return [(np.zeros(0), np.zeros((0, 3))) for _ in signals]
+
+    all_frames = np.concatenate([frames for frames in framed if len(frames)], axis=0) * window
+
+    # 자기상관 (FFT 한 번), LPC, 근 계산 모두 프레임 배치로 처리
+    nfft = 1 << int(np.ceil(np.log2(2 * frame_size)))
+    spectrum = np.fft.rfft(all_frames, nfft, axis=1)
+    autocorr = np.fft.irfft(np.abs(spectrum) ** 2, nfft, axis=1)[:, :order + 1]
+    autocorr[:, 0] *= 1.0 + 1e-9  # 수치 안정화 (white noise correction)
+
+    energetic = autocorr[:, 0] > 1e-10
+    formants = np.full((len(all_frames), 3), np.nan)
+    if energetic.any():
+        coeffs = _levinson_batch(autocorr[energetic], order)
+        formants[energetic] = _formants_from_lpc(coeffs, analysis_rate, ceiling)
+
+    frame_peaks = np.abs(all_frames).max(axis=1)
+    results = []
+    offset = 0
+    for frames, count, peak in zip(framed, counts, peaks):
+        times = frame_times(count, frame_size, hop_size, analysis_rate)
+        track = formants[offset:offset + count]
+        quiet = frame_peaks[offset:offset + count] < SILENCE_THRESHOLD * peak
+        track[quiet] = np.nan
+        offset += count
+        results.append((times, track))
+    return results
+
+
+def analyze_formants_batch(signals: List[np.ndarray], sample_rate: int = 16000) -> List[FormantResult]:
+    """
+    여러 녹음의 포먼트를 한 번에 분석합니다.
+
+    Args:
+        signals: mono float32 신호 목록 (모두 같은 샘플링 레이트)
+        sample_rate: 샘플링 레이트
+
+    Returns:
+        신호별 FormantResult 목록
+    """
+    try:
+        tracks = estimate_formants_batch(signals, sample_rate)
+    except Exception as e:
+        print(f"포먼트 분석 오류: {e}")
+        return [FormantResult(
+            success=False,
+            error=str(e),
+            feedback="포먼트 분석 중 오류가 발생했습니다."
+        ) for _ in signals]
+
+    results = []
+    for times, track in tracks:
+        valid = ~np.isnan(track).any(axis=1)
+        values = track[valid]
+        formant_track = [
+            FormantData(time=round(float(t), 3), f1=round(float(f1), 1), f2=round(float(f2), 1), f3=round(float(f3), 1))
+            for t, (f1, f2, f3) in zip(times[valid], values)
+        ]
+        results.append(build_formant_result(values[:, 0], values[:, 1], values[:, 2], formant_track))
+    return results
+
+
+def analyze_formant_segments(samples: np.ndarray, sample_rate: int,
+                             segments: List[VowelSegment]) -> FormantResult:
+    """
+    모음 핵 구간만 잘라 한 번의 배치로 포먼트를 추출하고, 모음별 결과를 채웁니다.
+    분석 창 때문에 구간 앞뒤로 창 길이만큼 여유를 둡니다.
+    """
+    padding = WINDOW_LENGTH
+    bounds = [
+        (max(0, int((segment.start - padding) * sample_rate)),
+         min(len(samples), int((segment.end + padding) * sample_rate)))
+        for segment in segments
+    ]
+    try:
+        tracks = estimate_formants_batch([samples[start:end] for start, end in bounds], sample_rate)
+    except Exception as e:
+        print(f"포먼트 분석 오류: {e}")
+        return FormantResult(
+            success=False,
+            error=str(e),
+            feedback="포먼트 분석 중 오류가 발생했습니다."
+        )
+
+    times_list, values_list, labels = [], [], []
+    for segment, (start, _), (times, track) in zip(segments, bounds, tracks):
+        # 구간 시작 기준 시간을 녹음 기준으로 변환하고 모음 핵 안의 프레임만 사용
+        times = times + start / sample_rate
+        valid = ~np.isnan(track).any(axis=1) & (times >= segment.start) & (times <= segment.end)
+        times_list.append(times[valid])
+        values_list.append(track[valid])
+        labels.extend([segment.vowel] * int(valid.sum()))
+
+    times = np.concatenate(times_list) if times_list else np.zeros(0)
+    values = np.concatenate(values_list) if values_list else np.zeros((0, 3))
+    formant_track = [
+        FormantData(time=round(float(t), 3), f1=round(float(f1), 1), f2=round(float(f2), 1), f3=round(float(f3), 1))
+        for t, (f1, f2, f3) in zip(times, values)
+    ]
+    return build_formant_result(
+        values[:, 0], values[:, 1], values[:, 2], formant_track, vowel_labels=labels
+    )
+
+
+def analyze_formants_lpc(audio_data: bytes, format_hint: Optional[str] = None,
+                         segments: Optional[List[VowelSegment]] = None) -> FormantResult:
+    """
+    WAV 바이트를 LPC 엔진으로 분석합니다. (analyze_formants(engine="lpc")의 구현)
+    """
+    try:
+        audio = decode_audio(audio_data, format_hint=format_hint)
+    except AudioDecodeError as e:
+        return FormantResult(
+            success=False,
+            error=str(e),
+            feedback="포먼트 분석 중 오류가 발생했습니다."
+        )
+    if segments:
+        return analyze_formant_segments(audio.samples, audio.sample_rate, segments)
+    return analyze_formants_batch([audio.samples], audio.sample_rate)[0]
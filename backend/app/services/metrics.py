@@ -0,0 +1,67 @@
+# 메트릭 서비스
+# 외부 의존성 없이 카운터/게이지를 모아 Prometheus 텍스트 형식으로 내보냅니다.
+# 값이 매번 바뀌는 게이지(대기열 길이 등)는 수집 함수(collector)로 조회 시점에 계산합니다.
+import threading
+from typing import Callable, Dict, List, Tuple
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+_lock = threading.Lock()
+_counters: Dict[str, Dict[LabelKey, float]] = {}
+_gauges: Dict[str, Dict[LabelKey, float]] = {}
+_help: Dict[str, str] = {}
+_collectors: List[Callable[[], List[Tuple[str, dict, float]]]] = []
+
+
+def _key(labels: dict) -> LabelKey:
+    return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+
+def describe(name: str, text: str) -> None:
+    """메트릭 설명 (# HELP) 등록"""
+    _help[name] = text
+
+
+def inc(name: str, value: float = 1.0, **labels) -> None:
+    """카운터 증가"""
+    with _lock:
+        series = _counters.setdefault(name, {})
+        key = _key(labels)
+        series[key] = series.get(key, 0.0) + value
+
+
+def set_gauge(name: str, value: float, **labels) -> None:
+    """게이지 설정"""
+    with _lock:
+        _gauges.setdefault(name, {})[_key(labels)] = value
+
+
+def register_collector(collector: Callable[[], List[Tuple[str, dict, float]]]) -> None:
+    """조회 시점에 (이름, 라벨, 값) 목록을 돌려주는 수집 함수 등록"""
+    _collectors.append(collector)
+
+
+def snapshot() -> Dict[str, Dict[LabelKey, float]]:
+    """현재 모든 메트릭 값 (카운터, 게이지, 수집 함수 결과)"""
+    with _lock:
+        values = {name: dict(series) for name, series in _counters.items()}
+        for name, series in _gauges.items():
+            values.setdefault(name, {}).update(series)
+    for collector in _collectors:
+        for name, labels, value in collector():
+            values.setdefault(name, {})[_key(labels)] = value
+    return values
+
+
+def render_prometheus() -> str:
+    """Prometheus 텍스트 노출 형식으로 렌더링"""
+    lines = []
+    for name, series in sorted(snapshot().items()):
+        metric_type = "counter" if name in _counters else "gauge"
+        if name in _help:
+            lines.append(f"# HELP {name} {_help[name]}")
+        lines.append(f"# TYPE {name} {metric_type}")
+        for key, value in sorted(series.items()):
+            label_text = ",".join(f'{label}="{text}"' for label, text in key)
+            lines.append(f"{name}{{{label_text}}} {value:g}" if label_text else f"{name} {value:g}")
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,333 @@
+# NumPy 톤(Tone) 분석 엔진
+# Praat 없이 프레임 배치 YIN 피치, 주기 기반 jitter/shimmer, 자기상관 HNR을 계산합니다.
+# 여러 녹음을 한 번의 FFT 배치로 처리할 수 있습니다.
+from typing import List, Optional
+from dataclasses import dataclass
+import numpy as np
+
+try:
+    from scipy.signal import find_peaks, butter, sosfiltfilt
+    SCIPY_AVAILABLE = True
+except ImportError:
+    SCIPY_AVAILABLE = False
+    print("Warning: scipy not installed. NumPy tone engine disabled.")
+
+from app.services.audio_io import decode_audio, AudioDecodeError
+from app.services.framing import frame_signal, frame_times
+from app.services.tone_analysis import ToneResult, build_tone_result
+
+# 피치 탐색 범위 (Praat 설정과 동일)
+PITCH_FLOOR = 75.0
+PITCH_CEILING = 600.0
+
+# 프레임 간격 (초)
+TIME_STEP = 0.01
+
+# YIN 누적 평균 정규화 차이(CMND) 임계값
+YIN_THRESHOLD = 0.15
+
+# CMND 최솟값이 이보다 크면 무성음으로 판단
+VOICING_THRESHOLD = 0.35
+
+# 최대 진폭 대비 이보다 작은 프레임은 무음으로 판단 (Praat silence threshold와 동일)
+SILENCE_THRESHOLD = 0.03
+
+# jitter/shimmer 계산 조건 (Praat: period floor/ceiling, max period/amplitude factor)
+PERIOD_FLOOR = 0.0001
+PERIOD_CEILING = 0.02
+MAX_PERIOD_FACTOR = 1.3
+MAX_AMPLITUDE_FACTOR = 1.6
+
+# 한 번에 FFT로 처리할 최대 프레임 수 (메모리 상한)
+FRAME_BLOCK_SIZE = 4096
+
+
+@dataclass
+class PitchTrack:
+    """프레임별 피치 추정 결과"""
+    times: np.ndarray       # 프레임 중심 시간 (초)
+    f0: np.ndarray          # 피치 (Hz), 무성 프레임은 NaN
+    strength: np.ndarray    # 정규화 자기상관 (0~1), HNR 계산용
+
+
+def _yin_block(frames: np.ndarray, sample_rate: int,
+               pitch_floor: float, pitch_ceiling: float):
+    """
+    프레임 행렬 전체에 대해 YIN 피치를 한 번에 계산합니다.
+
+    Returns:
+        (f0, cmnd 최솟값, 정규화 자기상관) 배열
+    """
+    num_frames, frame_size = frames.shape
+    rows = np.arange(num_frames)
+    tau_min = max(2, int(sample_rate / pitch_ceiling))
+    tau_max = min(int(sample_rate / pitch_floor), frame_size // 2)
+
+    # 자기상관 r(tau): FFT 한 번으로 모든 프레임 처리
+    nfft = 1 << int(np.ceil(np.log2(2 * frame_size)))
+    spectrum = np.fft.rfft(frames, nfft, axis=1)
+    acf = np.fft.irfft(spectrum * np.conj(spectrum), nfft, axis=1)[:, :tau_max + 1]
+
+    # 차이 함수 d(tau) = E_head(tau) + E_tail(tau) - 2 r(tau)
+    taus = np.arange(tau_max + 1)
+    cumulative = np.cumsum(frames.astype(np.float64) ** 2, axis=1)
+    head = cumulative[:, frame_size - 1 - taus]
+    tail = cumulative[:, -1:] - np.concatenate(
+        (np.zeros((num_frames, 1)), cumulative[:, :tau_max]), axis=1
+    )
+    difference = np.maximum(head + tail - 2.0 * acf, 0.0)
+
+    # 누적 평균 정규화 차이 (CMND)
+    cmnd = np.ones_like(difference)
+    running = np.cumsum(difference[:, 1:], axis=1)
+    cmnd[:, 1:] = difference[:, 1:] * taus[1:] / np.maximum(running, 1e-12)
+
+    # 임계값 아래 첫 골짜기 → 없으면 전역 최솟값
+    search = cmnd[:, tau_min:tau_max + 1]
+    below = search < YIN_THRESHOLD
+    first = np.where(below.any(axis=1), below.argmax(axis=1), search.argmin(axis=1))
+
+    # 첫 골짜기에서 국소 최솟값까지 이동
+    lookahead = np.minimum(first[:, None] + np.arange(tau_min)[None, :], search.shape[1] - 1)
+    best = lookahead[rows, np.take_along_axis(search, lookahead, axis=1).argmin(axis=1)]
+    tau = best + tau_min
+
+    # 포물선 보간으로 소수 지연 추정
+    left = cmnd[rows, np.maximum(tau - 1, 1)]
+    center = cmnd[rows, tau]
+    right = cmnd[rows, np.minimum(tau + 1, tau_max)]
+    denominator = left - 2.0 * center + right
+    shift = np.where(np.abs(denominator) > 1e-12, 0.5 * (left - right) / denominator, 0.0)
+    refined_tau = tau + np.clip(shift, -0.5, 0.5)
+
+    normalized_acf = acf[rows, tau] / np.sqrt(np.maximum(head[rows, tau] * tail[rows, tau], 1e-20))
+    return sample_rate / refined_tau, center, np.clip(normalized_acf, 0.0, 1.0)
+
+
+def estimate_pitch_batch(signals: List[np.ndarray], sample_rate: int = 16000,
+                         pitch_floor: float = PITCH_FLOOR,
+                         pitch_ceiling: float = PITCH_CEILING,
+                         time_step: float = TIME_STEP) -> List[PitchTrack]:
+    """
+    여러 신호의 피치를 한 번의 프레임 배치로 추정합니다.
+
+    Args:
+        signals: mono float32 신호 목록
+        sample_rate: 샘플링 레이트 (모든 신호 공통)
+
+    Returns:
+        신호별 PitchTrack 목록
+    """
+    # 피치 하한 3주기를 덮는 분석 창 (Praat To Pitch와 동일)
+    frame_size = int(round(3.0 / pitch_floor * sample_rate))
+    hop_size = int(round(time_step * sample_rate))
+
+    framed = [frame_signal(np.asarray(signal, dtype=np.float32), frame_size, hop_size) for signal in signals]
+    counts = [len(frames) for frames in framed]
+    if sum(counts) == 0:
+        empty = np.zeros(0)
+        return [PitchTrack(times=empty, f0=empty, strength=empty) for _ in signals]
+
+    all_frames = np.concatenate([frames for frames in framed if len(frames)], axis=0)
+    f0_parts, cmnd_parts, strength_parts = [], [], []
+    for start in range(0, len(all_frames), FRAME_BLOCK_SIZE):
+        block = all_frames[start:start + FRAME_BLOCK_SIZE]
+        # 프레임별 DC 제거
+        block = block - block.mean(axis=1, keepdims=True)
+        f0, cmnd_min, strength = _yin_block(block, sample_rate, pitch_floor, pitch_ceiling)
+        f0_parts.append(f0)
+        cmnd_parts.append(cmnd_min)
+        strength_parts.append(strength)
+    f0_all = np.concatenate(f0_parts)
+    cmnd_all = np.concatenate(cmnd_parts)
+    strength_all = np.concatenate(strength_parts)
+    peak_all = np.abs(all_frames).max(axis=1)
+
+    tracks = []
+    offset = 0
+    for signal, count in zip(signals, counts):
+        f0 = f0_all[offset:offset + count].copy()
+        cmnd_min = cmnd_all[offset:offset + count]
+        peaks = peak_all[offset:offset + count]
+        strength = strength_all[offset:offset + count]
+        offset += count
+
+        global_peak = np.abs(signal).max() if len(signal) else 0.0
+        voiced = (
+            (cmnd_min < VOICING_THRESHOLD)
+            & (peaks >= SILENCE_THRESHOLD * global_peak)
+            & (f0 >= pitch_floor) & (f0 <= pitch_ceiling)
+        )
+
+        # 옥타브 오류 제거: 중앙값에서 한 옥타브 가까이 벗어난 프레임은 무성 처리
+        if voiced.any():
+            median = np.median(f0[voiced])
+            voiced &= (f0 > median * 0.55) & (f0 < median * 1.8)
+
+        f0[~voiced] = np.nan
+        tracks.append(PitchTrack(
+            times=frame_times(count, frame_size, hop_size, sample_rate),
+            f0=f0,
+            strength=np.where(voiced, strength, np.nan),
+        ))
+    return tracks
+
+
+def _voiced_runs(voiced: np.ndarray):
+    """연속된 유성 프레임 구간의 (시작, 끝) 인덱스"""
+    padded = np.concatenate(([False], voiced, [False]))
+    edges = np.flatnonzero(padded[1:] != padded[:-1])
+    return list(zip(edges[0::2], edges[1::2]))
+
+
+def _cycle_measures(samples: np.ndarray, sample_rate: int, track: PitchTrack):
+    """
+    성문 주기(pulse)를 찾아 주기/진폭 시퀀스로 jitter와 shimmer를 계산합니다.
+
+    Returns:
+        (jitter %, shimmer %)
+    """
+    filtered = sosfiltfilt(butter(4, 1000, btype="low", fs=sample_rate, output="sos"), samples)
+    voiced = ~np.isnan(track.f0)
+    half_frame = int(1.5 / PITCH_FLOOR * sample_rate)
+
+    period_diffs, periods, amp_diffs, amplitudes = [], [], [], []
+    for start, end in _voiced_runs(voiced):
+        segment_start = max(0, int(track.times[start] * sample_rate) - half_frame)
+        segment_end = min(len(samples), int(track.times[end - 1] * sample_rate) + half_frame)
+        segment = filtered[segment_start:segment_end]
+        if len(segment) < 3:
+            continue
+
+        # 구간 내 최고 피치의 80%를 최소 간격으로 하여 주기당 하나의 피크만 선택
+        min_period = sample_rate / np.nanmax(track.f0[start:end])
+        pulses, _ = find_peaks(segment, distance=max(1, int(0.8 * min_period)),
+                               prominence=0.1 * np.ptp(segment))
+        if len(pulses) < 3:
+            continue
+
+        # 포물선 보간으로 피크 위치를 샘플 이하 단위까지 보정
+        left = segment[np.maximum(pulses - 1, 0)]
+        center = segment[pulses]
+        right = segment[np.minimum(pulses + 1, len(segment) - 1)]
+        denominator = left - 2.0 * center + right
+        offsets = np.where(np.abs(denominator) > 1e-12, 0.5 * (left - right) / denominator, 0.0)
+        pulse_times = (pulses + np.clip(offsets, -0.5, 0.5)) / sample_rate
+
+        # 주기 시퀀스와 각 주기의 최대 진폭
+        cycle_periods = np.diff(pulse_times)
+        raw = np.abs(samples[segment_start:segment_end])
+        cycle_amplitudes = np.maximum.reduceat(raw[:pulses[-1]], pulses[:-1])
+
+        # 유효한 연속 주기 쌍만 사용
+        valid = (cycle_periods >= PERIOD_FLOOR) & (cycle_periods <= PERIOD_CEILING)
+        ratio = cycle_periods[1:] / cycle_periods[:-1]
+        pair_valid = valid[1:] & valid[:-1] & (ratio <= MAX_PERIOD_FACTOR) & (ratio >= 1 / MAX_PERIOD_FACTOR)
+
+        period_diffs.append(np.abs(np.diff(cycle_periods))[pair_valid])
+        periods.append(cycle_periods[valid])
+
+        amp_ratio = cycle_amplitudes[1:] / np.maximum(cycle_amplitudes[:-1], 1e-12)
+        amp_valid = pair_valid & (amp_ratio <= MAX_AMPLITUDE_FACTOR) & (amp_ratio >= 1 / MAX_AMPLITUDE_FACTOR)
+        amp_diffs.append(np.abs(np.diff(cycle_amplitudes))[amp_valid])
+        amplitudes.append(cycle_amplitudes[valid])
+
+    period_diffs = np.concatenate(period_diffs) if period_diffs else np.zeros(0)
+    periods = np.concatenate(periods) if periods else np.zeros(0)
+    amp_diffs = np.concatenate(amp_diffs) if amp_diffs else np.zeros(0)
+    amplitudes = np.concatenate(amplitudes) if amplitudes else np.zeros(0)
+
+    jitter = period_diffs.mean() / periods.mean() * 100 if len(period_diffs) and len(periods) else 0.0
+    shimmer = amp_diffs.mean() / amplitudes.mean() * 100 if len(amp_diffs) and len(amplitudes) else 0.0
+    return float(jitter), float(shimmer)
+
+
+def _tone_from_track(samples: np.ndarray, sample_rate: int, track: PitchTrack) -> ToneResult:
+    """피치 트랙과 원신호로 ToneResult 생성"""
+    voiced_f0 = track.f0[~np.isnan(track.f0)]
+    if len(voiced_f0) == 0:
+        return ToneResult(
+            success=False,
+            error="No voiced frames detected",
+            feedback="목소리를 감지할 수 없습니다. 더 크게 말씀해주세요."
+        )
+
+    mean_pitch = float(voiced_f0.mean())
+    min_pitch = float(voiced_f0.min())
+    max_pitch = float(voiced_f0.max())
+    pitch_std = float(voiced_f0.std(ddof=1)) if len(voiced_f0) > 1 else 0.0
+
+    jitter, shimmer = _cycle_measures(samples, sample_rate, track)
+
+    # HNR: 정규화 자기상관 r → 10·log10(r / (1 - r))
+    strength = np.clip(track.strength[~np.isnan(track.strength)], 1e-6, 1 - 1e-6)
+    hnr = float(np.mean(10.0 * np.log10(strength / (1.0 - strength)))) if len(strength) else 0.0
+
+    voiced = ~np.isnan(track.f0)
+    pitch_track = [
+        {"time": round(float(time), 3), "f0": round(float(f0), 1)}
+        for time, f0 in zip(track.times[voiced], track.f0[voiced])
+    ]
+
+    return build_tone_result(
+        mean_pitch, min_pitch, max_pitch, pitch_std,
+        jitter, shimmer, hnr,
+        pitch_track=pitch_track
+    )
+
+
+def analyze_tone_batch(signals: List[np.ndarray], sample_rate: int = 16000) -> List[ToneResult]:
+    """
+    여러 녹음의 톤을 한 번에 분석합니다.
+
+    Args:
+        signals: mono float32 신호 목록 (모두 같은 샘플링 레이트)
+        sample_rate: 샘플링 레이트
+
+    Returns:
+        신호별 ToneResult 목록
+    """
+    if not SCIPY_AVAILABLE:
+        return [ToneResult(
+            success=False,
+            error="scipy library not available",
+            feedback="톤 분석 라이브러리가 설치되지 않았습니다."
+        ) for _ in signals]
+
+    try:
+        tracks = estimate_pitch_batch(signals, sample_rate)
+    except Exception as e:
+        print(f"톤 분석 오류: {e}")
+        return [ToneResult(
+            success=False,
+            error=str(e),
+            feedback="톤 분석 중 오류가 발생했습니다."
+        ) for _ in signals]
+
+    results = []
+    for signal, track in zip(signals, tracks):
+        try:
+            results.append(_tone_from_track(np.asarray(signal, dtype=np.float64), sample_rate, track))
+        except Exception as e:
+            print(f"톤 분석 오류: {e}")
+            results.append(ToneResult(
+                success=False,
+                error=str(e),
+                feedback="톤 분석 중 오류가 발생했습니다."
+            ))
+    return results
+
+
+def analyze_tone_numpy(audio_data: bytes, format_hint: Optional[str] = None) -> ToneResult:
+    """
+    WAV 바이트를 NumPy 엔진으로 분석합니다. (analyze_tone(engine="numpy")의 구현)
+    """
+    try:
+        audio = decode_audio(audio_data, format_hint=format_hint)
+    except AudioDecodeError as e:
+        return ToneResult(
+            success=False,
+            error=str(e),
+            feedback="톤 분석 중 오류가 발생했습니다."
+        )
+    return analyze_tone_batch([audio.samples], audio.sample_rate)[0]
@@ -0,0 +1,47 @@
+# 목록 API keyset 페이지 커서
+# (created_at, id) 쌍을 base64url로 감싼 불투명 문자열입니다. 클라이언트는 받은 next_cursor를 그대로 돌려보내고,
+# 서버는 그 행 다음부터 읽으므로 기록이 아무리 많아도 페이지 하나를 읽는 비용은 같습니다 (OFFSET 없음).
+import base64
+import json
+import uuid
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+Cursor = Tuple[str, str]
+
+
+class InvalidCursor(ValueError):
+    """클라이언트가 보낸 커서를 해석할 수 없음"""
+
+
+def encode_cursor(created_at: str, row_id: str) -> str:
+    """행의 (created_at, id) → 불투명 커서"""
+    raw = json.dumps([created_at, row_id], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[Cursor]:
+    """
+    불투명 커서 → (created_at, id)
+
+    PostgREST 필터 문자열에 들어가므로 시각과 UUID 형식인지 확인하고 정규화합니다.
+    """
+    if not cursor:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, row_id = json.loads(raw)
+        return datetime.fromisoformat(created_at).isoformat(), str(uuid.UUID(row_id))
+    except (ValueError, TypeError) as e:
+        raise InvalidCursor(str(e)) from e
+
+
+def split_page(rows: List[dict], limit: int) -> Tuple[List[dict], Optional[str]]:
+    """
+    limit + 1개를 읽은 행 → (이번 페이지 행, 다음 페이지 커서)
+    한 행을 더 읽어 다음 페이지가 있는지 판단하므로 마지막에 빈 페이지를 요청하지 않습니다.
+    """
+    if len(rows) <= limit:
+        return rows, None
+    page = rows[:limit]
+    return page, encode_cursor(page[-1]["created_at"], page[-1]["id"])
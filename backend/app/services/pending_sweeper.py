@@ -0,0 +1,123 @@
+# 오래된 지연 단계(pending_stages) 정리
+# 마감을 넘긴 공명/톤 단계는 응답 뒤 메모리(PendingStages)에서만 추적하므로, 프로세스가 재시작되거나
+# 결과 갱신이 실패하면 결과 행의 pending_stages가 영영 남고 클라이언트는 끝나지 않을 단계를 기다립니다.
+#
+# 서버가 주기적으로 PENDING_STAGE_TIMEOUT_SECONDS보다 오래된 pending 행을 찾아
+# 조건부 UPDATE로 점유(pending_stages 비움)한 뒤 남은 단계를 녹음에서 다시 계산해 채웁니다.
+# 녹음을 다시 읽을 수 없으면 pending만 비운 채 두어 해당 단계 결과 없이 완료된 것으로 봅니다.
+import asyncio
+import os
+from concurrent.futures import wait
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from app.services import metrics
+from app.services.analysis_pipeline import praat_process_stages, stage_output, store_contours
+from app.services.analysis_presets import get_preset
+from app.services.audio_io import AudioDecodeError, decode_audio
+from app.services.supabase import (
+    DEV_MODE,
+    ANALYSIS_LEASE_SECONDS,
+    download_recording_file,
+    get_recording,
+    list_stale_pending_results,
+    take_pending_stages,
+    update_analysis_result,
+)
+from app.services.voice_activity import detect_voice_activity, trim_silence
+
+# 이 시간(초)이 지나도 pending이면 맡은 프로세스가 사라진 것으로 봄 (분석 lease보다 길게)
+PENDING_STAGE_TIMEOUT_SECONDS = int(os.getenv("PENDING_STAGE_TIMEOUT_SECONDS", str(2 * ANALYSIS_LEASE_SECONDS)))
+
+# 정리 주기 (초, 0이면 끔)
+PENDING_SWEEP_INTERVAL_SECONDS = float(os.getenv("PENDING_SWEEP_INTERVAL_SECONDS", "60"))
+
+# 한 번에 정리할 최대 행 수
+PENDING_SWEEP_BATCH = 20
+
+STAGE_JOBS = ("formant", "tone")
+
+metrics.describe("truevoice_pending_stages_swept_total",
+                 "Stale pending_stages rows taken over by the sweeper, by outcome (recovered, cleared)")
+
+
+def recover_pending_stages(row: dict, pending: list) -> dict:
+    """
+    남은 단계를 녹음에서 다시 계산해 결과 행에 채울 필드를 반환합니다 (다시 계산할 수 없으면 빈 dict).
+    먼저 끝난 단계의 시계열은 메모리에만 있었으므로, 시계열은 다시 계산한 단계 것만 저장합니다.
+    """
+    stages = [name for name in pending if name in STAGE_JOBS]
+    recording = get_recording(row["recording_id"])
+    if not stages or not recording:
+        return {}
+
+    audio_data = download_recording_file(recording["file_path"])
+    if not audio_data:
+        return {}
+    format_hint = os.path.splitext(recording["file_path"])[1].lstrip(".").lower() or None
+    try:
+        decoded_audio = decode_audio(audio_data, format_hint=format_hint)
+    except AudioDecodeError as e:
+        print(f"[WARNING] 지연 단계 복구용 디코딩 실패 ({row['id']}): {e}")
+        return {}
+    vad = detect_voice_activity(decoded_audio.samples, decoded_audio.sample_rate)
+    if not vad.has_speech:
+        return {}
+    speech_audio = trim_silence(decoded_audio, vad)
+    wav_audio_data = speech_audio.to_wav_bytes()
+    preset = get_preset(row.get("analysis_preset"))
+
+    starters = praat_process_stages(stages, wav_audio_data, speech_audio, row.get("word_details") or [], preset)
+    futures = {name: start() for name, start in starters.items()}
+    wait(list(futures.values()))
+    outputs = {name: stage_output(name, future) for name, future in futures.items()}
+
+    fields = {f"{name}_data": output.data for name, output in outputs.items()}
+    if not row.get("contour_path"):
+        fields["contour_path"] = store_contours(
+            row["recording_id"],
+            outputs["formant"].track if "formant" in outputs else None,
+            outputs["tone"].track if "tone" in outputs else None,
+        )
+    return fields
+
+
+def sweep_pending_results() -> int:
+    """오래된 pending 행을 한 묶음 정리하고 정리한 행 수를 반환합니다 (블로킹)."""
+    cutoff = datetime.now(timezone.utc) - timedelta(seconds=PENDING_STAGE_TIMEOUT_SECONDS)
+    rows = list_stale_pending_results(cutoff.isoformat(), PENDING_SWEEP_BATCH)
+    swept = 0
+    for row in rows or []:
+        pending = list(row.get("pending_stages") or [])
+        # 다른 인스턴스가 먼저 가져갔거나 그사이 단계가 끝났으면 건너뜀
+        if not take_pending_stages(row["id"]):
+            continue
+        try:
+            fields = recover_pending_stages(row, pending)
+        except Exception as e:
+            print(f"[ERROR] 지연 단계 복구 오류 ({row['id']}): {e}")
+            fields = {}
+        if fields:
+            update_analysis_result(row["id"], fields)
+        outcome = "recovered" if fields else "cleared"
+        metrics.inc("truevoice_pending_stages_swept_total", outcome=outcome)
+        print(f"[INFO] 오래된 지연 단계 정리 ({outcome}): {row['id']} {pending}")
+        swept += 1
+    return swept
+
+
+async def run_pending_sweeper() -> None:
+    """PENDING_SWEEP_INTERVAL_SECONDS마다 오래된 pending 행 정리 (블로킹 조회/분석은 스레드에서)"""
+    while True:
+        await asyncio.sleep(PENDING_SWEEP_INTERVAL_SECONDS)
+        try:
+            await asyncio.to_thread(sweep_pending_results)
+        except Exception as e:
+            print(f"[ERROR] 지연 단계 정리 실패: {e}")
+
+
+def start_pending_sweeper() -> Optional[asyncio.Task]:
+    """정리 작업 시작 (DEV_MODE는 결과가 메모리에만 있어 재시작 뒤 남는 pending이 없으므로 실행하지 않음)"""
+    if DEV_MODE or PENDING_SWEEP_INTERVAL_SECONDS <= 0:
+        return None
+    return asyncio.get_running_loop().create_task(run_pending_sweeper())
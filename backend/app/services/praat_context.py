@@ -0,0 +1,153 @@
+# Praat 분석 컨텍스트
+# 요청마다 Sound를 한 번만 만들고, 피치와 포인트 프로세스를 톤/포먼트 분석이 공유합니다.
+import threading
+from typing import Optional
+import numpy as np
+
+try:
+    import parselmouth
+    from parselmouth.praat import call
+    PARSELMOUTH_AVAILABLE = True
+except ImportError:
+    PARSELMOUTH_AVAILABLE = False
+
+from app.services.audio_io import DecodedAudio, decode_audio
+from app.services.analysis_presets import AnalysisPreset, get_preset
+
+# 피치 탐색 범위 (기본값)
+PITCH_FLOOR = 75.0
+PITCH_CEILING = 600.0
+
+# 중앙 피치가 이보다 낮으면 남성 음역으로 보고 포먼트 상한을 5000Hz로 낮춤
+LOW_VOICE_MEDIAN_PITCH = 165.0
+
+
+class PraatAnalysisContext:
+    """
+    요청 단위 Praat 분석 컨텍스트
+
+    - Sound: 디코딩된 샘플에서 한 번만 생성 (임시 파일 없음)
+    - Pitch: 한 번만 계산 (To Pitch)
+    - PointProcess: 이미 계산한 Pitch에서 유도 (Sound & Pitch: To PointProcess (cc))
+    - 피치 통계를 포먼트 단계에 넘겨 포먼트 상한을 추가 패스 없이 결정
+    - 공명/톤 분석이 서로 다른 스레드에서 동시에 접근해도 한 번만 계산 (재진입 락)
+    - 프레임 간격/분석 창은 분석 품질 프리셋을 따름
+    """
+
+    def __init__(self, samples: np.ndarray, sample_rate: int,
+                 pitch_floor: float = PITCH_FLOOR, pitch_ceiling: float = PITCH_CEILING,
+                 start_time: float = 0.0, preset: Optional[AnalysisPreset] = None):
+        # start_time: 긴 녹음을 나눈 청크일 때 원래 녹음 기준 시작 시각 (시간축 유지)
+        # preset: 분석 품질 프리셋 (없으면 서버 기본값)
+        self.sound = parselmouth.Sound(
+            np.asarray(samples, dtype=np.float64), sampling_frequency=sample_rate, start_time=start_time
+        )
+        self.pitch_floor = pitch_floor
+        self.pitch_ceiling = pitch_ceiling
+        self.preset = preset or get_preset()
+        self._pitch = None
+        self._point_process = None
+        self._pitch_stats = None
+        self._formants = {}
+        self._lock = threading.RLock()
+
+    @classmethod
+    def from_audio(cls, audio: DecodedAudio,
+                   preset: Optional[AnalysisPreset] = None) -> Optional["PraatAnalysisContext"]:
+        """DecodedAudio로 컨텍스트 생성 (parselmouth가 없으면 None)"""
+        if not PARSELMOUTH_AVAILABLE:
+            return None
+        return cls(audio.samples, audio.sample_rate, preset=preset)
+
+    @classmethod
+    def from_wav_bytes(cls, audio_data: bytes,
+                       preset: Optional[AnalysisPreset] = None) -> "PraatAnalysisContext":
+        """WAV 바이트로 컨텍스트 생성"""
+        audio = decode_audio(audio_data, format_hint="wav")
+        return cls(audio.samples, audio.sample_rate, preset=preset)
+
+    @property
+    def pitch(self):
+        """Pitch 객체 (최초 접근 시 한 번만 계산)"""
+        with self._lock:
+            if self._pitch is None:
+                self._pitch = call(
+                    self.sound, "To Pitch", self.preset.pitch_time_step, self.pitch_floor, self.pitch_ceiling
+                )
+            return self._pitch
+
+    @property
+    def point_process(self):
+        """성문 펄스 (피치를 다시 추정하지 않고 기존 Pitch에서 유도)"""
+        with self._lock:
+            if self._point_process is None:
+                self._point_process = call([self.sound, self.pitch], "To PointProcess (cc)")
+            return self._point_process
+
+    def pitch_stats(self) -> dict:
+        """피치 통계 (Hz, 무성 구간만 있으면 0)"""
+        with self._lock:
+            if self._pitch_stats is None:
+                pitch = self.pitch
+                stats = {
+                    "mean": call(pitch, "Get mean", 0, 0, "Hertz"),
+                    "min": call(pitch, "Get minimum", 0, 0, "Hertz", "Parabolic"),
+                    "max": call(pitch, "Get maximum", 0, 0, "Hertz", "Parabolic"),
+                    "std": call(pitch, "Get standard deviation", 0, 0, "Hertz"),
+                    "median": call(pitch, "Get quantile", 0, 0, 0.5, "Hertz"),
+                }
+                # NaN 처리
+                self._pitch_stats = {key: 0 if np.isnan(value) else value for key, value in stats.items()}
+            return self._pitch_stats
+
+    def pitch_track(self) -> list:
+        """유성 프레임의 피치 시계열 [{'time', 'f0'}, ...]"""
+        pitch = self.pitch
+        times = pitch.xs()
+        frequencies = pitch.selected_array["frequency"]
+        return [
+            {"time": round(float(time), 3), "f0": round(float(f0), 1)}
+            for time, f0 in zip(times, frequencies) if f0 > 0
+        ]
+
+    def formant_ceiling(self) -> float:
+        """화자 음역에 맞는 포먼트 상한 (남성 5000Hz, 그 외 5500Hz)"""
+        median = self.pitch_stats()["median"]
+        if 0 < median < LOW_VOICE_MEDIAN_PITCH:
+            return 5000.0
+        return 5500.0
+
+    def formant(self, max_formants: Optional[int] = None, ceiling: Optional[float] = None,
+                window_length: Optional[float] = None):
+        """Formant 객체 (같은 설정이면 캐시 재사용, 지정하지 않은 설정은 프리셋 값)"""
+        max_formants = max_formants or self.preset.max_formants
+        ceiling = ceiling or self.formant_ceiling()
+        window_length = window_length or self.preset.formant_window_length
+        time_step = self.preset.formant_time_step
+        key = (max_formants, ceiling, window_length, time_step)
+        with self._lock:
+            if key not in self._formants:
+                self._formants[key] = call(
+                    self.sound, "To Formant (burg)", time_step, max_formants, ceiling, window_length, 50
+                )
+            return self._formants[key]
+
+    def formant_part(self, start_time: float, end_time: float, max_formants: Optional[int] = None,
+                     window_length: Optional[float] = None):
+        """
+        [start_time, end_time] 구간만 잘라 포먼트를 추출합니다.
+        분석 창 때문에 구간 앞뒤로 창 길이만큼 여유를 두고, 원래 시간축을 유지합니다.
+        """
+        max_formants = max_formants or self.preset.max_formants
+        window_length = window_length or self.preset.formant_window_length
+        padding = window_length
+        part = call(
+            self.sound, "Extract part",
+            max(self.sound.xmin, start_time - padding),
+            min(self.sound.xmax, end_time + padding),
+            "rectangular", 1.0, "yes",
+        )
+        return call(
+            part, "To Formant (burg)",
+            self.preset.formant_time_step, max_formants, self.formant_ceiling(), window_length, 50,
+        )
@@ -0,0 +1,141 @@
+# 분석 결과 점수 재계산
+# 이전 SCORING_VERSION으로 저장된 결과 행을 저장된 원시 특징값만으로 다시 채점합니다 (오디오 다운로드/DSP 없음).
+# - 조회할 때: ensure_current_scoring(row)가 그 행만 재계산해 결과 행에 반영
+# - 일괄: python -m scripts.rescore_results 가 rescore_rows로 배치 단위 벡터화 재계산
+# 특징값을 저장하기 전(scoring_version이 없는) 행은 재계산할 수 없어 그대로 둡니다.
+from typing import List, Optional
+
+import numpy as np
+
+from app.services import metrics
+from app.services.formant_analysis import KOREAN_VOWELS_FORMANTS, formant_feedback, score_vowel, vocal_tract_scale
+from app.services.scoring import FORMANT_FEATURES, SCORING_VERSION, TONE_FEATURES, formant_scores, tone_scores
+from app.services.supabase import update_analysis_result
+from app.services.tone_analysis import generate_tone_feedback
+
+metrics.describe("truevoice_rescored_results_total", "Analysis results rescored from stored features, by mode")
+
+
+def needs_rescoring(row: dict) -> bool:
+    """이전 점수 공식으로 저장된 행인지 (특징값이 없는 행은 False)"""
+    version = row.get("scoring_version")
+    return version is not None and version < SCORING_VERSION
+
+
+def _features(data: Optional[dict], names: tuple) -> Optional[dict]:
+    features = (data or {}).get("features")
+    if not features or any(features.get(name) is None for name in names):
+        return None
+    return features
+
+
+def _feature_arrays(datas: List[dict], names: tuple) -> dict:
+    """행별 특징값 dict 목록 → 특징별 배열"""
+    return {
+        name: np.array([data["features"][name] for data in datas], dtype=np.float64)
+        for name in names
+    }
+
+
+def _rescore_vowels(vowel_analysis: Optional[list], mean_f3: float) -> Optional[list]:
+    """모음별 평균 F1/F2로 기준 범위와 점수를 다시 계산"""
+    if not vowel_analysis:
+        return vowel_analysis
+    scale = vocal_tract_scale(mean_f3)
+    rescored = []
+    for entry in vowel_analysis:
+        target = KOREAN_VOWELS_FORMANTS.get(entry.get("vowel"))
+        if target is None:
+            rescored.append(entry)
+            continue
+        rescored.append({
+            **entry,
+            "target_f1": [round(target["f1"][0] * scale), round(target["f1"][1] * scale)],
+            "target_f2": [round(target["f2"][0] * scale), round(target["f2"][1] * scale)],
+            "score": round(score_vowel(entry["vowel"], entry["mean_f1"], entry["mean_f2"], scale), 1),
+        })
+    return rescored
+
+
+def _rescore_formant_data(datas: List[dict]) -> List[dict]:
+    features = _feature_arrays(datas, FORMANT_FEATURES)
+    scores = formant_scores(**features)
+    rescored = []
+    for index, data in enumerate(datas):
+        mean_f1, mean_f2, mean_f3 = (float(features[name][index]) for name in ("mean_f1", "mean_f2", "mean_f3"))
+        stability = float(scores["stability_score"][index])
+        resonance = float(scores["resonance_score"][index])
+        vowel_analysis = _rescore_vowels(data.get("vowel_analysis"), mean_f3)
+        rescored.append({
+            **data,
+            "resonance_score": round(resonance, 1),
+            "stability_score": round(stability, 1),
+            "vowel_analysis": vowel_analysis,
+            "feedback": formant_feedback(mean_f1, mean_f2, mean_f3, stability, resonance, vowel_analysis),
+        })
+    return rescored
+
+
+def _rescore_tone_data(datas: List[dict]) -> List[dict]:
+    features = _feature_arrays(datas, TONE_FEATURES)
+    scores = tone_scores(
+        features["mean_pitch"], features["min_pitch"], features["max_pitch"],
+        features["jitter"], features["shimmer"], features["hnr"],
+    )
+    rescored = []
+    for index, data in enumerate(datas):
+        value = {name: float(array[index]) for name, array in {**features, **scores}.items()}
+        rescored.append({
+            **data,
+            "tone_score": round(value["tone_score"], 1),
+            "stability_score": round(value["stability_score"], 1),
+            "clarity_score": round(value["clarity_score"], 1),
+            "intonation_score": round(value["intonation_score"], 1),
+            "mean_pitch": round(value["mean_pitch"], 1),
+            "pitch_range": round(value["pitch_range"], 1),
+            "feedback": generate_tone_feedback(
+                value["mean_pitch"], value["pitch_range"], value["jitter"], value["shimmer"], value["hnr"],
+                value["stability_score"], value["clarity_score"], value["intonation_score"],
+            ),
+        })
+    return rescored
+
+
+def rescore_rows(rows: List[dict]) -> List[dict]:
+    """
+    결과 행 목록을 현재 공식으로 재채점합니다 (배치 전체를 한 번에 벡터화 계산).
+
+    Returns:
+        행별 갱신 필드 [{"id", "formant_data", "tone_data", "scoring_version"}, ...]
+        (일괄 upsert에서 열이 같도록 특징값이 없는 데이터도 그대로 포함)
+    """
+    updates = [
+        {
+            "id": row["id"],
+            "formant_data": row.get("formant_data"),
+            "tone_data": row.get("tone_data"),
+            "scoring_version": SCORING_VERSION,
+        }
+        for row in rows
+    ]
+    for field, names, rescore in (
+        ("formant_data", FORMANT_FEATURES, _rescore_formant_data),
+        ("tone_data", TONE_FEATURES, _rescore_tone_data),
+    ):
+        indices = [index for index, row in enumerate(rows) if _features(row.get(field), names)]
+        if not indices:
+            continue
+        for index, data in zip(indices, rescore([rows[index][field] for index in indices])):
+            updates[index][field] = data
+    return updates
+
+
+def ensure_current_scoring(row: Optional[dict]) -> Optional[dict]:
+    """조회한 결과 행이 이전 공식이면 재채점해 저장하고 갱신된 행을 반환 (저장 실패해도 갱신된 행 반환)"""
+    if not row or not needs_rescoring(row):
+        return row
+    update = rescore_rows([row])[0]
+    update_analysis_result(row["id"], {key: value for key, value in update.items() if key != "id"})
+    metrics.inc("truevoice_rescored_results_total", mode="lazy")
+    print(f"[INFO] 결과 재채점: {row['id']} (v{row.get('scoring_version')} → v{SCORING_VERSION})")
+    return {**row, **update}
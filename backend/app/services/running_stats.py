@@ -0,0 +1,94 @@
+# 병합 가능한 통계 누적기
+# 구간(청크)별로 따로 계산한 통계를 원본 값 없이 합칠 수 있도록 개수/평균/제곱편차합/최솟값/최댓값을 보관합니다.
+# 병합은 Chan 등의 병렬 분산 공식을 사용하므로 합치는 순서와 무관하게 한 번에 계산한 값과 같습니다.
+import math
+from dataclasses import dataclass
+from typing import Iterable
+
+import numpy as np
+
+
+@dataclass
+class RunningStats:
+    """개수, 평균, 분산(제곱편차합), 최솟값, 최댓값 누적기"""
+    count: int = 0
+    mean: float = 0.0
+    m2: float = 0.0                 # 평균과의 제곱편차 합
+    min: float = math.inf
+    max: float = -math.inf
+
+    @classmethod
+    def from_values(cls, values) -> "RunningStats":
+        """값 배열에서 한 번에 계산 (NaN은 호출하는 쪽에서 제거)"""
+        values = np.asarray(values, dtype=np.float64)
+        if values.size == 0:
+            return cls()
+        mean = float(np.mean(values))
+        return cls(
+            count=int(values.size),
+            mean=mean,
+            m2=float(np.sum((values - mean) ** 2)),
+            min=float(np.min(values)),
+            max=float(np.max(values)),
+        )
+
+    def merge(self, other: "RunningStats") -> "RunningStats":
+        """두 누적기를 합친 새 누적기"""
+        if other.count == 0:
+            return RunningStats(self.count, self.mean, self.m2, self.min, self.max)
+        if self.count == 0:
+            return RunningStats(other.count, other.mean, other.m2, other.min, other.max)
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        return RunningStats(
+            count=count,
+            mean=self.mean + delta * other.count / count,
+            m2=self.m2 + other.m2 + delta * delta * self.count * other.count / count,
+            min=min(self.min, other.min),
+            max=max(self.max, other.max),
+        )
+
+    @property
+    def variance(self) -> float:
+        """모분산 (np.var와 같음)"""
+        return self.m2 / self.count if self.count else 0.0
+
+    @property
+    def sample_variance(self) -> float:
+        """표본분산 (n-1, Praat의 Get standard deviation과 같음)"""
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.variance)
+
+    @property
+    def sample_std(self) -> float:
+        return math.sqrt(self.sample_variance)
+
+
+@dataclass
+class WeightedMean:
+    """가중 평균 누적기 (청크별 비율 값을 프레임/주기 수로 가중해 합칠 때)"""
+    total: float = 0.0
+    weight: float = 0.0
+
+    def add(self, value: float, weight: float) -> None:
+        if weight > 0 and not math.isnan(value):
+            self.total += value * weight
+            self.weight += weight
+
+    def merge(self, other: "WeightedMean") -> "WeightedMean":
+        return WeightedMean(self.total + other.total, self.weight + other.weight)
+
+    @property
+    def value(self) -> float:
+        return self.total / self.weight if self.weight else 0.0
+
+
+def merge_all(accumulators: Iterable, empty):
+    """누적기 목록을 하나로 병합 (목록이 비어 있으면 empty)"""
+    merged = empty
+    for accumulator in accumulators:
+        merged = merged.merge(accumulator)
+    return merged
@@ -0,0 +1,156 @@
+# 공명/톤 점수 공식 (벡터화)
+# 저장된 원시 특징값(포먼트 평균/표준편차, 피치 통계, jitter, shimmer, HNR)만으로 점수를 계산합니다.
+# 스칼라 하나(분석 직후)와 결과 행 수백만 개(재계산)가 같은 NumPy 공식을 거칩니다.
+#
+# 공식을 바꾸면 SCORING_VERSION을 올리세요. 이전 버전 결과는 조회할 때(rescoring.ensure_current_scoring)
+# 또는 python -m scripts.rescore_results 로 일괄 재계산됩니다.
+import numpy as np
+
+# 점수 공식 버전 (analysis_results.scoring_version)
+SCORING_VERSION = 1
+
+# 결과 행의 formant_data["features"] / tone_data["features"]에 저장하는 원시 특징값
+FORMANT_FEATURES = ("mean_f1", "mean_f2", "mean_f3", "std_f1", "std_f2", "std_f3")
+TONE_FEATURES = ("mean_pitch", "min_pitch", "max_pitch", "pitch_std", "jitter", "shimmer", "hnr")
+
+
+def _array(values) -> np.ndarray:
+    return np.asarray(values, dtype=np.float64)
+
+
+# =========================================
+# 공명 (포먼트)
+# =========================================
+
+def formant_stability_scores(std_f1, std_f2, std_f3) -> dict:
+    """
+    포먼트 안정성 점수 (표준편차가 낮을수록 높은 점수)
+    일반적으로 F1 표준편차 100Hz 이하, F2 200Hz 이하가 안정적
+    """
+    stability_f1 = np.maximum(0.0, 100 - _array(std_f1) / 2)  # 200Hz 이상이면 0점
+    stability_f2 = np.maximum(0.0, 100 - _array(std_f2) / 4)  # 400Hz 이상이면 0점
+    stability_f3 = np.maximum(0.0, 100 - _array(std_f3) / 5)  # 500Hz 이상이면 0점
+    return {
+        "stability_f1": stability_f1,
+        "stability_f2": stability_f2,
+        "stability_f3": stability_f3,
+        "stability_score": stability_f1 * 0.4 + stability_f2 * 0.4 + stability_f3 * 0.2,
+    }
+
+
+def resonance_scores(f1, f2, f3, stability) -> np.ndarray:
+    """
+    공명 품질 점수 계산
+
+    좋은 공명의 특징:
+    - F1, F2, F3가 적절한 범위 내에 있음
+    - 포먼트 간 적절한 간격 유지
+    - 안정적인 포먼트 값
+    """
+    f1, f2 = _array(f1), _array(f2)
+    score = np.full(np.broadcast(f1, f2).shape, 50.0)  # 기본 점수
+
+    # F1 범위 체크 (250-900Hz가 일반적)
+    score += np.select([(250 <= f1) & (f1 <= 900), (200 <= f1) & (f1 <= 1000)], [15, 10], -10)
+
+    # F2 범위 체크 (700-2800Hz가 일반적)
+    score += np.select([(700 <= f2) & (f2 <= 2800), (600 <= f2) & (f2 <= 3000)], [15, 10], -10)
+
+    # F2/F1 비율 체크 (1.5-4.0이 일반적)
+    ratio = np.divide(f2, f1, out=np.zeros(score.shape), where=f1 > 0)
+    score += np.select([(1.5 <= ratio) & (ratio <= 4.0), (1.2 <= ratio) & (ratio <= 5.0)], [10, 5], 0)
+
+    # 안정성 반영
+    score += _array(stability) * 0.1
+
+    return np.clip(score, 0, 100)
+
+
+def formant_scores(mean_f1, mean_f2, mean_f3, std_f1, std_f2, std_f3) -> dict:
+    """포먼트 특징값 배열 → 안정성/공명 점수 배열"""
+    scores = formant_stability_scores(std_f1, std_f2, std_f3)
+    scores["resonance_score"] = resonance_scores(mean_f1, mean_f2, mean_f3, scores["stability_score"])
+    return scores
+
+
+# =========================================
+# 톤
+# =========================================
+
+def stability_scores(jitter, shimmer) -> np.ndarray:
+    """
+    안정성 점수 계산
+    - Jitter < 1%: 정상
+    - Shimmer < 3%: 정상
+    """
+    jitter, shimmer = _array(jitter), _array(shimmer)
+    # Jitter 점수 (0-50)
+    jitter_score = np.select(
+        [jitter < 0.5, jitter < 1.0, jitter < 2.0], [50, 40, 25], np.maximum(0, 50 - jitter * 10)
+    )
+    # Shimmer 점수 (0-50)
+    shimmer_score = np.select(
+        [shimmer < 2, shimmer < 4, shimmer < 6], [50, 40, 25], np.maximum(0, 50 - shimmer * 5)
+    )
+    return np.minimum(100, jitter_score + shimmer_score)
+
+
+def clarity_scores(hnr) -> np.ndarray:
+    """
+    명료도 점수 계산
+    - HNR > 20 dB: 매우 맑음
+    - HNR 10-20 dB: 보통
+    - HNR < 10 dB: 거칠음
+    """
+    hnr = _array(hnr)
+    return np.select(
+        [hnr >= 20, hnr >= 15, hnr >= 10, hnr >= 5],
+        [100, 80 + (hnr - 15) * 4, 60 + (hnr - 10) * 4, 40 + (hnr - 5) * 4],
+        np.maximum(0, hnr * 8),
+    )
+
+
+def intonation_scores(pitch_range, mean_pitch) -> np.ndarray:
+    """
+    억양 풍부함 점수 계산
+    - 적당한 피치 변화가 있으면 높은 점수
+    - 너무 단조롭거나 너무 변화가 심하면 낮은 점수
+    """
+    pitch_range, mean_pitch = _array(pitch_range), _array(mean_pitch)
+    # 피치 범위 비율 (평균 대비)
+    shape = np.broadcast(pitch_range, mean_pitch).shape
+    ratio = np.divide(pitch_range, mean_pitch, out=np.zeros(shape), where=mean_pitch > 0)
+
+    # 이상적인 범위: 0.3 ~ 0.8 (평균의 30-80%), 너무 단조로우면 40, 너무 변화가 심하면 50
+    return np.select(
+        [
+            mean_pitch == 0,
+            (0.3 <= ratio) & (ratio <= 0.8),
+            (0.2 <= ratio) & (ratio <= 1.0),
+            (0.1 <= ratio) & (ratio <= 1.2),
+            ratio < 0.1,
+        ],
+        [50, 100, 80, 60, 40],
+        50,
+    ).astype(np.float64)
+
+
+def pitch_ranges(min_pitch, max_pitch) -> np.ndarray:
+    """피치 범위 (최솟값이 없으면 0)"""
+    min_pitch, max_pitch = _array(min_pitch), _array(max_pitch)
+    return np.where(min_pitch > 0, max_pitch - min_pitch, 0.0)
+
+
+def tone_scores(mean_pitch, min_pitch, max_pitch, jitter, shimmer, hnr) -> dict:
+    """톤 특징값 배열 → 안정성/명료도/억양/종합 점수 배열"""
+    pitch_range = pitch_ranges(min_pitch, max_pitch)
+    stability = stability_scores(jitter, shimmer)
+    clarity = clarity_scores(hnr)
+    intonation = intonation_scores(pitch_range, mean_pitch)
+    return {
+        "pitch_range": pitch_range,
+        "stability_score": stability,
+        "clarity_score": clarity,
+        "intonation_score": intonation,
+        "tone_score": stability * 0.3 + clarity * 0.4 + intonation * 0.3,
+    }
@@ -0,0 +1,46 @@
+# 문장별 점수 집계 해석
+# sentence_stats 행(DB 트리거가 누적하는 개수/합계/제곱합/히스토그램)에서 평균과 표준편차를 계산합니다.
+# 행 하나만 읽으므로 결과가 몇 개든 조회 비용이 같습니다.
+import math
+from typing import Optional
+
+# sentence_stats 열 접두사 (<점수>_sum, <점수>_sumsq)
+SCORE_METRICS = ("pronunciation", "accuracy", "fluency", "completeness", "resonance", "tone")
+
+# 결과마다 항상 있는 점수 (개수 = attempts), 나머지는 <점수>_count
+ALWAYS_SCORED = ("pronunciation", "accuracy", "fluency", "completeness")
+
+# 발음 점수 히스토그램 칸 너비 (0-100점을 10칸)
+HISTOGRAM_BUCKET_WIDTH = 10
+
+
+def score_distribution(count: int, total: float, total_sq: float) -> dict:
+    """개수/합계/제곱합 → 평균과 (모)표준편차 (개수가 0이면 None)"""
+    if count <= 0:
+        return {"count": 0, "mean": None, "std": None}
+    mean = total / count
+    # 부동소수점 누적 오차로 아주 작은 음수가 될 수 있음
+    variance = max(0.0, total_sq / count - mean * mean)
+    return {"count": count, "mean": round(mean, 2), "std": round(math.sqrt(variance), 2)}
+
+
+def summarize_sentence_stats(row: Optional[dict]) -> Optional[dict]:
+    """sentence_stats 행 → 점수별 분포와 발음 점수 히스토그램"""
+    if not row or row.get("attempts", 0) <= 0:
+        return None
+    attempts = row["attempts"]
+    scores = {
+        metric: score_distribution(
+            attempts if metric in ALWAYS_SCORED else row.get(f"{metric}_count", 0),
+            row.get(f"{metric}_sum", 0.0),
+            row.get(f"{metric}_sumsq", 0.0),
+        )
+        for metric in SCORE_METRICS
+    }
+    return {
+        "original_text": row["original_text"],
+        "attempts": attempts,
+        "scores": scores,
+        "pronunciation_histogram": row.get("pronunciation_histogram") or [],
+        "histogram_bucket_width": HISTOGRAM_BUCKET_WIDTH,
+    }
@@ -0,0 +1,69 @@
+# 단일 실행(single-flight) 서비스
+# 같은 키로 동시에 들어온 요청이 하나의 진행 중 작업을 공유하도록 합니다.
+# (예: 같은 녹음에 대한 더블 탭, 응답 대기 중 클라이언트 재시도)
+import asyncio
+from typing import Awaitable, Callable, Dict, Hashable, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlightConflict(Exception):
+    """같은 키의 작업이 다른 옵션(tag)으로 진행 중이라 공유할 수 없을 때 발생하는 예외"""
+
+
+class SingleFlight:
+    """
+    프로세스 내 single-flight 그룹
+
+    - 첫 호출자가 작업을 시작하고, 진행 중에 들어온 호출자는 같은 작업의 결과를 기다림
+    - 작업이 끝나면 키를 지우므로 이후 호출은 새로 실행됨
+    - 대기자 한 명이 연결을 끊어도 작업은 취소되지 않음 (shield)
+    - 마지막 대기자까지 떠나면(취소되면) 아무도 받지 않을 작업이므로 작업도 취소
+    - tag가 다른 호출은 결과를 공유하지 않고 SingleFlightConflict로 거절
+    """
+
+    def __init__(self):
+        self._tasks: Dict[Hashable, asyncio.Task] = {}
+        self._tags: Dict[Hashable, Hashable] = {}
+        self._waiters: Dict[Hashable, int] = {}
+
+    def in_flight(self, key: Hashable) -> bool:
+        return key in self._tasks
+
+    async def do(self, key: Hashable, factory: Callable[[], Awaitable[T]],
+                 tag: Optional[Hashable] = None) -> T:
+        """
+        key로 진행 중인 작업이 있으면 그 결과를, 없으면 factory()를 실행한 결과를 반환합니다.
+        예외도 모든 대기자에게 그대로 전달됩니다.
+
+        tag는 작업의 결과를 바꾸는 옵션입니다. 진행 중인 작업과 tag가 다르면
+        다른 옵션의 결과를 조용히 받지 않도록 SingleFlightConflict를 발생시킵니다.
+        """
+        task = self._tasks.get(key)
+        if task is None:
+            task = asyncio.ensure_future(factory())
+            self._tasks[key] = task
+            self._tags[key] = tag
+            task.add_done_callback(lambda done: self._forget(key, done))
+        elif self._tags.get(key) != tag:
+            raise SingleFlightConflict(key)
+        else:
+            print(f"[INFO] 진행 중인 작업 공유: {key}")
+
+        self._waiters[key] = self._waiters.get(key, 0) + 1
+        try:
+            return await asyncio.shield(task)
+        finally:
+            self._waiters[key] -= 1
+            if self._waiters[key] == 0:
+                del self._waiters[key]
+                if not task.done():
+                    # 정리 중인 작업에 새 호출자가 붙지 않도록 바로 키에서 제거
+                    print(f"[INFO] 기다리는 호출자가 없어 작업 취소: {key}")
+                    self._forget(key, task)
+                    task.cancel()
+
+    def _forget(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._tasks.get(key) is task:
+            del self._tasks[key]
+            del self._tags[key]
@@ -1,9 +1,13 @@
 # Supabase 서비스 - 데이터베이스 및 스토리지 연동
 import os
+import time
 import uuid
-from typing import Optional
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
 from dotenv import load_dotenv
 
+from app.services.cancellation import CancelToken
+
 load_dotenv()
 
 # 개발 모드 확인
@@ -30,6 +34,18 @@ elif not DEV_MODE:
     DEV_MODE = True
 
 
+# 분석 산출물(시계열 바이너리 등) 저장 버킷
+ARTIFACTS_BUCKET = os.getenv("SUPABASE_ARTIFACTS_BUCKET", "analysis-artifacts")
+
+# 분석 점유(lease) 시간 (초): 이 시간이 지나도 analyzing이면 중단된 분석으로 보고 다시 점유 가능
+ANALYSIS_LEASE_SECONDS = int(os.getenv("ANALYSIS_LEASE_SECONDS", "300"))
+
+# DEV_MODE에서 저장한 결과/산출물/분석 점유 (프로세스 메모리)
+_dev_results: dict = {}
+_dev_artifacts: dict = {}
+_dev_claims: dict = {}
+
+
 def get_recording(recording_id: str) -> Optional[dict]:
     """녹음 정보 조회"""
     if DEV_MODE:
@@ -51,6 +67,8 @@ def update_recording_status(recording_id: str, status: str) -> bool:
     """녹음 상태 업데이트"""
     if DEV_MODE:
         print(f"[DEV_MODE] 상태 업데이트: {recording_id} -> {status}")
+        if status != "analyzing":
+            _dev_claims.pop(recording_id, None)
         return True
     try:
         supabase.table("recordings").update({"status": status}).eq("id", recording_id).execute()
@@ -60,6 +78,60 @@ def update_recording_status(recording_id: str, status: str) -> bool:
         return False
 
 
+def claim_recording(recording_id: str, lease_seconds: int = ANALYSIS_LEASE_SECONDS) -> Optional[bool]:
+    """
+    녹음 분석 점유 (인스턴스 간 중복 분석 방지)
+
+    status가 analyzing이 아니거나, analyzing이지만 lease가 만료된 경우에만
+    조건부 UPDATE 한 번으로 analyzing으로 바꿉니다. 바뀐 행이 있으면 점유 성공입니다.
+
+    Returns:
+        True (점유 성공), False (다른 인스턴스가 분석 중), None (DB 오류로 알 수 없음)
+    """
+    now = datetime.now(timezone.utc)
+    if DEV_MODE:
+        started_at = _dev_claims.get(recording_id)
+        if started_at and now - started_at < timedelta(seconds=lease_seconds):
+            return False
+        _dev_claims[recording_id] = now
+        return True
+    try:
+        expired = (now - timedelta(seconds=lease_seconds)).isoformat()
+        response = (
+            supabase.table("recordings")
+            .update({"status": "analyzing", "analysis_started_at": now.isoformat()})
+            .eq("id", recording_id)
+            .or_(f"status.neq.analyzing,analysis_started_at.is.null,analysis_started_at.lt.{expired}")
+            .execute()
+        )
+        return bool(response.data)
+    except Exception as e:
+        print(f"분석 점유 오류: {e}")
+        return None
+
+
+def wait_for_analysis(recording_id: str, timeout: float = ANALYSIS_LEASE_SECONDS,
+                      interval: float = 1.0, cancel: Optional[CancelToken] = None) -> Optional[str]:
+    """
+    다른 인스턴스가 점유한 분석이 끝날 때까지 상태를 폴링합니다.
+    cancel이 취소되면 다음 폴링을 기다리지 않고 바로 AnalysisCancelled를 발생시킵니다.
+
+    Returns:
+        최종 상태 (completed / failed 등), 시간 안에 끝나지 않으면 None
+    """
+    cancel = cancel or CancelToken()
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if cancel.wait(interval):
+            cancel.check()
+        recording = get_recording(recording_id)
+        status = recording.get("status") if recording else None
+        if status != "analyzing":
+            return status
+        interval = min(interval * 1.5, 5.0)
+    return None
+
+
 def save_analysis_result(
     recording_id: str,
     accuracy_score: float,
@@ -67,24 +139,39 @@ def save_analysis_result(
     completeness_score: float,
     pronunciation_score: float,
     feedback: str,
+    word_details: Optional[list] = None,  # 단어별 상세 결과 (점수, 오류 유형, 시간)
     formant_data: Optional[dict] = None,  # 공명 분석 결과
     tone_data: Optional[dict] = None,     # 톤 분석 결과
+    contour_path: Optional[str] = None,   # 시계열 바이너리 경로 (artifacts 버킷)
+    waveform_path: Optional[str] = None,  # 파형 피크 바이너리 경로 (artifacts 버킷)
+    pending_stages: Optional[list] = None,  # 마감 뒤 백그라운드에서 계산 중인 단계
+    analysis_preset: Optional[str] = None,  # 분석 품질 프리셋 (fast, balanced, accurate)
+    scoring_version: Optional[int] = None,  # 점수 공식 버전 (formant_data/tone_data의 features로 재계산 가능)
 ) -> Optional[dict]:
     """분석 결과 저장"""
     if DEV_MODE:
         mock_id = str(uuid.uuid4())
         print(f"[DEV_MODE] 결과 저장: {mock_id}")
-        return {
+        result = {
             "id": mock_id,
             "recording_id": recording_id,
+            "created_at": "2024-01-01T00:00:00Z",
             "accuracy_score": accuracy_score,
             "fluency_score": fluency_score,
             "completeness_score": completeness_score,
             "pronunciation_score": pronunciation_score,
             "feedback": feedback,
+            "word_details": word_details,
             "formant_data": formant_data,
             "tone_data": tone_data,
+            "contour_path": contour_path,
+            "waveform_path": waveform_path,
+            "pending_stages": pending_stages,
+            "analysis_preset": analysis_preset,
+            "scoring_version": scoring_version,
         }
+        _dev_results[mock_id] = result
+        return result
     try:
         data = {
             "recording_id": recording_id,
@@ -94,12 +181,30 @@ def save_analysis_result(
             "pronunciation_score": pronunciation_score,
             "feedback": feedback,
         }
+        # 단어별 상세 결과 추가
+        if word_details:
+            data["word_details"] = word_details
         # 공명 데이터 추가
         if formant_data:
             data["formant_data"] = formant_data
         # 톤 데이터 추가
         if tone_data:
             data["tone_data"] = tone_data
+        # 시계열 바이너리 경로 추가
+        if contour_path:
+            data["contour_path"] = contour_path
+        # 파형 피크 바이너리 경로 추가
+        if waveform_path:
+            data["waveform_path"] = waveform_path
+        # 계산 중인 단계 추가
+        if pending_stages:
+            data["pending_stages"] = pending_stages
+        # 분석 품질 프리셋 추가
+        if analysis_preset:
+            data["analysis_preset"] = analysis_preset
+        # 점수 공식 버전 추가
+        if scoring_version is not None:
+            data["scoring_version"] = scoring_version
 
         response = supabase.table("analysis_results").insert(data).execute()
         return response.data[0] if response.data else None
@@ -108,9 +213,132 @@ def save_analysis_result(
         return None
 
 
+def update_analysis_result(result_id: str, fields: dict) -> bool:
+    """분석 결과 일부 갱신 (지연된 단계 결과 반영 등)"""
+    if DEV_MODE:
+        print(f"[DEV_MODE] 결과 갱신: {result_id} {sorted(fields)}")
+        if result_id in _dev_results:
+            _dev_results[result_id].update(fields)
+        return True
+    try:
+        supabase.table("analysis_results").update(fields).eq("id", result_id).execute()
+        return True
+    except Exception as e:
+        print(f"결과 갱신 오류: {e}")
+        return False
+
+
+def list_stale_pending_results(older_than: str, limit: int = 20) -> Optional[List[dict]]:
+    """
+    pending_stages가 남은 채 older_than(ISO 8601)보다 오래된 결과 (오래된 순, 조회 실패하면 None)
+    지연 단계를 맡은 프로세스가 재시작됐거나 결과 갱신에 실패한 행입니다.
+    """
+    if DEV_MODE:
+        cutoff = datetime.fromisoformat(older_than)
+        rows = sorted(
+            (row for row in _dev_results.values()
+             if row.get("pending_stages")
+             and datetime.fromisoformat(row["created_at"].replace("Z", "+00:00")) < cutoff),
+            key=lambda row: row["created_at"],
+        )
+        return rows[:limit]
+    try:
+        response = (
+            supabase.table("analysis_results")
+            .select("id, recording_id, created_at, word_details, pending_stages, analysis_preset, contour_path")
+            .not_.is_("pending_stages", "null")
+            .neq("pending_stages", "[]")
+            .lt("created_at", older_than)
+            .order("created_at")
+            .limit(limit)
+            .execute()
+        )
+        return response.data or []
+    except Exception as e:
+        print(f"지연 단계 조회 오류: {e}")
+        return None
+
+
+def take_pending_stages(result_id: str) -> Optional[bool]:
+    """
+    오래된 지연 단계 정리 점유: pending_stages가 남아 있을 때만 조건부 UPDATE로 비웁니다.
+    바뀐 행이 있으면 이 인스턴스가 남은 단계를 다시 계산합니다 (인스턴스 간 중복 계산 방지).
+
+    Returns:
+        True (점유 성공), False (이미 다른 곳에서 정리됨), None (DB 오류)
+    """
+    if DEV_MODE:
+        row = _dev_results.get(result_id)
+        if not row or not row.get("pending_stages"):
+            return False
+        row["pending_stages"] = None
+        return True
+    try:
+        response = (
+            supabase.table("analysis_results")
+            .update({"pending_stages": None})
+            .eq("id", result_id)
+            .not_.is_("pending_stages", "null")
+            .execute()
+        )
+        return bool(response.data)
+    except Exception as e:
+        print(f"지연 단계 점유 오류: {e}")
+        return None
+
+
+def list_results_for_rescoring(scoring_version: int, after_id: Optional[str] = None,
+                               limit: int = 1000) -> list:
+    """
+    scoring_version보다 이전 공식으로 저장된 결과 행 (id 순 keyset 페이지).
+    재채점에 필요한 열만 조회합니다.
+    """
+    if DEV_MODE:
+        rows = sorted(
+            (row for row in _dev_results.values()
+             if row.get("scoring_version") is not None and row["scoring_version"] < scoring_version
+             and (after_id is None or row["id"] > after_id)),
+            key=lambda row: row["id"],
+        )
+        return rows[:limit]
+    try:
+        query = (
+            supabase.table("analysis_results")
+            .select("id, scoring_version, formant_data, tone_data")
+            .lt("scoring_version", scoring_version)
+            .order("id")
+            .limit(limit)
+        )
+        if after_id:
+            query = query.gt("id", after_id)
+        return query.execute().data or []
+    except Exception as e:
+        print(f"재채점 대상 조회 오류: {e}")
+        return []
+
+
+def upsert_analysis_results(rows: list) -> bool:
+    """결과 행 일부 열을 id 기준으로 한 번에 갱신 (모든 행의 열 구성이 같아야 함)"""
+    if not rows:
+        return True
+    if DEV_MODE:
+        for row in rows:
+            if row["id"] in _dev_results:
+                _dev_results[row["id"]].update(row)
+        return True
+    try:
+        supabase.table("analysis_results").upsert(rows, on_conflict="id").execute()
+        return True
+    except Exception as e:
+        print(f"결과 일괄 갱신 오류: {e}")
+        return False
+
+
 def get_analysis_result(result_id: str) -> Optional[dict]:
     """분석 결과 조회 (result_id로)"""
     if DEV_MODE:
+        if result_id in _dev_results:
+            return _dev_results[result_id]
         return {
             "id": result_id,
             "recording_id": "mock-recording-id",
@@ -161,6 +389,199 @@ def get_analysis_result_by_recording(recording_id: str) -> Optional[dict]:
         return None
 
 
+def _after_cursor(query, after: Optional[Tuple[str, str]], desc: bool = False):
+    """
+    (created_at, id) keyset 커서 이후 행만 (desc면 정렬 순서상 이후 = 더 이전 시각)
+    OR 조건만으로는 인덱스 범위를 좁히지 못하므로 created_at 경계를 함께 걸어 커서 위치부터 스캔합니다.
+    """
+    if after is None:
+        return query
+    created_at, row_id = after
+    op = "lt" if desc else "gt"
+    bounded = query.lte("created_at", created_at) if desc else query.gte("created_at", created_at)
+    return bounded.or_(
+        f'created_at.{op}."{created_at}",and(created_at.eq."{created_at}",id.{op}.{row_id})'
+    )
+
+
+def list_recordings_page(after: Optional[Tuple[str, str]] = None, limit: int = 100,
+                         desc: bool = False, status: Optional[str] = None) -> Optional[List[dict]]:
+    """녹음 목록 한 페이지 ((created_at, id) keyset 페이지, 조회 실패하면 None)"""
+    if DEV_MODE:
+        return []
+    try:
+        query = (
+            supabase.table("recordings")
+            .select("*")
+            .order("created_at", desc=desc)
+            .order("id", desc=desc)
+            .limit(limit)
+        )
+        if status:
+            query = query.eq("status", status)
+        return _after_cursor(query, after, desc).execute().data or []
+    except Exception as e:
+        print(f"녹음 목록 조회 오류: {e}")
+        return None
+
+
+def list_analysis_results_page(columns: str, after: Optional[Tuple[str, str]] = None,
+                               limit: int = 20, recording_id: Optional[str] = None) -> Optional[List[dict]]:
+    """
+    분석 결과 목록 한 페이지 (최신순 (created_at, id) keyset 페이지, 조회 실패하면 None)
+    columns로 필요한 열만 조회합니다 (PostgREST select 문법, JSON 경로 포함).
+    """
+    if DEV_MODE:
+        def key(row):
+            return datetime.fromisoformat(row["created_at"]).isoformat(), row["id"]
+        rows = sorted(
+            (row for row in _dev_results.values()
+             if (recording_id is None or row["recording_id"] == recording_id)
+             and (after is None or key(row) < after)),
+            key=key,
+            reverse=True,
+        )
+        return rows[:limit]
+    try:
+        query = (
+            supabase.table("analysis_results")
+            .select(columns)
+            .order("created_at", desc=True)
+            .order("id", desc=True)
+            .limit(limit)
+        )
+        if recording_id:
+            query = query.eq("recording_id", recording_id)
+        return _after_cursor(query, after, desc=True).execute().data or []
+    except Exception as e:
+        print(f"결과 목록 조회 오류: {e}")
+        return None
+
+
+def count_recordings(after: Optional[Tuple[str, str]] = None) -> Optional[int]:
+    """커서 이후 녹음 수 (진행률/남은 시간 계산용, 실패하면 None)"""
+    if DEV_MODE:
+        return 0
+    try:
+        query = supabase.table("recordings").select("id", count="exact").limit(1)
+        return _after_cursor(query, after).execute().count
+    except Exception as e:
+        print(f"녹음 수 조회 오류: {e}")
+        return None
+
+
+def list_results_for_export(columns: str, after: Optional[Tuple[str, str]] = None, limit: int = 5000,
+                            start: Optional[str] = None, end: Optional[str] = None,
+                            status: Optional[str] = None) -> Optional[List[dict]]:
+    """
+    내보내기용 결과 목록 한 페이지 ((created_at, id) 오름차순 keyset 페이지, 조회 실패하면 None)
+
+    Args:
+        columns: select 열 (recordings!inner(...)로 녹음 열을 함께 조회)
+        start, end: created_at 범위 [start, end)
+        status: 녹음 상태 필터
+    """
+    if DEV_MODE:
+        return []
+    try:
+        query = (
+            supabase.table("analysis_results")
+            .select(columns)
+            .order("created_at")
+            .order("id")
+            .limit(limit)
+        )
+        if start:
+            query = query.gte("created_at", start)
+        if end:
+            query = query.lt("created_at", end)
+        if status:
+            query = query.eq("recordings.status", status)
+        return _after_cursor(query, after).execute().data or []
+    except Exception as e:
+        print(f"내보내기 결과 조회 오류: {e}")
+        return None
+
+
+def get_latest_results_for_recordings(recording_ids: List[str]) -> Optional[Dict[str, dict]]:
+    """녹음별 최신 분석 결과 {recording_id: 행} (백필 대상 판단과 산출물 교체에 쓰는 열만, 조회 실패하면 None)"""
+    if DEV_MODE or not recording_ids:
+        return {}
+    try:
+        response = (
+            supabase.table("analysis_results")
+            .select("id, recording_id, created_at, word_details, formant_data, tone_data, contour_path, waveform_path")
+            .in_("recording_id", recording_ids)
+            .order("created_at", desc=True)
+            .execute()
+        )
+    except Exception as e:
+        print(f"결과 목록 조회 오류: {e}")
+        return None
+    latest = {}
+    for row in response.data or []:
+        latest.setdefault(row["recording_id"], row)
+    return latest
+
+
+def get_weak_words(limit: int = 20, min_attempts: int = 1) -> Optional[List[dict]]:
+    """자주 틀리는 단어 (word_stats 누적 집계, 오류 횟수 내림차순, 조회 실패하면 None)"""
+    if DEV_MODE:
+        return []
+    try:
+        response = (
+            supabase.table("word_stats")
+            .select("word, attempts, error_count, error_rate, mean_score")
+            .gte("attempts", min_attempts)
+            .order("error_count", desc=True)
+            .limit(limit)
+            .execute()
+        )
+        return response.data or []
+    except Exception as e:
+        print(f"약한 단어 조회 오류: {e}")
+        return None
+
+
+def get_sentence_word_stats(original_text: str, limit: int = 5,
+                            min_attempts: int = 1) -> Optional[List[dict]]:
+    """문장 안 단어별 누적 집계 (평균 점수 오름차순 = 어려운 단어부터, 조회 실패하면 None)"""
+    if DEV_MODE:
+        return []
+    try:
+        response = (
+            supabase.table("sentence_word_stats")
+            .select("position, word, attempts, error_count, error_rate, mean_score")
+            .eq("original_text", original_text)
+            .gte("attempts", min_attempts)
+            .order("mean_score")
+            .limit(limit)
+            .execute()
+        )
+        return response.data or []
+    except Exception as e:
+        print(f"문장 단어 조회 오류: {e}")
+        return None
+
+
+def get_sentence_stats(original_text: str) -> Optional[dict]:
+    """문장별 점수 집계 행 (sentence_stats, 없거나 조회 실패하면 None)"""
+    if DEV_MODE:
+        return None
+    try:
+        response = (
+            supabase.table("sentence_stats")
+            .select("*")
+            .eq("original_text", original_text)
+            .limit(1)
+            .execute()
+        )
+        return response.data[0] if response.data else None
+    except Exception as e:
+        print(f"문장 통계 조회 오류: {e}")
+        return None
+
+
 def get_recording_file_url(file_path: str) -> str:
     """녹음 파일의 공개 URL 가져오기"""
     if DEV_MODE:
@@ -204,3 +625,53 @@ def download_recording_file(file_path: str) -> Optional[bytes]:
     except Exception as e:
         print(f"[ERROR] 파일 다운로드 실패: {e}")
         return None
+
+
+def upload_artifact(path: str, data: bytes, content_type: str = "application/octet-stream") -> bool:
+    """
+    분석 산출물 업로드 (artifacts 버킷)
+
+    Args:
+        path: 버킷 내 경로 (예: contours/<recording_id>/<uuid>.tvc)
+        data: 바이너리 데이터
+        content_type: MIME 타입
+    """
+    if DEV_MODE:
+        _dev_artifacts[path] = data
+        return True
+    try:
+        supabase.storage.from_(ARTIFACTS_BUCKET).upload(
+            path, data, {"content-type": content_type, "upsert": "true"}
+        )
+        return True
+    except Exception as e:
+        print(f"[ERROR] 산출물 업로드 실패: {e}")
+        return False
+
+
+def download_artifact(path: str) -> Optional[bytes]:
+    """분석 산출물 다운로드 (artifacts 버킷)"""
+    if DEV_MODE:
+        return _dev_artifacts.get(path)
+    try:
+        response = supabase.storage.from_(ARTIFACTS_BUCKET).download(path)
+        return response if response else None
+    except Exception as e:
+        print(f"[ERROR] 산출물 다운로드 실패: {e}")
+        return None
+
+
+def delete_artifacts(paths: List[str]) -> bool:
+    """분석 산출물 삭제 (artifacts 버킷, 다시 분석해 새 경로로 바뀐 이전 산출물 정리용)"""
+    if not paths:
+        return True
+    if DEV_MODE:
+        for path in paths:
+            _dev_artifacts.pop(path, None)
+        return True
+    try:
+        supabase.storage.from_(ARTIFACTS_BUCKET).remove(paths)
+        return True
+    except Exception as e:
+        print(f"[ERROR] 산출물 삭제 실패: {e}")
+        return False
@@ -1,7 +1,6 @@
 # 톤(Tone) 분석 서비스
 # 피치, 억양, 목소리 안정성 등을 분석합니다.
 import os
-import tempfile
 from typing import Optional
 from dataclasses import dataclass
 import numpy as np
@@ -19,6 +18,12 @@ try:
 except ImportError:
     LIBROSA_AVAILABLE = False
 
+from app.services.praat_context import PraatAnalysisContext
+from app.services.scoring import clarity_scores, intonation_scores, stability_scores, tone_scores
+
+# 톤 분석 엔진 선택 (praat: parselmouth, numpy: 벡터화 NumPy/SciPy 구현)
+TONE_ENGINE = os.getenv("TONE_ENGINE", "praat").lower()
+
 
 @dataclass
 class ToneResult:
@@ -38,6 +43,12 @@ class ToneResult:
     shimmer: float = 0.0           # 음량 떨림 (%) - 낮을수록 안정
     hnr: float = 0.0               # 소음 대비 명료도 (dB) - 높을수록 맑음
     
+    # 시계열 데이터 (선택적, 유성 프레임만): [{'time': 0.01, 'f0': 182.3}, ...]
+    pitch_track: list = None
+
+    # 점수 재계산용 원시 특징값 (scoring.TONE_FEATURES)
+    features: dict = None
+    
     # 종합 점수 (0-100)
     stability_score: float = 0.0   # 안정성 점수
     clarity_score: float = 0.0     # 명료도 점수
@@ -48,17 +59,28 @@ class ToneResult:
     feedback: str = ""
 
 
-def analyze_tone(audio_data: bytes, sample_rate: int = 16000) -> ToneResult:
+def analyze_tone(audio_data: bytes, sample_rate: int = 16000, engine: Optional[str] = None,
+                 context: Optional[PraatAnalysisContext] = None) -> ToneResult:
     """
     오디오 데이터에서 톤을 분석합니다.
     
     Args:
         audio_data: WAV 형식의 오디오 데이터 (bytes)
         sample_rate: 샘플링 레이트 (기본 16000Hz)
+        engine: 분석 엔진 ("praat" 또는 "numpy", 기본값은 TONE_ENGINE 설정)
+        context: 포먼트 분석과 공유하는 Praat 분석 컨텍스트 (없으면 새로 생성)
     
     Returns:
         ToneResult: 톤 분석 결과
     """
+    if (engine or TONE_ENGINE) == "numpy":
+        from app.services.numpy_tone import analyze_tone_numpy
+        return analyze_tone_numpy(audio_data)
+    return _analyze_tone_praat(audio_data, context)
+
+
+def _analyze_tone_praat(audio_data: bytes, context: Optional[PraatAnalysisContext] = None) -> ToneResult:
+    """Praat(parselmouth)으로 톤을 분석합니다."""
     if not PARSELMOUTH_AVAILABLE:
         return ToneResult(
             success=False,
@@ -66,33 +88,21 @@ def analyze_tone(audio_data: bytes, sample_rate: int = 16000) -> ToneResult:
             feedback="톤 분석 라이브러리가 설치되지 않았습니다."
         )
     
-    temp_file_path = None
     try:
-        # 임시 파일에 오디오 저장
-        with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as temp_file:
-            temp_file.write(audio_data)
-            temp_file_path = temp_file.name
-        
-        # Praat Sound 객체 생성
-        sound = parselmouth.Sound(temp_file_path)
+        # Sound/Pitch/PointProcess는 컨텍스트에서 한 번만 계산
+        if context is None:
+            context = PraatAnalysisContext.from_wav_bytes(audio_data)
+        sound = context.sound
         
         # 1. 피치 분석
-        pitch = call(sound, "To Pitch", 0.0, 75, 600)
-        
-        mean_pitch = call(pitch, "Get mean", 0, 0, "Hertz")
-        min_pitch = call(pitch, "Get minimum", 0, 0, "Hertz", "Parabolic")
-        max_pitch = call(pitch, "Get maximum", 0, 0, "Hertz", "Parabolic")
-        pitch_std = call(pitch, "Get standard deviation", 0, 0, "Hertz")
+        stats = context.pitch_stats()
+        mean_pitch = stats["mean"]
+        min_pitch = stats["min"]
+        max_pitch = stats["max"]
+        pitch_std = stats["std"]
         
-        # NaN 처리
-        mean_pitch = 0 if np.isnan(mean_pitch) else mean_pitch
-        min_pitch = 0 if np.isnan(min_pitch) else min_pitch
-        max_pitch = 0 if np.isnan(max_pitch) else max_pitch
-        pitch_std = 0 if np.isnan(pitch_std) else pitch_std
-        pitch_range = max_pitch - min_pitch if min_pitch > 0 else 0
-        
-        # 2. 목소리 품질 분석
-        point_process = call(sound, "To PointProcess (periodic, cc)", 75, 600)
+        # 2. 목소리 품질 분석 (포인트 프로세스는 이미 계산한 피치에서 유도)
+        point_process = context.point_process
         
         # Jitter (피치 떨림)
         jitter = call(point_process, "Get jitter (local)", 0, 0, 0.0001, 0.02, 1.3)
@@ -103,37 +113,14 @@ def analyze_tone(audio_data: bytes, sample_rate: int = 16000) -> ToneResult:
         shimmer = 0 if np.isnan(shimmer) else shimmer * 100  # 퍼센트로 변환
         
         # HNR (Harmonics-to-Noise Ratio)
-        harmonicity = call(sound, "To Harmonicity (cc)", 0.01, 75, 0.1, 1.0)
+        harmonicity = call(sound, "To Harmonicity (cc)", context.preset.harmonicity_time_step, 75, 0.1, 1.0)
         hnr = call(harmonicity, "Get mean", 0, 0)
         hnr = 0 if np.isnan(hnr) else hnr
         
-        # 3. 점수 계산
-        stability_score = calculate_stability_score(jitter, shimmer)
-        clarity_score = calculate_clarity_score(hnr)
-        intonation_score = calculate_intonation_score(pitch_range, mean_pitch)
-        tone_score = (stability_score * 0.3 + clarity_score * 0.4 + intonation_score * 0.3)
-        
-        # 4. 피드백 생성
-        feedback = generate_tone_feedback(
-            mean_pitch, pitch_range, jitter, shimmer, hnr,
-            stability_score, clarity_score, intonation_score
-        )
-        
-        return ToneResult(
-            success=True,
-            mean_pitch=round(mean_pitch, 1),
-            min_pitch=round(min_pitch, 1),
-            max_pitch=round(max_pitch, 1),
-            pitch_range=round(pitch_range, 1),
-            pitch_std=round(pitch_std, 1),
-            jitter=round(jitter, 2),
-            shimmer=round(shimmer, 2),
-            hnr=round(hnr, 1),
-            stability_score=round(stability_score, 1),
-            clarity_score=round(clarity_score, 1),
-            intonation_score=round(intonation_score, 1),
-            tone_score=round(tone_score, 1),
-            feedback=feedback
+        return build_tone_result(
+            mean_pitch, min_pitch, max_pitch, pitch_std,
+            jitter, shimmer, hnr,
+            pitch_track=context.pitch_track() if context.preset.contours else None
         )
         
     except Exception as e:
@@ -143,86 +130,72 @@ def analyze_tone(audio_data: bytes, sample_rate: int = 16000) -> ToneResult:
             error=str(e),
             feedback="톤 분석 중 오류가 발생했습니다."
         )
-        
-    finally:
-        # 임시 파일 정리
-        if temp_file_path and os.path.exists(temp_file_path):
-            os.unlink(temp_file_path)
 
 
-def calculate_stability_score(jitter: float, shimmer: float) -> float:
+def build_tone_result(
+    mean_pitch: float, min_pitch: float, max_pitch: float, pitch_std: float,
+    jitter: float, shimmer: float, hnr: float,
+    pitch_track: Optional[list] = None
+) -> ToneResult:
     """
-    안정성 점수 계산
-    - Jitter < 1%: 정상
-    - Shimmer < 3%: 정상
+    원시 음향 특징으로부터 점수와 피드백을 계산해 ToneResult를 만듭니다.
+    Praat 엔진과 NumPy 엔진이 같은 점수 공식을 쓰도록 공유합니다.
     """
-    # Jitter 점수 (0-50)
-    if jitter < 0.5:
-        jitter_score = 50
-    elif jitter < 1.0:
-        jitter_score = 40
-    elif jitter < 2.0:
-        jitter_score = 25
-    else:
-        jitter_score = max(0, 50 - jitter * 10)
+    # 점수 계산 (저장된 특징값으로 재계산할 때와 같은 공식)
+    scores = tone_scores(mean_pitch, min_pitch, max_pitch, jitter, shimmer, hnr)
+    pitch_range = float(scores["pitch_range"])
+    stability_score = float(scores["stability_score"])
+    clarity_score = float(scores["clarity_score"])
+    intonation_score = float(scores["intonation_score"])
+    tone_score = float(scores["tone_score"])
     
-    # Shimmer 점수 (0-50)
-    if shimmer < 2:
-        shimmer_score = 50
-    elif shimmer < 4:
-        shimmer_score = 40
-    elif shimmer < 6:
-        shimmer_score = 25
-    else:
-        shimmer_score = max(0, 50 - shimmer * 5)
+    # 피드백 생성
+    feedback = generate_tone_feedback(
+        mean_pitch, pitch_range, jitter, shimmer, hnr,
+        stability_score, clarity_score, intonation_score
+    )
     
-    return min(100, jitter_score + shimmer_score)
+    return ToneResult(
+        success=True,
+        mean_pitch=round(mean_pitch, 1),
+        min_pitch=round(min_pitch, 1),
+        max_pitch=round(max_pitch, 1),
+        pitch_range=round(pitch_range, 1),
+        pitch_std=round(pitch_std, 1),
+        jitter=round(jitter, 2),
+        shimmer=round(shimmer, 2),
+        hnr=round(hnr, 1),
+        stability_score=round(stability_score, 1),
+        clarity_score=round(clarity_score, 1),
+        intonation_score=round(intonation_score, 1),
+        tone_score=round(tone_score, 1),
+        pitch_track=pitch_track,
+        features={
+            "mean_pitch": round(float(mean_pitch), 4),
+            "min_pitch": round(float(min_pitch), 4),
+            "max_pitch": round(float(max_pitch), 4),
+            "pitch_std": round(float(pitch_std), 4),
+            "jitter": round(float(jitter), 4),
+            "shimmer": round(float(shimmer), 4),
+            "hnr": round(float(hnr), 4),
+        },
+        feedback=feedback
+    )
+
+
+def calculate_stability_score(jitter: float, shimmer: float) -> float:
+    """안정성 점수 계산 (공식은 scoring.stability_scores)"""
+    return float(stability_scores(jitter, shimmer))
 
 
 def calculate_clarity_score(hnr: float) -> float:
-    """
-    명료도 점수 계산
-    - HNR > 20 dB: 매우 맑음
-    - HNR 10-20 dB: 보통
-    - HNR < 10 dB: 거칠음
-    """
-    if hnr >= 20:
-        return 100
-    elif hnr >= 15:
-        return 80 + (hnr - 15) * 4
-    elif hnr >= 10:
-        return 60 + (hnr - 10) * 4
-    elif hnr >= 5:
-        return 40 + (hnr - 5) * 4
-    else:
-        return max(0, hnr * 8)
+    """명료도 점수 계산 (공식은 scoring.clarity_scores)"""
+    return float(clarity_scores(hnr))
 
 
 def calculate_intonation_score(pitch_range: float, mean_pitch: float) -> float:
-    """
-    억양 풍부함 점수 계산
-    - 적당한 피치 변화가 있으면 높은 점수
-    - 너무 단조롭거나 너무 변화가 심하면 낮은 점수
-    """
-    if mean_pitch == 0:
-        return 50
-    
-    # 피치 범위 비율 (평균 대비)
-    range_ratio = pitch_range / mean_pitch if mean_pitch > 0 else 0
-    
-    # 이상적인 범위: 0.3 ~ 0.8 (평균의 30-80%)
-    if 0.3 <= range_ratio <= 0.8:
-        return 100
-    elif 0.2 <= range_ratio <= 1.0:
-        return 80
-    elif 0.1 <= range_ratio <= 1.2:
-        return 60
-    elif range_ratio < 0.1:
-        # 너무 단조로움
-        return 40
-    else:
-        # 너무 변화가 심함
-        return 50
+    """억양 풍부함 점수 계산 (공식은 scoring.intonation_scores)"""
+    return float(intonation_scores(pitch_range, mean_pitch))
 
 
 def generate_tone_feedback(
@@ -0,0 +1,188 @@
+# 음성 구간 검출(VAD) 서비스
+# 프레임 에너지 기반으로 무음을 잘라내고, 음성이 없는 녹음을 비싼 분석 전에 걸러냅니다.
+import os
+from dataclasses import dataclass, field
+import numpy as np
+
+from app.services.audio_io import DecodedAudio
+from app.services.framing import frame_signal
+
+# 음성으로 인정할 최소 길이 (밀리초)
+VAD_MIN_SPEECH_MS = int(os.getenv("VAD_MIN_SPEECH_MS", "200"))
+
+# 음성으로 인정할 최소 신호 대 잡음비 (dB)
+VAD_MIN_SNR_DB = float(os.getenv("VAD_MIN_SNR_DB", "6"))
+
+# 이보다 작은 프레임은 무조건 무음으로 처리 (dBFS)
+VAD_ABSOLUTE_FLOOR_DB = -55.0
+
+# 잘라낸 음성 구간 앞뒤로 남겨둘 여유 (초)
+VAD_PADDING = 0.15
+
+
+@dataclass
+class VoiceActivityResult:
+    """음성 구간 검출 결과"""
+    has_speech: bool
+    speech_start: float = 0.0      # 첫 음성 프레임 시작 (초)
+    speech_end: float = 0.0        # 마지막 음성 프레임 끝 (초)
+    speech_duration: float = 0.0   # 음성 프레임 총 길이 (초)
+    snr_db: float = 0.0            # 음성/잡음 에너지 차이 (dB)
+    frame_step: float = 0.01       # 프레임 간격 (초)
+    frame_length: float = 0.025    # 프레임 길이 (초)
+    # 프레임별 음성 여부 (True = 음성)
+    voiced_frames: np.ndarray = field(default_factory=lambda: np.zeros(0, dtype=bool))
+
+
+def frame_energy_db(samples: np.ndarray, sample_rate: int,
+                    frame_length: float = 0.025, frame_step: float = 0.01) -> np.ndarray:
+    """프레임별 RMS 에너지 (dBFS)를 한 번에 계산"""
+    frame_size = int(round(frame_length * sample_rate))
+    hop_size = int(round(frame_step * sample_rate))
+    frames = frame_signal(samples, frame_size, hop_size)
+    if len(frames) == 0:
+        return np.zeros(0, dtype=np.float64)
+
+    power = np.einsum("ij,ij->i", frames, frames, dtype=np.float64) / frame_size
+    return 10.0 * np.log10(power + 1e-12)
+
+
+def _smooth_mask(mask: np.ndarray, close_frames: int = 15, min_run: int = 3) -> np.ndarray:
+    """짧은 끊김은 메우고(closing), 너무 짧은 음성 조각은 제거합니다."""
+    if not mask.any():
+        return mask
+
+    # 1. closing: 팽창 후 침식으로 단어 사이 짧은 쉼을 메움
+    kernel = np.ones(close_frames, dtype=np.int32)
+    dilated = np.convolve(mask.astype(np.int32), kernel, mode="same") > 0
+    closed = np.convolve((~dilated).astype(np.int32), kernel, mode="same") == 0
+
+    # 2. min_run 프레임보다 짧은 조각 제거
+    padded = np.concatenate(([False], closed, [False]))
+    edges = np.flatnonzero(padded[1:] != padded[:-1])
+    starts, ends = edges[0::2], edges[1::2]
+    for start, end in zip(starts, ends):
+        if end - start < min_run:
+            closed[start:end] = False
+    return closed
+
+
+def detect_voice_activity(samples: np.ndarray, sample_rate: int,
+                          frame_length: float = 0.025, frame_step: float = 0.01) -> VoiceActivityResult:
+    """
+    프레임 에너지로 음성 구간을 검출합니다.
+
+    잡음 바닥(하위 10% 에너지)보다 충분히 큰 프레임을 음성으로 보고,
+    음성 길이와 SNR이 기준에 못 미치면 has_speech=False를 반환합니다.
+    SNR의 잡음 레벨은 무음 프레임 평균이고, 무음 프레임이 10개 미만이면 절대 기준(VAD_ABSOLUTE_FLOOR_DB)입니다.
+
+    Args:
+        samples: mono float32 샘플
+        sample_rate: 샘플링 레이트
+
+    Returns:
+        VoiceActivityResult
+    """
+    energy_db = frame_energy_db(samples, sample_rate, frame_length, frame_step)
+    if len(energy_db) == 0:
+        return VoiceActivityResult(has_speech=False, frame_step=frame_step, frame_length=frame_length)
+
+    noise_floor = float(np.percentile(energy_db, 10))
+    peak_level = float(np.percentile(energy_db, 95))
+
+    # 잡음 바닥과 최대 레벨 사이의 1/3 지점을 임계값으로 사용
+    threshold = max(noise_floor + (peak_level - noise_floor) / 3.0, VAD_ABSOLUTE_FLOOR_DB)
+    voiced = _smooth_mask(energy_db > threshold)
+
+    if not voiced.any():
+        return VoiceActivityResult(
+            has_speech=False,
+            voiced_frames=voiced,
+            frame_step=frame_step,
+            frame_length=frame_length,
+        )
+
+    voiced_index = np.flatnonzero(voiced)
+    speech_start = voiced_index[0] * frame_step
+    speech_end = min(voiced_index[-1] * frame_step + frame_length, len(samples) / sample_rate)
+    speech_duration = len(voiced_index) * frame_step
+
+    speech_level = float(np.mean(energy_db[voiced]))
+    if (~voiced).sum() >= 10:
+        noise_level = float(np.mean(energy_db[~voiced]))
+    else:
+        # 무음 구간이 거의 없으면(무음을 이미 잘라낸 녹음, 처음부터 끝까지 말한 녹음) 잡음을 추정할 수 없으므로
+        # 절대 기준과 비교 (녹음 자체의 하위 에너지를 잡음으로 보면 고른 발화가 SNR≈0으로 거절됨)
+        noise_level = VAD_ABSOLUTE_FLOOR_DB
+    snr_db = speech_level - noise_level
+
+    has_speech = (
+        speech_duration * 1000 >= VAD_MIN_SPEECH_MS
+        and snr_db >= VAD_MIN_SNR_DB
+    )
+
+    return VoiceActivityResult(
+        has_speech=has_speech,
+        speech_start=round(speech_start, 3),
+        speech_end=round(speech_end, 3),
+        speech_duration=round(speech_duration, 3),
+        snr_db=round(snr_db, 1),
+        frame_step=frame_step,
+        frame_length=frame_length,
+        voiced_frames=voiced,
+    )
+
+
+def trim_silence(audio: DecodedAudio, vad: VoiceActivityResult,
+                 padding: float = VAD_PADDING) -> DecodedAudio:
+    """음성 구간(앞뒤 여유 포함)만 남긴 DecodedAudio 반환"""
+    if not vad.has_speech:
+        return audio
+
+    start = max(0, int((vad.speech_start - padding) * audio.sample_rate))
+    end = min(len(audio.samples), int((vad.speech_end + padding) * audio.sample_rate))
+    if start == 0 and end == len(audio.samples):
+        return audio
+
+    return DecodedAudio(
+        samples=audio.samples[start:end],
+        sample_rate=audio.sample_rate,
+        source_format=audio.source_format,
+    )
+
+
+def detect_voiced_segments(samples: np.ndarray, sample_rate: int,
+                           frame_length: float = 0.025, frame_step: float = 0.01,
+                           max_zero_crossing_rate: float = 0.15,
+                           min_duration: float = 0.05):
+    """
+    유성음(모음) 구간을 에너지와 영교차율(ZCR)로 검출합니다.
+    모음은 에너지가 크고 영교차율이 낮으며, 마찰음(ㅅ, ㅎ 등)은 영교차율이 높습니다.
+
+    Returns:
+        (시작, 끝) 시간(초) 목록
+    """
+    frame_size = int(round(frame_length * sample_rate))
+    hop_size = int(round(frame_step * sample_rate))
+    frames = frame_signal(samples, frame_size, hop_size)
+    if len(frames) == 0:
+        return []
+
+    energy_db = frame_energy_db(samples, sample_rate, frame_length, frame_step)
+    signs = np.signbit(frames)
+    zero_crossing_rate = np.count_nonzero(signs[:, 1:] != signs[:, :-1], axis=1) / frame_size
+
+    noise_floor = float(np.percentile(energy_db, 10))
+    peak_level = float(np.percentile(energy_db, 95))
+    threshold = max(noise_floor + (peak_level - noise_floor) / 2.0, VAD_ABSOLUTE_FLOOR_DB)
+    voiced = (energy_db > threshold) & (zero_crossing_rate < max_zero_crossing_rate)
+
+    padded = np.concatenate(([False], voiced, [False]))
+    edges = np.flatnonzero(padded[1:] != padded[:-1])
+    segments = []
+    for start, end in zip(edges[0::2], edges[1::2]):
+        start_time = start * frame_step
+        end_time = (end - 1) * frame_step + frame_length
+        if end_time - start_time >= min_duration:
+            segments.append((round(float(start_time), 3), round(float(end_time), 3)))
+    return segments
@@ -0,0 +1,89 @@
+# 모음 구간 추출 서비스
+# 발음 평가의 단어 타이밍과 한글 음절 구조로 모음 핵(nucleus) 구간을 추정합니다.
+# 단어 타이밍이 없으면 로컬 유성음 검출기로 대체합니다.
+from typing import List, Optional
+from dataclasses import dataclass
+import numpy as np
+
+from app.services.voice_activity import detect_voiced_segments
+
+# 한글 음절 중성(모음) 21자 (유니코드 순서)
+HANGUL_MEDIALS = [
+    'ㅏ', 'ㅐ', 'ㅑ', 'ㅒ', 'ㅓ', 'ㅔ', 'ㅕ', 'ㅖ', 'ㅗ', 'ㅘ', 'ㅙ',
+    'ㅚ', 'ㅛ', 'ㅜ', 'ㅝ', 'ㅞ', 'ㅟ', 'ㅠ', 'ㅡ', 'ㅢ', 'ㅣ',
+]
+
+# 이중모음 → 포먼트 기준표(KOREAN_VOWELS_FORMANTS)의 단모음 핵
+# 활음(y, w) 뒤에 오는 모음이 음절의 대부분을 차지하므로 그 모음을 기준으로 평가
+NUCLEUS_VOWEL = {
+    'ㅑ': 'ㅏ', 'ㅘ': 'ㅏ',
+    'ㅒ': 'ㅐ', 'ㅙ': 'ㅐ',
+    'ㅕ': 'ㅓ', 'ㅝ': 'ㅓ',
+    'ㅖ': 'ㅔ', 'ㅚ': 'ㅔ', 'ㅞ': 'ㅔ',
+    'ㅛ': 'ㅗ',
+    'ㅠ': 'ㅜ',
+    'ㅟ': 'ㅣ', 'ㅢ': 'ㅣ',
+}
+
+# 음절 안에서 모음 핵으로 볼 구간 비율 (초성 자음과 받침을 제외)
+NUCLEUS_START = 0.35
+NUCLEUS_END = 0.80
+
+
+@dataclass
+class VowelSegment:
+    """모음 핵 구간"""
+    start: float                  # 시작 시간 (초)
+    end: float                    # 끝 시간 (초)
+    vowel: Optional[str] = None   # 단모음 (유성음 검출로 찾은 구간은 None)
+    word: Optional[str] = None    # 해당 단어
+
+
+def syllable_vowel(syllable: str) -> Optional[str]:
+    """한글 음절의 모음 핵 반환 (한글 음절이 아니면 None)"""
+    code = ord(syllable) - 0xAC00
+    if not 0 <= code < 11172:
+        return None
+    medial = HANGUL_MEDIALS[(code // 28) % 21]
+    return NUCLEUS_VOWEL.get(medial, medial)
+
+
+def segments_from_words(word_details: list) -> List[VowelSegment]:
+    """
+    단어별 타이밍(offset, duration)을 음절 수로 나눠 각 음절의 모음 핵 구간을 만듭니다.
+    타이밍이 없는 단어(누락된 단어 등)는 건너뜁니다.
+    """
+    segments = []
+    for word in word_details or []:
+        offset = word.get("offset")
+        duration = word.get("duration")
+        if offset is None or not duration:
+            continue
+
+        syllables = [ch for ch in word.get("word", "") if syllable_vowel(ch)]
+        if not syllables:
+            continue
+
+        syllable_duration = duration / len(syllables)
+        for index, syllable in enumerate(syllables):
+            syllable_start = offset + index * syllable_duration
+            segments.append(VowelSegment(
+                start=round(syllable_start + syllable_duration * NUCLEUS_START, 3),
+                end=round(syllable_start + syllable_duration * NUCLEUS_END, 3),
+                vowel=syllable_vowel(syllable),
+                word=word.get("word"),
+            ))
+    return segments
+
+
+def segments_from_voicing(samples: np.ndarray, sample_rate: int) -> List[VowelSegment]:
+    """단어 타이밍이 없을 때 로컬 유성음 검출로 모음 구간을 찾습니다 (모음 종류는 미상)."""
+    return [
+        VowelSegment(start=start, end=end)
+        for start, end in detect_voiced_segments(samples, sample_rate)
+    ]
+
+
+def find_vowel_segments(word_details: list, samples: np.ndarray, sample_rate: int) -> List[VowelSegment]:
+    """단어 타이밍 기반 모음 구간, 없으면 유성음 검출 구간"""
+    return segments_from_words(word_details) or segments_from_voicing(samples, sample_rate)
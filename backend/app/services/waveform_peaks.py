@@ -0,0 +1,94 @@
+# 파형 피크 서비스
+# 분석 중 이미 디코딩한 PCM으로 여러 해상도의 min/max 피크 포락선을 만들어
+# 클라이언트가 녹음 파일 전체를 받지 않고도 파형을 바로 그릴 수 있게 합니다.
+from typing import Optional
+import numpy as np
+
+from app.services.audio_io import DecodedAudio
+from app.services.contour_codec import encode_series, decode_series, read_header
+
+# 피크 하나당 샘플 수 (16kHz 기준 250, 62.5, 15.6, 3.9 피크/초)
+# 가장 세밀한 레벨을 계산한 뒤, 거친 레벨은 그 결과를 다시 묶어 만듭니다.
+SAMPLES_PER_PEAK = [64, 256, 1024, 4096]
+
+CONTENT_TYPE = "application/x-truevoice-peaks"
+
+
+def _reduce(values: np.ndarray, factor: int, reducer) -> np.ndarray:
+    """factor개씩 묶어 reducer(min/max) 적용 (마지막 남는 묶음은 그대로 포함)"""
+    num_groups = -(-len(values) // factor)
+    padding = num_groups * factor - len(values)
+    fill = values[-1] if len(values) else 0.0
+    padded = np.concatenate((values, np.full(padding, fill, dtype=values.dtype)))
+    return reducer(padded.reshape(num_groups, factor), axis=1)
+
+
+def compute_peaks(samples: np.ndarray, samples_per_peak: Optional[list] = None) -> dict:
+    """
+    샘플을 한 번만 훑어 가장 세밀한 min/max를 구하고, 거친 레벨은 그 결과에서 유도합니다.
+
+    Returns:
+        {피크당 샘플 수: (min 배열, max 배열)}
+    """
+    levels = sorted(samples_per_peak or SAMPLES_PER_PEAK)
+    samples = np.clip(np.asarray(samples, dtype=np.float32), -1.0, 1.0)
+    if len(samples) == 0:
+        return {}
+
+    finest = levels[0]
+    minimums = _reduce(samples, finest, np.min)
+    maximums = _reduce(samples, finest, np.max)
+
+    peaks = {finest: (minimums, maximums)}
+    for size in levels[1:]:
+        factor = size // finest
+        peaks[size] = (_reduce(minimums, factor, np.min), _reduce(maximums, factor, np.max))
+    return peaks
+
+
+def build_peaks_artifact(audio: DecodedAudio) -> Optional[bytes]:
+    """디코딩된 오디오의 피크 포락선을 컨테이너 바이트로 인코딩 (빈 오디오면 None)"""
+    peaks = compute_peaks(audio.samples)
+    if not peaks:
+        return None
+
+    series = {}
+    for size, (minimums, maximums) in peaks.items():
+        series[f"peaks.{size}.min"] = minimums
+        series[f"peaks.{size}.max"] = maximums
+    meta = {
+        "sample_rate": audio.sample_rate,
+        "duration": round(audio.duration, 3),
+        "samples_per_peak": sorted(peaks),
+    }
+    return encode_series(series, meta)
+
+
+def decode_peaks_level(data: bytes, width: int) -> dict:
+    """
+    화면 너비(width)만큼의 피크를 채울 수 있는 가장 거친 레벨을 골라 디코딩합니다.
+    어느 레벨도 충분하지 않으면 가장 세밀한 레벨을 반환합니다.
+    """
+    header, _ = read_header(data)
+    meta = header.get("meta", {})
+    counts = {
+        int(descriptor["name"].split(".")[1]): descriptor["count"]
+        for descriptor in header["series"]
+        if descriptor["name"].endswith(".min")
+    }
+
+    sizes = sorted(counts)
+    chosen = sizes[0]
+    for size in reversed(sizes):
+        if counts[size] >= width:
+            chosen = size
+            break
+
+    series, _ = decode_series(data, [f"peaks.{chosen}."])
+    return {
+        "sample_rate": meta.get("sample_rate"),
+        "duration": meta.get("duration"),
+        "samples_per_peak": chosen,
+        "min": series[f"peaks.{chosen}.min"],
+        "max": series[f"peaks.{chosen}.max"],
+    }
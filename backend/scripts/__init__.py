@@ -0,0 +1 @@
+# 운영/검증용 스크립트 패키지 (backend 디렉토리에서 python -m scripts.<이름> 으로 실행)
@@ -0,0 +1,173 @@
+# 과거 녹음 일괄 재분석 (백필)
+# recordings를 (created_at, id) keyset 페이지로 훑으면서 공명/톤/단어 상세가 빠진 녹음을
+# 프로세스 풀에서 다시 분석하고, 페이지마다 결과를 한 번의 upsert로 저장합니다.
+#
+# - 페이지를 저장한 뒤에만 체크포인트(마지막 커서)를 기록하므로, 중단하면 같은 명령으로 이어서 실행됩니다.
+# - Azure 요청률은 --azure-rps(전체 합)를 프로세스 수로 나눠 제한합니다.
+#   프로세스당 초당 0.2건보다 낮으면 토큰 대기(5초)가 길어져 요청이 throttled로 재시도될 수 있습니다.
+#
+# 사용법 (backend 디렉토리에서):
+#   python -m scripts.backfill_analysis --concurrency 4 --azure-rps 8
+#   python -m scripts.backfill_analysis --mode all --preset fast --checkpoint /tmp/backfill.json
+#   python -m scripts.backfill_analysis --reset          # 체크포인트를 무시하고 처음부터
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from app.services.backfill import BACKFILL_MODES, analyze_for_backfill, init_worker, needs_backfill
+from app.services.supabase import (
+    DEV_MODE,
+    count_recordings,
+    delete_artifacts,
+    get_latest_results_for_recordings,
+    list_recordings_page,
+    update_recording_status,
+    upsert_analysis_results,
+)
+
+DEFAULT_CHECKPOINT = ".backfill_checkpoint.json"
+
+
+def load_checkpoint(path: str, reset: bool = False) -> dict:
+    """체크포인트 읽기 (없거나 reset이면 처음부터). failed_ids는 나중에 다시 시도할 녹음"""
+    if reset or not os.path.exists(path):
+        return {"cursor": None, "scanned": 0, "succeeded": 0, "failed": 0, "skipped": 0, "failed_ids": []}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_checkpoint(path: str, checkpoint: dict) -> None:
+    """임시 파일에 쓰고 교체 (쓰는 도중 중단돼도 이전 체크포인트 유지)"""
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        json.dump(checkpoint, f, ensure_ascii=False, indent=2)
+    os.replace(temp_path, path)
+
+
+def format_duration(seconds: float) -> str:
+    seconds = int(seconds)
+    hours, rest = divmod(seconds, 3600)
+    minutes, seconds = divmod(rest, 60)
+    return f"{hours}시간 {minutes}분" if hours else f"{minutes}분 {seconds}초"
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description="과거 녹음 재분석 (중단 후 재개 가능)")
+    parser.add_argument("--mode", choices=BACKFILL_MODES, default="missing",
+                        help="missing: 공명/톤/단어 상세가 빠진 녹음만, all: 전체")
+    parser.add_argument("--concurrency", type=int, default=os.cpu_count() or 1, help="분석 프로세스 수")
+    parser.add_argument("--azure-rps", type=float, default=5.0, help="전체 Azure 초당 요청 한도 (0이면 서버 설정)")
+    parser.add_argument("--page-size", type=int, default=50, help="한 번에 읽고 저장할 녹음 수")
+    parser.add_argument("--preset", choices=("fast", "balanced", "accurate"), default=None,
+                        help="분석 품질 프리셋 (없으면 ANALYSIS_PRESET)")
+    parser.add_argument("--checkpoint", default=DEFAULT_CHECKPOINT, help="체크포인트 파일 경로")
+    parser.add_argument("--reset", action="store_true", help="체크포인트를 무시하고 처음부터")
+    args = parser.parse_args(argv)
+
+    if DEV_MODE:
+        print("[ERROR] DEV_MODE에서는 백필을 실행할 수 없습니다 (Supabase 설정 필요)")
+        return 1
+
+    checkpoint = load_checkpoint(args.checkpoint, reset=args.reset)
+    cursor = tuple(checkpoint["cursor"]) if checkpoint["cursor"] else None
+    remaining = count_recordings(cursor)
+    print(f"[INFO] 백필 시작: mode={args.mode}, 프로세스 {args.concurrency}, Azure {args.azure_rps}건/초, "
+          f"남은 녹음 {remaining if remaining is not None else '?'}"
+          + (f", 이어서 실행 (커서 {cursor[0]})" if cursor else ""))
+
+    pool = ProcessPoolExecutor(
+        max_workers=args.concurrency,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=init_worker,
+        initargs=(args.azure_rps / args.concurrency,),
+    )
+    started = time.perf_counter()
+    scanned = analyzed = 0
+    audio_seconds = 0.0
+    interrupted = False
+    try:
+        while True:
+            page = list_recordings_page(cursor, args.page_size)
+            if page is None:
+                print("[ERROR] 녹음 목록 조회 실패, 체크포인트에서 중단")
+                return 1
+            if not page:
+                break
+            latest = get_latest_results_for_recordings([recording["id"] for recording in page])
+            if latest is None:
+                print("[ERROR] 결과 조회 실패, 체크포인트에서 중단")
+                return 1
+
+            todo = [recording for recording in page
+                    if needs_backfill(recording, latest.get(recording["id"]), args.mode)]
+            futures = {
+                pool.submit(
+                    analyze_for_backfill, recording, latest.get(recording["id"]), args.preset,
+                ): recording
+                for recording in todo
+            }
+            rows = []
+            replaced_paths = []
+            for future in as_completed(futures):
+                outcome = future.result()
+                audio_seconds += outcome.audio_seconds
+                if outcome.row is None:
+                    checkpoint["failed"] += 1
+                    checkpoint["failed_ids"].append(outcome.recording_id)
+                    print(f"[WARNING] 실패: {outcome.recording_id} ({outcome.error})")
+                    continue
+                rows.append(outcome.row)
+                replaced_paths.extend(outcome.replaced_paths)
+
+            # 페이지 결과를 한 번에 저장한 뒤에만 커서를 옮김
+            if not upsert_analysis_results(rows):
+                print("[ERROR] 결과 저장 실패, 체크포인트에서 중단")
+                return 1
+            # 새 경로를 가리키는 행이 저장된 뒤에만 이전 산출물을 지움 (실패해도 고아 파일만 남음)
+            if not delete_artifacts(replaced_paths):
+                print(f"[WARNING] 이전 산출물 {len(replaced_paths)}개 삭제 실패")
+            statuses = {recording["id"]: recording.get("status") for recording in todo}
+            for row in rows:
+                if statuses[row["recording_id"]] != "completed":
+                    update_recording_status(row["recording_id"], "completed")
+
+            cursor = (page[-1]["created_at"], page[-1]["id"])
+            checkpoint["cursor"] = list(cursor)
+            checkpoint["scanned"] += len(page)
+            checkpoint["succeeded"] += len(rows)
+            checkpoint["skipped"] += len(page) - len(todo)
+            save_checkpoint(args.checkpoint, checkpoint)
+
+            # 처리량과 남은 시간 (분석 대상 비율이 지금까지와 같다고 가정)
+            scanned += len(page)
+            analyzed += len(todo)
+            elapsed = time.perf_counter() - started
+            rate = analyzed / elapsed if elapsed > 0 else 0.0
+            progress = f"{scanned}/{remaining}" if remaining else f"{scanned}"
+            eta = ""
+            if remaining and rate > 0:
+                left = (remaining - scanned) * (analyzed / scanned)
+                eta = f", 남은 시간 약 {format_duration(left / rate)}"
+            print(f"[INFO] {progress}건 확인, {analyzed}건 분석 ({rate:.2f}건/초, "
+                  f"오디오 {audio_seconds / elapsed:.1f}초/초){eta}, "
+                  f"누적 성공 {checkpoint['succeeded']} 실패 {checkpoint['failed']}")
+    except KeyboardInterrupt:
+        interrupted = True
+        print("[INFO] 중단됨. 같은 명령으로 다시 실행하면 마지막으로 저장한 페이지 다음부터 이어집니다.")
+    finally:
+        pool.shutdown(wait=not interrupted, cancel_futures=True)
+    if interrupted:
+        return 130
+
+    print(f"[INFO] 완료: 확인 {checkpoint['scanned']}, 성공 {checkpoint['succeeded']}, "
+          f"실패 {checkpoint['failed']}, 건너뜀 {checkpoint['skipped']} "
+          f"({format_duration(time.perf_counter() - started)})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,116 @@
+# 응답 직렬화 벤치마크
+# 실제 크기에 가까운 분석 응답을 만들어 직렬화 시간과 페이로드 크기를 비교합니다.
+#   - 기존: FastAPI 기본 렌더링 (jsonable_encoder + json.dumps)
+#   - orjson, MessagePack
+#   - 각 형식의 gzip / brotli 압축 후 크기
+#
+# 사용법 (backend 디렉토리에서):
+#   python -m scripts.bench_serialization [반복 횟수]
+import gzip
+import json
+import sys
+import time
+
+import numpy as np
+from fastapi.encoders import jsonable_encoder
+
+from app.compression import BROTLI_AVAILABLE, GZIP_LEVEL, BROTLI_QUALITY
+from app.serialization import dumps_json, dumps_msgpack, MSGPACK_AVAILABLE, ORJSON_AVAILABLE
+
+if BROTLI_AVAILABLE:
+    import brotli
+
+
+def build_result_payload(num_words: int) -> dict:
+    """단어 상세와 모음 분석이 포함된 결과 응답"""
+    rng = np.random.default_rng(0)
+    words = [
+        {
+            "word": f"단어{i}",
+            "accuracy_score": round(float(rng.uniform(40, 100)), 1),
+            "error_type": "None",
+            "offset": round(i * 0.45, 3),
+            "duration": 0.4,
+        }
+        for i in range(num_words)
+    ]
+    vowels = [
+        {"vowel": v, "frames": 20, "mean_f1": 700.5, "mean_f2": 1200.5,
+         "target_f1": 800, "target_f2": 1200, "score": 88.2}
+        for v in ["ㅏ", "ㅓ", "ㅗ", "ㅜ", "ㅡ", "ㅣ", "ㅐ"]
+    ]
+    return {
+        "id": "4f6c1c6e-0000-0000-0000-000000000000",
+        "recording_id": "9a0e2d3b-0000-0000-0000-000000000000",
+        "created_at": "2024-01-01T00:00:00Z",
+        "scores": {"accuracy": 85.2, "fluency": 78.4, "completeness": 100.0, "pronunciation": 82.1},
+        "feedback": "발음이 전반적으로 좋습니다.",
+        "word_details": words,
+        "formant": {"resonance_score": 82.0, "stability_score": 75.0,
+                    "feedback": "공명이 양호합니다.", "vowel_analysis": vowels},
+        "tone": {"tone_score": 80.0, "stability_score": 70.0, "clarity_score": 85.0,
+                 "intonation_score": 72.0, "mean_pitch": 180.2, "pitch_range": 90.1,
+                 "feedback": "톤이 안정적입니다."},
+    }
+
+
+def build_contour_payload(seconds: float) -> dict:
+    """원본 해상도 컨투어 응답 (피치 10ms, 포먼트 10ms 중 모음 구간 1/3)"""
+    times = np.round(np.arange(0, seconds, 0.01), 3)
+    formant_times = times[::3]
+    return {
+        "pitch": {"time": times.tolist(), "f0": np.round(180 + 30 * np.sin(times), 1).tolist()},
+        "formant": {
+            "time": formant_times.tolist(),
+            "f1": np.round(700 + 50 * np.sin(formant_times), 1).tolist(),
+            "f2": np.round(1200 + 80 * np.cos(formant_times), 1).tolist(),
+            "f3": np.round(2500 + 40 * np.sin(formant_times), 1).tolist(),
+        },
+    }
+
+
+def measure(function, payload, repeat: int):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        body = function(payload)
+    return (time.perf_counter() - start) / repeat * 1000, body
+
+
+def baseline_json(payload) -> bytes:
+    return json.dumps(jsonable_encoder(payload)).encode("utf-8")
+
+
+def main(argv):
+    repeat = int(argv[0]) if argv else 200
+    payloads = [
+        ("result (20 words)", build_result_payload(20)),
+        ("result (200 words)", build_result_payload(200)),
+        ("contours (10s)", build_contour_payload(10)),
+        ("contours (60s)", build_contour_payload(60)),
+    ]
+    encoders = [("fastapi default", baseline_json)]
+    if ORJSON_AVAILABLE:
+        encoders.append(("orjson", dumps_json))
+    if MSGPACK_AVAILABLE:
+        encoders.append(("msgpack", dumps_msgpack))
+
+    print(f"orjson={ORJSON_AVAILABLE} msgpack={MSGPACK_AVAILABLE} brotli={BROTLI_AVAILABLE} repeat={repeat}")
+    print()
+    print("| payload | encoder | encode ms | bytes | gzip bytes | gzip ms | br bytes | br ms |")
+    print("|---|---|---|---|---|---|---|---|")
+    for name, payload in payloads:
+        for encoder_name, encoder in encoders:
+            encode_ms, body = measure(encoder, payload, repeat)
+            gzip_ms, gzipped = measure(lambda b: gzip.compress(b, compresslevel=GZIP_LEVEL), body, repeat)
+            if BROTLI_AVAILABLE:
+                br_ms, compressed = measure(lambda b: brotli.compress(b, quality=BROTLI_QUALITY), body, repeat)
+                br = (f"{len(compressed)}", f"{br_ms:.3f}")
+            else:
+                br = ("-", "-")
+            print(f"| {name} | {encoder_name} | {encode_ms:.3f} | {len(body)} | "
+                  f"{len(gzipped)} | {gzip_ms:.3f} | {br[0]} | {br[1]} |")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
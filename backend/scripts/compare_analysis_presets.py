@@ -0,0 +1,115 @@
+# 분석 품질 프리셋 비교 리포트
+# fast/balanced/accurate 프리셋의 오디오 1초당 프레임 수(설정에서 계산)와,
+# 녹음으로 측정한 처리 시간, accurate 대비 특징값/점수 차이를 비교합니다.
+#
+# 사용법 (backend 디렉토리에서):
+#   python -m scripts.compare_analysis_presets recordings/*.wav recordings/*.m4a
+#   python -m scripts.compare_analysis_presets --vowel recordings/*.wav   # 모음 구간 분석 모드
+import sys
+import time
+
+import numpy as np
+
+from app.services.analysis_presets import PRESETS
+from app.services.audio_io import decode_audio
+from app.services.formant_analysis import analyze_formants
+from app.services.praat_context import PARSELMOUTH_AVAILABLE, PITCH_FLOOR, PraatAnalysisContext
+from app.services.tone_analysis import analyze_tone
+from app.services.vowel_segments import segments_from_voicing
+
+# 비교할 필드
+TONE_FIELDS = ["mean_pitch", "pitch_range", "pitch_std", "jitter", "shimmer", "hnr", "tone_score"]
+FORMANT_FIELDS = ["mean_f1", "mean_f2", "mean_f3", "stability_score", "resonance_score"]
+
+# 기준 프리셋 (가장 촘촘한 프레임)
+REFERENCE = "accurate"
+
+
+def frame_rates(preset):
+    """오디오 1초당 (피치, 포먼트, HNR) 프레임 수 (Praat 자동 간격은 피치 하한/창 길이로 환산)"""
+    pitch_step = preset.pitch_time_step or 0.75 / PITCH_FLOOR
+    formant_step = preset.formant_time_step or preset.formant_window_length / 4
+    return 1 / pitch_step, 1 / formant_step, 1 / preset.harmonicity_time_step
+
+
+def print_frame_rates():
+    """프리셋별 프레임 수 (포먼트 비용은 프레임 수 × 창 길이에 비례)"""
+    print("| preset | pitch frames/s | formant frames/s | harmonicity frames/s | formant frames × window (ms) |")
+    print("|---|---|---|---|---|")
+    for name, preset in PRESETS.items():
+        pitch, formant, harmonicity = frame_rates(preset)
+        formant_cost = formant * preset.formant_window_length * 1000
+        print(f"| {name} | {pitch:.0f} | {formant:.0f} | {harmonicity:.0f} | {formant_cost:.0f} |")
+    print()
+
+
+def analyze(audio, preset, segments):
+    """프리셋 하나로 톤/포먼트 분석 (컨텍스트 생성 포함 시간 측정)"""
+    wav_data = audio.to_wav_bytes()
+    start = time.perf_counter()
+    context = PraatAnalysisContext.from_audio(audio, preset)
+    tone = analyze_tone(wav_data, context=context)
+    formant = analyze_formants(wav_data, context=context, segments=segments)
+    return tone, formant, time.perf_counter() - start
+
+
+def main(args):
+    vowel_mode = "--vowel" in args
+    paths = [arg for arg in args if arg != "--vowel"]
+    if not paths:
+        print("사용법: python -m scripts.compare_analysis_presets [--vowel] <오디오 파일> ...")
+        return 1
+
+    print_frame_rates()
+    if not PARSELMOUTH_AVAILABLE:
+        print("[ERROR] parselmouth가 설치되어 있지 않아 처리 시간/특징값 차이는 측정할 수 없습니다.")
+        return 1
+
+    clips = []
+    for path in paths:
+        with open(path, "rb") as f:
+            audio = decode_audio(f.read(), format_hint=path.rsplit(".", 1)[-1])
+        segments = segments_from_voicing(audio.samples, audio.sample_rate) if vowel_mode else None
+        clips.append((path, audio, segments or None))
+
+    # 프리셋별 결과와 처리 시간
+    results = {name: [] for name in PRESETS}
+    elapsed = {name: 0.0 for name in PRESETS}
+    for path, audio, segments in clips:
+        for name, preset in PRESETS.items():
+            tone, formant, seconds = analyze(audio, preset, segments)
+            results[name].append((tone, formant))
+            elapsed[name] += seconds
+
+    # 파일별 비교표
+    fields = TONE_FIELDS + FORMANT_FIELDS
+    print("| file | preset | " + " | ".join(fields) + " |")
+    print("|---" * (len(fields) + 2) + "|")
+    for index, (path, _, _) in enumerate(clips):
+        for name in PRESETS:
+            tone, formant = results[name][index]
+            values = [f"{getattr(tone, field):.2f}" if tone.success else "-" for field in TONE_FIELDS]
+            values += [f"{getattr(formant, field):.2f}" if formant.success else "-" for field in FORMANT_FIELDS]
+            print(f"| {path} | {name} | " + " | ".join(values) + " |")
+
+    # 요약: 처리 시간과 기준 프리셋 대비 평균 절대 차이
+    total_audio = sum(audio.duration for _, audio, _ in clips)
+    print()
+    print(f"파일 수: {len(clips)}, 총 길이: {total_audio:.1f}s, 모드: {'vowel' if vowel_mode else 'full'}")
+    print()
+    print("| preset | time (s) | realtime factor | " + " | ".join(f"Δ{field}" for field in fields) + " |")
+    print("|---" * (len(fields) + 3) + "|")
+    for name in PRESETS:
+        diffs = {field: [] for field in fields}
+        for (tone, formant), (ref_tone, ref_formant) in zip(results[name], results[REFERENCE]):
+            for group, result, reference in ((TONE_FIELDS, tone, ref_tone), (FORMANT_FIELDS, formant, ref_formant)):
+                if result.success and reference.success:
+                    for field in group:
+                        diffs[field].append(abs(getattr(result, field) - getattr(reference, field)))
+        values = [f"{np.mean(diffs[field]):.2f}" if diffs[field] else "-" for field in fields]
+        print(f"| {name} | {elapsed[name]:.3f} | {elapsed[name] / total_audio:.4f} | " + " | ".join(values) + " |")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
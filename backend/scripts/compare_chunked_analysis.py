@@ -0,0 +1,92 @@
+# 청크 병렬 분석 검증 리포트
+# 긴 녹음을 한 번에 분석한 결과와 청크로 나눠 병렬 분석해 병합한 결과의 특징값 차이와 처리 시간을 비교합니다.
+#
+# 사용법 (backend 디렉토리에서):
+#   python -m scripts.compare_chunked_analysis recordings/passage_*.wav
+#   ANALYSIS_CHUNK_WORKERS=8 python -m scripts.compare_chunked_analysis recordings/*.m4a
+import sys
+import time
+
+import numpy as np
+
+from app.services.audio_io import decode_audio
+from app.services.chunked_analysis import (
+    ANALYSIS_CHUNK_WORKERS,
+    analyze_formants_chunked,
+    analyze_tone_chunked,
+    plan_chunks,
+)
+from app.services.formant_analysis import analyze_formants
+from app.services.praat_context import PraatAnalysisContext
+from app.services.tone_analysis import analyze_tone
+
+# 비교할 필드
+TONE_FIELDS = ["mean_pitch", "pitch_range", "pitch_std", "jitter", "shimmer", "hnr", "tone_score"]
+FORMANT_FIELDS = ["mean_f1", "mean_f2", "mean_f3", "stability_score", "resonance_score"]
+
+
+def main(paths):
+    if not paths:
+        print("사용법: python -m scripts.compare_chunked_analysis <오디오 파일> ...")
+        return 1
+
+    clips = []
+    for path in paths:
+        with open(path, "rb") as f:
+            audio = decode_audio(f.read(), format_hint=path.rsplit(".", 1)[-1])
+        chunks = plan_chunks(audio.samples, audio.sample_rate)
+        if chunks is None:
+            print(f"[INFO] {path}: {audio.duration:.1f}s, 청크 분할 기준보다 짧아 제외")
+            continue
+        clips.append((path, audio, chunks))
+    if not clips:
+        return 1
+
+    # 프로세스 풀 기동 시간은 제외 (서버에서는 첫 요청 이후 재사용)
+    _, audio, chunks = clips[0]
+    analyze_tone_chunked(audio, chunks)
+
+    print("| file | chunks | mode | " + " | ".join(TONE_FIELDS + FORMANT_FIELDS) + " |")
+    print("|---" * (len(TONE_FIELDS) + len(FORMANT_FIELDS) + 3) + "|")
+    diffs = {field: [] for field in TONE_FIELDS + FORMANT_FIELDS}
+    single_time, chunked_time = 0.0, 0.0
+    for path, audio, chunks in clips:
+        # 1. 한 번에 분석 (컨텍스트 공유)
+        wav_data = audio.to_wav_bytes()
+        start = time.perf_counter()
+        context = PraatAnalysisContext.from_audio(audio)
+        single = (analyze_tone(wav_data, context=context), analyze_formants(wav_data, context=context))
+        single_time += time.perf_counter() - start
+
+        # 2. 청크 병렬 분석
+        start = time.perf_counter()
+        chunked = (analyze_tone_chunked(audio, chunks), analyze_formants_chunked(audio, chunks))
+        chunked_time += time.perf_counter() - start
+
+        for name, (tone, formant) in (("single", single), ("chunked", chunked)):
+            values = [f"{getattr(tone, field):.2f}" if tone.success else "-" for field in TONE_FIELDS]
+            values += [f"{getattr(formant, field):.2f}" if formant.success else "-" for field in FORMANT_FIELDS]
+            print(f"| {path} | {len(chunks)} | {name} | " + " | ".join(values) + " |")
+        for fields, one, merged in ((TONE_FIELDS, single[0], chunked[0]), (FORMANT_FIELDS, single[1], chunked[1])):
+            if one.success and merged.success:
+                for field in fields:
+                    diffs[field].append(abs(getattr(one, field) - getattr(merged, field)))
+
+    # 요약
+    total_audio = sum(audio.duration for _, audio, _ in clips)
+    print()
+    print(f"파일 수: {len(clips)}, 총 길이: {total_audio:.1f}s, 워커: {ANALYSIS_CHUNK_WORKERS}")
+    print(f"한 번에 분석: {single_time:.3f}s (실시간 대비 {single_time / total_audio:.4f})")
+    print(f"청크 병렬:    {chunked_time:.3f}s (실시간 대비 {chunked_time / total_audio:.4f}, "
+          f"{single_time / chunked_time:.1f}x)")
+    print()
+    print("| field | mean abs diff | max abs diff |")
+    print("|---|---|---|")
+    for field, values in diffs.items():
+        values = np.array(values) if values else np.zeros(1)
+        print(f"| {field} | {values.mean():.2f} | {values.max():.2f} |")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
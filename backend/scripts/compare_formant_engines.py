@@ -0,0 +1,83 @@
+# 포먼트 분석 엔진 벤치마크 및 일치도 리포트
+# Praat(Burg) 엔진과 LPC 엔진의 FormantResult 값과 처리 시간을 비교합니다.
+#
+# 사용법 (backend 디렉토리에서):
+#   python -m scripts.compare_formant_engines recordings/*.wav recordings/*.m4a
+import sys
+import time
+
+import numpy as np
+
+from app.services.audio_io import decode_audio
+from app.services.formant_analysis import analyze_formants
+from app.services.lpc_formant import analyze_formants_batch
+
+# 비교할 FormantResult 필드
+FIELDS = [
+    "mean_f1", "mean_f2", "mean_f3",
+    "stability_f1", "stability_f2", "stability_f3",
+    "stability_score", "resonance_score",
+]
+
+
+def main(paths):
+    if not paths:
+        print("사용법: python -m scripts.compare_formant_engines <오디오 파일> ...")
+        return 1
+
+    clips = []
+    for path in paths:
+        with open(path, "rb") as f:
+            audio = decode_audio(f.read(), format_hint=path.rsplit(".", 1)[-1])
+        clips.append((path, audio))
+
+    # 1. Praat 엔진 (파일별)
+    praat_results, praat_time = [], 0.0
+    for _, audio in clips:
+        wav_data = audio.to_wav_bytes()
+        start = time.perf_counter()
+        praat_results.append(analyze_formants(wav_data, engine="praat"))
+        praat_time += time.perf_counter() - start
+
+    # 2. LPC 엔진 (파일별)
+    lpc_results, lpc_time = [], 0.0
+    for _, audio in clips:
+        start = time.perf_counter()
+        lpc_results.append(analyze_formants_batch([audio.samples], audio.sample_rate)[0])
+        lpc_time += time.perf_counter() - start
+
+    # 3. LPC 엔진 (전체 배치 한 번)
+    start = time.perf_counter()
+    analyze_formants_batch([audio.samples for _, audio in clips], 16000)
+    batch_time = time.perf_counter() - start
+
+    # 파일별 비교표
+    print("| file | engine | " + " | ".join(FIELDS) + " |")
+    print("|---" * (len(FIELDS) + 2) + "|")
+    diffs = {field: [] for field in FIELDS}
+    for (path, _), praat, lpc in zip(clips, praat_results, lpc_results):
+        for name, result in (("praat", praat), ("lpc", lpc)):
+            values = [f"{getattr(result, field):.1f}" if result.success else "-" for field in FIELDS]
+            print(f"| {path} | {name} | " + " | ".join(values) + " |")
+        if praat.success and lpc.success:
+            for field in FIELDS:
+                diffs[field].append(abs(getattr(praat, field) - getattr(lpc, field)))
+
+    # 요약
+    total_audio = sum(audio.duration for _, audio in clips)
+    print()
+    print(f"파일 수: {len(clips)}, 총 길이: {total_audio:.1f}s")
+    print(f"Praat:      {praat_time:.3f}s (실시간 대비 {praat_time / total_audio:.4f})")
+    print(f"LPC:        {lpc_time:.3f}s (실시간 대비 {lpc_time / total_audio:.4f}, {praat_time / lpc_time:.1f}x)")
+    print(f"LPC 배치:   {batch_time:.3f}s ({praat_time / batch_time:.1f}x)")
+    print()
+    print("| field | mean abs diff | max abs diff |")
+    print("|---|---|---|")
+    for field in FIELDS:
+        values = np.array(diffs[field]) if diffs[field] else np.zeros(1)
+        print(f"| {field} | {values.mean():.1f} | {values.max():.1f} |")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,73 @@
+# 분석 결과 내보내기 (Parquet / Arrow IPC 스트림 파일)
+# GET /api/export/results 와 같은 인코더로 결과를 페이지 단위로 읽어 파일에 바로 씁니다.
+# 메모리에는 페이지 하나만 올라오므로 수백만 행도 API 프로세스와 상관없이 내보낼 수 있습니다.
+#
+# 사용법 (backend 디렉토리에서):
+#   python -m scripts.export_results results.parquet
+#   python -m scripts.export_results results.arrows --format arrow --start 2024-01-01 --end 2024-02-01
+#   python -m scripts.export_results completed.parquet --status completed --features
+import argparse
+import os
+import sys
+import time
+from datetime import datetime, timezone
+
+from app.services.export import EXPORT_BATCH_ROWS, EXPORT_FORMATS, PYARROW_AVAILABLE, ExportFailed, stream_export
+from app.services.supabase import DEV_MODE
+
+
+def parse_time(value: str) -> datetime:
+    """ISO 8601 날짜/시각 (시간대가 없으면 UTC)"""
+    parsed = datetime.fromisoformat(value)
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description="분석 결과를 Parquet/Arrow 파일로 내보내기")
+    parser.add_argument("output", help="출력 파일 경로")
+    parser.add_argument("--format", choices=EXPORT_FORMATS, default="parquet")
+    parser.add_argument("--start", type=parse_time, help="이 시각 이후 결과만 (포함, 예: 2024-01-01)")
+    parser.add_argument("--end", type=parse_time, help="이 시각 이전 결과만 (제외)")
+    parser.add_argument("--status", help="녹음 상태 필터 (예: completed)")
+    parser.add_argument("--features", action="store_true", help="공명/톤 점수와 원시 특징값 열 포함")
+    parser.add_argument("--batch-rows", type=int, default=EXPORT_BATCH_ROWS, help="한 번에 읽고 쓸 행 수")
+    args = parser.parse_args(argv)
+
+    if not PYARROW_AVAILABLE:
+        print("[ERROR] pyarrow가 설치되어 있지 않습니다 (pip install pyarrow)")
+        return 1
+    if DEV_MODE:
+        print("[ERROR] DEV_MODE에서는 내보낼 결과가 없습니다. SUPABASE_URL/SUPABASE_SERVICE_KEY를 설정하세요.")
+        return 1
+
+    started = time.perf_counter()
+    exported = 0
+
+    def report(rows: int):
+        nonlocal exported
+        exported += rows
+        elapsed = time.perf_counter() - started
+        print(f"[INFO] {exported}행 ({exported / elapsed:.0f}행/초)")
+
+    # 끝까지 쓴 뒤에만 출력 경로로 옮겨, 중단되면 불완전한 파일이 남지 않게 함
+    partial_path = f"{args.output}.partial"
+    try:
+        with open(partial_path, "wb") as f:
+            for chunk in stream_export(
+                args.format, start=args.start, end=args.end, status=args.status,
+                include_features=args.features, batch_rows=args.batch_rows, on_batch=report,
+            ):
+                f.write(chunk)
+        os.replace(partial_path, args.output)
+    except (ExportFailed, KeyboardInterrupt) as e:
+        print(f"[ERROR] 내보내기 중단: {str(e) or '사용자 중단'} ({exported}행까지 기록, 파일 삭제)")
+        os.remove(partial_path)
+        return 130 if isinstance(e, KeyboardInterrupt) else 1
+
+    size_mb = os.path.getsize(args.output) / 1e6
+    print(f"[INFO] 완료: {exported}행, {size_mb:.1f}MB, {time.perf_counter() - started:.1f}초 → {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
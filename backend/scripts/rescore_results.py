@@ -0,0 +1,48 @@
+# 분석 결과 일괄 재채점
+# 이전 SCORING_VERSION으로 저장된 결과 행을 저장된 원시 특징값만으로 다시 채점합니다 (오디오/DSP 없음).
+# id 순 keyset 페이지로 읽어 배치 단위로 벡터화 계산하고, 한 번의 upsert로 저장합니다.
+# 중간에 멈춰도 이미 갱신한 행은 scoring_version이 올라가 있어 다시 실행하면 남은 행부터 이어집니다.
+#
+# 사용법 (backend 디렉토리에서):
+#   python -m scripts.rescore_results
+#   python -m scripts.rescore_results --batch-size 5000 --dry-run
+import argparse
+import sys
+import time
+
+from app.services import metrics
+from app.services.rescoring import rescore_rows
+from app.services.scoring import SCORING_VERSION
+from app.services.supabase import list_results_for_rescoring, upsert_analysis_results
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description="이전 점수 공식으로 저장된 분석 결과 재채점")
+    parser.add_argument("--batch-size", type=int, default=1000, help="한 번에 읽고 저장할 행 수")
+    parser.add_argument("--dry-run", action="store_true", help="계산만 하고 저장하지 않음")
+    args = parser.parse_args(argv)
+
+    print(f"[INFO] 재채점 시작: v{SCORING_VERSION} 미만, 배치 {args.batch_size}")
+    started = time.perf_counter()
+    after_id = None
+    total = 0
+    while True:
+        rows = list_results_for_rescoring(SCORING_VERSION, after_id=after_id, limit=args.batch_size)
+        if not rows:
+            break
+        updates = rescore_rows(rows)
+        if not args.dry_run and not upsert_analysis_results(updates):
+            print(f"[ERROR] 저장 실패, 마지막 성공 id: {after_id}")
+            return 1
+        metrics.inc("truevoice_rescored_results_total", len(updates), mode="bulk")
+        total += len(updates)
+        after_id = rows[-1]["id"]
+        elapsed = time.perf_counter() - started
+        print(f"[INFO] {total}행 재채점 ({total / elapsed:.0f}행/초), 마지막 id: {after_id}")
+
+    print(f"[INFO] 완료: {total}행, {time.perf_counter() - started:.1f}초{' (dry-run)' if args.dry_run else ''}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
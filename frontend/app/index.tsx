@@ -1,5 +1,5 @@
 // 홈/녹음 화면
-import React, { useState, useEffect } from 'react';
+import React, { useState, useEffect, useRef } from 'react';
 import {
   View,
   Text,
@@ -16,7 +16,7 @@ import { useRouter } from 'expo-router';
 import AsyncStorage from '@react-native-async-storage/async-storage';
 import RecordButton from '../components/RecordButton';
 import { uploadRecording, createRecording, DEV_MODE } from '../lib/supabase';
-import { analyzeRecording } from '../lib/api';
+import { analyzeRecording, analyzeRecordingStream, AnalyzeStreamEvent } from '../lib/api';
 import {
   Quote,
   QuoteCategory,
@@ -66,6 +66,10 @@ export default function HomeScreen() {
   const [selectedDifficulty, setSelectedDifficulty] = useState<Difficulty>('medium');
   const [currentQuote, setCurrentQuote] = useState<Quote | null>(null);
 
+  // 진행 중인 분석 요청 (취소하거나 화면을 벗어나면 연결을 끊어 서버 분석도 중단)
+  const analysisAbort = useRef<AbortController | null>(null);
+  useEffect(() => () => analysisAbort.current?.abort(), []);
+
   // 저장된 문장 불러오기
   useEffect(() => {
     loadSavedSentences();
@@ -203,12 +207,23 @@ export default function HomeScreen() {
         throw createError || new Error('녹음 기록 생성 실패');
       }
 
-      // 3. 발음 분석 요청
+      // 3. 발음 분석 요청 (단계가 끝날 때마다 진행 상황 표시)
       setStatusMessage('분석 중...');
-      const { result, error: analyzeError } = await analyzeRecording(
+      analysisAbort.current = new AbortController();
+      const { result, error: analyzeError } = await analyzeRecordingStream(
         recording.id,
-        currentText
+        currentText,
+        (streamEvent: AnalyzeStreamEvent) => {
+          if (streamEvent.event === 'converted') setStatusMessage('발음 평가 중...');
+          else if (streamEvent.event === 'scores') {
+            setStatusMessage(`발음 점수 ${Math.round(streamEvent.data.pronunciation)}점 · 목소리 분석 중...`);
+          }
+        },
+        analysisAbort.current.signal
       );
+      if (analysisAbort.current.signal.aborted) {
+        return;
+      }
 
       if (analyzeError || !result) {
         throw analyzeError || new Error('분석 실패');
@@ -229,11 +244,17 @@ export default function HomeScreen() {
       const errorMessage = error instanceof Error ? error.message : '녹음 처리 중 오류가 발생했습니다.';
       Alert.alert('알림', errorMessage);
     } finally {
+      analysisAbort.current = null;
       setIsAnalyzing(false);
       setStatusMessage('');
     }
   }
 
+  // 분석 취소
+  function handleCancelAnalysis() {
+    analysisAbort.current?.abort();
+  }
+
   // 다음 추천 문장으로 변경
   function handleNextText() {
     setTextIndex((prev) => (prev + 1) % SUGGESTED_TEXTS.length);
@@ -504,6 +525,11 @@ export default function HomeScreen() {
             <View style={styles.analyzingContainer}>
               <ActivityIndicator size="large" color="#3498db" />
               <Text style={styles.analyzingText}>{statusMessage}</Text>
+              {analysisAbort.current && (
+                <TouchableOpacity style={styles.cancelButton} onPress={handleCancelAnalysis}>
+                  <Text style={styles.cancelButtonText}>취소</Text>
+                </TouchableOpacity>
+              )}
             </View>
           ) : (
             <>
@@ -906,6 +932,18 @@ const styles = StyleSheet.create({
     fontSize: 16,
     color: '#7f8c8d',
   },
+  cancelButton: {
+    marginTop: 16,
+    paddingVertical: 8,
+    paddingHorizontal: 20,
+    borderRadius: 16,
+    borderWidth: 1,
+    borderColor: '#bdc3c7',
+  },
+  cancelButtonText: {
+    fontSize: 14,
+    color: '#7f8c8d',
+  },
   devBadge: {
     position: 'absolute',
     top: 10,
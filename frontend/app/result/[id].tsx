@@ -179,7 +179,7 @@ export default function ResultScreen() {
 
         {/* 🎧 내 녹음 재생 */}
         {audioUrl && (
-          <AudioPlayer audioUrl={audioUrl} title="내 녹음 듣기" />
+          <AudioPlayer audioUrl={audioUrl} title="내 녹음 듣기" resultId={params.id} />
         )}
 
         {/* 발음 상세 */}
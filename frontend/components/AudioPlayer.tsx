@@ -8,19 +8,39 @@ import {
   ActivityIndicator,
 } from 'react-native';
 import { Audio } from 'expo-av';
+import { getResultWaveform, WaveformPeaks } from '../lib/api';
+
+// 파형 막대 수
+const WAVEFORM_BARS = 60;
 
 interface AudioPlayerProps {
   audioUrl: string;
   title?: string;
+  resultId?: string;  // 있으면 서버에서 미리 계산한 파형 피크를 표시
 }
 
-export default function AudioPlayer({ audioUrl, title = '내 녹음' }: AudioPlayerProps) {
+export default function AudioPlayer({ audioUrl, title = '내 녹음', resultId }: AudioPlayerProps) {
   const [sound, setSound] = useState<Audio.Sound | null>(null);
   const [isPlaying, setIsPlaying] = useState(false);
   const [isLoading, setIsLoading] = useState(false);
   const [duration, setDuration] = useState(0);
   const [position, setPosition] = useState(0);
   const [error, setError] = useState<string | null>(null);
+  const [waveform, setWaveform] = useState<WaveformPeaks | null>(null);
+
+  // 파형 피크 로드 (녹음 파일을 받지 않고 바로 표시)
+  useEffect(() => {
+    if (!resultId) return;
+    let cancelled = false;
+    getResultWaveform(resultId, WAVEFORM_BARS).then(({ waveform: peaks }) => {
+      if (!cancelled && peaks) {
+        setWaveform(peaks);
+      }
+    });
+    return () => {
+      cancelled = true;
+    };
+  }, [resultId]);
 
   // 컴포넌트 언마운트 시 사운드 정리
   useEffect(() => {
@@ -98,6 +118,28 @@ export default function AudioPlayer({ audioUrl, title = '내 녹음' }: AudioPla
   // 진행률 계산
   const progress = duration > 0 ? (position / duration) * 100 : 0;
 
+  // 파형 막대 높이 (피크를 막대 수에 맞게 묶고 0~1로 정규화)
+  function getWaveformBars(peaks: WaveformPeaks): number[] {
+    const count = Math.min(WAVEFORM_BARS, peaks.max.length);
+    const groupSize = peaks.max.length / count;
+    const bars: number[] = [];
+    for (let i = 0; i < count; i++) {
+      const start = Math.floor(i * groupSize);
+      const end = Math.max(start + 1, Math.floor((i + 1) * groupSize));
+      let amplitude = 0;
+      for (let j = start; j < end; j++) {
+        amplitude = Math.max(amplitude, peaks.max[j], -peaks.min[j]);
+      }
+      bars.push(amplitude);
+    }
+    const loudest = Math.max(...bars, 0.01);
+    return bars.map((bar) => bar / loudest);
+  }
+
+  const waveformBars = waveform ? getWaveformBars(waveform) : null;
+  // 재생 전에는 파형 메타데이터의 길이를 표시
+  const totalDuration = duration || (waveform ? waveform.duration * 1000 : 0);
+
   if (error) {
     return (
       <View style={styles.container}>
@@ -134,12 +176,30 @@ export default function AudioPlayer({ audioUrl, title = '내 녹음' }: AudioPla
 
           {/* 진행 바 & 시간 */}
           <View style={styles.progressSection}>
-            <View style={styles.progressBarContainer}>
-              <View style={[styles.progressBar, { width: `${progress}%` }]} />
-            </View>
+            {waveformBars ? (
+              <View style={styles.waveformContainer}>
+                {waveformBars.map((height, index) => (
+                  <View
+                    key={index}
+                    style={[
+                      styles.waveformBar,
+                      {
+                        height: `${Math.max(8, height * 100)}%`,
+                        backgroundColor:
+                          (index / waveformBars.length) * 100 < progress ? '#3498db' : '#d5dde3',
+                      },
+                    ]}
+                  />
+                ))}
+              </View>
+            ) : (
+              <View style={styles.progressBarContainer}>
+                <View style={[styles.progressBar, { width: `${progress}%` }]} />
+              </View>
+            )}
             <View style={styles.timeContainer}>
               <Text style={styles.timeText}>{formatTime(position)}</Text>
-              <Text style={styles.timeText}>{formatTime(duration)}</Text>
+              <Text style={styles.timeText}>{formatTime(totalDuration)}</Text>
             </View>
           </View>
         </View>
@@ -203,6 +263,17 @@ const styles = StyleSheet.create({
     backgroundColor: '#3498db',
     borderRadius: 3,
   },
+  waveformContainer: {
+    height: 32,
+    flexDirection: 'row',
+    alignItems: 'center',
+    justifyContent: 'space-between',
+  },
+  waveformBar: {
+    flex: 1,
+    marginHorizontal: 0.5,
+    borderRadius: 1,
+  },
   timeContainer: {
     flexDirection: 'row',
     justifyContent: 'space-between',
@@ -1,5 +1,13 @@
 // 백엔드 API 클라이언트
-import { AnalysisResult, DEV_MODE, getMockAnalysisResult } from './supabase';
+import {
+  AnalysisPreset,
+  AnalysisResult,
+  DEV_MODE,
+  FormantAnalysis,
+  getMockAnalysisResult,
+  Recording,
+  ToneAnalysis,
+} from './supabase';
 
 // API 기본 URL
 const API_URL = process.env.EXPO_PUBLIC_API_URL || 'http://localhost:8000';
@@ -30,12 +38,15 @@ interface AnalyzeResponse {
     pitch_range: number;
     feedback: string;
   };
+  pending?: ('formant' | 'tone')[];
+  preset?: AnalysisPreset;
 }
 
 // 발음 분석 요청
 export async function analyzeRecording(
   recordingId: string,
-  referenceText: string
+  referenceText: string,
+  preset?: AnalysisPreset
 ): Promise<{ result: AnalysisResult | null; error: Error | null }> {
   // 개발 모드에서는 목업 데이터 반환
   if (DEV_MODE) {
@@ -54,6 +65,7 @@ export async function analyzeRecording(
       body: JSON.stringify({
         recording_id: recordingId,
         reference_text: referenceText,
+        preset,
       }),
     });
 
@@ -80,6 +92,8 @@ export async function analyzeRecording(
       feedback: data.feedback!,
       formant: data.formant,
       tone: data.tone,
+      pending: data.pending,
+      preset: data.preset,
     };
 
     return { result, error: null };
@@ -89,6 +103,110 @@ export async function analyzeRecording(
   }
 }
 
+// 분석 스트림 이벤트 (단계가 끝날 때마다 도착)
+export type AnalyzeStreamEvent =
+  | { event: 'downloaded'; data: { bytes: number } }
+  | { event: 'converted'; data: { duration: number; speech_duration: number; sample_rate: number } }
+  | { event: 'scores'; data: NonNullable<AnalyzeResponse['scores']> }
+  | { event: 'formant'; data: NonNullable<AnalyzeResponse['formant']> }
+  | { event: 'tone'; data: NonNullable<AnalyzeResponse['tone']> }
+  | { event: 'saved'; data: AnalyzeResponse }
+  | { event: 'error'; data: { status_code: number; detail: string } };
+
+// SSE 메시지 블록("event: ...\ndata: ...") 파싱
+function parseSseBlock(block: string): AnalyzeStreamEvent | null {
+  let event = 'message';
+  const dataLines: string[] = [];
+  for (const line of block.split('\n')) {
+    if (line.startsWith('event:')) event = line.slice(6).trim();
+    else if (line.startsWith('data:')) dataLines.push(line.slice(5).trim());
+  }
+  if (dataLines.length === 0) return null;
+  return { event, data: JSON.parse(dataLines.join('\n')) } as AnalyzeStreamEvent;
+}
+
+// 발음 분석 요청 (단계별 결과를 onEvent로 먼저 받음)
+// React Native의 fetch는 응답 스트리밍을 지원하지 않아 XMLHttpRequest의 progress로 읽음
+export function analyzeRecordingStream(
+  recordingId: string,
+  referenceText: string,
+  onEvent: (event: AnalyzeStreamEvent) => void,
+  signal?: AbortSignal,
+  preset?: AnalysisPreset
+): Promise<{ result: AnalysisResult | null; error: Error | null }> {
+  if (DEV_MODE) {
+    return analyzeRecording(recordingId, referenceText, preset);
+  }
+
+  return new Promise((resolve) => {
+    const xhr = new XMLHttpRequest();
+    let offset = 0;
+    let buffer = '';
+    let settled = false;
+
+    const finish = (result: AnalysisResult | null, error: Error | null) => {
+      if (settled) return;
+      settled = true;
+      if (error) console.error('분석 요청 오류:', error);
+      resolve({ result, error });
+    };
+
+    const handle = (streamEvent: AnalyzeStreamEvent) => {
+      onEvent(streamEvent);
+      if (streamEvent.event === 'saved') {
+        const data = streamEvent.data;
+        finish({
+          id: data.result_id!,
+          recording_id: recordingId,
+          created_at: new Date().toISOString(),
+          accuracy_score: data.scores!.accuracy,
+          fluency_score: data.scores!.fluency,
+          completeness_score: data.scores!.completeness,
+          pronunciation_score: data.scores!.pronunciation,
+          feedback: data.feedback!,
+          formant: data.formant,
+          tone: data.tone,
+          pending: data.pending,
+          preset: data.preset,
+        }, null);
+      } else if (streamEvent.event === 'error') {
+        const detail = streamEvent.data.detail || '분석에 실패했습니다.';
+        finish(null, new Error(
+          detail.includes('No speech recognized')
+            ? '🎤 음성이 감지되지 않았어요!\n\n마이크에 가까이 대고 크고 또렷하게 말해보세요.'
+            : detail
+        ));
+      }
+    };
+
+    const readChunk = () => {
+      buffer += xhr.responseText.slice(offset);
+      offset = xhr.responseText.length;
+      let boundary = buffer.indexOf('\n\n');
+      while (boundary !== -1) {
+        const streamEvent = parseSseBlock(buffer.slice(0, boundary));
+        buffer = buffer.slice(boundary + 2);
+        if (streamEvent) handle(streamEvent);
+        boundary = buffer.indexOf('\n\n');
+      }
+    };
+
+    xhr.open('POST', `${API_URL}/api/analyze/stream`);
+    xhr.setRequestHeader('Content-Type', 'application/json');
+    xhr.setRequestHeader('Accept', 'text/event-stream');
+    xhr.onprogress = readChunk;
+    xhr.onload = () => {
+      readChunk();
+      finish(null, new Error('분석 결과를 받지 못했습니다.'));
+    };
+    xhr.onerror = () => finish(null, new Error('네트워크 오류가 발생했습니다.'));
+    xhr.onabort = () => finish(null, new Error('분석이 취소되었습니다.'));
+    signal?.addEventListener('abort', () => xhr.abort());
+
+    xhr.send(JSON.stringify({ recording_id: recordingId, reference_text: referenceText, preset }));
+  });
+}
+
 // 분석 결과 조회
 export async function getResult(
   resultId: string
@@ -102,27 +220,288 @@ export async function getResult(
   try {
     const response = await fetch(`${API_URL}/api/results/${resultId}`);
     const data = await response.json();
+    return { result: toAnalysisResult(data), error: null };
+  } catch (error) {
+    console.error('결과 조회 오류:', error);
+    return { result: null, error: error as Error };
+  }
+}
 
-    const result: AnalysisResult = {
-      id: data.id,
-      recording_id: data.recording_id,
-      created_at: data.created_at,
-      accuracy_score: data.scores.accuracy,
-      fluency_score: data.scores.fluency,
-      completeness_score: data.scores.completeness,
-      pronunciation_score: data.scores.pronunciation,
-      feedback: data.feedback,
-      formant: data.formant,
-      tone: data.tone,
-    };
+// 결과 조회 응답 → AnalysisResult
+function toAnalysisResult(data: any): AnalysisResult {
+  return {
+    id: data.id,
+    recording_id: data.recording_id,
+    created_at: data.created_at,
+    accuracy_score: data.scores.accuracy,
+    fluency_score: data.scores.fluency,
+    completeness_score: data.scores.completeness,
+    pronunciation_score: data.scores.pronunciation,
+    feedback: data.feedback,
+    formant: data.formant ?? undefined,
+    tone: data.tone ?? undefined,
+    pending: data.pending ?? undefined,
+    preset: data.preset ?? undefined,
+  };
+}
 
-    return { result, error: null };
+// 녹음의 최신 분석 결과 조회 (result_id를 모를 때)
+export async function getRecordingResult(
+  recordingId: string
+): Promise<{ result: AnalysisResult | null; error: Error | null }> {
+  if (DEV_MODE) {
+    return { result: getMockAnalysisResult(), error: null };
+  }
+
+  try {
+    const response = await fetch(`${API_URL}/api/recordings/${recordingId}/result`);
+    if (!response.ok) {
+      throw new Error('결과를 찾을 수 없습니다.');
+    }
+    const data = await response.json();
+    return { result: toAnalysisResult(data), error: null };
   } catch (error) {
     console.error('결과 조회 오류:', error);
     return { result: null, error: error as Error };
   }
 }
 
+// 기록 목록의 분석 결과 (include로 요청한 필드만 채워짐)
+export interface ResultSummary {
+  id: string;
+  recording_id: string;
+  created_at: string;
+  scores: { accuracy: number; fluency: number; completeness: number; pronunciation: number };
+  feedback: string | null;
+  resonance_score: number | null;
+  tone_score: number | null;
+  pending: ('formant' | 'tone')[] | null;
+  preset: AnalysisPreset | null;
+  formant: FormantAnalysis | null;
+  tone: ToneAnalysis | null;
+  word_details: Record<string, unknown>[] | null;
+}
+
+// 분석 결과 기록 조회 (최신순, nextCursor가 null이면 마지막 페이지)
+export async function getResultHistory(options: {
+  cursor?: string | null;
+  limit?: number;
+  include?: ('formant' | 'tone' | 'words')[];
+  recordingId?: string;
+} = {}): Promise<{ items: ResultSummary[]; nextCursor: string | null; error: Error | null }> {
+  try {
+    const params = new URLSearchParams({ limit: String(options.limit ?? 20) });
+    if (options.cursor) params.set('cursor', options.cursor);
+    if (options.include?.length) params.set('include', options.include.join(','));
+    if (options.recordingId) params.set('recording_id', options.recordingId);
+
+    const response = await fetch(`${API_URL}/api/results?${params}`);
+    if (!response.ok) {
+      throw new Error('결과 기록을 조회할 수 없습니다.');
+    }
+    const data = await response.json();
+    return { items: data.items, nextCursor: data.next_cursor ?? null, error: null };
+  } catch (error) {
+    console.error('결과 기록 조회 오류:', error);
+    return { items: [], nextCursor: null, error: error as Error };
+  }
+}
+
+// 녹음 기록 조회 (최신순, nextCursor가 null이면 마지막 페이지)
+export async function getRecordingHistory(options: {
+  cursor?: string | null;
+  limit?: number;
+  status?: Recording['status'];
+} = {}): Promise<{ items: Recording[]; nextCursor: string | null; error: Error | null }> {
+  try {
+    const params = new URLSearchParams({ limit: String(options.limit ?? 20) });
+    if (options.cursor) params.set('cursor', options.cursor);
+    if (options.status) params.set('status', options.status);
+
+    const response = await fetch(`${API_URL}/api/recordings?${params}`);
+    if (!response.ok) {
+      throw new Error('녹음 기록을 조회할 수 없습니다.');
+    }
+    const data = await response.json();
+    return { items: data.items, nextCursor: data.next_cursor ?? null, error: null };
+  } catch (error) {
+    console.error('녹음 기록 조회 오류:', error);
+    return { items: [], nextCursor: null, error: error as Error };
+  }
+}
+
+// 시계열(피치/포먼트) 타입 - 유성 프레임만 포함
+export interface ResultContours {
+  meta: Record<string, unknown>;
+  pitch?: { time: number[]; f0: (number | null)[] };
+  formant?: { time: number[]; f1: (number | null)[]; f2: (number | null)[]; f3: (number | null)[] };
+}
+
+// 분석 결과 시계열 조회 (차트를 열 때만 호출)
+export async function getResultContours(
+  resultId: string
+): Promise<{ contours: ResultContours | null; error: Error | null }> {
+  try {
+    const response = await fetch(`${API_URL}/api/results/${resultId}/contours?format=json`);
+    if (!response.ok) {
+      throw new Error('시계열 데이터가 없습니다.');
+    }
+    const contours: ResultContours = await response.json();
+    return { contours, error: null };
+  } catch (error) {
+    console.error('시계열 조회 오류:', error);
+    return { contours: null, error: error as Error };
+  }
+}
+
+export interface ContourLevel {
+  kind: 'pitch' | 'formant';
+  level: number;        // 0 = 원본 해상도
+  bucket_size: number;  // 포인트 하나에 묶인 원본 포인트 수
+  time: number[];
+  [channel: string]: number | string | (number | null)[];
+}
+
+// 차트 크기에 맞춘 시계열 조회 (points: 차트 가로 픽셀 수, start/end: 줌 범위 초)
+export async function getResultContourLevel(
+  resultId: string,
+  kind: 'pitch' | 'formant',
+  points: number,
+  range?: { start?: number; end?: number }
+): Promise<{ contour: ContourLevel | null; error: Error | null }> {
+  try {
+    const params = new URLSearchParams({ points: String(Math.round(points)) });
+    if (range?.start !== undefined) params.set('start', String(range.start));
+    if (range?.end !== undefined) params.set('end', String(range.end));
+
+    const response = await fetch(`${API_URL}/api/results/${resultId}/contours/${kind}?${params}`);
+    if (!response.ok) {
+      throw new Error('시계열 데이터가 없습니다.');
+    }
+    const contour: ContourLevel = await response.json();
+    return { contour, error: null };
+  } catch (error) {
+    console.error('시계열 조회 오류:', error);
+    return { contour: null, error: error as Error };
+  }
+}
+
+export interface WaveformPeaks {
+  sample_rate: number;
+  duration: number;        // 초
+  samples_per_peak: number;
+  min: number[];           // -1 ~ 0
+  max: number[];           // 0 ~ 1
+}
+
+// 재생용 파형 피크 조회 (width: 그릴 막대 수)
+export async function getResultWaveform(
+  resultId: string,
+  width: number
+): Promise<{ waveform: WaveformPeaks | null; error: Error | null }> {
+  try {
+    const response = await fetch(
+      `${API_URL}/api/results/${resultId}/waveform?width=${Math.round(width)}`
+    );
+    if (!response.ok) {
+      throw new Error('파형 데이터가 없습니다.');
+    }
+    const waveform: WaveformPeaks = await response.json();
+    return { waveform, error: null };
+  } catch (error) {
+    console.error('파형 조회 오류:', error);
+    return { waveform: null, error: error as Error };
+  }
+}
+
+// 단어별 누적 통계 (오류 비율 0-1, 평균 점수 0-100)
+export interface WordStat {
+  word: string;
+  attempts: number;
+  error_count: number;
+  error_rate: number;
+  mean_score: number;
+}
+
+export interface SentenceWordStat extends WordStat {
+  position: number;  // 문장 안 단어 순서 (0부터)
+}
+
+// 가장 자주 틀리는 단어 조회
+export async function getWeakWords(
+  limit = 20,
+  minAttempts = 5
+): Promise<{ words: WordStat[]; error: Error | null }> {
+  try {
+    const params = new URLSearchParams({ limit: String(limit), min_attempts: String(minAttempts) });
+    const response = await fetch(`${API_URL}/api/words/weak?${params}`);
+    if (!response.ok) {
+      throw new Error('단어 통계를 조회할 수 없습니다.');
+    }
+    const data = await response.json();
+    return { words: data.words, error: null };
+  } catch (error) {
+    console.error('약한 단어 조회 오류:', error);
+    return { words: [], error: error as Error };
+  }
+}
+
+// 문장에서 어려운 단어 조회 (첫 번째가 가장 어려운 단어)
+export async function getSentenceHardWords(
+  text: string,
+  limit = 5
+): Promise<{ words: SentenceWordStat[]; error: Error | null }> {
+  try {
+    const params = new URLSearchParams({ text, limit: String(limit) });
+    const response = await fetch(`${API_URL}/api/sentences/words?${params}`);
+    if (!response.ok) {
+      throw new Error('단어 통계를 조회할 수 없습니다.');
+    }
+    const data = await response.json();
+    return { words: data.words, error: null };
+  } catch (error) {
+    console.error('문장 단어 조회 오류:', error);
+    return { words: [], error: error as Error };
+  }
+}
+
+// 점수 분포 (count가 0이면 mean/std는 null)
+export interface ScoreDistribution {
+  count: number;
+  mean: number | null;
+  std: number | null;
+}
+
+// 문장별 점수 집계
+export interface SentenceStats {
+  original_text: string;
+  attempts: number;
+  scores: Record<'pronunciation' | 'accuracy' | 'fluency' | 'completeness' | 'resonance' | 'tone', ScoreDistribution>;
+  pronunciation_histogram: number[];  // 칸별 결과 수 (0점부터 histogram_bucket_width 점 단위)
+  histogram_bucket_width: number;
+}
+
+// 문장 난이도 통계 조회 (기록이 없으면 stats = null, error = null)
+export async function getSentenceStats(
+  text: string
+): Promise<{ stats: SentenceStats | null; error: Error | null }> {
+  try {
+    const params = new URLSearchParams({ text });
+    const response = await fetch(`${API_URL}/api/sentences/stats?${params}`);
+    if (response.status === 404) {
+      return { stats: null, error: null };
+    }
+    if (!response.ok) {
+      throw new Error('문장 통계를 조회할 수 없습니다.');
+    }
+    const stats: SentenceStats = await response.json();
+    return { stats, error: null };
+  } catch (error) {
+    console.error('문장 통계 조회 오류:', error);
+    return { stats: null, error: error as Error };
+  }
+}
+
 // 헬스 체크
 export async function healthCheck(): Promise<boolean> {
   try {
@@ -20,7 +20,7 @@ export interface Recording {
   file_path: string;
   original_text: string;
   duration_ms: number | null;
-  status: 'pending' | 'analyzing' | 'completed' | 'failed';
+  status: 'pending' | 'analyzing' | 'completed' | 'failed' | 'cancelled';
 }
 
 // 공명(포먼트) 분석 결과
@@ -41,6 +41,9 @@ export interface ToneAnalysis {
   feedback: string;
 }
 
+// 분석 품질 프리셋 (fast: 점수만 빠르게, balanced: 기본, accurate: 5ms 프레임)
+export type AnalysisPreset = 'fast' | 'balanced' | 'accurate';
+
 // 분석 결과 데이터 타입
 export interface AnalysisResult {
   id: string;
@@ -55,6 +58,10 @@ export interface AnalysisResult {
   formant?: FormantAnalysis;
   // 톤 분석 결과
   tone?: ToneAnalysis;
+  // 마감까지 끝나지 않아 아직 계산 중인 단계 (getResult로 다시 조회)
+  pending?: ('formant' | 'tone')[];
+  // 분석 품질 프리셋
+  preset?: AnalysisPreset;
 }
 
 // 녹음 파일 업로드
@@ -10,7 +10,8 @@ CREATE TABLE IF NOT EXISTS recordings (
     file_path TEXT NOT NULL,           -- Storage 경로
     original_text TEXT NOT NULL,       -- 읽어야 할 텍스트
     duration_ms INTEGER,               -- 녹음 길이 (밀리초)
-    status TEXT DEFAULT 'pending'      -- pending, analyzing, completed, failed
+    status TEXT DEFAULT 'pending',     -- pending, analyzing, completed, failed, cancelled (분석 중 연결 끊김)
+    analysis_started_at TIMESTAMP WITH TIME ZONE  -- 분석 점유 시각 (lease 만료 판단용)
 );
 
 -- 2. analysis_results 테이블: 분석 결과 저장
@@ -33,7 +34,7 @@ CREATE TABLE IF NOT EXISTS analysis_results (
     feedback TEXT,
 
     -- 포먼트(공명) 분석 결과 (JSON)
-    formant_data JSONB
+    formant_data JSONB,
     -- 예: {
     --   "mean_f1": 520.3,
     --   "mean_f2": 1450.7,
@@ -44,8 +45,31 @@ CREATE TABLE IF NOT EXISTS analysis_results (
     --   "stability_score": 78.5,
     --   "resonance_score": 82.0,
     --   "feedback": "공명이 양호합니다.",
-    --   "formant_track": [{"time": 0.0, "f1": 520, "f2": 1450, "f3": 2650}, ...]
+    --   "features": {"mean_f1": 520.31, "std_f1": 35.2, ...}   -- 재채점용 원시 특징값
     -- }
+    -- (포먼트 트랙/피치 컨투어 같은 시계열은 행을 키우지 않도록 contour_path에 별도 저장)
+
+    -- 톤 분석 결과 (JSON)
+    tone_data JSONB,
+
+    -- 시계열 바이너리 경로 (analysis-artifacts 버킷, int16 양자화 컨테이너)
+    -- GET /api/results/{id}/contours 로 차트를 열 때만 지연 로딩
+    contour_path TEXT,
+
+    -- 파형 피크 바이너리 경로 (analysis-artifacts 버킷, int8 min/max 포락선)
+    -- GET /api/results/{id}/waveform 으로 오디오 플레이어가 조회
+    waveform_path TEXT,
+
+    -- 마감(ANALYZE_DEADLINE_MS)을 넘겨 백그라운드에서 계산 중인 단계 (예: ["tone"])
+    -- 끝날 때마다 formant_data/tone_data를 채우고 목록에서 제거
+    pending_stages JSONB,
+
+    -- 분석 품질 프리셋 (fast, balanced, accurate)
+    analysis_preset TEXT,
+
+    -- 점수 공식 버전 (backend/app/services/scoring.py의 SCORING_VERSION)
+    -- formant_data/tone_data의 "features"(원시 특징값)로 DSP 없이 재채점, NULL이면 특징값 없는 이전 행
+    scoring_version INTEGER
 );
 
 -- 3. 인덱스 생성
@@ -53,21 +77,288 @@ CREATE INDEX IF NOT EXISTS idx_recordings_status ON recordings(status);
 CREATE INDEX IF NOT EXISTS idx_recordings_created_at ON recordings(created_at DESC);
 CREATE INDEX IF NOT EXISTS idx_analysis_recording_id ON analysis_results(recording_id);
 CREATE INDEX IF NOT EXISTS idx_analysis_created_at ON analysis_results(created_at DESC);
+-- 기록 목록/백필의 (created_at, id) keyset 페이지용 (역방향 스캔으로 오름차순도 사용)
+CREATE INDEX IF NOT EXISTS idx_recordings_created_at_id ON recordings(created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_analysis_created_at_id ON analysis_results(created_at DESC, id DESC);
+-- 녹음별 결과 기록/최신 결과
+CREATE INDEX IF NOT EXISTS idx_analysis_recording_created ON analysis_results(recording_id, created_at DESC, id DESC);
+-- 재채점 대상(이전 scoring_version) keyset 스캔용
+CREATE INDEX IF NOT EXISTS idx_analysis_scoring_version ON analysis_results(scoring_version, id);
+-- 오래된 지연 단계(pending_stages) 정리용 (pending 행만 담는 부분 인덱스)
+CREATE INDEX IF NOT EXISTS idx_analysis_pending ON analysis_results(created_at) WHERE pending_stages IS NOT NULL;
+
+-- =========================================
+-- 단어별 결과 (약한 단어 조회용)
+-- =========================================
+-- analysis_results.word_details를 단어 한 행씩 펼친 정규화 테이블입니다.
+-- 결과 행이 저장/갱신될 때 트리거가 채우므로 백엔드는 word_details만 저장하면 됩니다.
+CREATE TABLE IF NOT EXISTS word_results (
+    id BIGINT GENERATED ALWAYS AS IDENTITY PRIMARY KEY,
+    result_id UUID NOT NULL REFERENCES analysis_results(id) ON DELETE CASCADE,
+    recording_id UUID,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    original_text TEXT NOT NULL,       -- 녹음의 기준 텍스트 (문장별 조회용으로 복제)
+    position INTEGER NOT NULL,         -- 문장 안 단어 순서 (0부터)
+    word TEXT NOT NULL,
+    score DECIMAL(5,2),                -- 단어 정확도 점수 (0-100)
+    error_type TEXT,                   -- Azure ErrorType (None, Mispronunciation, Omission, Insertion ...)
+    is_error BOOLEAN GENERATED ALWAYS AS (COALESCE(error_type, 'None') <> 'None') STORED
+);
+
+CREATE INDEX IF NOT EXISTS idx_word_results_result_id ON word_results(result_id);
+CREATE INDEX IF NOT EXISTS idx_word_results_word ON word_results(word, created_at DESC);
+
+-- 단어별 누적 집계 (word_results 트리거가 증감, 전체 스캔 없이 조회)
+CREATE TABLE IF NOT EXISTS word_stats (
+    word TEXT PRIMARY KEY,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    error_count INTEGER NOT NULL DEFAULT 0,
+    score_sum DOUBLE PRECISION NOT NULL DEFAULT 0,
+    mean_score DOUBLE PRECISION GENERATED ALWAYS AS
+        (CASE WHEN attempts > 0 THEN score_sum / attempts END) STORED,
+    error_rate DOUBLE PRECISION GENERATED ALWAYS AS
+        (CASE WHEN attempts > 0 THEN error_count::DOUBLE PRECISION / attempts END) STORED
+);
+
+-- 가장 자주 틀리는 단어
+CREATE INDEX IF NOT EXISTS idx_word_stats_error_count ON word_stats(error_count DESC);
+
+-- 문장(기준 텍스트) 안 단어 위치별 누적 집계
+CREATE TABLE IF NOT EXISTS sentence_word_stats (
+    original_text TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    word TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    error_count INTEGER NOT NULL DEFAULT 0,
+    score_sum DOUBLE PRECISION NOT NULL DEFAULT 0,
+    mean_score DOUBLE PRECISION GENERATED ALWAYS AS
+        (CASE WHEN attempts > 0 THEN score_sum / attempts END) STORED,
+    error_rate DOUBLE PRECISION GENERATED ALWAYS AS
+        (CASE WHEN attempts > 0 THEN error_count::DOUBLE PRECISION / attempts END) STORED,
+    PRIMARY KEY (original_text, position, word)
+);
+
+-- 문장에서 가장 어려운 단어 (평균 점수 오름차순)
+CREATE INDEX IF NOT EXISTS idx_sentence_word_stats_mean ON sentence_word_stats(original_text, mean_score);
+
+-- 결과 행의 word_details → word_results (갱신되면 그 결과의 단어 행을 다시 만듦)
+CREATE OR REPLACE FUNCTION sync_word_results() RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'UPDATE' THEN
+        DELETE FROM word_results WHERE result_id = NEW.id;
+    END IF;
+    IF jsonb_typeof(NEW.word_details) = 'array' THEN
+        INSERT INTO word_results (result_id, recording_id, created_at, original_text, position, word, score, error_type)
+        SELECT NEW.id, NEW.recording_id, NEW.created_at, r.original_text, w.ordinality - 1,
+               w.value->>'word', (w.value->>'score')::DECIMAL, w.value->>'error_type'
+        FROM recordings r, jsonb_array_elements(NEW.word_details) WITH ORDINALITY AS w(value, ordinality)
+        WHERE r.id = NEW.recording_id AND COALESCE(w.value->>'word', '') <> '';
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_analysis_word_results_insert ON analysis_results;
+CREATE TRIGGER trg_analysis_word_results_insert
+AFTER INSERT ON analysis_results
+FOR EACH ROW EXECUTE FUNCTION sync_word_results();
+
+DROP TRIGGER IF EXISTS trg_analysis_word_results_update ON analysis_results;
+CREATE TRIGGER trg_analysis_word_results_update
+AFTER UPDATE OF word_details ON analysis_results
+FOR EACH ROW WHEN (OLD.word_details IS DISTINCT FROM NEW.word_details)
+EXECUTE FUNCTION sync_word_results();
+
+-- word_results 행 추가/삭제 → 집계 증감 (결과/녹음 삭제 시 CASCADE로 지워지는 행도 반영)
+CREATE OR REPLACE FUNCTION apply_word_stats() RETURNS TRIGGER AS $$
+DECLARE
+    w word_results;
+    delta INTEGER;
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        w := NEW;
+        delta := 1;
+    ELSE
+        w := OLD;
+        delta := -1;
+    END IF;
+
+    INSERT INTO word_stats AS s (word, attempts, error_count, score_sum)
+    VALUES (w.word, delta, delta * w.is_error::INTEGER, delta * COALESCE(w.score, 0))
+    ON CONFLICT (word) DO UPDATE SET
+        attempts = s.attempts + EXCLUDED.attempts,
+        error_count = s.error_count + EXCLUDED.error_count,
+        score_sum = s.score_sum + EXCLUDED.score_sum;
+
+    INSERT INTO sentence_word_stats AS s (original_text, position, word, attempts, error_count, score_sum)
+    VALUES (w.original_text, w.position, w.word, delta, delta * w.is_error::INTEGER, delta * COALESCE(w.score, 0))
+    ON CONFLICT (original_text, position, word) DO UPDATE SET
+        attempts = s.attempts + EXCLUDED.attempts,
+        error_count = s.error_count + EXCLUDED.error_count,
+        score_sum = s.score_sum + EXCLUDED.score_sum;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_word_results_stats ON word_results;
+CREATE TRIGGER trg_word_results_stats
+AFTER INSERT OR DELETE ON word_results
+FOR EACH ROW EXECUTE FUNCTION apply_word_stats();
+
+-- =========================================
+-- 문장별 점수 집계 (연습 문장 난이도)
+-- =========================================
+-- 기준 텍스트(original_text)마다 결과 수, 점수 합계/제곱합, 발음 점수 히스토그램을 누적합니다.
+-- 평균/표준편차는 합계에서 바로 계산하므로 recordings와 analysis_results를 조인/스캔하지 않습니다.
+-- analysis_results 트리거가 저장/갱신(지연된 공명/톤 단계, 재채점 포함)/삭제 때마다 증감합니다.
+CREATE TABLE IF NOT EXISTS sentence_stats (
+    original_text TEXT PRIMARY KEY,
+    attempts INTEGER NOT NULL DEFAULT 0,              -- 분석 결과 수 (발음/정확도/유창성/완성도 공통)
+    pronunciation_sum DOUBLE PRECISION NOT NULL DEFAULT 0,
+    pronunciation_sumsq DOUBLE PRECISION NOT NULL DEFAULT 0,
+    accuracy_sum DOUBLE PRECISION NOT NULL DEFAULT 0,
+    accuracy_sumsq DOUBLE PRECISION NOT NULL DEFAULT 0,
+    fluency_sum DOUBLE PRECISION NOT NULL DEFAULT 0,
+    fluency_sumsq DOUBLE PRECISION NOT NULL DEFAULT 0,
+    completeness_sum DOUBLE PRECISION NOT NULL DEFAULT 0,
+    completeness_sumsq DOUBLE PRECISION NOT NULL DEFAULT 0,
+    -- 공명/톤은 분석하지 않은 결과가 있어 개수를 따로 셈
+    resonance_count INTEGER NOT NULL DEFAULT 0,
+    resonance_sum DOUBLE PRECISION NOT NULL DEFAULT 0,
+    resonance_sumsq DOUBLE PRECISION NOT NULL DEFAULT 0,
+    tone_count INTEGER NOT NULL DEFAULT 0,
+    tone_sum DOUBLE PRECISION NOT NULL DEFAULT 0,
+    tone_sumsq DOUBLE PRECISION NOT NULL DEFAULT 0,
+    -- 발음 점수 히스토그램 (10점 단위 10칸: 0-10, 10-20, ..., 90-100)
+    pronunciation_histogram INTEGER[] NOT NULL DEFAULT array_fill(0, ARRAY[10]),
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+-- 결과 행 하나를 문장 집계에 더하거나(delta = 1) 뺌(delta = -1)
+CREATE OR REPLACE FUNCTION apply_sentence_stats(r analysis_results, delta INTEGER) RETURNS VOID AS $$
+DECLARE
+    text_key TEXT;
+    resonance DOUBLE PRECISION := (r.formant_data->>'resonance_score')::DOUBLE PRECISION;
+    tone DOUBLE PRECISION := (r.tone_data->>'tone_score')::DOUBLE PRECISION;
+    pronunciation DOUBLE PRECISION := COALESCE(r.pronunciation_score, 0);
+    accuracy DOUBLE PRECISION := COALESCE(r.accuracy_score, 0);
+    fluency DOUBLE PRECISION := COALESCE(r.fluency_score, 0);
+    completeness DOUBLE PRECISION := COALESCE(r.completeness_score, 0);
+    bucket INTEGER := LEAST(GREATEST(FLOOR(COALESCE(r.pronunciation_score, 0) / 10)::INTEGER, 0), 9) + 1;
+BEGIN
+    SELECT original_text INTO text_key FROM recordings WHERE id = r.recording_id;
+    IF text_key IS NULL THEN
+        RETURN;
+    END IF;
+
+    INSERT INTO sentence_stats (original_text) VALUES (text_key)
+    ON CONFLICT (original_text) DO NOTHING;
+
+    UPDATE sentence_stats SET
+        attempts = attempts + delta,
+        pronunciation_sum = pronunciation_sum + delta * pronunciation,
+        pronunciation_sumsq = pronunciation_sumsq + delta * pronunciation * pronunciation,
+        accuracy_sum = accuracy_sum + delta * accuracy,
+        accuracy_sumsq = accuracy_sumsq + delta * accuracy * accuracy,
+        fluency_sum = fluency_sum + delta * fluency,
+        fluency_sumsq = fluency_sumsq + delta * fluency * fluency,
+        completeness_sum = completeness_sum + delta * completeness,
+        completeness_sumsq = completeness_sumsq + delta * completeness * completeness,
+        resonance_count = resonance_count + CASE WHEN resonance IS NULL THEN 0 ELSE delta END,
+        resonance_sum = resonance_sum + delta * COALESCE(resonance, 0),
+        resonance_sumsq = resonance_sumsq + delta * COALESCE(resonance * resonance, 0),
+        tone_count = tone_count + CASE WHEN tone IS NULL THEN 0 ELSE delta END,
+        tone_sum = tone_sum + delta * COALESCE(tone, 0),
+        tone_sumsq = tone_sumsq + delta * COALESCE(tone * tone, 0),
+        pronunciation_histogram[bucket] = pronunciation_histogram[bucket] + delta,
+        updated_at = NOW()
+    WHERE original_text = text_key;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION sync_sentence_stats() RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        PERFORM apply_sentence_stats(OLD, -1);
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        PERFORM apply_sentence_stats(NEW, 1);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_analysis_sentence_stats ON analysis_results;
+CREATE TRIGGER trg_analysis_sentence_stats
+AFTER INSERT OR DELETE ON analysis_results
+FOR EACH ROW EXECUTE FUNCTION sync_sentence_stats();
+
+DROP TRIGGER IF EXISTS trg_analysis_sentence_stats_update ON analysis_results;
+CREATE TRIGGER trg_analysis_sentence_stats_update
+AFTER UPDATE OF pronunciation_score, accuracy_score, fluency_score, completeness_score, formant_data, tone_data
+ON analysis_results
+FOR EACH ROW WHEN (
+    OLD.pronunciation_score IS DISTINCT FROM NEW.pronunciation_score
+    OR OLD.accuracy_score IS DISTINCT FROM NEW.accuracy_score
+    OR OLD.fluency_score IS DISTINCT FROM NEW.fluency_score
+    OR OLD.completeness_score IS DISTINCT FROM NEW.completeness_score
+    OR OLD.formant_data->'resonance_score' IS DISTINCT FROM NEW.formant_data->'resonance_score'
+    OR OLD.tone_data->'tone_score' IS DISTINCT FROM NEW.tone_data->'tone_score'
+)
+EXECUTE FUNCTION sync_sentence_stats();
+
+-- 녹음을 지우면 결과를 먼저 지워 집계에서 빼기 (CASCADE로 지워질 때는 녹음의 original_text를 찾을 수 없음)
+CREATE OR REPLACE FUNCTION delete_recording_results() RETURNS TRIGGER AS $$
+BEGIN
+    DELETE FROM analysis_results WHERE recording_id = OLD.id;
+    RETURN OLD;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_recordings_delete_results ON recordings;
+CREATE TRIGGER trg_recordings_delete_results
+BEFORE DELETE ON recordings
+FOR EACH ROW EXECUTE FUNCTION delete_recording_results();
 
 -- 4. RLS 비활성화 (개발 환경에서만 사용)
 -- 주의: 프로덕션에서는 RLS를 활성화하고 적절한 정책을 설정하세요!
 ALTER TABLE recordings DISABLE ROW LEVEL SECURITY;
 ALTER TABLE analysis_results DISABLE ROW LEVEL SECURITY;
+ALTER TABLE word_results DISABLE ROW LEVEL SECURITY;
+ALTER TABLE word_stats DISABLE ROW LEVEL SECURITY;
+ALTER TABLE sentence_word_stats DISABLE ROW LEVEL SECURITY;
+ALTER TABLE sentence_stats DISABLE ROW LEVEL SECURITY;
 
 -- 5. 모든 사용자에게 권한 부여 (개발용)
 GRANT ALL ON recordings TO anon, authenticated;
 GRANT ALL ON analysis_results TO anon, authenticated;
+GRANT ALL ON word_results, word_stats, sentence_word_stats TO anon, authenticated;
+GRANT ALL ON sentence_stats TO anon, authenticated;
 
 -- =========================================
 -- 기존 테이블에 formant_data 컬럼 추가 (마이그레이션용)
 -- =========================================
 -- 이미 테이블이 있는 경우 아래 명령어로 컬럼 추가
 -- ALTER TABLE analysis_results ADD COLUMN IF NOT EXISTS formant_data JSONB;
+-- ALTER TABLE analysis_results ADD COLUMN IF NOT EXISTS tone_data JSONB;
+-- ALTER TABLE analysis_results ADD COLUMN IF NOT EXISTS contour_path TEXT;
+-- ALTER TABLE analysis_results ADD COLUMN IF NOT EXISTS waveform_path TEXT;
+-- ALTER TABLE analysis_results ADD COLUMN IF NOT EXISTS pending_stages JSONB;
+-- ALTER TABLE analysis_results ADD COLUMN IF NOT EXISTS analysis_preset TEXT;
+-- ALTER TABLE analysis_results ADD COLUMN IF NOT EXISTS scoring_version INTEGER;
+-- ALTER TABLE recordings ADD COLUMN IF NOT EXISTS analysis_started_at TIMESTAMP WITH TIME ZONE;
+-- 이미 저장된 word_details를 word_results로 옮기기 (단어별 결과 테이블/트리거를 만든 뒤 한 번 실행, 집계는 트리거가 채움)
+-- INSERT INTO word_results (result_id, recording_id, created_at, original_text, position, word, score, error_type)
+-- SELECT a.id, a.recording_id, a.created_at, r.original_text, w.ordinality - 1,
+--        w.value->>'word', (w.value->>'score')::DECIMAL, w.value->>'error_type'
+-- FROM analysis_results a
+-- JOIN recordings r ON r.id = a.recording_id
+-- CROSS JOIN LATERAL jsonb_array_elements(a.word_details) WITH ORDINALITY AS w(value, ordinality)
+-- WHERE jsonb_typeof(a.word_details) = 'array' AND COALESCE(w.value->>'word', '') <> ''
+--   AND NOT EXISTS (SELECT 1 FROM word_results x WHERE x.result_id = a.id);
+-- 이미 저장된 결과를 문장별 집계에 반영하기 (sentence_stats/트리거를 만든 뒤 빈 테이블에서 한 번 실행)
+-- SELECT apply_sentence_stats(a, 1) FROM analysis_results a;
 
 -- =========================================
 -- Storage 버킷 설정
@@ -79,6 +370,11 @@ INSERT INTO storage.buckets (id, name, public)
 VALUES ('recordings', 'recordings', true)
 ON CONFLICT (id) DO NOTHING;
 
+-- 분석 산출물(시계열 바이너리) 버킷: 백엔드(service key)만 접근하므로 비공개
+INSERT INTO storage.buckets (id, name, public)
+VALUES ('analysis-artifacts', 'analysis-artifacts', false)
+ON CONFLICT (id) DO NOTHING;
+
 -- Storage 정책: 모든 접근 허용 (개발용)
 -- 기존 정책이 있으면 삭제 후 재생성
 DROP POLICY IF EXISTS "Allow all access to recordings" ON storage.objects;